@@ -1,203 +1,861 @@
 import sys
 import os
+import argparse
 import hashlib
 import json
-import shutil
-import csv
 import logging
+import time
+import tempfile
+from collections import deque
 from datetime import datetime
-from typing import Set, Optional, Tuple, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Set, Optional, Tuple, List, Iterable, Iterator, NamedTuple, Callable
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from PyQt5.QtWidgets import (QApplication, QWidget, QPushButton, QProgressBar,
-                              QTableWidget, QTableWidgetItem, QFileDialog, 
+                              QTableView, QFileDialog, 
                               QMessageBox, QVBoxLayout, QHBoxLayout, QGridLayout,
-                              QLabel, QFrame, QAbstractItemView, QInputDialog, QStyle)
-from PyQt5.QtCore import QThread, pyqtSignal, Qt
+                              QLabel, QFrame, QAbstractItemView, QInputDialog, QStyle,
+                              QComboBox, QCheckBox, QSpinBox)
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, Qt, QAbstractTableModel, QModelIndex
 from PyQt5.QtGui import QColor, QCursor
 
+from io_scheduler import (IO_ORDER_WALK, IO_ORDER_MODES, order_for_locality, PageCacheAdvisor,
+                          CACHE_MODE_NORMAL, CACHE_MODES, PREFETCH_DEPTH, data_extents)
+from scan_checkpoint import ScanCheckpoint
+from file_walker import WalkFilter, WalkStats, walk_files, parallel_walk_files
+from quarantine_store import QuarantineStore
+from action_stage import (DetectionActionStage, ActionOutcome, ACTION_REPORT,
+                          ACTION_QUARANTINE, ACTION_DELETE)
+from report_writer import ReportSink, export_report, write_attachment
+from log_config import configure_logging, LOG_CATEGORY_FILE
+from signature_store import SignatureStore, SignatureSnapshot
+from dir_tree_cache import DirTreeCache
+from throttle import ScanThrottle, IOPRIO_CLASSES
+from allowlist import Allowlist, AllowlistStore, import_allowlist
+from scan_profiler import (ScanProfiler, PROFILE_MODES, PROFILE_CPROFILE, PROFILE_SAMPLING,
+                           PROFILES_FOLDER)
+from scan_scheduler import ScanScheduler, ScanJob, PRIORITY_NORMAL, JOB_PAUSED
+from result_store import ResultStore
+from scan_diff import build_scan_index, find_previous_index, write_scan_diff
+from mime_engine import MimeScanner, is_mail_file, MEMBER_SEPARATOR
+from elf_engine import (buffer_reader, file_reader, seekable_reader, is_elf, is_elf_file,
+                        match_sections, section_hashes, ELF_MAGIC)
+from entropy_engine import (EntropyPolicy, EntropyReport, is_executable_file, profile_bytes,
+                            DEFAULT_THRESHOLD, DEFAULT_MIN_RATIO)
+from signature_merge import SignatureFeed, merge_signature_files, DEFAULT_MEMORY_LIMIT, SOURCES_SUFFIX
+
 
 
 VIRUS_DB_FILE = "./virus_signatures.json"
+SECTION_DB_FILE = "./section_signatures.json"
+SIGNATURE_SOURCES_FILE = VIRUS_DB_FILE + SOURCES_SUFFIX  # İmza -> kaynak akışlar
+ALLOWLIST_FILE = "./allowlist.bin"
 QUARANTINE_FOLDER = "quarantine"
 LOG_FILE = "antivirus.log"
+REPORTS_FOLDER = "reports"
+
+# Tarama motoru adları (raporlarda kullanılır)
+ENGINE_SIGNATURE = "md5-signature"
+ENGINE_ALLOWLIST = "allowlist"
+ENGINE_MIME = "mime"                      # E-posta eki (yol: mesaj!ek)
+ENGINE_MIME_CONTAINER = "mime-container"  # Eki tehlikeli olduğu için işaretlenen e-posta dosyası
+ENGINE_ELF_SECTION = "elf-section"        # Çalıştırılabilir bölümü imzayla eşleşen ELF dosyası
+ENGINE_ENTROPY = "entropy-heuristic"      # Entropi profili paketlenmiş/şifreli görünen dosya (şüpheli)
+# Dosya hash'i imza deposunda olmayan tespitler: eylem taramadaki hash ile doğrulanır
+CONTENT_ENGINES = (ENGINE_MIME_CONTAINER, ENGINE_ELF_SECTION)
+MAIL_CHUNK_SIZE = 1 << 20
+
+# Küçük dosya hızlı yolu: bu boyutun altındaki dosyalar toplu olarak taranır
+SMALL_FILE_LIMIT = 8 * 1024
+HASH_CHUNK_SIZE = 65536
+# Seyrek dosyalardaki boşluklar diskten okunmaz; hash'e bu ortak sıfır tamponu verilir
+_ZERO_CHUNK = memoryview(bytes(HASH_CHUNK_SIZE))
+SMALL_FILE_BATCH = 64
+# Akışlarda bölüm kontrolü rastgele erişim ister: ELF akışları bu boyuta kadar bellekte,
+# sonra geçici dosyada tutulur; STREAM_SECTION_LIMIT'ten büyük akışlarda kontrol atlanır
+STREAM_SPOOL_MEMORY = 8 * 1024 * 1024
+STREAM_SECTION_LIMIT = 512 * 1024 * 1024
+_O_RDONLY_BINARY = os.O_RDONLY | getattr(os, "O_BINARY", 0)
 
 # Loglama konfigürasyonu
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding='utf-8'),
-        logging.StreamHandler()
-    ]
-)
+# (thread'ler yalnızca kuyruğa yazar, dosya JSON satırları ve boyut bazlı dönüşümlü)
+configure_logging(LOG_FILE, level=logging.INFO)
 logger = logging.getLogger('Mert Ulupınar')
 
-# Global cache için
-_virus_signatures_cache: Optional[Set[str]] = None
-_cache_timestamp: float = 0
+# Paylaşılan imza deposu (değiştirilemez, generation numaralı görüntüler)
+_signature_store = SignatureStore(VIRUS_DB_FILE)
 
-def load_virus_signatures() -> Set[str]:
+def load_virus_signatures() -> SignatureSnapshot:
     """
-    Virus imzalarını cache'den veya dosyadan yükler.
-    Cache mekanizması ile performansı artırır.
+    Virus imzalarının güncel anlık görüntüsünü döndürür.
+    Dosya en fazla saniyede bir kontrol edilir; dönen küme değiştirilemez.
     """
-    global _virus_signatures_cache, _cache_timestamp
-    
-    # Cache kontrolü (dosya değişmişse yeniden yükle)
-    if os.path.exists(VIRUS_DB_FILE):
-        file_mtime = os.path.getmtime(VIRUS_DB_FILE)
-        if _virus_signatures_cache is not None and _cache_timestamp >= file_mtime:
-            logger.debug("Virus imzaları cache'den yüklendi")
-            return _virus_signatures_cache
-        
-        try:
-            with open(VIRUS_DB_FILE, "r", encoding="utf-8") as f:
-                _virus_signatures_cache = set(json.load(f))
-                _cache_timestamp = file_mtime
-                logger.info(f"{len(_virus_signatures_cache)} virus imzası yüklendi")
-                return _virus_signatures_cache
-        except (json.JSONDecodeError, IOError) as e:
-            logger.error(f"Virus imza dosyası yüklenemedi: {e}")
-            return set()
-    
-        # Dosya yoksa boş set döndür
-    logger.warning("Virus imza dosyası bulunamadı, boş set döndürülüyor")
-    _virus_signatures_cache = set()
-    _cache_timestamp = 0
-    return _virus_signatures_cache
-
-def save_virus_signatures(signatures: Set[str]) -> None:
-    """İmzaları dosyaya kaydeder ve cache'i günceller."""
-    global _virus_signatures_cache, _cache_timestamp
-    
+    return _signature_store.snapshot()
+
+# ELF bölüm imzaları (dosyanın tamamının değil, çalıştırılabilir bölümlerinin MD5'i)
+_section_store = SignatureStore(SECTION_DB_FILE, label="Bölüm")
+
+def load_section_signatures() -> SignatureSnapshot:
+    """ELF bölüm imzalarının güncel anlık görüntüsünü döndürür (dosya yoksa boş)."""
+    return _section_store.snapshot()
+
+def add_section_signatures(paths: Iterable[str]) -> int:
+    """
+    Örnek ELF dosyalarının çalıştırılabilir bölüm hash'lerini bölüm imza
+    indeksine ekler. Eklenen yeni imza sayısını döndürür.
+    """
+    signatures = load_section_signatures()
+    new_signatures = set()
+    for path in paths:
+        hashes = section_hashes(path)
+        if not hashes:
+            logger.warning(f"Çalıştırılabilir ELF bölümü bulunamadı: {path}")
+        for elf_range, digest in hashes:
+            logger.info(f"{path}: {elf_range.kind} {elf_range.name} ({elf_range.size} byte) -> {digest}")
+            new_signatures.add(digest)
+    new_signatures -= signatures
+    if new_signatures:
+        snapshot = _section_store.publish(signatures | new_signatures)
+        logger.info(f"{len(new_signatures)} yeni bölüm imzası eklendi (generation {snapshot.generation})")
+    return len(new_signatures)
+
+# Bilinen temiz dosya listesi (dosya yoksa None)
+_allowlist_store = AllowlistStore(ALLOWLIST_FILE)
+
+def load_allowlist() -> Optional[Allowlist]:
+    """Güncel allowlist'i döndürür; allowlist dosyası yoksa None."""
+    return _allowlist_store.current()
+
+def save_virus_signatures(signatures: Iterable[str]) -> SignatureSnapshot:
+    """İmzaları dosyaya atomik olarak kaydeder ve yeni görüntüyü yayımlar."""
     try:
-        with open(VIRUS_DB_FILE, "w", encoding="utf-8") as f:
-            json.dump(sorted(list(signatures)), f, indent=2, ensure_ascii=False)
-        
-        # Cache'i güncelle
-        _virus_signatures_cache = signatures.copy()
-        _cache_timestamp = os.path.getmtime(VIRUS_DB_FILE)
-        logger.info(f"{len(signatures)} virus imzası kaydedildi")
-    except IOError as e:
+        snapshot = _signature_store.publish(signatures)
+        logger.info(f"{len(snapshot)} virus imzası kaydedildi (generation {snapshot.generation})")
+        return snapshot
+    except (IOError, OSError) as e:
         logger.error(f"İmza dosyası kaydedilemedi: {e}")
+        return load_virus_signatures()
 
 def update_virus_signatures(new_signatures: Set[str]) -> None:
-    """Yeni imzaları mevcut imzalara ekler."""
+    """
+    Yeni imzaları mevcut imzalara ekler.
+    Küçük setler içindir; büyük akışlar için merge_signature_feeds kullanın.
+    """
     signatures = load_virus_signatures()
-    old_count = len(signatures)
-    signatures.update(new_signatures)
-    new_count = len(signatures) - old_count
-    save_virus_signatures(signatures)
+    merged = signatures | new_signatures
+    new_count = len(merged) - len(signatures)
+    save_virus_signatures(merged)
     logger.info(f"{new_count} yeni virus imzası eklendi")
 
+def merge_signature_feeds(feed_paths: Iterable[str], removal_paths: Iterable[str] = (),
+                          memory_limit: int = DEFAULT_MEMORY_LIMIT) -> dict:
+    """
+    İmza akışı dosyalarını imza veritabanıyla diskte birleştirir ve yayımlar.
+
+    Veritabanı ve akışlar belleğe yüklenmez (harici birleştirmeli sıralama);
+    bellek kullanımı memory_limit ile sınırlıdır. removal_paths dosyalarındaki
+    hash'ler sonuçtan çıkarılır. Her imzanın kaynakları SIGNATURE_SOURCES_FILE
+    dosyasına yazılır: mevcut veritabanındakiler "local", akışlardakiler
+    dosyanın tam yoluyla (aynı adlı dosyalar karışmaz).
+    Birleştirme sayaçlarını ve yeni generation numarasını döndürür.
+    """
+    feeds = [SignatureFeed("local", VIRUS_DB_FILE, local=True)] if os.path.exists(VIRUS_DB_FILE) else []
+    feeds.extend(SignatureFeed(os.path.abspath(path), path) for path in feed_paths)
+    feeds.extend(SignatureFeed(os.path.abspath(path), path, remove=True) for path in removal_paths)
+    
+    # Aynı dizinde hazırlanır: yayımlama tek os.replace ile olur
+    fd, merged_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(VIRUS_DB_FILE)), suffix=".merge")
+    os.close(fd)
+    try:
+        counts = merge_signature_files(feeds, merged_path, SIGNATURE_SOURCES_FILE, memory_limit)
+        counts["generation"] = _signature_store.publish_file(merged_path)
+    except BaseException:
+        try:
+            os.remove(merged_path)
+        except OSError:
+            pass
+        raise
+    logger.info(f"{counts['new']} yeni virus imzası eklendi, {counts['removed']} silindi "
+                f"(generation {counts['generation']})")
+    return counts
+
 def remove_virus_signature(signature: str) -> bool:
     """Belirtilen imzayı siler."""
     signatures = load_virus_signatures()
     if signature in signatures:
-        signatures.remove(signature)
-        save_virus_signatures(signatures)
+        save_virus_signatures(signatures - {signature})
         logger.info(f"Virus imzası silindi: {signature[:16]}...")
         return True
     logger.warning(f"Silinmek istenen imza bulunamadı: {signature[:16]}...")
     return False
 
-def calculate_hash(path: str, algorithm: str = 'md5') -> Optional[str]:
+class ScanVerdict(NamedTuple):
+    """Tek bir dosyanın tarama sonucu."""
+    path: str
+    is_virus: bool
+    file_hash: Optional[str] = None  # Okunamadıysa None
+    size: int = -1                   # Byte cinsinden (bilinmiyorsa -1)
+    elapsed: float = 0.0             # Dosya başına tarama süresi (saniye)
+    engine: str = ENGINE_SIGNATURE   # Kararı veren tarama motoru
+    generation: int = 0              # Karşılaştırılan imza görüntüsünün generation numarası
+
+def _digest_file(path: str, algorithm: str = 'md5',
+                 advisor: Optional[PageCacheAdvisor] = None,
+                 throttle: Optional[ScanThrottle] = None,
+                 on_chunk: Optional[Callable] = None) -> Tuple[Optional[str], int]:
     """
-    Dosyanın hash değerini hesaplar.
-    Varsayılan olarak MD5 kullanır (virus signatures ile uyumlu).
+    Dosyanın hash değerini ve hash'lenen byte sayısını döndürür.
+    advisor verilirse okuma page cache politikasına göre işaretlenir,
+    throttle verilirse okuma hızı ortak sınırlara göre ayarlanır.
+    on_chunk verilirse hash'e giren her parçayla çağrılır (ek okuma yapılmaz).
+    Seyrek dosyalarda yalnızca veri bölgeleri okunur.
     """
     hash_func = hashlib.md5() if algorithm == 'md5' else hashlib.sha256()
+    size = 0
     
     try:
+        if throttle is not None:
+            throttle.before_file()
         with open(path, "rb") as f:
-            # Büyük dosyalar için optimize edilmiş chunk size (64KB)
-            for chunk in iter(lambda: f.read(65536), b""):
-                hash_func.update(chunk)
-        return hash_func.hexdigest()
+            resident = advisor.begin(f.fileno(), path) if advisor is not None else True
+            try:
+                st = os.fstat(f.fileno())
+                extents = data_extents(f.fileno(), st) if st.st_size > SMALL_FILE_LIMIT else None
+                if extents is not None:
+                    size = _digest_sparse(f, extents, st.st_size, hash_func, throttle, on_chunk)
+                else:
+                    # Büyük dosyalar için optimize edilmiş chunk size (64KB)
+                    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                        hash_func.update(chunk)
+                        if on_chunk is not None:
+                            on_chunk(chunk)
+                        size += len(chunk)
+                        if throttle is not None:
+                            throttle.after_read(len(chunk))
+            finally:
+                # Okuma hatasında da taramanın getirdiği sayfalar bırakılır
+                if advisor is not None:
+                    advisor.end(f.fileno(), resident)
+        return hash_func.hexdigest(), size
     except (IOError, OSError, PermissionError):
-        return None
+        return None, -1
 
-def scan_file(path: str, virus_signatures: Optional[Set[str]] = None) -> Tuple[str, bool]:
+def _digest_sparse(f, extents: List[Tuple[int, int]], file_size: int, hash_func,
+                   throttle: Optional[ScanThrottle] = None,
+                   on_chunk: Optional[Callable] = None) -> int:
     """
-    Dosyayı tarar ve virüs olup olmadığını kontrol eder.
+    Seyrek dosyayı veri bölgeleri üzerinden hash'ler; boşluklar için sıfır
+    tamponu kullanılır, böylece hash dosyanın tamamı okunmuş gibi çıkar.
+    Hash'lenen byte sayısını döndürür.
+    """
+    position = 0
+    for start, end in extents + [(file_size, file_size)]:
+        # Önceki bölgenin sonundan bu bölgeye kadar boşluk
+        while position < start:
+            length = min(HASH_CHUNK_SIZE, start - position)
+            hash_func.update(_ZERO_CHUNK[:length])
+            if on_chunk is not None:
+                on_chunk(_ZERO_CHUNK[:length])
+            position += length
+        if start == end:
+            continue
+        f.seek(start)
+        while position < end:
+            chunk = f.read(min(HASH_CHUNK_SIZE, end - position))
+            if not chunk:
+                # Dosya okunurken kısaldı
+                return position
+            hash_func.update(chunk)
+            if on_chunk is not None:
+                on_chunk(chunk)
+            position += len(chunk)
+            if throttle is not None:
+                throttle.after_read(len(chunk))
+    logger.debug("Seyrek dosya: %s (%d byte boşluk okunmadı)", f.name,
+                 file_size - sum(end - start for start, end in extents),
+                 extra={"category": LOG_CATEGORY_FILE})
+    return position
+
+def calculate_hash(path: str, algorithm: str = 'md5', cache_mode: str = CACHE_MODE_NORMAL) -> Optional[str]:
+    """
+    Dosyanın hash değerini hesaplar.
+    Varsayılan olarak MD5 kullanır (virus signatures ile uyumlu).
+    cache_mode='drop' ile okunan veri page cache'te bırakılmaz.
+    """
+    advisor = PageCacheAdvisor(cache_mode) if cache_mode != CACHE_MODE_NORMAL else None
+    return _digest_file(path, algorithm, advisor)[0]
+
+def inspect_file(path: str, virus_signatures: Optional[Set[str]] = None,
+                 advisor: Optional[PageCacheAdvisor] = None,
+                 throttle: Optional[ScanThrottle] = None,
+                 allowlist: Optional[Allowlist] = None,
+                 section_signatures: Optional[Set[str]] = None,
+                 entropy: Optional[EntropyPolicy] = None) -> ScanVerdict:
+    """
+    Dosyayı tarar ve hash, boyut ve süre bilgisiyle ayrıntılı sonuç döndürür.
     virus_signatures parametresi ile imzalar tekrar yüklenmez.
+    allowlist verilmezse varsayılan allowlist dosyası (varsa) kullanılır.
+    Temiz çıkan ELF dosyalarının çalıştırılabilir bölümleri bölüm imzalarıyla
+    (section_signatures verilmezse bölüm imza dosyası) karşılaştırılır.
+    entropy verilirse hash için okunan parçaların entropi profili de çıkarılır.
     """
     if virus_signatures is None:
         virus_signatures = load_virus_signatures()
+    if allowlist is None:
+        allowlist = load_allowlist()
     
-    file_hash = calculate_hash(path)
-    
+    start = time.perf_counter()
+    profiler = entropy.profiler() if entropy is not None else None
+    file_hash, size = _digest_file(path, advisor=advisor, throttle=throttle,
+                                   on_chunk=profiler.update if profiler is not None else None)
+    verdict = _judge(path, file_hash, size, start, virus_signatures, allowlist)
+    if _needs_content_check(verdict):
+        if section_signatures is None:
+            section_signatures = load_section_signatures()
+        if section_signatures:
+            verdict = _check_file_sections(verdict, section_signatures, throttle)
+    if profiler is not None and _needs_content_check(verdict):
+        verdict = _check_entropy(verdict, profiler.report(), entropy)
+    return verdict
+
+def _judge(path: str, file_hash: Optional[str], size: int, start: float,
+           virus_signatures: Set[str], allowlist: Optional[Allowlist] = None) -> ScanVerdict:
+    """
+    Hash'i önce allowlist, sonra imza görüntüsüyle karşılaştırır; kararı
+    loglar ve döndürür. Allowlist'te bulunan dosya için işlem orada biter.
+    """
+    generation = getattr(virus_signatures, "generation", 0)
     if file_hash is None:
-        logger.debug(f"Hash hesaplanamadı: {path}")
-        return path, False
+        logger.debug("Hash hesaplanamadı: %s", path, extra={"category": LOG_CATEGORY_FILE})
+        return ScanVerdict(path, False, None, size, time.perf_counter() - start, generation=generation)
+
+    if allowlist is not None and allowlist.contains(file_hash, size):
+        logger.debug("Bilinen temiz dosya: %s", path, extra={"category": LOG_CATEGORY_FILE})
+        return ScanVerdict(path, False, file_hash, size, time.perf_counter() - start,
+                           ENGINE_ALLOWLIST, generation)
 
     is_virus = file_hash in virus_signatures
     
     if is_virus:
-        logger.warning(f"Virüs tespit edildi! Dosya: {path}, Hash: {file_hash}")
+        logger.warning("Virüs tespit edildi! Dosya: %s, Hash: %s", path, file_hash,
+                       extra={"category": LOG_CATEGORY_FILE, "path": path, "hash": file_hash})
     else:
-        logger.debug(f"Temiz dosya: {path}")
+        logger.debug("Temiz dosya: %s", path, extra={"category": LOG_CATEGORY_FILE})
     
-    return path, is_virus
+    return ScanVerdict(path, is_virus, file_hash, size, time.perf_counter() - start,
+                       generation=generation)
+
+def _needs_content_check(verdict: ScanVerdict) -> bool:
+    """Temiz çıkan ve allowlist'te olmayan dosyalar bölüm imzalarıyla da kontrol edilir."""
+    return not verdict.is_virus and verdict.file_hash is not None and verdict.engine == ENGINE_SIGNATURE
+
+def _check_sections(verdict: ScanVerdict, read_at, section_signatures: Set[str]) -> ScanVerdict:
+    """
+    ELF dosyasının çalıştırılabilir bölümlerini bölüm imzalarıyla karşılaştırır.
+    ELF olmayan dosyalar için yalnızca ilk 16 byte okunur.
+    """
+    match = match_sections(read_at, verdict.size, section_signatures)
+    if match is None:
+        return verdict
+    elf_range, digest = match
+    logger.warning("Virüs tespit edildi (ELF bölümü)! Dosya: %s, Bölüm: %s, Hash: %s",
+                   verdict.path, elf_range.name, digest,
+                   extra={"category": LOG_CATEGORY_FILE, "path": verdict.path, "hash": digest})
+    return verdict._replace(is_virus=True, engine=ENGINE_ELF_SECTION)
+
+def _check_entropy(verdict: ScanVerdict, report: EntropyReport, policy: EntropyPolicy) -> ScanVerdict:
+    """
+    Entropi profili paketlenmiş/şifreli görünen dosyayı şüpheli olarak işaretler.
+    Sezgisel sonuç tespit değildir: is_virus False kalır, eylem uygulanmaz.
+    """
+    if not policy.is_suspicious(report):
+        return verdict
+    logger.warning("Şüpheli entropi profili! Dosya: %s, Ortalama: %.2f bit/byte, Yüksek blok oranı: %.0f%%",
+                   verdict.path, report.mean_entropy, report.high_ratio * 100,
+                   extra={"category": LOG_CATEGORY_FILE, "path": verdict.path, "hash": verdict.file_hash})
+    return verdict._replace(engine=ENGINE_ENTROPY)
 
-def move_to_quarantine(file_path: str) -> str:
-    """Dosyayı karantina klasörüne taşır."""
-    os.makedirs(QUARANTINE_FOLDER, exist_ok=True)
+def _check_file_sections(verdict: ScanVerdict, section_signatures: Set[str],
+                         throttle: Optional[ScanThrottle] = None) -> ScanVerdict:
+    """_check_sections'ın diskteki dosya için sürümü (okumalar throttle'a sayılır)."""
+    try:
+        fd = os.open(verdict.path, _O_RDONLY_BINARY)
+    except OSError:
+        return verdict
+    try:
+        on_read = throttle.after_read if throttle is not None else None
+        return _check_sections(verdict, file_reader(fd, on_read), section_signatures)
+    except OSError:
+        return verdict
+    finally:
+        os.close(fd)
+
+def inspect_mail(path: str, virus_signatures: Optional[Set[str]] = None,
+                 throttle: Optional[ScanThrottle] = None,
+                 allowlist: Optional[Allowlist] = None) -> List[ScanVerdict]:
+    """
+    .eml/.mbox dosyasını tarar. Dosya bir kez okunur: aynı veri hem dosyanın
+    hash'ine hem MIME ayrıştırıcısına verilir, ekler çözülerek hash'lenir.
+    İlk sonuç dosyanın kendisidir, ardından "mesaj!ek" yollu ek sonuçları gelir.
+    Eklerden biri tehlikeliyse dosya da tehlikeli olarak işaretlenir.
+    """
+    if virus_signatures is None:
+        virus_signatures = load_virus_signatures()
+    if allowlist is None:
+        allowlist = load_allowlist()
     
-    filename = os.path.basename(file_path)
-    quarantine_path = os.path.join(QUARANTINE_FOLDER, filename)
+    start = time.perf_counter()
+    hash_func = hashlib.md5()
+    scanner = MimeScanner()
+    size = 0
+    try:
+        if throttle is not None:
+            throttle.before_file()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(MAIL_CHUNK_SIZE), b""):
+                hash_func.update(chunk)
+                scanner.feed(chunk)
+                size += len(chunk)
+                if throttle is not None:
+                    throttle.after_read(len(chunk))
+        parts = scanner.close()
+    except (IOError, OSError):
+        return [_judge(path, None, -1, start, virus_signatures, allowlist)]
     
-    # Aynı isimde dosya varsa benzersiz isim oluştur
-    counter = 1
-    base, ext = os.path.splitext(filename)
-    while os.path.exists(quarantine_path):
-        quarantine_path = os.path.join(QUARANTINE_FOLDER, f"{base}_{counter}{ext}")
-        counter += 1
+    container = _judge(path, hash_func.hexdigest(), size, start, virus_signatures, allowlist)
+    if container.engine == ENGINE_ALLOWLIST:
+        return [container]
     
-    shutil.move(file_path, quarantine_path)
-    logger.info(f"Dosya karantinaya alındı: {file_path} -> {quarantine_path}")
-    return quarantine_path
+    members = [_judge(f"{path}{MEMBER_SEPARATOR}{part.name}", part.file_hash, part.size, start,
+                      virus_signatures, allowlist)._replace(engine=ENGINE_MIME)
+               for part in parts]
+    if not container.is_virus and any(member.is_virus for member in members):
+        container = container._replace(is_virus=True, engine=ENGINE_MIME_CONTAINER)
+    return [container] + members
+
+def scan_file(path: str, virus_signatures: Optional[Set[str]] = None) -> Tuple[str, bool]:
+    """
+    Dosyayı tarar ve virüs olup olmadığını kontrol eder.
+    virus_signatures parametresi ile imzalar tekrar yüklenmez.
+    """
+    verdict = inspect_file(path, virus_signatures)
+    return verdict.path, verdict.is_virus
+
+def scan_bytes(buffer, virus_signatures: Optional[Set[str]] = None,
+               name: str = "<bellek>",
+               section_signatures: Optional[Set[str]] = None,
+               entropy: Optional[EntropyPolicy] = None) -> ScanVerdict:
+    """
+    Bellekteki veriyi diske yazmadan tarar.
+    bytes, bytearray, memoryview, mmap gibi buffer protokolünü destekleyen
+    her nesne kabul edilir; bitişik (contiguous) veri kopyalanmadan hash'lenir.
+    name, sonuçta ve loglarda yol yerine kullanılır.
+    entropy verilirse veri entropi sezgiseliyle de değerlendirilir.
+    """
+    if virus_signatures is None:
+        virus_signatures = load_virus_signatures()
+    
+    start = time.perf_counter()
+    view = memoryview(buffer)
+    if not view.contiguous:
+        # hashlib yalnızca bitişik buffer kabul eder
+        view = memoryview(view.tobytes())
+    with view:
+        verdict = _judge(name, hashlib.md5(view).hexdigest(), view.nbytes, start,
+                         virus_signatures, load_allowlist())
+        if _needs_content_check(verdict):
+            if section_signatures is None:
+                section_signatures = load_section_signatures()
+            if section_signatures:
+                verdict = _check_sections(verdict, buffer_reader(view.cast("B")), section_signatures)
+        if entropy is not None and _needs_content_check(verdict):
+            verdict = _check_entropy(verdict, profile_bytes(view, entropy), entropy)
+    return verdict
+
+class _StreamContent:
+    """
+    Akış parçalarını hash döngüsüyle birlikte içerik motorlarına verir.
+
+    Entropi profili parçalardan doğrudan çıkarılır. Bölüm kontrolü için
+    yalnızca ELF ile başlayan akışlar geçici tampona kopyalanır; diğer
+    akışlar ilk byte'larından sonra kopyalanmaz.
+    """
+
+    def __init__(self, section_signatures: Set[str], entropy: Optional[EntropyPolicy] = None):
+        self.section_signatures = section_signatures
+        self.entropy = entropy
+        self.profiler = entropy.profiler() if entropy is not None else None
+        self.spool = (tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_MEMORY)
+                      if section_signatures else None)
+        self._spooled = 0
+        self._header_checked = False
+
+    @property
+    def active(self) -> bool:
+        return self.profiler is not None or self.spool is not None
+
+    def update(self, chunk) -> None:
+        if self.profiler is not None:
+            self.profiler.update(chunk)
+        if self.spool is None:
+            return
+        self.spool.write(chunk)
+        self._spooled += memoryview(chunk).nbytes
+        if not self._header_checked and self._spooled >= len(ELF_MAGIC):
+            self._header_checked = True
+            self.spool.seek(0)
+            header = self.spool.read(len(ELF_MAGIC))
+            self.spool.seek(0, os.SEEK_END)
+            if not is_elf(header):
+                self._drop_spool()
+        elif self._spooled > STREAM_SECTION_LIMIT:
+            logger.debug("ELF akışı bölüm kontrolü için çok büyük, atlanıyor")
+            self._drop_spool()
+
+    def check(self, verdict: ScanVerdict) -> ScanVerdict:
+        """Temiz çıkan akışa bölüm ve entropi kontrollerini uygular."""
+        try:
+            if self.spool is not None and self._header_checked and _needs_content_check(verdict):
+                verdict = _check_sections(verdict, seekable_reader(self.spool), self.section_signatures)
+            if self.profiler is not None and _needs_content_check(verdict):
+                verdict = _check_entropy(verdict, self.profiler.report(), self.entropy)
+        finally:
+            self.close()
+        return verdict
+
+    def _drop_spool(self) -> None:
+        self.spool.close()
+        self.spool = None
+
+    def close(self) -> None:
+        if self.spool is not None:
+            self._drop_spool()
+
+def scan_stream(source, virus_signatures: Optional[Set[str]] = None,
+                name: str = "<akış>", chunk_size: int = 65536,
+                section_signatures: Optional[Set[str]] = None,
+                entropy: Optional[EntropyPolicy] = None):
+    """
+    Akıştan gelen veriyi parçalar geldikçe hash'leyerek tarar.
+    
+    source şunlardan biri olabilir:
+      * read() veya readinto() metodu olan dosya benzeri nesne,
+      * bytes benzeri parçalar üreten bir iterable,
+      * bytes benzeri parçalar üreten bir async iterable; bu durumda
+        dönen coroutine await edilmelidir.
+    
+    İmza görüntüsü akış başlarken alınır, böylece tüm akış tek görüntüyle
+    değerlendirilir. Okuma hatasında file_hash None olan sonuç döner.
+    Dosya taramasındaki gibi temiz çıkan ELF akışları bölüm imzalarıyla,
+    entropy verilirse parçalar entropi sezgiseliyle de değerlendirilir.
+    """
+    if virus_signatures is None:
+        virus_signatures = load_virus_signatures()
+    if section_signatures is None:
+        section_signatures = load_section_signatures()
+    content = _StreamContent(section_signatures, entropy)
+    
+    if hasattr(source, "__aiter__"):
+        return _scan_async_stream(source, virus_signatures, name, content)
+    
+    start = time.perf_counter()
+    hash_func = hashlib.md5()
+    size = 0
+    on_chunk = content.update if content.active else None
+    try:
+        for chunk in _iter_stream_chunks(source, chunk_size):
+            hash_func.update(chunk)
+            size += memoryview(chunk).nbytes
+            if on_chunk is not None:
+                on_chunk(chunk)
+    except (IOError, OSError) as e:
+        content.close()
+        logger.error("Akış okunamadı: %s - %s", name, e, extra={"category": LOG_CATEGORY_FILE})
+        return _judge(name, None, size, start, virus_signatures)
+    return content.check(_judge(name, hash_func.hexdigest(), size, start, virus_signatures, load_allowlist()))
+
+def _iter_stream_chunks(source, chunk_size: int) -> Iterator:
+    """Dosya benzeri nesneden veya iterable'dan veri parçalarını üretir."""
+    if hasattr(source, "readinto"):
+        # Tek buffer yeniden kullanılır, parça başına bellek ayrılmaz
+        buffer = bytearray(chunk_size)
+        view = memoryview(buffer)
+        while True:
+            count = source.readinto(view)
+            if not count:
+                return
+            yield view[:count]
+    elif hasattr(source, "read"):
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            yield chunk
+    else:
+        yield from source
+
+async def _scan_async_stream(source, virus_signatures: Set[str], name: str,
+                             content: _StreamContent) -> ScanVerdict:
+    """scan_stream'in async iterable kaynaklar için sürümü."""
+    start = time.perf_counter()
+    hash_func = hashlib.md5()
+    size = 0
+    on_chunk = content.update if content.active else None
+    try:
+        async for chunk in source:
+            hash_func.update(chunk)
+            size += memoryview(chunk).nbytes
+            if on_chunk is not None:
+                on_chunk(chunk)
+    except (IOError, OSError) as e:
+        content.close()
+        logger.error("Akış okunamadı: %s - %s", name, e, extra={"category": LOG_CATEGORY_FILE})
+        return _judge(name, None, size, start, virus_signatures)
+    return content.check(_judge(name, hash_func.hexdigest(), size, start, virus_signatures, load_allowlist()))
+
+def move_to_quarantine(file_path: str, metadata: Optional[dict] = None) -> str:
+    """
+    Dosyayı içerik adresli karantina deposuna taşır.
+    Saklanan (sıkıştırılmış) örneğin yolunu döndürür.
+    """
+    with QuarantineStore(QUARANTINE_FOLDER) as store:
+        entry = store.add(file_path, metadata)
+    return entry.object_path
+
+def restore_from_quarantine(original_path: str, destination: Optional[str] = None) -> str:
+    """Orijinal yolu verilen en son karantina kaydını geri yükler."""
+    with QuarantineStore(QUARANTINE_FOLDER) as store:
+        entries = store.find(original_path=original_path)
+        if not entries:
+            raise FileNotFoundError(f"Karantinada kayıt bulunamadı: {original_path}")
+        return store.restore(entries[-1].id, destination)
 
 # ======================
 # Paralel Tarama Fonksiyonları
 # ======================
 
-def scan_file_parallel(file_path: str, virus_signatures: Set[str]) -> Tuple[str, bool]:
+def scan_file_parallel(file_path: str, virus_signatures: Set[str],
+                       advisor: Optional[PageCacheAdvisor] = None,
+                       throttle: Optional[ScanThrottle] = None,
+                       allowlist: Optional[Allowlist] = None,
+                       entropy: Optional[EntropyPolicy] = None) -> ScanVerdict:
     """Paralel tarama için optimize edilmiş dosya tarama fonksiyonu."""
     try:
-        return scan_file(file_path, virus_signatures)
+        return inspect_file(file_path, virus_signatures, advisor, throttle, allowlist, entropy=entropy)
+    except Exception as e:
+        logger.error("Dosya tarama hatası: %s - %s", file_path, e, extra={"category": LOG_CATEGORY_FILE})
+        return ScanVerdict(file_path, False)
+
+def scan_file_verdicts(file_path: str, virus_signatures: Set[str],
+                       advisor: Optional[PageCacheAdvisor] = None,
+                       throttle: Optional[ScanThrottle] = None,
+                       allowlist: Optional[Allowlist] = None,
+                       entropy: Optional[EntropyPolicy] = None) -> List[ScanVerdict]:
+    """
+    Dosyayı tarar ve sonuç listesini döndürür.
+    E-posta dosyalarında dosyanın sonucundan sonra ek sonuçları da gelir.
+    """
+    if not is_mail_file(file_path):
+        return [scan_file_parallel(file_path, virus_signatures, advisor, throttle, allowlist, entropy)]
+    try:
+        return inspect_mail(file_path, virus_signatures, throttle, allowlist)
     except Exception as e:
-        logger.error(f"Dosya tarama hatası: {file_path} - {e}")
-        return file_path, False
+        logger.error("E-posta tarama hatası: %s - %s", file_path, e, extra={"category": LOG_CATEGORY_FILE})
+        return [ScanVerdict(file_path, False)]
 
-def scan_files_parallel(files: List[str], virus_signatures: Set[str], max_workers: int = 4) -> List[Tuple[str, bool]]:
+def scan_file_batch(paths: List[str], virus_signatures: Set[str],
+                    advisor: Optional[PageCacheAdvisor] = None,
+                    throttle: Optional[ScanThrottle] = None,
+                    allowlist: Optional[Allowlist] = None,
+                    section_signatures: Optional[Set[str]] = None,
+                    entropy: Optional[EntropyPolicy] = None) -> Tuple[List[ScanVerdict], List[str]]:
+    """
+    Küçük dosyaları tek iş olarak toplu tarar (hızlı yol).
+    Her dosya fstat ile ölçülür ve tek bir os.read çağrısıyla okunur.
+    SMALL_FILE_LIMIT üzerindeki dosyalar ve e-posta dosyaları taranmadan
+    ikinci listede döndürülür.
+    """
+    results = []
+    large_files = []
+    generation = getattr(virus_signatures, "generation", 0)
+    if allowlist is None:
+        allowlist = load_allowlist()
+    if section_signatures is None:
+        section_signatures = load_section_signatures()
+    
+    for path in paths:
+        if is_mail_file(path):
+            # Ekler MIME motoruyla taranır
+            large_files.append(path)
+            continue
+        start = time.perf_counter()
+        try:
+            fd = os.open(path, _O_RDONLY_BINARY)
+        except OSError:
+            results.append(ScanVerdict(path, False, None, -1, time.perf_counter() - start,
+                                       generation=generation))
+            continue
+        
+        try:
+            size = os.fstat(fd).st_size
+            if size > SMALL_FILE_LIMIT:
+                large_files.append(path)
+                continue
+            # Dosya/s payı burada düşülür: büyük dosyalar akış yolunda bir kez sayılır
+            if throttle is not None:
+                throttle.before_file()
+            resident = advisor.begin(fd, path) if advisor is not None else True
+            try:
+                # Bir byte fazlası istenir: dosya okunurken büyüdüyse akış yoluna bırak
+                data = os.read(fd, size + 1)
+            finally:
+                # Büyüyen dosyanın sayfaları da bırakılır; akış yolu onu soğuk olarak yeniden okur
+                if advisor is not None:
+                    advisor.end(fd, resident)
+            if len(data) > size:
+                large_files.append(path)
+                continue
+            if throttle is not None:
+                throttle.after_read(len(data))
+        except OSError:
+            results.append(ScanVerdict(path, False, None, -1, time.perf_counter() - start,
+                                       generation=generation))
+            continue
+        finally:
+            os.close(fd)
+        
+        verdict = _judge(path, hashlib.md5(data).hexdigest(), len(data), start,
+                         virus_signatures, allowlist)
+        if section_signatures and _needs_content_check(verdict):
+            # Veri zaten bellekte: bölümler ek okuma olmadan hash'lenir
+            verdict = _check_sections(verdict, buffer_reader(data), section_signatures)
+        if entropy is not None and len(data) >= entropy.min_size and _needs_content_check(verdict):
+            verdict = _check_entropy(verdict, profile_bytes(data, entropy), entropy)
+        results.append(verdict)
+    
+    return results, large_files
+
+def iter_scan_results(files: Iterable[str], virus_signatures: Set[str], max_workers: int = 4,
+                      io_order: str = IO_ORDER_WALK, batch_size: int = SMALL_FILE_BATCH,
+                      signature_source: Optional[Callable[[], Set[str]]] = None,
+                      advisor: Optional[PageCacheAdvisor] = None,
+                      throttle: Optional[ScanThrottle] = None,
+                      allowlist: Optional[Allowlist] = None,
+                      profiler: Optional[ScanProfiler] = None,
+                      entropy: Optional[EntropyPolicy] = None) -> Iterator[ScanVerdict]:
+    """
+    Dosyaları paralel tarar ve sonuçları tamamlandıkça üretir.
+    Dosyalar batch_size'lık gruplar halinde küçük dosya hızlı yoluna verilir,
+    büyük dosyalar ayrı ayrı akış (streaming) ile taranır.
+    signature_source verilirse her iş başlarken güncel imza görüntüsü alınır,
+    böylece tarama sırasında yayımlanan imzalar sonraki dosyalarda kullanılır.
+    advisor etkinse büyük dosyalar sınırlı sayıda kuyruğa alınır ve kuyruğa
+    girerken WILLNEED ile önceden okunmaya başlanır.
+    throttle verilirse tüm işçiler aynı byte/s, dosya/s ve CPU sınırlarını paylaşır.
+    profiler verilirse işçi thread'lerindeki işler profil altında çalışır.
+    entropy verilirse dosyalar entropi sezgiseliyle de değerlendirilir.
+    Üreteç erken kapatılırsa bekleyen işler iptal edilir.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    prefetching = advisor is not None and advisor.enabled
+    large_backlog = deque()
+    in_flight_limit = max_workers + PREFETCH_DEPTH
+    singles_in_flight = [0]
+    
+    def current_signatures() -> Set[str]:
+        return signature_source() if signature_source is not None else virus_signatures
+    
+    def run_batch(batch: List[str]) -> Tuple[List[ScanVerdict], List[str]]:
+        return scan_file_batch(batch, current_signatures(), advisor, throttle, allowlist, entropy=entropy)
+    
+    def run_single(file_path: str) -> List[ScanVerdict]:
+        return scan_file_verdicts(file_path, current_signatures(), advisor, throttle, allowlist, entropy)
+    
+    if profiler is not None:
+        run_batch = profiler.wrap(run_batch)
+        run_single = profiler.wrap(run_single)
+    
+    def submit_large_files():
+        while large_backlog and (not prefetching or singles_in_flight[0] < in_flight_limit):
+            file_path = large_backlog.popleft()
+            if prefetching:
+                # İşçiler önceki dosyaları hash'lerken bu dosyanın okunması başlar
+                advisor.prefetch(file_path)
+            pending[executor.submit(run_single, file_path)] = file_path
+            singles_in_flight[0] += 1
+    
+    try:
+        batch = []
+        for file_path in order_for_locality(files, io_order):
+            batch.append(file_path)
+            if len(batch) >= batch_size:
+                pending[executor.submit(run_batch, batch)] = batch
+                batch = []
+        if batch:
+            pending[executor.submit(run_batch, batch)] = batch
+        
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                work = pending.pop(future)
+                if isinstance(work, str):
+                    singles_in_flight[0] -= 1
+                    submit_large_files()
+                try:
+                    outcome = future.result()
+                except Exception as e:
+                    logger.error("Thread hatası: %s - %s", work, e)
+                    if isinstance(work, str):
+                        yield ScanVerdict(work, False)
+                    else:
+                        yield from (ScanVerdict(file_path, False) for file_path in work)
+                    continue
+                
+                if isinstance(work, str):
+                    yield from outcome
+                    continue
+                
+                results, large_files = outcome
+                large_backlog.extend(large_files)
+                submit_large_files()
+                yield from results
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+def scan_files_parallel(files: List[str], virus_signatures: Set[str], max_workers: int = 4,
+                        io_order: str = IO_ORDER_WALK) -> List[Tuple[str, bool]]:
     """
     Dosyaları paralel olarak tarar.
     max_workers: Aynı anda çalışacak thread sayısı (varsayılan 4)
+    io_order: Dosyaların işçilere veriliş sırası ('walk', 'inode', 'extent')
     """
-    results = []
     total = len(files)
     
     logger.info(f"{total} dosya paralel tarama başlatılıyor ({max_workers} thread ile)")
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        future_to_file = {
-            executor.submit(scan_file_parallel, file_path, virus_signatures): file_path 
-            for file_path in files
-        }
-        
-        for future in as_completed(future_to_file):
-            try:
-                result = future.result()
-                results.append(result)
-            except Exception as e:
-                file_path = future_to_file[future]
-                logger.error(f"Thread hatası: {file_path} - {e}")
-                results.append((file_path, False))
+    results = [(verdict.path, verdict.is_virus)
+               for verdict in iter_scan_results(files, virus_signatures, max_workers, io_order)]
     
     logger.info(f"Paralel tarama tamamlandı: {len(results)} dosya tarandı")
     return results
 
+def scan_files_to_store(files: List[str], virus_signatures: Set[str], max_workers: int = 4,
+                        io_order: str = IO_ORDER_WALK, store: Optional[ResultStore] = None) -> ResultStore:
+    """
+    Dosyaları paralel tarar ve sonuçları sütunlu depoya yazar.
+    Çok sayıda dosyada scan_files_parallel'in (yol, durum) listesi yerine kullanılır;
+    depo bellek bütçesini aşınca diske taşar.
+    """
+    if store is None:
+        store = ResultStore(row_factory=ScanVerdict)
+    for verdict in iter_scan_results(files, virus_signatures, max_workers, io_order):
+        store.add(verdict)
+    logger.info(f"Paralel tarama tamamlandı: {len(store)} dosya tarandı ({store.stats()})")
+    return store
+
+def new_report_path(folder: str = REPORTS_FOLDER) -> str:
+    """Yeni tarama için zaman damgalı rapor yolu üretir."""
+    return os.path.join(folder, f"scan_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.jsonl")
+
 # ======================
 # Tarama Thread'i
 # ======================
@@ -206,80 +864,357 @@ class ScanThread(QThread):
     """Asenkron dosya tarama thread'i."""
     progress = pyqtSignal(int)
     result = pyqtSignal(str, bool)
+    content_detected = pyqtSignal(str, str)  # Eki/bölümü tehlikeli dosya ve taramadaki hash'i
+    summary = pyqtSignal(dict)
     finished = pyqtSignal()
 
-    def __init__(self, path: str, scan_type: str = 'directory', parallel: bool = True, max_workers: int = 4):
+    def __init__(self, path: str, scan_type: str = 'directory', parallel: bool = True, max_workers: int = 4,
+                 io_order: str = IO_ORDER_WALK, checkpoint: Optional[ScanCheckpoint] = None,
+                 resume: bool = False, walk_filter: Optional[WalkFilter] = None,
+                 action_stage: Optional[DetectionActionStage] = None,
+                 report_sink: Optional[ReportSink] = None,
+                 tree_cache: Optional[DirTreeCache] = None, walk_workers: int = 1,
+                 cache_mode: str = CACHE_MODE_NORMAL, throttle: Optional[ScanThrottle] = None,
+                 profiler: Optional[ScanProfiler] = None,
+                 scheduler: Optional[ScanScheduler] = None, priority: int = PRIORITY_NORMAL,
+                 result_store: Optional[ResultStore] = None,
+                 entropy_policy: Optional[EntropyPolicy] = None):
         super().__init__()
         self.path = path
         self.scan_type = scan_type
         self._is_running = True
         self.parallel = parallel  # Paralel tarama aktif mi
         self.max_workers = max_workers  # Thread sayısı
+        self.io_order = io_order  # Disk yerelliği sıralaması
+        self.checkpoint = checkpoint  # Devam ettirilebilir tarama kaydı
+        self.resume = resume  # Checkpoint'ten devam et
+        self.walk_filter = walk_filter or WalkFilter()  # Gezinme filtreleri
+        self.walk_stats = WalkStats()
+        self.action_stage = action_stage  # Tespit sonrası eylem aşaması
+        self.report_sink = report_sink  # Tarama sırasında yazılan rapor
+        self.tree_cache = tree_cache  # Artımlı tarama için dizin ağacı önbelleği
+        self.walk_workers = walk_workers  # Eşzamanlı listelenen dizin sayısı (1 = seri)
+        self.cache_advisor = PageCacheAdvisor(cache_mode)  # Page cache politikası
+        self.throttle = throttle  # Arka plan taraması için G/Ç ve CPU sınırları
+        self.profiler = profiler  # Tüm tarama thread'lerini profilleyen nesne
+        self.profile_outputs = {}
+        self.scheduler = scheduler  # Verilirse dosyalar paylaşılan işçi havuzunda taranır
+        self.priority = priority  # Zamanlayıcıdaki iş önceliği
+        self.job: Optional[ScanJob] = None
+        self.result_store = result_store  # Sonuçların sütunlu kopyası (API/rapor için)
+        self.entropy_policy = entropy_policy  # Verilirse paketlenmiş/şifreli dosya sezgiseli
+        self._suspicious = 0  # Sezgisel motorların şüpheli bulduğu dosyalar (eylem uygulanmaz)
+        self.scan_index: Optional[str] = None   # Raporun sıralı indeksi
+        self.diff_report: Optional[str] = None  # Önceki taramayla fark raporu
+        self.changes: dict = {}
+        self._known = {}  # Önbellekte hash'i bulunan dosyalar: yol -> (hash, boyut)
+        self.allowlist: Optional[Allowlist] = None  # Bilinen temiz dosyalar (tarama başında alınır)
+        self._allowlist_hits = 0
+        self._file_seconds = 0.0  # Dosya başına tarama sürelerinin toplamı
+        self._mail_members = 0  # Taranan e-posta eki sayısı
+        self._total_files = 0
+        self._completed = 0
 
     def run(self):
         """Tarama işlemini başlatır."""
         logger.info(f"Tarama başlatıldı: {self.path} (Paralel: {self.parallel})")
         
-        # Virus imzalarını bir kere yükle (performans optimizasyonu)
+        if self.throttle is not None:
+            # İşçi thread'leri bu thread'den oluşturulduğu için nice/ioprio'yu devralır
+            self.throttle.apply_priority()
+        if self.profiler is not None:
+            self.profiler.start(self.scheduler.thread_ids() if self.scheduler is not None else ())
+        
+        # Güncel imza görüntüsü; tarama sırasında yenisi yayımlanırsa dosyalar arasında geçilir
         virus_signatures = load_virus_signatures()
+        logger.info(f"İmza generation {virus_signatures.generation} ile taranıyor")
+        self.allowlist = load_allowlist()
         
-        files = self._get_files()
+        phase = time.perf_counter()
+        files, completed = self._prepare_files()
+        phase = self._record_phase("walk", phase)
         if not files:
             logger.warning("Taranacak dosya bulunamadı")
+            self._finish_profile()
             self.finished.emit()
             return
         
-        total_files = len(files)
-        logger.info(f"Toplam {total_files} dosya taranacak")
-        
-        if self.parallel and total_files > 10:
+        self._total_files = len(files)
+        self._completed = 0
+        logger.info(f"Toplam {self._total_files} dosya taranacak")
+        
+        if completed:
+            # Önceki çalışmada tamamlananları yeniden taramadan raporla
+            logger.info(f"{len(completed)} dosya checkpoint'ten alındı")
+            pending = []
+            for file_path in files:
+                # E-posta dosyaları eklerinin satırlarıyla birlikte yeniden taranır
+                if file_path in completed and not is_mail_file(file_path):
+                    self._emit_result(ScanVerdict(*completed[file_path]), record=False)
+                else:
+                    pending.append(file_path)
+            files = pending
+        
+        if self._known:
+            # Değişmeyen dosyalar okunmadan, kayıtlı hash'leri güncel imzalarla karşılaştırılır
+            files = self._emit_known(files, virus_signatures)
+        
+        if self.io_order != IO_ORDER_WALK:
+            # Dönen kafa/seek maliyetini azaltmak için disk konumuna göre sırala
+            files = list(order_for_locality(files, self.io_order))
+        phase = self._record_phase("prepare", phase)
+        
+        if self.scheduler is not None:
+            # Tüm taramalar aynı işçi havuzunu paylaşır, ortak dosyalar bir kez taranır
+            self._run_scheduled_scan(files)
+        elif self.parallel and len(files) > 10:
             # Paralel tarama (10'dan fazla dosya için)
-            self._run_parallel_scan(files, virus_signatures, total_files)
+            self._run_parallel_scan(files, virus_signatures)
         else:
             # Seri tarama
-            self._run_serial_scan(files, virus_signatures, total_files)
+            self._run_serial_scan(files, virus_signatures)
+        self.cache_advisor.close()
+        phase = self._record_phase("scan", phase)
+        
+        if self.checkpoint is not None:
+            if self._is_running:
+                self.checkpoint.discard()
+            else:
+                # Durdurulan tarama daha sonra devam ettirilebilir
+                self.checkpoint.close()
+        if self.tree_cache is not None:
+            self.tree_cache.commit()
+        if self.report_sink is not None and self._is_running:
+            self._index_report()
+        self._record_phase("finalize", phase)
+        self._finish_profile()
         
         logger.info("Tarama tamamlandı")
+        self.summary.emit(self._build_summary())
         self.finished.emit()
     
-    def _run_serial_scan(self, files: List[str], virus_signatures: Set[str], total_files: int):
+    def _build_summary(self) -> dict:
+        """Tarama istatistiklerini döndürür."""
+        summary = {"scanned": self._completed, "pruned": self.walk_stats.total_pruned,
+                   "signature_generation": load_virus_signatures().generation}
+        summary.update(self.walk_stats.as_dict())
+        if self.tree_cache is not None:
+            summary.update(self.tree_cache.stats.as_dict())
+        if self.cache_advisor.enabled:
+            summary.update(self.cache_advisor.as_dict())
+        if self.allowlist is not None:
+            summary["allowlist_hits"] = self._allowlist_hits
+            summary["allowlist_hit_rate"] = round(self._allowlist_hits / self._completed, 4) if self._completed else 0.0
+        if self._mail_members:
+            summary["mail_attachments"] = self._mail_members
+        if self.entropy_policy is not None:
+            summary["suspicious"] = self._suspicious
+        if self.throttle is not None:
+            summary["throttle"] = self.throttle.as_dict()
+        if self.profile_outputs:
+            summary["profile"] = self.profile_outputs
+        if self.scan_index is not None:
+            summary["scan_index"] = self.scan_index
+        if self.diff_report is not None:
+            summary["diff_report"] = self.diff_report
+            summary["changes"] = self.changes
+        return summary
+    
+    def _record_phase(self, name: str, started: float) -> float:
+        """Aşama süresini profilin zaman dökümüne ekler; şimdiki zamanı döndürür."""
+        now = time.perf_counter()
+        if self.profiler is not None:
+            self.profiler.record_phase(name, now - started)
+        return now
+    
+    def _finish_profile(self):
+        """Profili bitirir; zaman dökümünü rapora ek olarak yazar."""
+        if self.profiler is None or not self.profiler.running:
+            return
+        self.profiler.record_total("file_work_seconds", self._file_seconds)
+        self.profile_outputs = dict(self.profiler.stop())
+        if self.report_sink is not None:
+            try:
+                self.profile_outputs["report"] = write_attachment(self.report_sink.path, "profile",
+                                                                  self.profiler.breakdown())
+            except (IOError, OSError) as e:
+                logger.error(f"Zaman dökümü rapora eklenemedi: {e}")
+    
+    def _index_report(self):
+        """
+        Raporu yola göre sıralı indekse çevirir ve aynı dizinin önceki
+        taramasıyla farkını raporun yanına yazar.
+        """
+        root = os.path.abspath(self.path)
+        try:
+            self.report_sink.flush()
+            # Sabit adlı raporda (--report gece.jsonl) önceki indeks .prev.idx olarak saklanır
+            self.scan_index = build_scan_index(self.report_sink.path, root=root, keep_previous=True)
+            previous = find_previous_index(os.path.dirname(self.scan_index) or ".", root, self.scan_index)
+            if previous is not None:
+                self.diff_report = os.path.splitext(self.report_sink.path)[0] + ".diff.jsonl"
+                self.changes = write_scan_diff(previous, self.scan_index, self.diff_report)
+        except (IOError, OSError, ValueError) as e:
+            logger.error(f"Tarama indeksi oluşturulamadı: {e}")
+    
+    def _prepare_files(self) -> Tuple[List[str], dict]:
+        """Dosya listesini ve checkpoint'te tamamlanmış sonuçları hazırlar."""
+        if self.checkpoint is None:
+            return self._get_files(), {}
+        
+        resume = self.resume and self.checkpoint.exists()
+        files, completed = self.checkpoint.load() if resume else (None, {})
+        if files is None:
+            files = self._get_files()
+        
+        # Yarıda kesilen dosya listesi checkpoint'e tam liste gibi yazılmamalı
+        if self._is_running:
+            self.checkpoint.begin(files, resume=resume)
+        return files, completed
+    
+    def _emit_result(self, verdict: ScanVerdict, record: bool = True):
+        """Sonucu GUI'ye ve rapora iletir, checkpoint'e kaydeder ve ilerlemeyi günceller."""
+        self.result.emit(verdict.path, verdict.is_virus)
+        if verdict.engine == ENGINE_MIME:
+            # E-posta eki: dosya değil; ilerleme, checkpoint ve eylem e-posta dosyasına aittir
+            self._mail_members += 1
+            if self.report_sink is not None:
+                self.report_sink.write(verdict)
+            if self.result_store is not None:
+                self.result_store.add(verdict)
+            return
+        self._file_seconds += verdict.elapsed
+        if verdict.engine == ENGINE_ALLOWLIST:
+            self._allowlist_hits += 1
+        elif verdict.engine == ENGINE_ENTROPY:
+            self._suspicious += 1
+        if self.report_sink is not None:
+            self.report_sink.write(verdict)
+        if self.result_store is not None:
+            self.result_store.add(verdict)
+        if record and self.checkpoint is not None and not is_mail_file(verdict.path):
+            # Ek satırları checkpoint'e yazılmadığından e-posta dosyaları devam ederken yeniden taranır
+            self.checkpoint.record(verdict)
+        if (self.tree_cache is not None and verdict.file_hash is not None
+                and verdict.path not in self._known):
+            self.tree_cache.record_hash(verdict.path, verdict.file_hash)
+        if verdict.engine in CONTENT_ENGINES:
+            self.content_detected.emit(verdict.path, verdict.file_hash)
+        if verdict.is_virus and self.action_stage is not None:
+            # Eylem kendi thread'inde uygulanır, tarama beklemez
+            # Eki veya bölümü tehlikeli dosya imzayla değil taramadaki hash'iyle doğrulanır
+            self.action_stage.submit(verdict.path, verdict.file_hash
+                                     if verdict.engine in CONTENT_ENGINES else None)
+        
+        self._completed += 1
+        progress_percent = int(self._completed / self._total_files * 100)
+        self.progress.emit(progress_percent)
+    
+    def _emit_known(self, files: List[str], virus_signatures: Set[str]) -> List[str]:
+        """Hash'i önbellekte olan dosyaları raporlar, taranması gerekenleri döndürür."""
+        pending = []
+        generation = getattr(virus_signatures, "generation", 0)
+        section_signatures = load_section_signatures()
+        for file_path in files:
+            known = self._known.get(file_path)
+            if known is None or is_mail_file(file_path):
+                # E-postaların ekleri güncel imzalarla yeniden taranmalı
+                pending.append(file_path)
+                continue
+            if not self._is_running:
+                break
+            file_hash, size = known
+            if self.allowlist is not None and self.allowlist.contains(file_hash, size):
+                self._emit_result(ScanVerdict(file_path, False, file_hash, size,
+                                              engine=ENGINE_ALLOWLIST, generation=generation))
+                continue
+            if (section_signatures and file_hash not in virus_signatures
+                    and is_elf_file(file_path)):
+                # Dosya hash'i bölüm imzalarını göstermez: ELF dosyaları yeniden taranır
+                pending.append(file_path)
+                continue
+            if (self.entropy_policy is not None and file_hash not in virus_signatures
+                    and size >= self.entropy_policy.min_size and is_executable_file(file_path)):
+                # Entropi profili önbellekte tutulmaz: çalıştırılabilir dosyalar yeniden taranır
+                pending.append(file_path)
+                continue
+            self._emit_result(ScanVerdict(file_path, file_hash in virus_signatures, file_hash, size,
+                                          generation=generation))
+        logger.info(f"{len(files) - len(pending)} dosya dizin ağacı önbelleğinden değerlendirildi")
+        return pending
+    
+    def _run_serial_scan(self, files: List[str], virus_signatures: Set[str]):
         """Seri tarama modu."""
+        advisor = self.cache_advisor if self.cache_advisor.enabled else None
+        if advisor is not None:
+            for file_path in files[:PREFETCH_DEPTH]:
+                advisor.prefetch(file_path)
+        
         for index, file_path in enumerate(files):
             if not self._is_running:
                 break
+            if advisor is not None and index + PREFETCH_DEPTH < len(files):
+                # Bu dosya hash'lenirken ilerideki dosya diskten okunmaya başlar
+                advisor.prefetch(files[index + PREFETCH_DEPTH])
             
-            path, is_virus = scan_file(file_path, virus_signatures)
-            self.result.emit(path, is_virus)
-            
-            progress_percent = int((index + 1) / total_files * 100)
-            self.progress.emit(progress_percent)
+            # Görüntü yalnızca dosyalar arasında değişir, bir dosya tek görüntüyle taranır
+            virus_signatures = load_virus_signatures()
+            if is_mail_file(file_path):
+                for verdict in inspect_mail(file_path, virus_signatures, self.throttle, self.allowlist):
+                    self._emit_result(verdict)
+                continue
+            self._emit_result(inspect_file(file_path, virus_signatures, advisor, self.throttle,
+                                           self.allowlist, entropy=self.entropy_policy))
 
-    def _run_parallel_scan(self, files: List[str], virus_signatures: Set[str], total_files: int):
+    def _run_parallel_scan(self, files: List[str], virus_signatures: Set[str]):
         """Paralel tarama modu."""
-        completed = 0
-        
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_file = {
-                executor.submit(scan_file_parallel, file_path, virus_signatures): file_path 
-                for file_path in files
-            }
-            
-            for future in as_completed(future_to_file):
+        results = iter_scan_results(files, virus_signatures, self.max_workers,
+                                    signature_source=load_virus_signatures,
+                                    advisor=self.cache_advisor, throttle=self.throttle,
+                                    allowlist=self.allowlist, profiler=self.profiler,
+                                    entropy=self.entropy_policy)
+        try:
+            for verdict in results:
                 if not self._is_running:
-                    executor.shutdown(wait=False)
                     break
-                
-                try:
-                    path, is_virus = future.result()
-                    self.result.emit(path, is_virus)
-                    
-                    completed += 1
-                    progress_percent = int(completed / total_files * 100)
-                    self.progress.emit(progress_percent)
-                except Exception as e:
-                    file_path = future_to_file[future]
-                    logger.error(f"Paralel tarama hatası: {file_path} - {e}")
-                    self.result.emit(file_path, False)
+                self._emit_result(verdict)
+        finally:
+            results.close()
+    
+    def _run_scheduled_scan(self, files: List[str]):
+        """
+        Dosyaları paylaşılan zamanlayıcıya iş olarak gönderir ve sonuçları bekler.
+        iter_scan_results ile aynı şekilde küçük dosyalar SMALL_FILE_BATCH'lik
+        gruplar halinde hızlı yoldan, büyük dosyalar önceden okunarak taranır.
+        """
+        advisor = self.cache_advisor if self.cache_advisor.enabled else None
+        throttle, allowlist, entropy = self.throttle, self.allowlist, self.entropy_policy
+        
+        def scan(file_path: str, virus_signatures: Set[str]) -> List[ScanVerdict]:
+            return scan_file_verdicts(file_path, virus_signatures, advisor, throttle, allowlist, entropy)
+        
+        def scan_batch(paths: List[str], virus_signatures: Set[str]):
+            verdicts, large_files = scan_file_batch(paths, virus_signatures, advisor, throttle, allowlist,
+                                                    entropy=entropy)
+            grouped = {}
+            for verdict in verdicts:
+                grouped.setdefault(verdict.path, []).append(verdict)
+            return grouped, large_files
+        
+        if self.profiler is not None:
+            scan = self.profiler.wrap(scan)
+            scan_batch = self.profiler.wrap(scan_batch)
+        self.job = self.scheduler.submit(files, self.priority, name=self.path, scan_func=scan,
+                                         batch_func=scan_batch, batch_size=SMALL_FILE_BATCH,
+                                         prefetch=advisor.prefetch if advisor is not None else None)
+        if not self._is_running:
+            # stop() iş oluşturulmadan önce çağrıldı
+            self.job.cancel()
+        for verdicts in self.job.results():
+            if not self._is_running:
+                break
+            for verdict in verdicts:
+                self._emit_result(verdict)
     
     def _get_files(self) -> list:
         """Taranacak dosya listesini döndürür."""
@@ -290,23 +1225,130 @@ class ScanThread(QThread):
         return []
     
     def _get_files_in_directory(self, path: str) -> list:
-        """Dizindeki tüm dosyaları recursive olarak toplar."""
-        all_files = []
-        try:
-            for root, _, files in os.walk(path):
-                for file in files:
-                    if not self._is_running:
-                        break
-                    file_path = os.path.join(root, file)
-                    all_files.append(file_path)
-        except (OSError, PermissionError) as e:
-            logger.error(f"Dizin taranamadı: {e}")
+        """Dizindeki dosyaları filtreleri uygulayarak recursive olarak toplar."""
+        if self.tree_cache is not None:
+            # Yalnızca değişen dizinler listelenir
+            all_files = []
+            for entry in self.tree_cache.walk(path, self.walk_filter, self.walk_stats,
+                                              should_continue=lambda: self._is_running):
+                all_files.append(entry.path)
+                if entry.hash is not None:
+                    self._known[entry.path] = (entry.hash, entry.size)
+            logger.info(f"Dizin ağacı önbelleği: {self.tree_cache.stats.as_dict()}")
+        elif self.walk_workers > 1:
+            # Ağ dosya sistemlerinde dizin listeleme gecikmelerini örtüştürür
+            all_files = list(parallel_walk_files(path, self.walk_filter, self.walk_stats,
+                                                 should_continue=lambda: self._is_running,
+                                                 workers=self.walk_workers))
+        else:
+            all_files = list(walk_files(path, self.walk_filter, self.walk_stats,
+                                        should_continue=lambda: self._is_running))
         
+        if self.walk_stats.total_pruned:
+            logger.info(f"Gezinme sırasında {self.walk_stats.total_pruned} girdi elendi: "
+                        f"{self.walk_stats.as_dict()}")
         return all_files
     
     def stop(self):
         """Taramayı durdurur."""
         self._is_running = False
+        if self.job is not None:
+            self.job.cancel()
+    
+    def pause(self):
+        """Zamanlayıcıdaki işi duraklatır (yalnızca zamanlayıcı ile)."""
+        if self.job is not None:
+            self.job.pause()
+    
+    def resume(self):
+        if self.job is not None:
+            self.job.resume()
+    
+    @property
+    def paused(self) -> bool:
+        return self.job is not None and self.job.state == JOB_PAUSED
+
+class ActionSignals(QObject):
+    """Eylem aşaması sonuçlarını GUI thread'ine taşıyan sinyaller."""
+    outcome = pyqtSignal(str, str, bool, str)
+
+    def emit_outcome(self, outcome: ActionOutcome):
+        self.outcome.emit(outcome.path, outcome.action, outcome.ok, outcome.detail)
+
+class ScanResultModel(QAbstractTableModel):
+    """
+    Sonuç tablosunun modeli.
+    Satırlar tabloya kopyalanmaz; görünen hücreler sütunlu depodan okunur.
+    """
+    HEADERS = ["📁 Dosya Yolu", "🔍 Durum"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = ResultStore(row_factory=ScanVerdict)
+        self._status = {}  # Durumu değişen satırlar: satır -> (metin, nötr renk)
+    
+    def reset(self):
+        self.beginResetModel()
+        self.store.close()
+        self.store = ResultStore(row_factory=ScanVerdict)
+        self._status = {}
+        self.endResetModel()
+    
+    def close(self):
+        """Depoyu kapatır; diske taşan segmentler silinir."""
+        self.store.close()
+    
+    def append(self, path: str, is_virus: bool) -> int:
+        row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.append(path, is_virus)
+        self.endInsertRows()
+        return row
+    
+    def path(self, row: int) -> str:
+        return self.store.path(row)
+    
+    def status(self, row: int) -> str:
+        override = self._status.get(row)
+        if override is not None:
+            return override[0]
+        return "Tehlikeli" if self.store.is_virus(row) else "Temiz"
+    
+    def set_status(self, row: int, text: Optional[str], neutral: bool = False):
+        """Satırın durum metnini değiştirir; text None ise taramadaki duruma döner."""
+        if text is None:
+            self._status.pop(row, None)
+        else:
+            self._status[row] = (text, neutral)
+        self.dataChanged.emit(self.index(row, 0), self.index(row, 1))
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            return self.path(row) if index.column() == 0 else self.status(row)
+        if role in (Qt.BackgroundRole, Qt.ForegroundRole):
+            override = self._status.get(row)
+            if override is not None and override[1]:
+                colors = (QColor(180, 180, 180), QColor(Qt.black))
+            elif self.store.is_virus(row):
+                colors = (QColor(200, 0, 0), QColor(Qt.white))
+            else:
+                colors = (QColor(0, 200, 0), QColor(Qt.black))
+            return colors[0] if role == Qt.BackgroundRole else colors[1]
+        return None
 
 class ModernButton(QPushButton):
     """Modern özelleştirilmiş buton."""
@@ -434,6 +1476,20 @@ class AntivirusApp(QWidget):
         self.scanned_files = 0
         self.infected_files = 0
         self.clean_files = 0
+        self.last_summary = {}
+        self._row_by_path = {}
+        self._manual_quarantine = set()
+        self._content_hashes = {}  # Eki/bölümü tehlikeli dosyalar: yol -> taramadaki hash
+        self.manualActionStage = None
+        self.reportSink = None  # Son başlatılan taramanın raporu (Raporu Kaydet)
+        self._scan_summaries = {}  # Tarama thread'i -> özet (eşzamanlı taramalar karışmasın)
+        self.scanThrottle = ScanThrottle()  # Tarama sürerken de değiştirilebilen sınırlar
+        # Tüm taramalar tek işçi havuzunu paylaşır; çakışan dizinler bir kez taranır
+        self.scanScheduler = ScanScheduler(4, scan_file_parallel, load_virus_signatures)
+        self.scanThread = None
+        self.scanThreads = []  # Çalışan taramalar (bitene kadar referans tutulur)
+        self.actionSignals = ActionSignals()
+        self.actionSignals.outcome.connect(self.applyActionOutcome)
         self.initUI()
 
     def initUI(self):
@@ -572,6 +1628,53 @@ class AntivirusApp(QWidget):
         
         control_layout.addWidget(self.scanButton, 0, 0, 1, 3)
         
+        # Tespit sonrası eylem seçimi
+        action_label = QLabel("Tehdit bulunduğunda:")
+        action_label.setStyleSheet("color: #666; font-size: 13px; font-weight: bold;")
+        self.actionCombo = QComboBox()
+        self.actionCombo.addItem("Yalnızca raporla", ACTION_REPORT)
+        self.actionCombo.addItem("Otomatik karantinaya al", ACTION_QUARANTINE)
+        self.actionCombo.addItem("Otomatik sil", ACTION_DELETE)
+        
+        control_layout.addWidget(action_label, 1, 0)
+        control_layout.addWidget(self.actionCombo, 1, 1, 1, 2)
+        
+        # Artımlı tarama: değişmeyen dizinler yeniden listelenmez
+        self.incrementalCheck = QCheckBox("Artımlı tarama (yalnızca değişen dizinler)")
+        self.incrementalCheck.setStyleSheet("color: #666; font-size: 13px;")
+        control_layout.addWidget(self.incrementalCheck, 2, 0, 1, 3)
+        
+        # Okuma hızı sınırı; değişiklik çalışan taramaya hemen uygulanır
+        throttle_label = QLabel("Okuma sınırı (MB/s):")
+        throttle_label.setStyleSheet("color: #666; font-size: 13px; font-weight: bold;")
+        self.throttleSpin = QSpinBox()
+        self.throttleSpin.setRange(0, 10000)
+        self.throttleSpin.setSpecialValueText("Sınırsız")
+        self.throttleSpin.valueChanged.connect(self.updateThrottle)
+        
+        control_layout.addWidget(throttle_label, 3, 0)
+        control_layout.addWidget(self.throttleSpin, 3, 1, 1, 2)
+        
+        # Yavaş taramaları incelemek için profil çıkarma
+        profile_label = QLabel("Profil:")
+        profile_label.setStyleSheet("color: #666; font-size: 13px; font-weight: bold;")
+        self.profileCombo = QComboBox()
+        self.profileCombo.addItem("Kapalı", None)
+        self.profileCombo.addItem("Örnekleme (flame graph)", PROFILE_SAMPLING)
+        self.profileCombo.addItem("cProfile (ayrıntılı)", PROFILE_CPROFILE)
+        
+        control_layout.addWidget(profile_label, 4, 0)
+        control_layout.addWidget(self.profileCombo, 4, 1, 1, 2)
+        
+        # Son başlatılan taramayı duraklat / iptal et
+        self.pauseButton = ModernButton("⏸ Duraklat", "#FF9800", "#F57C00")
+        self.pauseButton.clicked.connect(self.togglePause)
+        self.cancelButton = ModernButton("⏹ İptal", "#f44336", "#d32f2f")
+        self.cancelButton.clicked.connect(self.cancelScan)
+        
+        control_layout.addWidget(self.pauseButton, 5, 0, 1, 2)
+        control_layout.addWidget(self.cancelButton, 5, 2)
+        
         control_frame.setLayout(control_layout)
         layout.addWidget(control_frame)
 
@@ -622,13 +1725,13 @@ class AntivirusApp(QWidget):
         results_title.setStyleSheet("color: #333; font-size: 16px; font-weight: bold; margin-bottom: 10px;")
         
         # Tablo
-        self.resultTable = QTableWidget()
-        self.resultTable.setColumnCount(2)
-        self.resultTable.setHorizontalHeaderLabels(["📁 Dosya Yolu", "🔍 Durum"])
+        self.resultModel = ScanResultModel(self)
+        self.resultTable = QTableView()
+        self.resultTable.setModel(self.resultModel)
         
         # Tablo stilini ayarla
         self.resultTable.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 gridline-color: #e0e0e0;
                 background-color: #fafafa;
                 alternate-background-color: #f5f5f5;
@@ -699,45 +1802,106 @@ class AntivirusApp(QWidget):
         dir_path = QFileDialog.getExistingDirectory(self, "Dizin Seç")
         if not dir_path:
             return
-        self.resultTable.setRowCount(0)
+        if not self.scanThreads:
+            # Süren tarama yoksa tablo ve istatistikler sıfırlanır; varsa sonuçlar aynı tabloya eklenir
+            self.resultModel.reset()
+            self._row_by_path = {}
+            self._content_hashes = {}
+            self.scanned_files = 0
+            self.infected_files = 0
+            self.clean_files = 0
+            self.last_summary = {}
+            self.update_stats()
         self.progressBar.setValue(0)
         
-        # İstatistikleri sıfırla
-        self.scanned_files = 0
-        self.infected_files = 0
-        self.clean_files = 0
-        self.update_stats()
-        
         self.status_label.setText("Dizin taraması başlatılıyor...")
 
-        self.scanThread = ScanThread(dir_path, 'directory')
+        # Yarım kalan tarama varsa devam etmeyi öner
+        checkpoint = ScanCheckpoint(dir_path)
+        resume = False
+        if checkpoint.exists():
+            answer = QMessageBox.question(
+                self, "Yarım Kalan Tarama",
+                "Bu dizin için yarım kalmış bir tarama bulundu.\nKaldığı yerden devam edilsin mi?",
+                QMessageBox.Yes | QMessageBox.No, QMessageBox.Yes
+            )
+            resume = answer == QMessageBox.Yes
+
+        # Eylem aşaması, rapor ve önbellek taramaya aittir; scanFinished'te o taramayla bırakılır
+        action = self.actionCombo.currentData()
+        action_stage = None
+        if action != ACTION_REPORT:
+            action_stage = DetectionActionStage(action, load_virus_signatures, QUARANTINE_FOLDER,
+                                                on_outcome=self.actionSignals.emit_outcome,
+                                                metadata={"action": "auto"})
+
+        # Sonuçlar tarama sırasında rapor dosyasına yazılır
+        self.reportSink = ReportSink(new_report_path())
+
+        # Dosyalar da stat edilir: dizin mtime'ını değiştirmeyen yerinde düzenlemeler kaçmaz
+        tree_cache = DirTreeCache(stat_files=True) if self.incrementalCheck.isChecked() else None
+        profile_mode = self.profileCombo.currentData()
+        
+        self.scanThread = ScanThread(dir_path, 'directory', checkpoint=checkpoint, resume=resume,
+                                     action_stage=action_stage, report_sink=self.reportSink,
+                                     tree_cache=tree_cache, throttle=self.scanThrottle,
+                                     profiler=ScanProfiler(profile_mode) if profile_mode else None,
+                                     scheduler=self.scanScheduler)
         self.scanThread.result.connect(self.addScanResult)
+        self.scanThread.content_detected.connect(self.addContentDetection)
         self.scanThread.progress.connect(self.updateProgressBar)
+        self.scanThread.summary.connect(self.updateSummary)
         self.scanThread.finished.connect(self.scanFinished)
+        self.scanThreads.append(self.scanThread)
+        self.pauseButton.setText("⏸ Duraklat")
         self.scanThread.start()
 
-    def addScanResult(self, path, is_virus):
-        row = self.resultTable.rowCount()
-        self.resultTable.insertRow(row)
+    def togglePause(self):
+        thread = self.scanThread
+        if thread is None or thread not in self.scanThreads:
+            return
+        if thread.paused:
+            thread.resume()
+            self.pauseButton.setText("⏸ Duraklat")
+            self.status_label.setText("Tarama devam ediyor...")
+        else:
+            thread.pause()
+            self.pauseButton.setText("▶ Devam")
+            self.status_label.setText("Tarama duraklatıldı")
+
+    def cancelScan(self):
+        if self.scanThread is not None and self.scanThread in self.scanThreads:
+            self.scanThread.stop()
+            self.status_label.setText("Tarama iptal ediliyor...")
 
-        file_item = QTableWidgetItem(path)
-        status_item = QTableWidgetItem("Tehlikeli" if is_virus else "Temiz")
+    def closeEvent(self, event):
+        """Pencere kapanırken taramaları durdurur ve açık kaynakları bırakır."""
+        for thread in self.scanThreads:
+            thread.stop()
+        self.scanScheduler.shutdown()
+        for thread in self.scanThreads:
+            thread.wait()
+            self._releaseScan(thread, wait=True)
+        self.scanThreads = []
+        if self.manualActionStage is not None:
+            self.manualActionStage.close(wait=True)
+            self.manualActionStage = None
+        if self.reportSink is not None:
+            self.reportSink.close()
+        self.resultModel.close()
+        super().closeEvent(event)
 
+    def addContentDetection(self, path, file_hash):
+        """Eki veya bölümü tehlikeli dosyanın hash'ini elle karantina doğrulaması için saklar."""
+        self._content_hashes[path] = file_hash
+
+    def addScanResult(self, path, is_virus):
+        row = self.resultModel.append(path, is_virus)
         if is_virus:
-            file_item.setBackground(QColor(200, 0, 0))
-            file_item.setForeground(QColor(Qt.white))
-            status_item.setBackground(QColor(200, 0, 0))
-            status_item.setForeground(QColor(Qt.white))
             self.infected_files += 1
+            self._row_by_path[path] = row
         else:
-            file_item.setBackground(QColor(0, 200, 0))
-            file_item.setForeground(QColor(Qt.black))
-            status_item.setBackground(QColor(0, 200, 0))
-            status_item.setForeground(QColor(Qt.black))
             self.clean_files += 1
-
-        self.resultTable.setItem(row, 0, file_item)
-        self.resultTable.setItem(row, 1, status_item)
         
         self.scanned_files += 1
         self.update_stats()
@@ -755,42 +1919,101 @@ class AntivirusApp(QWidget):
         else:
             self.status_label.setText(f"Tarama devam ediyor... %{value}")
 
+    def updateThrottle(self, value):
+        self.scanThrottle.set_limits(bytes_per_sec=value * (1 << 20) or None)
+
+    def updateSummary(self, summary):
+        self.last_summary = summary
+        if self.sender() is not None:
+            self._scan_summaries[self.sender()] = summary
+
     def scanFinished(self):
+        thread = self.sender()
+        if thread not in self.scanThreads:
+            return
+        # run() sinyalden hemen sonra döner; nesne bırakılmadan önce beklenir
+        thread.wait()
+        self.scanThreads.remove(thread)
+        # Kalan eylemler arka planda tamamlanır
+        self._releaseScan(thread, wait=False)
+        summary = self._scan_summaries.pop(thread, {})
         self.progressBar.setValue(100)
-        self.status_label.setText("Tarama tamamlandı!")
+        pruned = summary.get("pruned", 0)
+        if pruned:
+            self.status_label.setText(f"Tarama tamamlandı! ({pruned} öğe filtrelendi)")
+        else:
+            self.status_label.setText("Tarama tamamlandı!")
+        changes = summary.get("changes")
+        if changes:
+            self.status_label.setText(self.status_label.text() +
+                                      f" Önceki taramaya göre: {changes['new']} yeni, {changes['removed']} silinmiş, "
+                                      f"{changes['changed']} değişmiş, {changes['detected']} yeni tespit")
+        profile = summary.get("profile")
+        if profile:
+            QMessageBox.information(self, "Profil", "Profil çıktıları yazıldı:\n" + "\n".join(profile.values()))
+
+    @staticmethod
+    def _releaseScan(thread, wait: bool):
+        """Taramanın kendi eylem aşamasını, raporunu ve dizin ağacı önbelleğini bırakır."""
+        if thread.action_stage is not None:
+            thread.action_stage.close(wait=wait)
+            thread.action_stage = None
+        if thread.report_sink is not None:
+            # Dosya kapanır; yol ve kayıt sayısı Raporu Kaydet için kalır
+            thread.report_sink.close()
+        if thread.tree_cache is not None:
+            thread.tree_cache.close()
+            thread.tree_cache = None
 
     # ======================
     # Karantina
     # ======================
     def quarantineSelectedFile(self):
-        selected_row = self.resultTable.currentRow()
+        selected_row = self.resultTable.currentIndex().row()
         if selected_row == -1:
             QMessageBox.warning(self, "Uyarı", "Lütfen karantinaya alınacak dosyayı seçin.")
             return
 
-        file_path_item = self.resultTable.item(selected_row, 0)
-        status_item = self.resultTable.item(selected_row, 1)
+        file_path = self.resultModel.path(selected_row)
+        status = self.resultModel.status(selected_row)
 
-        if not file_path_item or not status_item:
+        if status != "Tehlikeli":
+            QMessageBox.information(self, "Bilgi", "Bu dosya temiz görünüyor, karantinaya alınmadı.")
+            return
+        if MEMBER_SEPARATOR in file_path and not os.path.exists(file_path):
+            QMessageBox.information(self, "Bilgi", "Bu bir e-posta ekidir; ekin bulunduğu e-posta "
+                                                   "dosyasını karantinaya alın.")
             return
 
-        file_path = file_path_item.text()
-        status = status_item.text()
+        # Taşıma (farklı dosya sisteminde kopyalama) GUI thread'ini bloklamasın
+        if self.manualActionStage is None:
+            self.manualActionStage = DetectionActionStage(ACTION_QUARANTINE, load_virus_signatures,
+                                                          QUARANTINE_FOLDER,
+                                                          on_outcome=self.actionSignals.emit_outcome,
+                                                          batch_delay=0, metadata={"action": "manual"})
+        self._row_by_path[file_path] = selected_row
+        self._manual_quarantine.add(file_path)
+        self.resultModel.set_status(selected_row, "Karantinaya alınıyor...")
+        self.manualActionStage.submit(file_path, self._content_hashes.get(file_path))
 
-        if status != "Tehlikeli":
-            QMessageBox.information(self, "Bilgi", "Bu dosya temiz görünüyor, karantinaya alınmadı.")
+    def applyActionOutcome(self, path, action, ok, detail):
+        """Eylem aşamasından gelen sonucu tabloya işler."""
+        manual = path in self._manual_quarantine
+        self._manual_quarantine.discard(path)
+        
+        row = self._row_by_path.get(path)
+        if row is None or row >= self.resultModel.rowCount() or self.resultModel.path(row) != path:
             return
 
-        try:
-            quarantine_path = move_to_quarantine(file_path)
-            status_item.setText("Karantinada")
-            file_path_item.setBackground(QColor(180, 180, 180))
-            file_path_item.setForeground(QColor(Qt.black))
-            status_item.setBackground(QColor(180, 180, 180))
-            status_item.setForeground(QColor(Qt.black))
-            QMessageBox.information(self, "Başarılı", f"Dosya karantinaya alındı:\n{quarantine_path}")
-        except Exception as e:
-            QMessageBox.critical(self, "Hata", f"Karantinaya alma başarısız:\n{str(e)}")
+        if ok and action != ACTION_REPORT:
+            self.resultModel.set_status(row, "Karantinada" if action == ACTION_QUARANTINE else "Silindi",
+                                        neutral=True)
+            if manual:
+                QMessageBox.information(self, "Başarılı", f"Dosya karantinaya alındı:\n{detail}")
+        elif not ok:
+            self.resultModel.set_status(row, None)
+            if manual:
+                QMessageBox.critical(self, "Hata", f"Karantinaya alma başarısız:\n{detail}")
 
     # ======================
     # İmza İşlemleri
@@ -825,39 +2048,26 @@ class AntivirusApp(QWidget):
     # 📊 Rapor Kaydetme
     # ======================
     def saveReport(self):
-        """Tarama raporunu JSON veya CSV formatında kaydeder."""
-        if self.resultTable.rowCount() == 0:
+        """Tarama sırasında yazılan raporu JSONL, JSON veya CSV formatında kaydeder."""
+        if self.reportSink is None or self.reportSink.count == 0:
             QMessageBox.information(self, "Bilgi", "Kaydedilecek rapor bulunmamaktadır.")
             return
 
         save_path, _ = QFileDialog.getSaveFileName(
             self, "Raporu Kaydet", "", 
-            "JSON Files (*.json);;CSV Files (*.csv)"
+            "JSON Lines Files (*.jsonl);;JSON Files (*.json);;CSV Files (*.csv)"
         )
         if not save_path:
             return
 
-        try:
-            # Sonuçları topla
-            results = []
-            for row in range(self.resultTable.rowCount()):
-                file_item = self.resultTable.item(row, 0).text()
-                status_item = self.resultTable.item(row, 1).text()
-                results.append({"dosya": file_item, "durum": status_item})
-
-            # Dosya formatına göre kaydet
-            if save_path.endswith(".json"):
-                with open(save_path, "w", encoding="utf-8") as f:
-                    json.dump(results, f, indent=2, ensure_ascii=False)
-            elif save_path.endswith(".csv"):
-                with open(save_path, "w", newline="", encoding="utf-8") as f:
-                    writer = csv.DictWriter(f, fieldnames=["dosya", "durum"])
-                    writer.writeheader()
-                    writer.writerows(results)
-            else:
-                QMessageBox.warning(self, "Uyarı", "Dosya uzantısı desteklenmiyor (.json veya .csv seçin).")
-                return
+        if not save_path.endswith((".jsonl", ".json", ".csv")):
+            QMessageBox.warning(self, "Uyarı", "Dosya uzantısı desteklenmiyor (.jsonl, .json veya .csv seçin).")
+            return
 
+        try:
+            # Rapor zaten diskte: yalnızca kopyalanır veya akışla dönüştürülür
+            self.reportSink.flush()
+            export_report(self.reportSink.path, save_path)
             QMessageBox.information(self, "Başarılı", f"Rapor kaydedildi:\n{save_path}")
         except Exception as e:
             QMessageBox.critical(self, "Hata", f"Rapor kaydedilemedi:\n{str(e)}")
@@ -866,8 +2076,162 @@ class AntivirusApp(QWidget):
 # Uygulama Çalıştırma
 # ======================
 
+def run_headless_scan(path: str, report_path: Optional[str] = None, action: str = ACTION_REPORT,
+                      max_workers: int = 4, io_order: str = IO_ORDER_WALK,
+                      incremental: bool = False, walk_workers: int = 1,
+                      cache_mode: str = CACHE_MODE_NORMAL,
+                      throttle: Optional[ScanThrottle] = None,
+                      profiler: Optional[ScanProfiler] = None,
+                      entropy_policy: Optional[EntropyPolicy] = None,
+                      walk_filter: Optional[WalkFilter] = None) -> dict:
+    """
+    GUI olmadan tarama yapar; sonuçlar report_path'e akışla yazılır.
+    walk_filter verilirse dizin gezinmesinde dahil etme / hariç tutma ve
+    boyut kuralları uygulanır. Tarama özetini döndürür.
+    """
+    scan_type = 'file' if os.path.isfile(path) else 'directory'
+    infected = []
+    summary = {}
+    
+    sink = ReportSink(report_path) if report_path else None
+    stage = None
+    if action != ACTION_REPORT:
+        stage = DetectionActionStage(action, load_virus_signatures, QUARANTINE_FOLDER,
+                                     metadata={"action": "auto"})
+    
+    tree_cache = DirTreeCache(stat_files=True) if incremental and scan_type == 'directory' else None
+    
+    thread = ScanThread(path, scan_type, max_workers=max_workers, io_order=io_order,
+                        action_stage=stage, report_sink=sink, tree_cache=tree_cache,
+                        walk_workers=walk_workers, cache_mode=cache_mode, throttle=throttle,
+                        profiler=profiler, entropy_policy=entropy_policy, walk_filter=walk_filter)
+    thread.result.connect(lambda file_path, is_virus: is_virus and infected.append(file_path))
+    thread.summary.connect(summary.update)
+    try:
+        thread.run()
+    finally:
+        if stage is not None:
+            stage.close(wait=True)
+        if sink is not None:
+            sink.close()
+        if tree_cache is not None:
+            tree_cache.close()
+    
+    summary["infected"] = len(infected)
+    return summary
+
+def parse_arguments(argv: List[str]) -> Tuple[argparse.Namespace, List[str]]:
+    """Komut satırı seçeneklerini ayrıştırır; tanınmayanlar Qt'ye bırakılır."""
+    parser = argparse.ArgumentParser(description="Mert Ulupınar Antivirus Scanner Pro")
+    parser.add_argument("--scan", metavar="YOL", help="GUI açmadan dosya veya dizin tara")
+    parser.add_argument("--report", metavar="DOSYA", help="Sonuçların yazılacağı rapor (.jsonl veya .csv)")
+    parser.add_argument("--action", choices=(ACTION_REPORT, ACTION_QUARANTINE, ACTION_DELETE),
+                        default=ACTION_REPORT, help="Tehdit bulunduğunda uygulanacak eylem")
+    parser.add_argument("--workers", type=int, default=4, help="Thread sayısı")
+    parser.add_argument("--io-order", choices=IO_ORDER_MODES, default=IO_ORDER_WALK,
+                        help="G/Ç sıralaması (walk, inode, extent)")
+    parser.add_argument("--include", metavar="GLOB", nargs="+", default=[],
+                        help="Yalnızca eşleşen dosyaları tara ('/' içeren glob'lar göreli yolun tamamına uyar)")
+    parser.add_argument("--exclude", metavar="GLOB", nargs="+", default=[],
+                        help="Eşleşen dosya/dizinleri atla ('dizin/' yalnızca dizinler)")
+    parser.add_argument("--min-size", metavar="BYTE", type=int, default=0,
+                        help="Bu boyuttan küçük dosyaları atla")
+    parser.add_argument("--max-size", metavar="BYTE", type=int,
+                        help="Bu boyuttan büyük dosyaları atla")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Yalnızca son taramadan beri değişen dizinleri listele (dizin ağacı önbelleği)")
+    parser.add_argument("--walk-workers", type=int, default=1,
+                        help="Dizinleri eşzamanlı listeleyen thread sayısı (NFS/SMB için)")
+    parser.add_argument("--cache-mode", choices=CACHE_MODES, default=CACHE_MODE_NORMAL,
+                        help="Page cache politikası (drop: taranan veri cache'te bırakılmaz)")
+    parser.add_argument("--max-mbps", type=float, default=0,
+                        help="Saniyede okunacak en fazla MB (0 = sınırsız)")
+    parser.add_argument("--max-files-per-sec", type=float, default=0,
+                        help="Saniyede açılacak en fazla dosya (0 = sınırsız)")
+    parser.add_argument("--cpu-percent", type=float, default=0,
+                        help="Tarama thread'i başına CPU payı yüzdesi (0 = sınırsız)")
+    parser.add_argument("--nice", type=int, help="Tarama thread'lerinin nice değeri (örn. 19)")
+    parser.add_argument("--ioprio", choices=tuple(IOPRIO_CLASSES),
+                        help="Tarama thread'lerinin G/Ç önceliği sınıfı (idle: yalnızca disk boştayken)")
+    parser.add_argument("--entropy", metavar="BIT", type=float, nargs="?", const=DEFAULT_THRESHOLD,
+                        help=f"Entropi sezgiselini etkinleştir; blok eşiği bit/byte (varsayılan {DEFAULT_THRESHOLD})")
+    parser.add_argument("--entropy-ratio", type=float, default=DEFAULT_MIN_RATIO,
+                        help="Dosyanın şüpheli sayılması için eşiği aşan blokların en az oranı")
+    parser.add_argument("--merge-feeds", metavar="DOSYA", nargs="+",
+                        help="İmza akışlarını veritabanıyla bellek sınırlı birleştir ve çık")
+    parser.add_argument("--remove-feeds", metavar="DOSYA", nargs="+", default=[],
+                        help="Birleştirmede veritabanından çıkarılacak hash listeleri")
+    parser.add_argument("--merge-memory-mb", type=int, default=DEFAULT_MEMORY_LIMIT >> 20,
+                        help="Birleştirmede sıralama için kullanılacak en fazla bellek (MB)")
+    parser.add_argument("--import-allowlist", metavar="DOSYA", nargs="+",
+                        help="NSRL RDS CSV'si veya hash listesini allowlist'e aktar ve çık")
+    parser.add_argument("--add-section-signatures", metavar="DOSYA", nargs="+",
+                        help="Örnek ELF dosyalarının çalıştırılabilir bölüm hash'lerini bölüm imzalarına ekle ve çık")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_SAMPLING, choices=PROFILE_MODES,
+                        help="Taramayı profille (sampling: düşük ek yük, cprofile: ayrıntılı)")
+    parser.add_argument("--profile-dir", default=PROFILES_FOLDER, help="Profil çıktılarının yazılacağı dizin")
+    parser.add_argument("--diff", metavar=("ESKI", "YENI"), nargs=2,
+                        help="İki taramanın (rapor veya .idx) farkını yaz ve çık")
+    parser.add_argument("--diff-output", metavar="DOSYA",
+                        help="Fark raporu (.jsonl veya .csv; varsayılan: YENI raporun yanında .diff.jsonl)")
+    return parser.parse_known_args(argv[1:])
+
+def build_throttle(args: argparse.Namespace) -> Optional[ScanThrottle]:
+    """Komut satırı sınırlarından ScanThrottle oluşturur; sınır yoksa None döndürür."""
+    if not (args.max_mbps or args.max_files_per_sec or args.cpu_percent
+            or args.nice is not None or args.ioprio):
+        return None
+    return ScanThrottle(bytes_per_sec=args.max_mbps * (1 << 20) or None,
+                        files_per_sec=args.max_files_per_sec or None,
+                        cpu_fraction=args.cpu_percent / 100.0 or None,
+                        nice=args.nice, ioprio_class=args.ioprio)
+
+def build_walk_filter(args: argparse.Namespace) -> Optional[WalkFilter]:
+    """Komut satırı kurallarından WalkFilter oluşturur; kural yoksa None döndürür."""
+    if not (args.include or args.exclude or args.min_size or args.max_size is not None):
+        return None
+    return WalkFilter(include=args.include, exclude=args.exclude,
+                      min_size=args.min_size, max_size=args.max_size)
+
 def main():
-    app = QApplication(sys.argv)
+    args, qt_args = parse_arguments(sys.argv)
+    
+    if args.import_allowlist:
+        count = import_allowlist(ALLOWLIST_FILE, args.import_allowlist)
+        print(f"Allowlist: {count} kayıt ({ALLOWLIST_FILE})")
+        sys.exit(0)
+    
+    if args.merge_feeds or args.remove_feeds:
+        counts = merge_signature_feeds(args.merge_feeds or [], args.remove_feeds,
+                                       args.merge_memory_mb << 20)
+        print(json.dumps(counts, ensure_ascii=False, indent=2))
+        sys.exit(0)
+    
+    if args.add_section_signatures:
+        count = add_section_signatures(args.add_section_signatures)
+        print(f"Bölüm imzaları: {count} yeni imza ({SECTION_DB_FILE})")
+        sys.exit(0)
+    
+    if args.diff:
+        old, new = args.diff
+        output = args.diff_output or os.path.splitext(new)[0] + ".diff.jsonl"
+        counts = write_scan_diff(old, new, output)
+        print(json.dumps({"diff_report": output, "changes": counts}, ensure_ascii=False, indent=2))
+        sys.exit(0)
+    
+    if args.scan:
+        # Başsız (headless) tarama: tehdit bulunursa çıkış kodu 1
+        summary = run_headless_scan(args.scan, args.report, args.action, args.workers, args.io_order,
+                                    args.incremental, args.walk_workers, args.cache_mode,
+                                    build_throttle(args),
+                                    ScanProfiler(args.profile, args.profile_dir) if args.profile else None,
+                                    EntropyPolicy(args.entropy, args.entropy_ratio)
+                                    if args.entropy is not None else None,
+                                    build_walk_filter(args))
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+        sys.exit(1 if summary.get("infected") else 0)
+    
+    app = QApplication(sys.argv[:1] + qt_args)
     
     # Uygulama ikonunu ayarla
     app.setWindowIcon(app.style().standardIcon(QStyle.SP_ComputerIcon))
@@ -881,4 +2245,4 @@ def main():
     sys.exit(app.exec_())
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,227 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Tespit Sonrası Eylem Aşaması (karantina / raporla / sil)
+
+Created by Mert Ulupınar
+"""
+
+import os
+import time
+import queue
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Callable, List, Optional, Set, Tuple
+
+from quarantine_store import QuarantineStore
+
+logger = logging.getLogger('Mert Ulupınar.Actions')
+
+# Eylem modları
+ACTION_REPORT = "report"
+ACTION_QUARANTINE = "quarantine"
+ACTION_DELETE = "delete"
+ACTION_MODES = (ACTION_REPORT, ACTION_QUARANTINE, ACTION_DELETE)
+
+ACTION_BATCH_SIZE = 32     # Bir işlemde uygulanacak en fazla dosya
+ACTION_BATCH_DELAY = 0.25  # Toplu işlem dolana kadar beklenecek süre (saniye)
+
+_STOP = object()
+
+
+class ActionOutcome:
+    """Bir dosyaya uygulanan eylemin sonucu."""
+
+    __slots__ = ("path", "action", "ok", "detail")
+
+    def __init__(self, path: str, action: str, ok: bool, detail: str = ""):
+        self.path = path
+        self.action = action
+        self.ok = ok
+        self.detail = detail  # Karantina yolu veya hata açıklaması
+
+    def __repr__(self):
+        return f"ActionOutcome({self.path!r}, {self.action!r}, ok={self.ok}, {self.detail!r})"
+
+
+def hash_open_file(path: str) -> Tuple[Optional[str], Optional[os.stat_result]]:
+    """Dosyayı açıp MD5'ini ve açık dosyanın stat bilgisini döndürür."""
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            hash_func = hashlib.md5()
+            for chunk in iter(lambda: f.read(65536), b""):
+                hash_func.update(chunk)
+            return hash_func.hexdigest(), st
+    except (IOError, OSError):
+        return None, None
+
+
+class DetectionActionStage:
+    """
+    Tespit edilen dosyalara eylemleri kendi thread'inde toplu olarak uygular.
+
+    Tarama thread'i submit() ile yalnızca kuyruğa ekler, hiç beklemez.
+    Her dosyanın hash'i eylemden hemen önce yeniden doğrulanır (TOCTOU);
+    dosya bu arada değiştiyse eylem uygulanmaz. Sonuçlar on_outcome ile bildirilir.
+    İmzalar her toplu işte signature_source() ile yeniden alınır; uzun ömürlü
+    aşamalar da güncellenen imza veritabanıyla doğrulama yapar.
+    """
+
+    def __init__(self, action: str, signature_source: Callable[[], Set[str]], quarantine_folder: str,
+                 on_outcome: Optional[Callable[[ActionOutcome], None]] = None,
+                 batch_size: int = ACTION_BATCH_SIZE, batch_delay: float = ACTION_BATCH_DELAY,
+                 metadata: Optional[dict] = None):
+        if action not in ACTION_MODES:
+            raise ValueError(f"Bilinmeyen eylem: {action}")
+        self.action = action
+        self.signature_source = signature_source
+        self.quarantine_folder = quarantine_folder
+        self.on_outcome = on_outcome
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.metadata = metadata  # Karantina kaydına eklenecek bilgiler
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="DetectionActionStage", daemon=True)
+        self._thread.start()
+
+    def submit(self, path: str, expected_hash: Optional[str] = None) -> None:
+        """
+        Dosyayı eylem kuyruğuna ekler (bloklamaz).
+        expected_hash verilirse dosya imzalarla değil bu hash ile doğrulanır;
+        kendi hash'i imza olmayan, içindeki bir parça tehlikeli dosyalar için
+        (ör. eki tehlikeli e-posta) taramadaki hash verilir.
+        """
+        self._queue.put((path, expected_hash))
+
+    def close(self, wait: bool = True, timeout: Optional[float] = None) -> None:
+        """Kuyruktaki işler bittikten sonra thread'i durdurur."""
+        self._queue.put(_STOP)
+        if wait:
+            self._thread.join(timeout)
+
+    def _run(self) -> None:
+        """Kuyruktan toplu işler oluşturup uygular."""
+        store = None
+        stopping = False
+        try:
+            while not stopping:
+                batch = [self._queue.get()]
+                deadline = time.monotonic() + self.batch_delay
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(self._queue.get(timeout=remaining))
+                    except queue.Empty:
+                        break
+
+                if _STOP in batch:
+                    stopping = True
+                    batch = [p for p in batch if p is not _STOP]
+                    # Durdurma isteğinden önce eklenenleri de işle
+                    while True:
+                        try:
+                            item = self._queue.get_nowait()
+                        except queue.Empty:
+                            break
+                        if item is not _STOP:
+                            batch.append(item)
+                if not batch:
+                    continue
+
+                try:
+                    if self.action == ACTION_QUARANTINE and store is None:
+                        store = QuarantineStore(self.quarantine_folder)
+                    outcomes = self._process(batch, store)
+                except Exception as e:
+                    # Beklenmeyen hata thread'i durdurmamalı; toplu işteki dosyalar başarısız sayılır
+                    logger.error(f"Eylem toplu işi uygulanamadı ({self.action}): {e}")
+                    outcomes = [ActionOutcome(path, self.action, False, str(e)) for path, _ in batch]
+                for outcome in outcomes:
+                    self._notify(outcome)
+        finally:
+            if store is not None:
+                store.close()
+
+    def _process(self, batch: List[Tuple[str, Optional[str]]],
+                 store: Optional[QuarantineStore]) -> List[ActionOutcome]:
+        """Toplu işi doğrular ve eylemi uygular."""
+        outcomes = []
+        verified = []
+        virus_signatures = None
+        for path, expected_hash in batch:
+            file_hash, st = hash_open_file(path)
+            if expected_hash is None and virus_signatures is None:
+                virus_signatures = self.signature_source()
+            if file_hash is None:
+                outcomes.append(ActionOutcome(path, self.action, False, "Dosya okunamadı"))
+            elif (file_hash != expected_hash if expected_hash is not None
+                  else file_hash not in virus_signatures):
+                outcomes.append(ActionOutcome(path, self.action, False, "Dosya taramadan sonra değişti"))
+            else:
+                verified.append((path, file_hash, st))
+
+        if self.action == ACTION_REPORT:
+            outcomes.extend(ActionOutcome(path, self.action, True) for path, _, _ in verified)
+        elif self.action == ACTION_QUARANTINE:
+            outcomes.extend(self._quarantine(verified, store))
+        else:
+            outcomes.extend(self._delete(path, st) for path, _, st in verified)
+        return outcomes
+
+    def _quarantine(self, verified: list, store: QuarantineStore) -> List[ActionOutcome]:
+        """Doğrulanan dosyaları karantinaya alır."""
+        if not verified:
+            return []
+        paths = [path for path, _, _ in verified]
+        hashes = [file_hash for _, file_hash, _ in verified]
+        try:
+            entries = store.add_many(paths, metadata=self.metadata)
+        except (IOError, OSError, sqlite3.Error, ValueError):
+            # Toplu işlem geri alındı: dosyaları tek tek dene; biri diğerlerini engellemez
+            entries = []
+            for path in paths:
+                try:
+                    entries.extend(store.add_many([path], metadata=self.metadata))
+                except (IOError, OSError, sqlite3.Error, ValueError) as e:
+                    entries.append(e)
+
+        outcomes = []
+        for path, file_hash, entry in zip(paths, hashes, entries):
+            if isinstance(entry, Exception):
+                outcomes.append(ActionOutcome(path, self.action, False, str(entry)))
+            elif entry.md5 != file_hash:
+                # Doğrulama ile taşıma arasında dosya değiştirilmiş: geri koy
+                try:
+                    store.restore(entry.id)
+                except (IOError, OSError, sqlite3.Error, ValueError) as e:
+                    logger.error(f"Değişen dosya geri yüklenemedi: {path} - {e}")
+                outcomes.append(ActionOutcome(path, self.action, False, "Dosya taşıma sırasında değişti"))
+            else:
+                outcomes.append(ActionOutcome(path, self.action, True, entry.object_path))
+        return outcomes
+
+    def _delete(self, path: str, st: os.stat_result) -> ActionOutcome:
+        """Doğrulanan dosyayı, hâlâ aynı dosyaysa siler."""
+        try:
+            current = os.lstat(path)
+            if (current.st_dev, current.st_ino) != (st.st_dev, st.st_ino):
+                return ActionOutcome(path, self.action, False, "Dosya doğrulamadan sonra değiştirildi")
+            os.remove(path)
+        except OSError as e:
+            return ActionOutcome(path, self.action, False, str(e))
+        logger.warning(f"Virüslü dosya silindi: {path}")
+        return ActionOutcome(path, self.action, True)
+
+    def _notify(self, outcome: ActionOutcome) -> None:
+        """Sonucu loglar ve geri çağırmaya iletir."""
+        if not outcome.ok:
+            logger.warning(f"Eylem uygulanamadı ({outcome.action}): {outcome.path} - {outcome.detail}")
+        if self.on_outcome is not None:
+            try:
+                self.on_outcome(outcome)
+            except Exception as e:
+                logger.error(f"Eylem sonucu iletilemedi: {e}")
@@ -0,0 +1,312 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Bilinen Temiz Dosya Listesi (NSRL tarzı allowlist)
+
+Dosya biçimi (little-endian):
+    başlık   : MAGIC (8) | kayıt sayısı (u64) | bitmap bit sayısı (u64)
+    bitmap   : bitmap bit sayısı / 8 byte; MD5'in ilk 8 byte'ından türetilen
+               iki bitlik ön filtre (tek dosyalık Bloom filtresi)
+    kayıtlar : MD5'e göre sıralı (md5 16 byte | boyut u64) kayıtları
+
+Ön filtrede olmayan hash'ler için sıralı tabloya hiç dokunulmaz; tablo
+mmap ile açılır ve ikili arama yalnızca ilgili sayfaları okur. Liste
+oluşturulurken kayıtlar diske taşan sıralamayla (external_sort) sıralanır;
+kaynak boyutu belleği sınırlamaz.
+
+Created by Mert Ulupınar
+"""
+
+import os
+import csv
+import mmap
+import time
+import shutil
+import struct
+import logging
+import tempfile
+import threading
+from typing import Iterable, Iterator, Optional, Tuple
+
+from external_sort import DEFAULT_RUN_SIZE, external_sort
+
+logger = logging.getLogger('Mert Ulupınar.Allowlist')
+
+MAGIC = b"PVALLOW1"
+_HEADER = struct.Struct("<8sQQ")
+_RECORD = struct.Struct("<16sQ")
+RECORD_SIZE = _RECORD.size
+UNKNOWN_SIZE = 0xFFFFFFFFFFFFFFFF  # Boyutu verilmeyen kayıtlar (yalnızca hash listesi)
+BITS_PER_ENTRY = 10  # İki bit ile ~%5 yanlış pozitif
+RELOAD_CHECK_INTERVAL = 1.0
+_COPY_BUFFER = 1 << 20
+
+# NSRL RDS sütun adları (NSRLFile.txt)
+NSRL_MD5_COLUMN = "MD5"
+NSRL_SIZE_COLUMN = "FileSize"
+
+
+def _bitmap_bits(count: int) -> int:
+    """Kayıt sayısına göre ikinin kuvveti olan bitmap boyutunu döndürür."""
+    bits = 1 << 16
+    while bits < count * BITS_PER_ENTRY:
+        bits <<= 1
+    return bits
+
+
+def _probes(digest: bytes, mask: int) -> Tuple[int, int]:
+    """Hash'in ilk 8 byte'ından iki bitmap konumu türetir."""
+    first = int.from_bytes(digest[0:4], "little")
+    second = int.from_bytes(digest[4:8], "little")
+    return first & mask, second & mask
+
+
+class Allowlist:
+    """
+    Salt okunur, mmap ile açılan bilinen temiz hash listesi.
+
+    contains() thread güvenlidir; sayaçlar yalnızca istatistik amaçlıdır.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            size = os.fstat(self._file.fileno()).st_size
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        except (OSError, ValueError):
+            self._file.close()
+            raise
+        if self._map is None or size < _HEADER.size:
+            self.close()
+            raise ValueError(f"Geçersiz allowlist dosyası: {path}")
+
+        magic, self.count, bits = _HEADER.unpack_from(self._map, 0)
+        self._bitmap_offset = _HEADER.size
+        self._table_offset = self._bitmap_offset + bits // 8
+        if magic != MAGIC or size != self._table_offset + self.count * RECORD_SIZE:
+            self.close()
+            raise ValueError(f"Geçersiz allowlist dosyası: {path}")
+        self._mask = bits - 1
+        self.lookups = 0
+        self.prefilter_rejects = 0
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    def contains(self, file_hash: str, size: Optional[int] = None) -> bool:
+        """Hash (ve biliniyorsa boyut) listede varsa True döndürür."""
+        self.lookups += 1
+        try:
+            digest = bytes.fromhex(file_hash)
+        except (TypeError, ValueError):
+            return False
+        if len(digest) != 16:
+            return False
+
+        # Ön filtre: bitlerden biri boşsa hash kesinlikle listede değil
+        first, second = _probes(digest, self._mask)
+        bitmap = self._map
+        base = self._bitmap_offset
+        if not (bitmap[base + (first >> 3)] >> (first & 7)) & 1 \
+                or not (bitmap[base + (second >> 3)] >> (second & 7)) & 1:
+            self.prefilter_rejects += 1
+            return False
+
+        index = self._find(digest)
+        if index is None:
+            return False
+        # Aynı hash farklı boyutlarla kayıtlı olabilir: bitişik kayıtlar denenir
+        while index < self.count:
+            stored, stored_size = _RECORD.unpack_from(self._map, self._table_offset + index * RECORD_SIZE)
+            if stored != digest:
+                break
+            if size is None or stored_size == UNKNOWN_SIZE or stored_size == size:
+                self.hits += 1
+                return True
+            index += 1
+        return False
+
+    def _find(self, digest: bytes) -> Optional[int]:
+        """digest'e eşit ilk kaydın indeksini ikili arama ile bulur."""
+        low, high = 0, self.count
+        table = self._table_offset
+        data = self._map
+        while low < high:
+            middle = (low + high) // 2
+            offset = table + middle * RECORD_SIZE
+            if data[offset:offset + 16] < digest:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count and data[table + low * RECORD_SIZE:table + low * RECORD_SIZE + 16] == digest:
+            return low
+        return None
+
+    def __iter__(self) -> Iterator[Tuple[str, Optional[int]]]:
+        """(md5, boyut) çiftlerini sıralı olarak üretir."""
+        for index in range(self.count):
+            digest, size = _RECORD.unpack_from(self._map, self._table_offset + index * RECORD_SIZE)
+            yield digest.hex(), (None if size == UNKNOWN_SIZE else size)
+
+    def as_dict(self) -> dict:
+        return {"allowlist_entries": self.count, "allowlist_lookups": self.lookups,
+                "allowlist_prefilter_rejects": self.prefilter_rejects, "allowlist_hits": self.hits}
+
+
+def build_allowlist(path: str, entries: Iterable[Tuple[str, Optional[int]]],
+                    run_size: int = DEFAULT_RUN_SIZE, tmp_dir: Optional[str] = None) -> int:
+    """
+    (md5, boyut) çiftlerinden allowlist dosyasını atomik olarak oluşturur.
+
+    Kayıtlar external_sort ile sıralanır ve sıralı tabloya akış halinde
+    yazılır; bellekte en fazla run_size kayıt ve ön filtre bitmap'i bulunur.
+    Tekrarlanan kayıtlar birleştirilir; yazılan kayıt sayısını döndürür.
+    """
+    def records() -> Iterator[str]:
+        for file_hash, size in entries:
+            try:
+                digest = bytes.fromhex(file_hash.strip())
+            except ValueError:
+                continue
+            if len(digest) != 16:
+                continue
+            if size is None or size < 0 or size >= UNKNOWN_SIZE:
+                size = UNKNOWN_SIZE
+            # Sabit genişlikli metin: düz metin sıralaması hash sırasıdır
+            yield digest.hex() + format(size, "016x")
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    table_fd, table_path = tempfile.mkstemp(dir=directory, suffix=".records.tmp")
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    count = 0
+    try:
+        with os.fdopen(table_fd, "w+b", buffering=_COPY_BUFFER) as table:
+            previous = None
+            for record in external_sort(records(), run_size=run_size, tmp_dir=tmp_dir):
+                if record == previous:
+                    continue
+                previous = record
+                table.write(_RECORD.pack(bytes.fromhex(record[:32]), int(record[32:], 16)))
+                count += 1
+
+            # Bitmap boyutu kayıt sayısına bağlı: tablo ikinci kez sırayla okunur
+            bits = _bitmap_bits(count)
+            bitmap = bytearray(bits // 8)
+            mask = bits - 1
+            table.seek(0)
+            for chunk in iter(lambda: table.read(RECORD_SIZE * 4096), b""):
+                for offset in range(0, len(chunk), RECORD_SIZE):
+                    for probe in _probes(chunk[offset:offset + 8], mask):
+                        bitmap[probe >> 3] |= 1 << (probe & 7)
+
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, count, bits))
+                f.write(bitmap)
+                table.seek(0)
+                shutil.copyfileobj(table, f, _COPY_BUFFER)
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    finally:
+        try:
+            os.remove(table_path)
+        except OSError:
+            pass
+    logger.info(f"Allowlist oluşturuldu: {path} ({count} kayıt)")
+    return count
+
+
+def iter_hash_source(path: str) -> Iterator[Tuple[str, Optional[int]]]:
+    """
+    İçe aktarılacak dosyadan (md5, boyut) çiftlerini üretir.
+
+    NSRL RDS CSV'si (başlıkta "MD5" ve "FileSize" sütunları) veya her
+    satırda "md5" ya da "md5 boyut" / "md5,boyut" bulunan düz liste olabilir.
+    """
+    with open(path, "r", encoding="utf-8", errors="replace", newline="") as f:
+        first = f.readline()
+        f.seek(0)
+        if NSRL_MD5_COLUMN in first and "," in first:
+            for row in csv.DictReader(f):
+                size = row.get(NSRL_SIZE_COLUMN)
+                yield row.get(NSRL_MD5_COLUMN) or "", int(size) if size and size.isdigit() else None
+            return
+
+        for line in f:
+            parts = line.replace(",", " ").split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            size = int(parts[1]) if len(parts) > 1 and parts[1].isdigit() else None
+            yield parts[0], size
+
+
+def import_allowlist(path: str, sources: Iterable[str]) -> int:
+    """Kaynak dosyaları mevcut allowlist ile birleştirip yeniden yazar."""
+    def entries():
+        if os.path.exists(path):
+            with Allowlist(path) as existing:
+                yield from existing
+        for source in sources:
+            logger.info(f"Allowlist kaynağı okunuyor: {source}")
+            yield from iter_hash_source(source)
+
+    return build_allowlist(path, entries())
+
+
+class AllowlistStore:
+    """
+    Güncel allowlist'i tutar; dosya değişirse yeniden açar.
+    Dosya yoksa current() None döndürür.
+    """
+
+    def __init__(self, path: str, check_interval: float = RELOAD_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._allowlist: Optional[Allowlist] = None
+        self._file_key = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[Allowlist]:
+        if time.monotonic() < self._next_check:
+            return self._allowlist
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            try:
+                st = os.stat(self.path)
+                key = (st.st_ino, st.st_size, st.st_mtime_ns)
+            except OSError:
+                key = None
+            if key == self._file_key:
+                return self._allowlist
+
+            self._file_key = key
+            # Eski eşleme kapatılmaz: onu kullanan taramalar sürebilir
+            self._allowlist = None
+            if key is not None:
+                try:
+                    self._allowlist = Allowlist(self.path)
+                    logger.info(f"{len(self._allowlist)} kayıtlı allowlist yüklendi")
+                except (OSError, ValueError) as e:
+                    logger.error(f"Allowlist açılamadı: {e}")
+            return self._allowlist
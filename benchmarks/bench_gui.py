@@ -0,0 +1,259 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+GUI Tepkisellik Benchmark'ı
+
+Kullanım:
+    python benchmarks/bench_gui.py [--results 10000 100000 1000000] [--rate N]
+                                   [--json DOSYA] [--max-latency-ms MS] [--max-paint-ms MS]
+
+AntivirusApp, QT_QPA_PLATFORM=offscreen ile ekran olmadan açılır. Ayrı bir
+QThread, gerçek ScanThread'in sinyalleriyle (result, progress) sentetik
+sonuç akışı üretir; sonuçlar GUI'ye aynı kuyruklu bağlantılarla ulaşır.
+Her sonuç sayısı için:
+  * olay döngüsü gecikmesi: sabit aralıklı QTimer'ın kayması (p50/p99/en çok),
+  * güncelleme başına boyama süresi: pencereye gelen her UpdateRequest'in
+    işlenme süresi (p50/p99/en çok),
+  * bellek artışı: pencere açılmadan önceki ve tüm sonuçlar işlendikten
+    sonraki RSS farkı (sonuç başına byte),
+  * akış bittikten sonra kuyrukta bekleyen sonuçların işlenme süresi
+ölçülür. --max-latency-ms veya --max-paint-ms aşılırsa çıkış kodu 1 olur;
+böylece CI benzeri koşularda GUI performans gerilemeleri yakalanır.
+
+Created by Mert Ulupınar
+"""
+
+import os
+import gc
+import sys
+import json
+import time
+import argparse
+import logging
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from PyQt5.QtCore import QEvent, QEventLoop, QObject, QThread, QTimer, Qt, pyqtSignal
+from PyQt5.QtWidgets import QApplication
+
+from PyVirüs import AntivirusApp
+
+DEFAULT_RESULTS = (10_000, 100_000, 1_000_000)
+PROBE_INTERVAL_MS = 10
+
+
+class SyntheticScan(QThread):
+    """ScanThread ile aynı sinyalleri sentetik sonuçlarla yayan thread."""
+    result = pyqtSignal(str, bool)
+    progress = pyqtSignal(int)
+
+    def __init__(self, total: int, rate: float, infected_every: int):
+        super().__init__()
+        self.total = total
+        self.rate = rate                      # Saniyede sonuç (0 = sınırsız)
+        self.infected_every = infected_every
+        self.elapsed = 0.0
+        self._is_running = True
+
+    def stop(self):
+        self._is_running = False
+
+    def run(self):
+        start = time.perf_counter()
+        sent = 0
+        last_percent = -1
+        while sent < self.total and self._is_running:
+            if self.rate:
+                due = min(self.total, int((time.perf_counter() - start) * self.rate))
+                if due <= sent:
+                    time.sleep(0.001)
+                    continue
+            else:
+                due = min(self.total, sent + 1000)
+            for index in range(sent, due):
+                self.result.emit(f"/veri/dizin{index // 1000:04d}/dosya{index:07d}.bin",
+                                 index % self.infected_every == 0)
+            sent = due
+            percent = sent * 100 // self.total
+            if percent != last_percent:
+                self.progress.emit(percent)
+                last_percent = percent
+        self.elapsed = time.perf_counter() - start
+
+
+class LatencyProbe:
+    """Sabit aralıklı zamanlayıcının kaymasından olay döngüsü gecikmesini ölçer."""
+
+    def __init__(self, interval_ms: int = PROBE_INTERVAL_MS):
+        self.interval_ms = interval_ms
+        self.samples = []
+        self._last = 0.0
+        self.timer = QTimer()
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+
+    def start(self):
+        self._last = time.perf_counter()
+        self.timer.start(self.interval_ms)
+
+    def stop(self):
+        self.timer.stop()
+
+    def _tick(self):
+        now = time.perf_counter()
+        self.samples.append(max(0.0, (now - self._last) * 1000 - self.interval_ms))
+        self._last = now
+
+
+class PaintTimer(QObject):
+    """Pencereye gelen UpdateRequest'leri kendisi işleyip boyama süresini ölçer."""
+
+    def __init__(self, window):
+        super().__init__()
+        self.window = window
+        self.samples = []
+        self._inside = False
+        window.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self.window and event.type() == QEvent.UpdateRequest and not self._inside:
+            self._inside = True
+            start = time.perf_counter()
+            try:
+                obj.event(event)
+            finally:
+                self._inside = False
+            self.samples.append((time.perf_counter() - start) * 1000)
+            return True
+        return False
+
+
+def rss_bytes() -> int:
+    """Sürecin güncel RSS'i (Linux'ta /proc, diğerlerinde en yüksek RSS)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def percentile(samples: list, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def run_case(app: QApplication, total: int, rate: float, infected_every: int, timeout: float) -> dict:
+    """Tek sonuç sayısı için yeni bir pencerede ölçüm yapar."""
+    gc.collect()
+    rss_before = rss_bytes()
+    window = AntivirusApp()
+    window.show()
+    app.processEvents()
+
+    thread = SyntheticScan(total, rate, infected_every)
+    loop = QEventLoop()
+    received = [0]
+    drained_at = [0.0]
+
+    def count(path, is_virus):
+        received[0] += 1
+        if received[0] == total:
+            drained_at[0] = time.perf_counter()
+            loop.quit()
+
+    # Gerçek taramadaki bağlantılar; sayaç addScanResult'tan sonra çalışır
+    thread.result.connect(window.addScanResult)
+    thread.result.connect(count)
+    thread.progress.connect(window.updateProgressBar)
+
+    probe = LatencyProbe()
+    painter = PaintTimer(window)
+    QTimer.singleShot(int(timeout * 1000), loop.quit)
+
+    start = time.perf_counter()
+    probe.start()
+    thread.start()
+    loop.exec_()
+    probe.stop()
+    finished = received[0] == total
+    thread.stop()
+    thread.wait()
+    end = drained_at[0] if finished else time.perf_counter()
+
+    app.processEvents()
+    gc.collect()
+    rss_after = rss_bytes()
+
+    result = {
+        "results": total,
+        "received": received[0],
+        "timed_out": not finished,
+        "seconds": round(end - start, 3),
+        "results_per_sec": round(received[0] / (end - start), 1) if end > start else 0.0,
+        "drain_seconds": round(max(0.0, end - start - thread.elapsed), 3),
+        "latency_p50_ms": round(percentile(probe.samples, 0.50), 2),
+        "latency_p99_ms": round(percentile(probe.samples, 0.99), 2),
+        "latency_max_ms": round(max(probe.samples, default=0.0), 2),
+        "paints": len(painter.samples),
+        "paint_p50_ms": round(percentile(painter.samples, 0.50), 2),
+        "paint_p99_ms": round(percentile(painter.samples, 0.99), 2),
+        "paint_max_ms": round(max(painter.samples, default=0.0), 2),
+        "rss_growth_mb": round((rss_after - rss_before) / (1 << 20), 1),
+        "bytes_per_result": round((rss_after - rss_before) / max(received[0], 1), 1),
+    }
+
+    window.removeEventFilter(painter)
+    window.scanScheduler.shutdown()
+    window.close()
+    window.deleteLater()
+    app.sendPostedEvents(None, QEvent.DeferredDelete)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GUI tepkisellik benchmark'ı (offscreen Qt)")
+    parser.add_argument("--results", type=int, nargs="+", default=list(DEFAULT_RESULTS),
+                        help="Denenecek sonuç sayıları")
+    parser.add_argument("--rate", type=float, default=0,
+                        help="Saniyede gönderilecek sonuç (0 = olabildiğince hızlı)")
+    parser.add_argument("--infected-every", type=int, default=1000,
+                        help="Her N sonuçtan biri tehlikeli olarak gönderilir")
+    parser.add_argument("--timeout", type=float, default=600, help="Ölçüm başına en uzun süre (saniye)")
+    parser.add_argument("--json", metavar="DOSYA", help="Sonuçların yazılacağı JSON dosyası")
+    parser.add_argument("--max-latency-ms", type=float, help="p99 olay döngüsü gecikmesi üst sınırı")
+    parser.add_argument("--max-paint-ms", type=float, help="p99 boyama süresi üst sınırı")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    app = QApplication(sys.argv[:1])
+
+    print(f"{'sonuç':>9}{'sonuç/s':>11}{'boşaltma s':>12}{'gecikme p50/p99/en çok ms':>28}"
+          f"{'boyama':>8}{'boyama p50/p99 ms':>20}{'RSS MB':>9}{'B/sonuç':>9}")
+    results = []
+    for total in args.results:
+        case = run_case(app, total, args.rate, args.infected_every, args.timeout)
+        results.append(case)
+        latency = f"{case['latency_p50_ms']:.1f}/{case['latency_p99_ms']:.1f}/{case['latency_max_ms']:.0f}"
+        paint = f"{case['paint_p50_ms']:.2f}/{case['paint_p99_ms']:.2f}"
+        print(f"{total:>9}{case['results_per_sec']:>11.0f}{case['drain_seconds']:>12.2f}{latency:>28}"
+              f"{case['paints']:>8}{paint:>20}{case['rss_growth_mb']:>9.1f}{case['bytes_per_result']:>9.0f}"
+              + ("  (zaman aşımı)" if case["timed_out"] else ""))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"rate": args.rate, "cases": results}, f, ensure_ascii=False, indent=2)
+
+    failed = [case for case in results if case["timed_out"]
+              or (args.max_latency_ms is not None and case["latency_p99_ms"] > args.max_latency_ms)
+              or (args.max_paint_ms is not None and case["paint_p99_ms"] > args.max_paint_ms)]
+    for case in failed:
+        print(f"Sınır aşıldı: {case['results']} sonuç")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Paralel Dizin Gezinme Benchmark'ı (yapay gecikmeli dosya sistemi)
+
+Kullanım:
+    python benchmarks/bench_parallel_walk.py [DİZİN] [--dirs N] [--files N] [--latency MS]
+
+NFS/SMB benzeri bir bağlantıyı taklit etmek için her os.scandir ve os.stat
+çağrısına --latency milisaniye bekleme eklenir (sleep GIL'i bırakır, tıpkı
+ağ beklemesi gibi). Seri walk_files ile farklı işçi sayılarındaki
+parallel_walk_files karşılaştırılır ve dosya kümelerinin aynı olduğu
+doğrulanır.
+
+Created by Mert Ulupınar
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+from file_walker import walk_files, parallel_walk_files
+
+
+def create_tree(root: str, dirs: int, files: int) -> None:
+    """İki seviyeli bir dizin ağacı oluşturur."""
+    for d in range(dirs):
+        sub = os.path.join(root, f"g{d % 16:02d}", f"d{d:05d}")
+        os.makedirs(sub, exist_ok=True)
+        for f in range(files):
+            with open(os.path.join(sub, f"f{f:04d}.txt"), "wb") as fh:
+                fh.write(b"x")
+
+
+def add_latency(latency: float) -> None:
+    """os.scandir ve os.stat çağrılarını yapay olarak yavaşlatır."""
+    real_scandir, real_stat = os.scandir, os.stat
+
+    def slow_scandir(path="."):
+        time.sleep(latency)
+        return real_scandir(path)
+
+    def slow_stat(path, *args, **kwargs):
+        time.sleep(latency)
+        return real_stat(path, *args, **kwargs)
+
+    os.scandir = slow_scandir
+    os.stat = slow_stat
+
+
+def measure(label: str, walk) -> set:
+    """Gezinmeyi çalıştırır, süreyi yazdırır ve dosya kümesini döndürür."""
+    start = time.perf_counter()
+    found = set(walk())
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {elapsed:8.3f} s   {len(found) / elapsed:10.0f} dosya/s")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Paralel dizin gezinme benchmark'ı")
+    parser.add_argument("directory", nargs="?", help="Gezilecek dizin (boşsa geçici ağaç)")
+    parser.add_argument("--dirs", type=int, default=400, help="Oluşturulacak dizin sayısı")
+    parser.add_argument("--files", type=int, default=10, help="Dizin başına dosya sayısı")
+    parser.add_argument("--latency", type=float, default=2.0, help="Çağrı başına gecikme (ms)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[4, 8, 16, 32])
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        root = args.directory
+        if root is None:
+            root = temp_dir
+            print(f"{args.dirs} dizin x {args.files} dosya oluşturuluyor...")
+            create_tree(root, args.dirs, args.files)
+
+        add_latency(args.latency / 1000.0)
+        print(f"Çağrı başına gecikme: {args.latency} ms")
+
+        expected = measure("seri (walk_files)", lambda: walk_files(root))
+        for workers in args.workers:
+            found = measure(f"paralel ({workers} işçi)",
+                            lambda: parallel_walk_files(root, workers=workers))
+            if found != expected:
+                print(f"  HATA: dosya kümesi farklı ({len(found)} != {len(expected)})")
+                sys.exit(1)
+        print("Tüm dosya kümeleri aynı.")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,15 +9,20 @@ import os
 import json
 import logging
 import hashlib
-from typing import Set, Optional
+import shutil
+import tempfile
+from typing import Dict, Iterable, Set, Optional
 from datetime import datetime
 from urllib import request, error
 
+from signature_merge import SignatureFeed, merge_signature_files, DEFAULT_MEMORY_LIMIT
+
 logger = logging.getLogger('Mert Ulupınar.CloudUpdater')
 
 # Bulut güncelleme ayarları
 CLOUD_UPDATE_URL = "https://raw.githubusercontent.com/example/virus-signatures/main/signatures.json"
 LOCAL_CACHE_FILE = "cloud_signatures_cache.json"
+DOWNLOAD_CHUNK_SIZE = 1 << 20
 UPDATE_INTERVAL = 3600  # 1 saat (saniye cinsinden)
 
 
@@ -104,6 +109,7 @@ class CloudUpdater:
     def merge_signatures(self, local_sigs: Set[str], cloud_sigs: Set[str]) -> Set[str]:
         """
         Yerel ve bulut imzalarını birleştir.
+        Küçük imza setleri içindir; büyük akışlar için merge_feed_files kullanın.
         
         Args:
             local_sigs: Yerel imzalar
@@ -122,6 +128,58 @@ class CloudUpdater:
         
         return merged
     
+    def download_feed(self, destination: str, timeout: int = 10) -> bool:
+        """
+        Bulut imza akışını belleğe almadan, parça parça diske indirir.
+        İndirme yarıda kalırsa destination değişmez.
+        """
+        directory = os.path.dirname(os.path.abspath(destination))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            logger.info(f"Bulut imza akışı indiriliyor: {self.update_url}")
+            req = request.Request(self.update_url, headers={'User-Agent': 'Mert Ulupınar/1.0'})
+            with os.fdopen(fd, "wb") as f, request.urlopen(req, timeout=timeout) as response:
+                shutil.copyfileobj(response, f, DOWNLOAD_CHUNK_SIZE)
+            os.replace(tmp_path, destination)
+            return True
+        except (error.URLError, OSError) as e:
+            logger.error(f"İmza akışı indirilemedi: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+    
+    def merge_feed_files(self, local_db: str, output_path: str, removals: Iterable[str] = (),
+                         sources_path: Optional[str] = None,
+                         memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                         timeout: int = 10) -> Optional[Dict]:
+        """
+        Bulut akışını indirip yerel veritabanı dosyasıyla diskte birleştirir.
+        Yerel imzalar ve akış Python setlerine yüklenmez; bellek kullanımı
+        memory_limit ile sınırlıdır. removals dosyalarındaki hash'ler sonuçtan
+        çıkarılır. Birleştirme sayaçlarını veya None (başarısızsa) döndürür.
+        """
+        directory = os.path.dirname(os.path.abspath(output_path))
+        fd, feed_path = tempfile.mkstemp(dir=directory, suffix=".feed")
+        os.close(fd)
+        try:
+            if not self.download_feed(feed_path, timeout):
+                logger.warning("Bulut güncellemesi başarısız")
+                return None
+            feeds = [SignatureFeed("local", local_db)] if os.path.exists(local_db) else []
+            feeds.append(SignatureFeed("cloud", feed_path))
+            feeds.extend(SignatureFeed(os.path.basename(path), path, remove=True) for path in removals)
+            counts = merge_signature_files(feeds, output_path, sources_path, memory_limit)
+        finally:
+            try:
+                os.remove(feed_path)
+            except OSError:
+                pass
+        
+        self._save_update_time(datetime.now().timestamp())
+        return counts
+    
     def update_from_cloud(self, local_signatures: Set[str]) -> Optional[Set[str]]:
         """
         Buluttan güncelleme yap.
@@ -0,0 +1,339 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Artımlı Tarama için Dizin Ağacı Önbelleği
+
+Created by Mert Ulupınar
+"""
+
+import os
+import time
+import sqlite3
+import logging
+from typing import Callable, Iterator, List, Optional
+
+from file_walker import WalkFilter, WalkStats, filter_entries
+
+logger = logging.getLogger('Mert Ulupınar.DirTree')
+
+CACHE_FOLDER = "cache"
+CACHE_FILE = "dirtree.sqlite3"
+COMMIT_EVERY = 2000  # Bu kadar değişiklikte bir indeks işlemi kapatılır
+
+# Bu kadar yeni değiştirilmiş girdilere güvenilmez (zaman damgası çözünürlüğü)
+RACY_WINDOW_NS = 2 * 1_000_000_000
+
+# Girdi türleri
+KIND_FILE = 0      # Normal dosya (veya dosyaya bağlantı)
+KIND_DIR = 1       # Gerçek dizin
+KIND_DIR_LINK = 2  # Dizine işaret eden sembolik bağlantı (takip edilmez)
+KIND_OTHER = 3     # FIFO, soket, cihaz, kırık bağlantı
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    ino INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    entry_count INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS entries (
+    dir TEXT NOT NULL,
+    name TEXT NOT NULL,
+    kind INTEGER NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    ino INTEGER,
+    hash TEXT,
+    PRIMARY KEY (dir, name)
+) WITHOUT ROWID;
+"""
+
+
+class CachedEntry:
+    """
+    Önbellekteki bir dizin girdisi.
+    os.DirEntry ile aynı arayüzü sağlar, böylece gezinme filtreleri aynen uygulanır.
+    """
+
+    __slots__ = ("name", "path", "kind", "size", "mtime_ns", "ino", "hash")
+
+    def __init__(self, directory: str, name: str, kind: int, size: Optional[int] = None,
+                 mtime_ns: Optional[int] = None, ino: Optional[int] = None, hash: Optional[str] = None):
+        self.name = name
+        self.path = os.path.join(directory, name)
+        self.kind = kind
+        self.size = size
+        self.mtime_ns = mtime_ns
+        self.ino = ino
+        self.hash = hash  # Son taramadaki MD5 (bilinmiyorsa None)
+
+    @property
+    def st_size(self) -> Optional[int]:
+        return self.size
+
+    def is_dir(self, follow_symlinks: bool = True) -> bool:
+        return self.kind == KIND_DIR or (follow_symlinks and self.kind == KIND_DIR_LINK)
+
+    def is_file(self, follow_symlinks: bool = True) -> bool:
+        return self.kind == KIND_FILE
+
+    def is_symlink(self) -> bool:
+        return self.kind == KIND_DIR_LINK
+
+    def stat(self, follow_symlinks: bool = True) -> "CachedEntry":
+        return self
+
+    def matches(self, st: os.stat_result) -> bool:
+        """Kayıtlı bilgiler verilen stat ile aynı mı?"""
+        return (self.size, self.mtime_ns, self.ino) == (st.st_size, st.st_mtime_ns, st.st_ino)
+
+
+class TreeStats:
+    """Artımlı gezinme sayaçları."""
+
+    def __init__(self):
+        self.reused_dirs = 0     # Listelemeden önbellekten alınan dizinler
+        self.rescanned_dirs = 0  # Değiştiği için yeniden listelenen dizinler
+        self.removed_dirs = 0    # Silinen alt ağaçların önbellek kayıtları
+        self.known_files = 0     # Hash'i önbellekten alınan dosyalar
+
+    def as_dict(self) -> dict:
+        return {
+            "reused_dirs": self.reused_dirs,
+            "rescanned_dirs": self.rescanned_dirs,
+            "removed_dirs": self.removed_dirs,
+            "known_files": self.known_files,
+        }
+
+
+class DirTreeCache:
+    """
+    Dizin özetlerinden (inode, mtime, girdi sayısı) oluşan kalıcı ağaç.
+
+    Yeniden taramada her dizin için yalnızca dizinin kendisi stat edilir.
+    mtime ve inode değişmemişse girdi listesi ve dosya hash'leri önbellekten
+    alınır; dizin listelenmez, içindeki dosyalar stat edilmez ve okunmaz.
+    Yalnızca değişen dizinler listelenir ve yalnızca yeni veya değişen
+    dosyalar yeniden hash'lenir.
+
+    Uyarı: Bir dosyanın içeriği yerinde değiştirildiğinde (yeniden adlandırma
+    olmadan) dizinin mtime'ı değişmez. Bu durum varsayılan olarak fark edilmez;
+    stat_files=True ile değişmeyen dizinlerdeki dosyalar da stat edilir
+    (listeleme ve okuma yine atlanır).
+    """
+
+    def __init__(self, path: str = os.path.join(CACHE_FOLDER, CACHE_FILE), stat_files: bool = False):
+        self.path = path
+        self.stat_files = stat_files
+        self.stats = TreeStats()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Önbellek GUI thread'inde oluşturulup tarama thread'inde kullanılır
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._pending_writes = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        """Bekleyen değişiklikleri işler ve bağlantıyı kapatır."""
+        self.commit()
+        self._db.close()
+
+    # ======================
+    # Gezinme
+    # ======================
+
+    def walk(self, root: str, walk_filter: Optional[WalkFilter] = None,
+             stats: Optional[WalkStats] = None,
+             should_continue: Optional[Callable[[], bool]] = None) -> Iterator[CachedEntry]:
+        """
+        walk_files ile aynı dosyaları, son bilinen hash'leriyle birlikte üretir.
+        Hash'i None olan dosyalar yeni veya değişmiştir ve taranmalıdır.
+        """
+        walk_filter = walk_filter or WalkFilter(ignore_file=None)
+        stats = stats if stats is not None else WalkStats()
+        root = os.path.abspath(root)
+
+        stack = [(root, "", ())]
+        while stack:
+            if should_continue is not None and not should_continue():
+                return
+            directory, rel_dir, inherited = stack.pop()
+
+            entries = self._entries(directory)
+            if entries is None:
+                continue
+
+            files, subdirs = filter_entries(walk_filter, stats, directory, rel_dir, inherited, entries)
+            for entry in files:
+                if entry.hash is not None:
+                    self.stats.known_files += 1
+                yield entry
+            stack.extend(reversed(subdirs))
+
+    def _entries(self, directory: str) -> Optional[List[CachedEntry]]:
+        """Dizin değişmemişse önbellekteki, değişmişse yeni listeyi döndürür."""
+        try:
+            st = os.stat(directory)
+        except OSError as e:
+            logger.debug(f"Dizin okunamadı: {directory} - {e}")
+            return None
+
+        row = self._db.execute("SELECT ino, mtime_ns FROM dirs WHERE path = ?", (_db_path(directory),)).fetchone()
+        if row is not None and row == (st.st_ino, st.st_mtime_ns):
+            self.stats.reused_dirs += 1
+            entries = self._load(directory)
+            if self.stat_files:
+                self._revalidate(directory, entries)
+            return entries
+
+        self.stats.rescanned_dirs += 1
+        return self._rescan(directory, st)
+
+    def _load(self, directory: str) -> List[CachedEntry]:
+        """Dizinin önbellekteki girdilerini okur."""
+        rows = self._db.execute(
+            "SELECT name, kind, size, mtime_ns, ino, hash FROM entries WHERE dir = ?", (_db_path(directory),)
+        )
+        return [CachedEntry(directory, os.fsdecode(name), *rest) for name, *rest in rows]
+
+    def _revalidate(self, directory: str, entries: List[CachedEntry]) -> None:
+        """Değişmeyen dizindeki dosyaları stat ederek yerinde değişiklikleri yakalar."""
+        for entry in entries:
+            if entry.kind != KIND_FILE or entry.hash is None:
+                continue
+            try:
+                st = os.stat(entry.path)
+            except OSError:
+                entry.hash = None
+                continue
+            if not entry.matches(st) or _is_racy(st.st_mtime_ns):
+                entry.hash = None
+                entry.size, entry.mtime_ns, entry.ino = st.st_size, _trusted_mtime(st.st_mtime_ns), st.st_ino
+                self._db.execute(
+                    "UPDATE entries SET size = ?, mtime_ns = ?, ino = ?, hash = NULL WHERE dir = ? AND name = ?",
+                    (entry.size, entry.mtime_ns, entry.ino, _db_path(directory), _db_path(entry.name))
+                )
+                self._count_write()
+
+    def _rescan(self, directory: str, st: os.stat_result) -> Optional[List[CachedEntry]]:
+        """Dizini listeler, değişmeyen dosyaların hash'lerini korur ve kaydı günceller."""
+        try:
+            with os.scandir(directory) as it:
+                dir_entries = list(it)
+        except OSError as e:
+            logger.debug(f"Dizin okunamadı: {directory} - {e}")
+            return None
+
+        old = {entry.name: entry for entry in self._load(directory)}
+        entries = []
+        for dir_entry in dir_entries:
+            name = dir_entry.name
+            try:
+                if dir_entry.is_dir(follow_symlinks=False):
+                    entries.append(CachedEntry(directory, name, KIND_DIR))
+                elif dir_entry.is_file():
+                    fst = dir_entry.stat()
+                    previous = old.get(name)
+                    file_hash = None
+                    if previous is not None and previous.kind == KIND_FILE and previous.matches(fst):
+                        file_hash = previous.hash
+                    entries.append(CachedEntry(directory, name, KIND_FILE, fst.st_size,
+                                               _trusted_mtime(fst.st_mtime_ns), fst.st_ino, file_hash))
+                elif dir_entry.is_symlink() and dir_entry.is_dir():
+                    entries.append(CachedEntry(directory, name, KIND_DIR_LINK))
+                else:
+                    entries.append(CachedEntry(directory, name, KIND_OTHER))
+            except OSError:
+                continue
+
+        # Artık var olmayan (veya dizin olmaktan çıkan) alt dizinlerin kayıtlarını kaldır
+        current_dirs = {e.name for e in entries if e.kind == KIND_DIR}
+        for name, previous in old.items():
+            if previous.kind == KIND_DIR and name not in current_dirs:
+                self._remove_subtree(os.path.join(directory, name))
+
+        key = _db_path(directory)
+        self._db.execute("DELETE FROM entries WHERE dir = ?", (key,))
+        self._db.executemany(
+            "INSERT INTO entries (dir, name, kind, size, mtime_ns, ino, hash) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(key, _db_path(e.name), e.kind, e.size, e.mtime_ns, e.ino, e.hash) for e in entries]
+        )
+        self._db.execute(
+            "INSERT OR REPLACE INTO dirs (path, ino, mtime_ns, entry_count) VALUES (?, ?, ?, ?)",
+            (key, st.st_ino, _trusted_mtime(st.st_mtime_ns), len(entries))
+        )
+        self._count_write()
+        return entries
+
+    def _remove_subtree(self, path: str) -> None:
+        """
+        Silinen bir dizinin ve altındaki tüm dizinlerin kayıtlarını siler.
+        Alt dizinler metin veya (UTF-8 olmayan adlarda) BLOB olarak saklanmış
+        olabilir; SQLite iki türü ayrı sıraladığından iki aralık da silinir.
+        """
+        prefix = path.rstrip(os.sep) + os.sep
+        raw_prefix = os.fsencode(prefix)
+        ranges = [(os.fsencode(path), raw_prefix, raw_prefix[:-1] + bytes([raw_prefix[-1] + 1]))]
+        if isinstance(_db_path(prefix), str):
+            ranges.append((path, prefix, prefix[:-1] + chr(ord(os.sep) + 1)))
+        for exact, lower, upper in ranges:
+            self.stats.removed_dirs += self._db.execute(
+                "DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)", (exact, lower, upper)
+            ).rowcount
+            self._db.execute(
+                "DELETE FROM entries WHERE dir = ? OR (dir >= ? AND dir < ?)", (exact, lower, upper)
+            )
+
+    # ======================
+    # Hash Kaydı
+    # ======================
+
+    def record_hash(self, path: str, file_hash: str) -> None:
+        """Taranan dosyanın hash'ini önbelleğe yazar."""
+        directory, name = os.path.split(path)
+        self._db.execute("UPDATE entries SET hash = ? WHERE dir = ? AND name = ? AND kind = ?",
+                         (file_hash, _db_path(directory), _db_path(name), KIND_FILE))
+        self._count_write()
+
+    def commit(self) -> None:
+        """Bekleyen değişiklikleri işler."""
+        self._db.commit()
+        self._pending_writes = 0
+
+    def _count_write(self) -> None:
+        """Uzun gezinmelerde indeks işlemini belirli aralıklarla kapatır."""
+        self._pending_writes += 1
+        if self._pending_writes >= COMMIT_EVERY:
+            self._db.commit()
+            self._pending_writes = 0
+
+
+def _db_path(path: str):
+    """
+    Yolu veya adı önbellekte saklanacak değere çevirir. SQLite metni geçerli
+    UTF-8 olmalıdır; os.walk'un vekil karakterli döndürdüğü UTF-8 olmayan
+    adlar os.fsencode ile byte (BLOB) olarak saklanır.
+    """
+    try:
+        path.encode("utf-8")
+    except UnicodeEncodeError:
+        return os.fsencode(path)
+    return path
+
+
+def _is_racy(mtime_ns: int) -> bool:
+    """Zaman damgası, aynı tikte yapılan bir değişikliği gizleyebilecek kadar yeni mi?"""
+    return time.time_ns() - mtime_ns < RACY_WINDOW_NS
+
+
+def _trusted_mtime(mtime_ns: int) -> int:
+    """Çok yeni zaman damgaları -1 olarak saklanır, böylece sonraki taramada yeniden kontrol edilir."""
+    return -1 if _is_racy(mtime_ns) else mtime_ns
@@ -0,0 +1,230 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+ELF Bölüm Düzeyinde Hash Motoru
+
+Dolgu (padding) veya string tablosundaki tek bir byte'ı değiştirmek dosyanın
+MD5'ini değiştirir ama çalıştırılabilir kodu değiştirmez. Bu motor ELF
+başlıklarını küçük okumalarla ayrıştırır ve yalnızca kod bölümlerini
+(.text, .text.*) ve çalıştırılabilir segmentleri okuyarak ayrı ayrı hash'ler.
+Bağlayıcının ürettiği .plt/.init/.fini saplamaları ve MIN_RANGE_SIZE'dan
+küçük aralıklar ilgisiz programlarda ortak olduğundan indekslenmez.
+
+Okumalar read_at(offset, size) fonksiyonuyla yapılır; böylece aynı kod
+açık dosya (pread) ve bellekteki veri için kullanılır. ELF olmayan
+dosyalar için yalnızca ilk byte'lar okunur.
+
+Created by Mert Ulupınar
+"""
+
+import os
+import struct
+import hashlib
+import logging
+from typing import Callable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+logger = logging.getLogger('Mert Ulupınar.ElfEngine')
+
+ELF_MAGIC = b"\x7fELF"
+MIN_RANGE_SIZE = 4096           # Daha küçük bölümler hash'lenmez (ortak derleyici kodu, yanlış pozitif)
+# Yalnızca kod taşıyan bölümler indekslenir; .plt*, .init ve .fini gibi bağlayıcı
+# tarafından üretilen saplamalar ilgisiz programlarda byte byte aynıdır
+CODE_SECTION = ".text"
+MAX_TABLE_BYTES = 4 * 1024 * 1024  # Bölüm/program başlık tablosu ve isim tablosu için üst sınır
+READ_CHUNK = 1 << 20
+
+_IDENT_SIZE = 16
+_ELFCLASS32, _ELFCLASS64 = 1, 2
+_ELFDATA2LSB, _ELFDATA2MSB = 1, 2
+
+_SHT_NOBITS = 8
+_SHF_EXECINSTR = 0x4
+_PT_LOAD = 1
+_PF_X = 0x1
+
+# e_phoff, e_shoff, e_phentsize, e_phnum, e_shentsize, e_shnum, e_shstrndx
+_HEADER = {
+    _ELFCLASS32: "IIIIHHHHHH",  # e_entry, e_phoff, e_shoff, e_flags, e_ehsize, ...
+    _ELFCLASS64: "QQQIHHHHHH",
+}
+# sh_name, sh_type, sh_flags, sh_addr, sh_offset, sh_size
+_SECTION = {_ELFCLASS32: "IIIIII", _ELFCLASS64: "IIQQQQ"}
+_PROGRAM = {
+    _ELFCLASS32: "IIIIIIII",  # p_type, p_offset, p_vaddr, p_paddr, p_filesz, p_memsz, p_flags, p_align
+    _ELFCLASS64: "IIQQQQQQ",  # p_type, p_flags, p_offset, p_vaddr, p_paddr, p_filesz, p_memsz, p_align
+}
+
+ReadAt = Callable[[int, int], bytes]
+
+
+class ElfRange(NamedTuple):
+    """Hash'lenecek çalıştırılabilir bölüm veya segment."""
+    kind: str     # "section" veya "segment"
+    name: str     # Bölüm adı (.text) veya segment numarası
+    offset: int
+    size: int
+
+
+def is_elf(header: bytes) -> bool:
+    return header[:4] == ELF_MAGIC
+
+
+def is_elf_file(path: str) -> bool:
+    """Dosyanın ilk byte'larına bakarak ELF olup olmadığını döndürür."""
+    try:
+        with open(path, "rb") as f:
+            return is_elf(f.read(len(ELF_MAGIC)))
+    except OSError:
+        return False
+
+
+def file_reader(fd: int, on_read: Optional[Callable[[int], None]] = None) -> ReadAt:
+    """Açık dosya için read_at; on_read her okumada okunan byte sayısıyla çağrılır."""
+    def read_at(offset: int, size: int) -> bytes:
+        if hasattr(os, "pread"):
+            data = os.pread(fd, size, offset)
+        else:  # Windows
+            os.lseek(fd, offset, os.SEEK_SET)
+            data = os.read(fd, size)
+        if on_read is not None:
+            on_read(len(data))
+        return data
+    return read_at
+
+
+def seekable_reader(f) -> ReadAt:
+    """Konumlanabilir dosya nesnesi (ör. SpooledTemporaryFile) için read_at."""
+    def read_at(offset: int, size: int) -> bytes:
+        f.seek(offset)
+        return f.read(size)
+    return read_at
+
+
+def buffer_reader(data) -> ReadAt:
+    """Bellekteki veri için read_at (kopyasız dilimler)."""
+    view = memoryview(data)
+    return lambda offset, size: view[offset:offset + size]
+
+
+def executable_ranges(read_at: ReadAt, file_size: int) -> List[ElfRange]:
+    """
+    ELF dosyasının çalıştırılabilir bölümlerini ve PT_LOAD segmentlerini döndürür.
+    ELF değilse veya başlıklar bozuksa boş liste döner.
+    """
+    ident = bytes(read_at(0, _IDENT_SIZE))
+    if not is_elf(ident) or len(ident) < _IDENT_SIZE:
+        return []
+    elf_class, data_order = ident[4], ident[5]
+    if elf_class not in _HEADER or data_order not in (_ELFDATA2LSB, _ELFDATA2MSB):
+        return []
+    order = "<" if data_order == _ELFDATA2LSB else ">"
+
+    fields = struct.Struct(order + _HEADER[elf_class])
+    header = bytes(read_at(_IDENT_SIZE + 8, fields.size))  # e_type, e_machine, e_version atlanır
+    if len(header) < fields.size:
+        return []
+    (_, phoff, shoff, _, _, phentsize, phnum, shentsize, shnum, shstrndx) = fields.unpack(header)
+
+    ranges = []
+    ranges.extend(_sections(read_at, order, elf_class, shoff, shentsize, shnum, shstrndx, file_size))
+    ranges.extend(_segments(read_at, order, elf_class, phoff, phentsize, phnum, file_size))
+    return ranges
+
+
+def _read_table(read_at: ReadAt, offset: int, entry_size: int, count: int, entry_format: str,
+                file_size: int) -> Iterator[tuple]:
+    """Başlık tablosunu tek okumayla alır ve girdileri çözer."""
+    record = struct.Struct(entry_format)
+    if not offset or not count or entry_size < record.size:
+        return
+    total = entry_size * count
+    if total > MAX_TABLE_BYTES or offset + total > file_size:
+        return
+    table = bytes(read_at(offset, total))
+    for index in range(count):
+        start = index * entry_size
+        if start + record.size > len(table):
+            return
+        yield record.unpack_from(table, start)
+
+
+def _in_file(offset: int, size: int, file_size: int) -> bool:
+    return size >= MIN_RANGE_SIZE and offset + size <= file_size
+
+
+def _sections(read_at: ReadAt, order: str, elf_class: int, shoff: int, shentsize: int, shnum: int,
+              shstrndx: int, file_size: int) -> List[ElfRange]:
+    headers = list(_read_table(read_at, shoff, shentsize, shnum, order + _SECTION[elf_class], file_size))
+    executable = [h for h in headers
+                  if h[1] != _SHT_NOBITS and h[2] & _SHF_EXECINSTR and _in_file(h[4], h[5], file_size)]
+    if not executable:
+        return []
+
+    # İsim tablosu yalnızca çalıştırılabilir bölüm varsa okunur; isimsiz bölümler atlanır
+    names = b""
+    if shstrndx < len(headers):
+        _, _, _, _, str_offset, str_size = headers[shstrndx]
+        if str_size <= MAX_TABLE_BYTES and str_offset + str_size <= file_size:
+            names = bytes(read_at(str_offset, str_size))
+
+    ranges = []
+    for name_offset, _, _, _, offset, size in executable:
+        end = names.find(b"\0", name_offset)
+        name = names[name_offset:end].decode("ascii", "replace") if 0 <= name_offset < end else ""
+        if name == CODE_SECTION or name.startswith(CODE_SECTION + "."):
+            ranges.append(ElfRange("section", name, offset, size))
+    return ranges
+
+
+def _segments(read_at: ReadAt, order: str, elf_class: int, phoff: int, phentsize: int, phnum: int,
+              file_size: int) -> List[ElfRange]:
+    ranges = []
+    for index, entry in enumerate(_read_table(read_at, phoff, phentsize, phnum,
+                                              order + _PROGRAM[elf_class], file_size)):
+        if elf_class == _ELFCLASS64:
+            p_type, p_flags, offset, _, _, filesz, _, _ = entry
+        else:
+            p_type, offset, _, _, filesz, _, p_flags, _ = entry
+        if p_type == _PT_LOAD and p_flags & _PF_X and _in_file(offset, filesz, file_size):
+            ranges.append(ElfRange("segment", str(index), offset, filesz))
+    return ranges
+
+
+def hash_range(read_at: ReadAt, elf_range: ElfRange) -> str:
+    """Aralığın MD5'ini parça parça okuyarak hesaplar."""
+    hash_func = hashlib.md5()
+    position, end = elf_range.offset, elf_range.offset + elf_range.size
+    while position < end:
+        chunk = read_at(position, min(READ_CHUNK, end - position))
+        if not chunk:
+            break
+        hash_func.update(chunk)
+        position += len(chunk)
+    return hash_func.hexdigest()
+
+
+def iter_range_hashes(read_at: ReadAt, file_size: int) -> Iterator[Tuple[ElfRange, str]]:
+    """Çalıştırılabilir aralıkları sırayla hash'ler (bölümler önce)."""
+    seen = set()
+    for elf_range in executable_ranges(read_at, file_size):
+        key = (elf_range.offset, elf_range.size)
+        if key in seen:
+            # Segment tek bir bölümle aynı aralıksa ikinci kez okunmaz
+            continue
+        seen.add(key)
+        yield elf_range, hash_range(read_at, elf_range)
+
+
+def match_sections(read_at: ReadAt, file_size: int,
+                   section_signatures: Set[str]) -> Optional[Tuple[ElfRange, str]]:
+    """İmza indeksinde bulunan ilk bölümü/segmenti döndürür; yoksa None."""
+    for elf_range, digest in iter_range_hashes(read_at, file_size):
+        if digest in section_signatures:
+            return elf_range, digest
+    return None
+
+
+def section_hashes(path: str) -> List[Tuple[ElfRange, str]]:
+    """Dosyanın çalıştırılabilir bölüm hash'lerini döndürür (imza indeksi oluşturmak için)."""
+    with open(path, "rb") as f:
+        fd = f.fileno()
+        return list(iter_range_hashes(file_reader(fd), os.fstat(fd).st_size))
@@ -0,0 +1,75 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Harici (Diske Taşan) Birleştirmeli Sıralama
+
+Bellekten büyük kayıt akışları sıralı parçalar (run) halinde geçici dosyalara
+yazılır, ardından tek geçişte k-yollu birleştirilir. Bellekte aynı anda en
+fazla run_size kayıt bulunur.
+
+Created by Mert Ulupınar
+"""
+
+import os
+import json
+import heapq
+import shutil
+import logging
+import tempfile
+from typing import Any, Callable, Iterable, Iterator, List, Optional
+
+logger = logging.getLogger('Mert Ulupınar.ExternalSort')
+
+DEFAULT_RUN_SIZE = 200_000  # Bellekte sıralanacak en fazla kayıt
+_READ_BUFFER = 1 << 16
+
+
+def _write_run(directory: str, index: int, items: List[Any]) -> str:
+    """Sıralı parçayı JSON satırları olarak yazar."""
+    path = os.path.join(directory, f"run_{index:05d}.jsonl")
+    with open(path, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.writelines(json.dumps(item, separators=(",", ":")) + "\n" for item in items)
+    return path
+
+
+def _read_run(path: str) -> Iterator[Any]:
+    with open(path, "r", encoding="utf-8", buffering=_READ_BUFFER) as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def external_sort(items: Iterable[Any], key: Optional[Callable[[Any], Any]] = None,
+                  run_size: int = DEFAULT_RUN_SIZE, tmp_dir: Optional[str] = None) -> Iterator[Any]:
+    """
+    Kayıtları key'e göre sıralı üretir (kararlı: eşit anahtarlar geliş sırasını korur).
+
+    Kayıtlar JSON ile yazılıp okunduğundan liste, sözlük, metin ve sayılardan
+    oluşmalıdır (demetler liste olarak döner). Tek parçaya sığan akışlar diske
+    hiç yazılmaz. Geçici dosyalar üretici bitince veya kapatılınca silinir.
+    """
+    run: List[Any] = []
+    directory = None
+    runs: List[str] = []
+    try:
+        for item in items:
+            run.append(item)
+            if len(run) >= run_size:
+                if directory is None:
+                    directory = tempfile.mkdtemp(prefix="sort_", dir=tmp_dir)
+                run.sort(key=key)
+                runs.append(_write_run(directory, len(runs), run))
+                run = []
+
+        run.sort(key=key)
+        if not runs:
+            yield from run
+            return
+
+        if run:
+            runs.append(_write_run(directory, len(runs), run))
+            run = []
+        logger.debug(f"Harici sıralama: {len(runs)} parça birleştiriliyor")
+        # heapq.merge eşit anahtarlarda önceki parçayı önce verir: sıralama kararlı kalır
+        yield from heapq.merge(*(_read_run(path) for path in runs), key=key)
+    finally:
+        if directory is not None:
+            shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,386 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Filtreli Dizin Gezinme Modülü
+
+Created by Mert Ulupınar
+"""
+
+import os
+import re
+import fnmatch
+import logging
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Callable, Iterable, Iterator, List, Optional, Pattern, Tuple
+
+logger = logging.getLogger('Mert Ulupınar.Walker')
+
+# Her dizinde aranan yoksayma dosyası (satır başına bir glob, # yorum)
+IGNORE_FILE_NAME = ".pyvirusignore"
+
+# Paralel gezinmede aynı anda listelenen dizin sayısı (NFS/SMB gecikmesini gizler)
+WALK_WORKERS = 8
+
+
+def _translate_segment(segment: str) -> str:
+    """Tek bir yol parçasının glob'unu regex'e çevirir; joker karakterler '/' ile eşleşmez."""
+    out, i, n = [], 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i
+            if j < n and segment[j] == "!":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            j = segment.find("]", j)
+            if j < 0:
+                out.append("\\[")
+                continue
+            stuff = segment[i:j].replace("\\", "\\\\")
+            i = j + 1
+            if stuff.startswith("!"):
+                stuff = "^" + stuff[1:]
+            elif stuff.startswith("^"):
+                stuff = "\\" + stuff
+            out.append(f"(?!/)[{stuff}]")
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def translate_path_glob(glob: str) -> str:
+    """
+    '/' içeren glob'u parça parça regex'e çevirir: '*' ve '?' tek bir yol
+    parçasında kalır ('build/*.o', 'build/sub/x.o' ile eşleşmez); tek başına
+    '**' parçası sıfır veya daha fazla dizinle eşleşir.
+    """
+    segments = glob.split("/")
+    out = []
+    for index, segment in enumerate(segments):
+        last = index == len(segments) - 1
+        if segment == "**":
+            out.append(".*" if last else "(?:[^/]+/)*")
+        else:
+            out.append(_translate_segment(segment) + ("" if last else "/"))
+    return "(?s:" + "".join(out) + r")\Z"
+
+
+def compile_rules(globs: Iterable[str] = (), regexes: Iterable[str] = (),
+                  path_globs: Iterable[str] = ()) -> Optional[Pattern]:
+    """
+    Glob ve regex kurallarını tek bir derlenmiş regex'te birleştirir.
+    path_globs yol parçalarına göre çevrilir (bkz. translate_path_glob).
+    Kural yoksa None döner.
+    """
+    parts = [fnmatch.translate(g) for g in globs]
+    parts.extend(translate_path_glob(g) for g in path_globs)
+    parts.extend(regexes)
+    if not parts:
+        return None
+    return re.compile("|".join(f"(?:{p})" for p in parts))
+
+
+class _RuleSet:
+    """
+    Bir kural kümesi: '/' içeren glob'lar göreli yolun tamamına, diğerleri
+    dosya adına uygulanır. Regex'ler göreli yolun herhangi bir yerinde aranır.
+    """
+
+    __slots__ = ("base", "name_rules", "path_rules", "regex_rules", "dir_name_rules", "dir_path_rules")
+
+    def __init__(self, base: str, globs: Iterable[str] = (), regexes: Iterable[str] = ()):
+        self.base = base  # Kuralların göreli olduğu dizin ("" = kök)
+        name_globs, path_globs, dir_name_globs, dir_path_globs = [], [], [], []
+        for glob in globs:
+            dir_only = glob.endswith("/")
+            glob = glob.rstrip("/")
+            if not glob:
+                continue
+            if "/" in glob:
+                (dir_path_globs if dir_only else path_globs).append(glob.lstrip("/"))
+            else:
+                (dir_name_globs if dir_only else name_globs).append(glob)
+
+        self.name_rules = compile_rules(name_globs)
+        self.path_rules = compile_rules(path_globs=path_globs)
+        self.regex_rules = compile_rules(regexes=regexes)
+        self.dir_name_rules = compile_rules(dir_name_globs)
+        self.dir_path_rules = compile_rules(path_globs=dir_path_globs)
+
+    def matches(self, name: str, rel: str, is_dir: bool) -> bool:
+        """Girdi bu kurallarla eşleşiyor mu?"""
+        if self.base:
+            rel = rel[len(self.base) + 1:]
+        if self.name_rules is not None and self.name_rules.match(name):
+            return True
+        # Yol glob'ları köke bağlıdır: "build/*.o", "rebuild/x.o" ile eşleşmez
+        if self.path_rules is not None and self.path_rules.fullmatch(rel):
+            return True
+        if self.regex_rules is not None and self.regex_rules.search(rel):
+            return True
+        if is_dir:
+            if self.dir_name_rules is not None and self.dir_name_rules.match(name):
+                return True
+            if self.dir_path_rules is not None and self.dir_path_rules.fullmatch(rel):
+                return True
+        return False
+
+
+class WalkFilter:
+    """
+    Gezinme sırasında uygulanan dahil etme / hariç tutma kuralları.
+
+    Args:
+        include: Taranacak dosya glob'ları (boşsa tüm dosyalar)
+        exclude: Hariç tutulacak dosya/dizin glob'ları ('dizin/' yalnızca dizinler)
+        include_regex: Göreli yolda aranan dahil etme regex'leri
+        exclude_regex: Göreli yolda aranan hariç tutma regex'leri
+        min_size: En küçük dosya boyutu (byte)
+        max_size: En büyük dosya boyutu (byte, None = sınırsız)
+        ignore_file: Dizin bazlı yoksayma dosyasının adı (None = kapalı)
+    """
+
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = (),
+                 include_regex: Iterable[str] = (), exclude_regex: Iterable[str] = (),
+                 min_size: int = 0, max_size: Optional[int] = None,
+                 ignore_file: Optional[str] = IGNORE_FILE_NAME):
+        include, include_regex = list(include), list(include_regex)
+        self.include = _RuleSet("", include, include_regex)
+        self.has_include = bool(include or include_regex)
+        self.exclude = _RuleSet("", exclude, exclude_regex)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.ignore_file = ignore_file
+
+    @property
+    def checks_size(self) -> bool:
+        """Boyut kontrolü için stat gerekli mi?"""
+        return self.min_size > 0 or self.max_size is not None
+
+    def load_ignore_file(self, directory: str, rel: str) -> Optional[_RuleSet]:
+        """Dizindeki yoksayma dosyasını okuyup kural kümesine çevirir."""
+        try:
+            with open(os.path.join(directory, self.ignore_file), "r", encoding="utf-8") as f:
+                globs = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+        except (IOError, OSError, UnicodeDecodeError) as e:
+            logger.warning(f"Yoksayma dosyası okunamadı: {directory} - {e}")
+            return None
+        return _RuleSet(rel, globs) if globs else None
+
+
+class WalkStats:
+    """Gezinme sırasında elenen girdilerin sayaçları."""
+
+    def __init__(self):
+        self.pruned_dirs = 0      # Kuralla budanan alt ağaçlar
+        self.excluded_files = 0   # Kuralla elenen dosyalar
+        self.special_files = 0    # FIFO, soket, cihaz vb.
+        self.size_filtered = 0    # Boyut sınırı dışındaki dosyalar
+
+    @property
+    def total_pruned(self) -> int:
+        """Toplam elenen girdi sayısı."""
+        return self.pruned_dirs + self.excluded_files + self.special_files + self.size_filtered
+
+    def merge(self, other: "WalkStats") -> None:
+        """Başka bir sayaç kümesini bu kümeye ekler."""
+        self.pruned_dirs += other.pruned_dirs
+        self.excluded_files += other.excluded_files
+        self.special_files += other.special_files
+        self.size_filtered += other.size_filtered
+
+    def as_dict(self) -> dict:
+        return {
+            "pruned_dirs": self.pruned_dirs,
+            "excluded_files": self.excluded_files,
+            "special_files": self.special_files,
+            "size_filtered": self.size_filtered,
+        }
+
+
+def walk_files(root: str, walk_filter: Optional[WalkFilter] = None,
+               stats: Optional[WalkStats] = None,
+               should_continue: Optional[Callable[[], bool]] = None) -> Iterator[str]:
+    """
+    Dizindeki dosyaları os.scandir ile recursive olarak üretir.
+
+    Hariç tutulan dizinlere hiç girilmez. Normal dosya olmayan girdiler
+    d_type bilgisiyle, hiçbir dosya açılmadan elenir. Dizin sembolik
+    bağlantıları os.walk'ta olduğu gibi takip edilmez.
+    """
+    walk_filter = walk_filter or WalkFilter(ignore_file=None)
+    stats = stats if stats is not None else WalkStats()
+    root = os.fspath(root)
+
+    stack: List[Tuple[str, str, Tuple[_RuleSet, ...]]] = [(root, "", ())]
+    while stack:
+        if should_continue is not None and not should_continue():
+            return
+        directory, rel_dir, inherited = stack.pop()
+
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError as e:
+            logger.debug(f"Dizin okunamadı: {directory} - {e}")
+            continue
+
+        files, subdirs = filter_entries(walk_filter, stats, directory, rel_dir, inherited, entries)
+        for entry in files:
+            yield entry.path
+
+        # os.walk ile aynı (üstten alta, listeleme sırasında) gezinme
+        stack.extend(reversed(subdirs))
+
+
+def filter_entries(walk_filter: WalkFilter, stats: WalkStats, directory: str, rel_dir: str,
+                   inherited: Tuple[_RuleSet, ...], entries: list,
+                   follow_symlinks: bool = False) -> Tuple[list, list]:
+    """
+    Bir dizinin girdilerine filtreleri uygular.
+
+    entries os.DirEntry veya aynı arayüzü sağlayan nesneler olabilir
+    (ör. önbellekten gelen liste). Taranacak dosya girdilerini ve
+    (yol, göreli yol, kurallar) biçiminde inilecek alt dizinleri döndürür.
+    follow_symlinks=True ise dizin bağlantıları da alt dizin sayılır.
+    """
+    rules = inherited
+    if walk_filter.ignore_file and any(e.name == walk_filter.ignore_file for e in entries):
+        local = walk_filter.load_ignore_file(directory, rel_dir)
+        if local is not None:
+            rules = inherited + (local,)
+
+    files = []
+    subdirs = []
+    for entry in entries:
+        rel = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+        try:
+            is_dir = entry.is_dir(follow_symlinks=follow_symlinks)
+            is_file = not is_dir and entry.is_file()
+        except OSError:
+            continue
+
+        if is_dir:
+            if _excluded(walk_filter, rules, entry.name, rel, True):
+                stats.pruned_dirs += 1
+            else:
+                subdirs.append((entry.path, rel, rules))
+            continue
+
+        if not is_file:
+            # FIFO, soket, cihaz düğümü veya dizine işaret eden bağlantı
+            if not entry.is_symlink() or not entry.is_dir():
+                stats.special_files += 1
+            continue
+
+        if _excluded(walk_filter, rules, entry.name, rel, False) or (
+                walk_filter.has_include and not walk_filter.include.matches(entry.name, rel, False)):
+            stats.excluded_files += 1
+            continue
+
+        if walk_filter.checks_size:
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                continue
+            if size < walk_filter.min_size or (
+                    walk_filter.max_size is not None and size > walk_filter.max_size):
+                stats.size_filtered += 1
+                continue
+
+        files.append(entry)
+    return files, subdirs
+
+
+def parallel_walk_files(root: str, walk_filter: Optional[WalkFilter] = None,
+                        stats: Optional[WalkStats] = None,
+                        should_continue: Optional[Callable[[], bool]] = None,
+                        workers: int = WALK_WORKERS, follow_symlinks: bool = False) -> Iterator[str]:
+    """
+    walk_files ile aynı dosya kümesini, dizinleri eşzamanlı listeleyerek üretir.
+
+    Bekleyen dizinler ortak bir iş kuyruğundadır; her işçi bir dizini
+    os.scandir ile listeler ve filtreleri DirEntry'deki (d_type ve önbelleğe
+    alınmış stat) bilgilerle uygular. Ağ dosya sistemlerinde readdir
+    gecikmeleri üst üste biner. Sonuçların sırası walk_files'tan farklıdır.
+
+    follow_symlinks=True ise dizin bağlantıları takip edilir; (st_dev, st_ino)
+    ile her dizin yalnızca bir kez gezilir, böylece bağlantı döngüleri sonsuz
+    gezinmeye yol açmaz.
+    """
+    walk_filter = walk_filter or WalkFilter(ignore_file=None)
+    stats = stats if stats is not None else WalkStats()
+    root = os.fspath(root)
+
+    visited = set()
+    if follow_symlinks:
+        try:
+            st = os.stat(root)
+            visited.add((st.st_dev, st.st_ino))
+        except OSError:
+            return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="WalkWorker")
+    pending = set()
+    try:
+        pending.add(executor.submit(_list_directory, walk_filter, root, "", (), follow_symlinks))
+        while pending:
+            if should_continue is not None and not should_continue():
+                return
+            done, _ = wait(pending, timeout=0.2, return_when=FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                files, subdirs, local_stats = future.result()
+                stats.merge(local_stats)
+                for directory, rel, rules, key in subdirs:
+                    if key is not None:
+                        if key in visited:
+                            logger.debug(f"Döngü nedeniyle atlandı: {directory}")
+                            continue
+                        visited.add(key)
+                    pending.add(executor.submit(_list_directory, walk_filter, directory, rel,
+                                                rules, follow_symlinks))
+                yield from files
+    finally:
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=False)
+
+
+def _list_directory(walk_filter: WalkFilter, directory: str, rel_dir: str,
+                    inherited: Tuple[_RuleSet, ...], follow_symlinks: bool):
+    """Paralel gezinme işçisi: bir dizini listeler ve filtreler."""
+    local_stats = WalkStats()
+    try:
+        with os.scandir(directory) as it:
+            entries = list(it)
+    except OSError as e:
+        logger.debug(f"Dizin okunamadı: {directory} - {e}")
+        return [], [], local_stats
+
+    files, subdirs = filter_entries(walk_filter, local_stats, directory, rel_dir, inherited,
+                                    entries, follow_symlinks)
+    result = []
+    for path, rel, rules in subdirs:
+        key = None
+        if follow_symlinks:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            key = (st.st_dev, st.st_ino)
+        result.append((path, rel, rules, key))
+    return [entry.path for entry in files], result, local_stats
+
+
+def _excluded(walk_filter: WalkFilter, rules: Tuple[_RuleSet, ...],
+              name: str, rel: str, is_dir: bool) -> bool:
+    """Girdi genel veya dizin bazlı kurallarla hariç tutuluyor mu?"""
+    if walk_filter.exclude.matches(name, rel, is_dir):
+        return True
+    return any(r.matches(name, rel, is_dir) for r in rules)
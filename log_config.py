@@ -0,0 +1,135 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Bloklamayan, Yapılandırılmış (JSON) Loglama
+
+Created by Mert Ulupınar
+"""
+
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime
+from typing import Dict, Optional
+
+LOG_MAX_BYTES = 10 * 1024 * 1024  # Dönüşümden önceki en büyük log boyutu
+LOG_BACKUP_COUNT = 5
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Dosya başına üretilen yüksek hacimli olay kategorisi
+LOG_CATEGORY_FILE = "scan.file"
+
+# Kategori -> her N kayıttan biri tutulur (WARNING ve üstü hiç elenmez)
+DEFAULT_SAMPLE_RATES: Dict[str, int] = {LOG_CATEGORY_FILE: 100}
+
+# LogRecord'un standart alanları; bunların dışındakiler JSON'a ek alan olarak yazılır
+_RESERVED = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+class JsonFormatter(logging.Formatter):
+    """Her kaydı tek satırlık JSON nesnesi olarak biçimlendirir."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RESERVED:
+                data[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Kategori bazlı örnekleme: extra={"category": ...} taşıyan kayıtlardan
+    her N kayıtta biri geçer. WARNING ve üstü seviyeler her zaman geçer.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, int]] = None):
+        super().__init__()
+        self.rates = dict(DEFAULT_SAMPLE_RATES if rates is None else rates)
+        self._counters: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        category = getattr(record, "category", None)
+        if category is None or record.levelno >= logging.WARNING:
+            return True
+        rate = self.rates.get(category, 1)
+        if rate <= 1:
+            return True
+        with self._lock:
+            count = self._counters.get(category, 0)
+            self._counters[category] = count + 1
+        if count % rate:
+            return False
+        record.sample_rate = rate
+        return True
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    Kaydı biçimlendirmeden kuyruğa koyar.
+    Mesaj birleştirme ve JSON'a çevirme dinleyici thread'inde yapılır.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Traceback nesneleri thread'ler arasında taşınmamalı
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(log_file: str, level: int = logging.INFO, console: bool = True,
+                      sample_rates: Optional[Dict[str, int]] = None,
+                      max_bytes: int = LOG_MAX_BYTES,
+                      backup_count: int = LOG_BACKUP_COUNT) -> logging.handlers.QueueListener:
+    """
+    Kök logger'ı kuyruk tabanlı loglamaya geçirir.
+
+    Tarama thread'leri yalnızca kuyruğa ekler; dosyaya (JSON, boyut bazlı
+    dönüşümlü) ve konsola yazma tek bir dinleyici thread'inde yapılır.
+    Birden çok kez çağrılırsa mevcut dinleyici döndürülür.
+    """
+    global _listener
+
+    with _listener_lock:
+        if _listener is not None:
+            return _listener
+
+        file_handler = logging.handlers.RotatingFileHandler(
+            log_file, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers = [file_handler]
+        if console:
+            stream_handler = logging.StreamHandler()
+            stream_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+            handlers.append(stream_handler)
+
+        log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+        queue_handler = DeferredQueueHandler(log_queue)
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+        return _listener
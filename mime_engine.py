@@ -0,0 +1,384 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+MIME / E-posta Ek Tarama Motoru
+
+.eml ve .mbox dosyalarındaki ekler base64 veya quoted-printable ile
+kodlandığından dosyanın MD5'i ekin imzasıyla eşleşmez. Bu modül MIME
+yapısını parça parça (artımlı) ayrıştırır ve ekleri çözerek doğrudan
+hash'e verir; mesajın tamamı bellekte tutulmaz.
+
+Bellek sınırı: satır ve başlık tamponları LINE_LIMIT/HEADER_LIMIT ile,
+base64 artığı 3 byte ile sınırlıdır; büyük mbox dosyaları sabit bellekle
+işlenir.
+
+Created by Mert Ulupınar
+"""
+
+import re
+import hashlib
+import binascii
+import logging
+from email.header import decode_header, make_header
+from email.parser import BytesHeaderParser
+from email.policy import compat32
+from typing import Callable, List, NamedTuple, Optional
+
+logger = logging.getLogger('Mert Ulupınar.MimeEngine')
+
+MAIL_EXTENSIONS = (".eml", ".mbox", ".mbx")
+MEMBER_SEPARATOR = "!"  # Sonuç yolu: mesaj!ek (mbox için mesaj!numara!ek)
+
+LINE_LIMIT = 64 * 1024    # Satır sonu gelmeden tamponlanacak en fazla byte
+HEADER_LIMIT = 64 * 1024  # Parça başına saklanacak en fazla başlık byte'ı
+
+_HEADERS = "headers"  # Parça başlıkları okunuyor
+_BODY = "body"        # Yaprak parçanın gövdesi
+_SKIP = "skip"        # multipart preamble/epilogue: sınır satırı bekleniyor
+
+_B64_NOISE = re.compile(rb"[^A-Za-z0-9+/=]+")
+_MBOXRD_ESCAPE = re.compile(rb"(^|\n)>(>*From )")
+_UNSAFE_NAME = re.compile(r"[\\/\x00-\x1f]")
+
+
+class MimePart(NamedTuple):
+    """Çözülmüş bir ekin hash'i."""
+    name: str               # Mesaj içindeki ad (mbox için "numara!ad")
+    file_hash: str          # Çözülmüş içeriğin MD5'i
+    size: int               # Çözülmüş içeriğin boyutu
+    content_type: str
+
+
+def is_mail_file(path: str) -> bool:
+    """Dosya uzantısı e-posta (.eml, .mbox) ise True döndürür."""
+    return path.lower().endswith(MAIL_EXTENSIONS)
+
+
+class _Base64Decoder:
+    """Parça parça base64 çözücü; 4'ün katı olmayan artık sonraki parçaya kalır."""
+
+    def __init__(self):
+        self._rest = b""
+
+    def decode(self, data: bytes) -> bytes:
+        data = self._rest + _B64_NOISE.sub(b"", data)
+        usable = len(data) - len(data) % 4
+        self._rest = data[usable:]
+        return self._convert(data[:usable])
+
+    def flush(self) -> bytes:
+        rest, self._rest = self._rest, b""
+        # Eksik dolgu tamamlanır; tek karakterlik artık çözülemez
+        return self._convert(rest + b"=" * (-len(rest) % 4)) if len(rest) > 1 else b""
+
+    @staticmethod
+    def _convert(data: bytes) -> bytes:
+        if not data:
+            return b""
+        try:
+            return binascii.a2b_base64(data)
+        except binascii.Error:
+            return b""
+
+
+class _QuotedPrintableDecoder:
+    """Parça parça quoted-printable çözücü; yarım kalan "=XX" sonraki parçaya kalır."""
+
+    def __init__(self):
+        self._rest = b""
+
+    def decode(self, data: bytes) -> bytes:
+        data = self._rest + data
+        cut = data.find(b"=", max(0, len(data) - 2))
+        if cut >= 0:
+            self._rest, data = data[cut:], data[:cut]
+        else:
+            self._rest = b""
+        return binascii.a2b_qp(data)
+
+    def flush(self) -> bytes:
+        # Parça sonundaki "=" yumuşak satır sonudur
+        rest, self._rest = self._rest, b""
+        return binascii.a2b_qp(rest) if rest.strip(b"=") else b""
+
+
+class _IdentityDecoder:
+    """7bit/8bit/binary gövde."""
+
+    def decode(self, data: bytes) -> bytes:
+        return data
+
+    def flush(self) -> bytes:
+        return b""
+
+
+_DECODERS = {"base64": _Base64Decoder, "quoted-printable": _QuotedPrintableDecoder}
+
+
+class _Leaf:
+    """Hash'lenen yaprak parçanın durumu."""
+
+    __slots__ = ("name", "content_type", "decoder", "md5", "size")
+
+    def __init__(self, name: str, content_type: str, encoding: str):
+        self.name = name
+        self.content_type = content_type
+        self.decoder = _DECODERS.get(encoding, _IdentityDecoder)()
+        self.md5 = hashlib.md5()
+        self.size = 0
+
+    def update(self, data: bytes) -> None:
+        decoded = self.decoder.decode(data)
+        if decoded:
+            self.md5.update(decoded)
+            self.size += len(decoded)
+
+    def finish(self) -> MimePart:
+        decoded = self.decoder.flush()
+        if decoded:
+            self.md5.update(decoded)
+            self.size += len(decoded)
+        return MimePart(self.name, self.md5.hexdigest(), self.size, self.content_type)
+
+
+def _header_text(value: str) -> str:
+    """RFC 2047 kodlu başlık değerini çözer."""
+    try:
+        return str(make_header(decode_header(value)))
+    except (UnicodeError, LookupError, ValueError, TypeError):
+        return value
+
+
+class MimeScanner:
+    """
+    Artımlı MIME ayrıştırıcı.
+
+    feed() ile dosyanın ardışık parçaları verilir, close() ile bitirilir.
+    Ekler (dosya adı olan, "attachment" olarak işaretli, base64 kodlu veya
+    metin olmayan yaprak parçalar) çözülerek hash'lenir ve parts listesine
+    eklenir; on_part verilirse ek tamamlanınca çağrılır.
+
+    mbox: None ise dosyanın "From " ile başlayıp başlamadığına bakılır.
+    """
+
+    def __init__(self, mbox: Optional[bool] = None, on_part: Optional[Callable[[MimePart], None]] = None):
+        self.mbox = mbox
+        self.on_part = on_part
+        self.parts: List[MimePart] = []
+        self.messages = 0 if mbox else 1
+        self._buf = bytearray()
+        self._state = _HEADERS
+        self._headers = bytearray()
+        self._boundaries: List[bytes] = []
+        self._leaf: Optional[_Leaf] = None
+        self._leaf_count = 0
+        self._pending_eol = b""
+        self._line_start = True
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    # Girdi
+    # ------------------------------------------------------------------
+
+    def feed(self, data: bytes) -> None:
+        """Dosyanın sıradaki parçasını işler."""
+        self._buf += data
+        if self.mbox is None:
+            if len(self._buf) < 5:
+                return
+            self.mbox = self._buf.startswith(b"From ")
+            self.messages = 0 if self.mbox else 1
+        self._process(final=False)
+
+    def close(self) -> List[MimePart]:
+        """Kalan veriyi işler, açık parçayı bitirir ve ekleri döndürür."""
+        if not self._closed:
+            self._closed = True
+            if self.mbox is None:
+                self.mbox = self._buf.startswith(b"From ")
+                self.messages = 0 if self.mbox else 1
+            self._process(final=True)
+            self._end_leaf()
+        return self.parts
+
+    def _process(self, final: bool) -> None:
+        while self._buf:
+            if self._state == _BODY:
+                progressed = self._consume_body(final)
+            else:
+                line = self._take_line(final)
+                progressed = line is not None
+                if progressed:
+                    self._handle_line(line)
+            if not progressed:
+                return
+
+    def _take_line(self, final: bool) -> Optional[bytes]:
+        """Tampondan bir satır alır; satır sonu yoksa ve tampon küçükse None döner."""
+        buf = self._buf
+        end = buf.find(b"\n")
+        if end >= 0:
+            end += 1
+        elif final or len(buf) >= LINE_LIMIT:
+            end = min(len(buf), LINE_LIMIT)
+        else:
+            return None
+        line = bytes(buf[:end])
+        del buf[:end]
+        self._line_start = line.endswith(b"\n")
+        return line
+
+    # ------------------------------------------------------------------
+    # Başlıklar ve sınırlar
+    # ------------------------------------------------------------------
+
+    def _handle_line(self, line: bytes) -> None:
+        if self.mbox and line.startswith(b"From "):
+            self._start_message()
+            return
+        if self._state == _HEADERS:
+            if line.strip(b"\r\n") == b"":
+                self._begin_body()
+            elif len(self._headers) + len(line) <= HEADER_LIMIT:
+                self._headers += line
+        else:
+            self._check_boundary(line)
+
+    def _check_boundary(self, line: bytes) -> bool:
+        """Satır açık multipart'lardan birinin sınırıysa durumu günceller."""
+        if not line.startswith(b"--") or not self._boundaries:
+            return False
+        text = line.rstrip(b" \t\r\n")
+        for depth in range(len(self._boundaries) - 1, -1, -1):
+            delimiter = b"--" + self._boundaries[depth]
+            if text == delimiter:
+                self._end_leaf()
+                del self._boundaries[depth + 1:]
+                self._state = _HEADERS
+                self._headers = bytearray()
+                return True
+            if text == delimiter + b"--":
+                self._end_leaf()
+                del self._boundaries[depth:]
+                # Kapanan multipart'ın epilogue'u: dış sınıra kadar atlanır
+                self._state = _SKIP
+                return True
+        return False
+
+    def _start_message(self) -> None:
+        """mbox'ta yeni mesaj ("From " satırı)."""
+        self._end_leaf()
+        self.messages += 1
+        self._boundaries = []
+        self._leaf_count = 0
+        self._state = _HEADERS
+        self._headers = bytearray()
+
+    def _begin_body(self) -> None:
+        """Başlıklar bitti: parçanın türüne göre gövde durumuna geçer."""
+        message = BytesHeaderParser(policy=compat32).parsebytes(bytes(self._headers) + b"\n")
+        self._headers = bytearray()
+        encoding = (message.get("Content-Transfer-Encoding") or "").strip().lower()
+
+        if message.get_content_maintype() == "multipart":
+            boundary = message.get_boundary()
+            if boundary:
+                self._boundaries.append(boundary.encode("ascii", "surrogateescape"))
+                self._state = _SKIP  # preamble
+                return
+        if message.get_content_type() == "message/rfc822" and encoding not in _DECODERS:
+            # Ekli mesaj: gövdesi yeni başlıklarla başlar
+            self._state = _HEADERS
+            return
+
+        self._leaf_count += 1
+        self._state = _BODY
+        self._pending_eol = b""
+        filename = message.get_filename()
+        disposition = message.get_content_disposition()
+        if filename or disposition == "attachment" or encoding == "base64" \
+                or message.get_content_maintype() != "text":
+            name = _UNSAFE_NAME.sub("_", _header_text(filename)) if filename else f"part{self._leaf_count}"
+            if self.mbox:
+                name = f"{self.messages}{MEMBER_SEPARATOR}{name}"
+            self._leaf = _Leaf(name, message.get_content_type(), encoding)
+
+    def _end_leaf(self) -> None:
+        self._pending_eol = b""
+        if self._leaf is None:
+            return
+        part = self._leaf.finish()
+        self._leaf = None
+        self.parts.append(part)
+        if self.on_part is not None:
+            self.on_part(part)
+
+    # ------------------------------------------------------------------
+    # Gövde
+    # ------------------------------------------------------------------
+
+    def _consume_body(self, final: bool) -> bool:
+        """
+        Gövde verisini bir sonraki olası sınır satırına kadar toplu işler.
+        Sınır ve "From " satırları yalnızca satır başında aranır.
+        """
+        buf = self._buf
+        if self._line_start and (buf[:2] == b"--"[:len(buf[:2])] or
+                                 (self.mbox and buf[:5] == b"From "[:len(buf[:5])])):
+            # Satır başı sınır olabilir: satırın tamamı beklenir
+            if buf.find(b"\n") < 0 and not final and len(buf) < LINE_LIMIT:
+                return False
+            if buf.startswith(b"--") or (self.mbox and buf.startswith(b"From ")):
+                line = self._take_line(final=True)
+                if self.mbox and line.startswith(b"From "):
+                    self._start_message()
+                elif not self._check_boundary(line):
+                    self._body_data(line)
+                return True
+
+        candidates = [buf.find(b"\n--")]
+        if self.mbox:
+            candidates.append(buf.find(b"\nFrom "))
+        candidates = [index for index in candidates if index >= 0]
+        if candidates:
+            end = min(candidates) + 1
+        else:
+            end = buf.rfind(b"\n") + 1
+            tail = len(buf) - end
+            # Yarım son satır sınırın başı olabilir; büyük değilse bekletilir
+            if final or tail >= LINE_LIMIT:
+                end = len(buf)
+            elif end == 0:
+                return False
+        data = bytes(buf[:end])
+        del buf[:end]
+        self._line_start = data.endswith(b"\n")
+        self._body_data(data)
+        return True
+
+    def _body_data(self, data: bytes) -> None:
+        """
+        Gövde verisini çözücüye verir. Son satır sonu bekletilir: sınırdan
+        önceki satır sonu sınıra aittir, parçanın içeriğine girmez.
+        """
+        if data.endswith(b"\r\n"):
+            eol = b"\r\n"
+        elif data.endswith(b"\n"):
+            eol = b"\n"
+        else:
+            eol = b""
+        payload = self._pending_eol + data[:len(data) - len(eol)]
+        self._pending_eol = eol
+        if self._leaf is None or not payload:
+            return
+        if self.mbox:
+            payload = _MBOXRD_ESCAPE.sub(rb"\1\2", payload)
+        self._leaf.update(payload)
+
+
+def scan_mail_parts(path: str, chunk_size: int = 1 << 20) -> List[MimePart]:
+    """Dosyadaki ekleri hash'ler (yardımcı; tarayıcı okumayı kendisi yapar)."""
+    scanner = MimeScanner()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            scanner.feed(chunk)
+    return scanner.close()
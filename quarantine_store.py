@@ -0,0 +1,326 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+İçerik Adresli Karantina Deposu
+
+Created by Mert Ulupınar
+"""
+
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import logging
+import tempfile
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger('Mert Ulupınar.Quarantine')
+
+OBJECTS_DIR = "objects"
+INDEX_FILE = "index.sqlite3"
+CHUNK_SIZE = 65536
+COMPRESSION_LEVEL = 6
+GZIP_WBITS = 31  # gzip uyumlu çıktı (gzip -d ile açılabilir)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    sha256 TEXT PRIMARY KEY,
+    md5 TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    stored_size INTEGER NOT NULL,
+    refcount INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    sha256 TEXT NOT NULL REFERENCES objects(sha256),
+    original_path TEXT NOT NULL,
+    quarantined_at REAL NOT NULL,
+    restored_at REAL,
+    mode INTEGER,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS entries_sha256 ON entries(sha256);
+CREATE INDEX IF NOT EXISTS entries_path ON entries(original_path);
+CREATE INDEX IF NOT EXISTS objects_md5 ON objects(md5);
+"""
+
+
+def _db_path(path: str):
+    """
+    Yolu indekste saklanacak değere çevirir. SQLite metni geçerli UTF-8
+    olmalıdır; os.walk'un vekil karakterli döndürdüğü UTF-8 olmayan adlar
+    os.fsencode ile byte (BLOB) olarak saklanır.
+    """
+    try:
+        path.encode("utf-8")
+    except UnicodeEncodeError:
+        return os.fsencode(path)
+    return path
+
+
+class QuarantineEntry:
+    """Karantina indeksindeki bir kayıt."""
+
+    __slots__ = ("id", "sha256", "md5", "original_path", "quarantined_at",
+                 "restored_at", "size", "mode", "object_path", "metadata")
+
+    def __init__(self, row: sqlite3.Row, object_path: str):
+        self.id = row["id"]
+        self.sha256 = row["sha256"]
+        self.md5 = row["md5"]
+        self.original_path = os.fsdecode(row["original_path"])
+        self.quarantined_at = row["quarantined_at"]
+        self.restored_at = row["restored_at"]
+        self.size = row["size"]
+        self.mode = row["mode"]
+        self.object_path = object_path
+        self.metadata = json.loads(row["metadata"]) if row["metadata"] else {}
+
+
+class QuarantineStore:
+    """
+    Hash ile adreslenen, sıkıştırılmış karantina deposu.
+
+    Örnekler objects/<ab>/<cd>/<sha256>.gz yolunda tutulur; aynı içerik bir
+    kez saklanır. Orijinal yol, zaman ve ek bilgiler SQLite indeksindedir.
+    Orijinal dosya yalnızca örnek diske yazılıp indekse işlendikten sonra silinir.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self.objects_dir = os.path.join(root, OBJECTS_DIR)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(root, INDEX_FILE))
+        self._db.row_factory = sqlite3.Row
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        """İndeks bağlantısını kapatır."""
+        self._db.close()
+
+    def object_path(self, sha256: str) -> str:
+        """Hash için örnek dosyasının yolunu döndürür."""
+        return os.path.join(self.objects_dir, sha256[:2], sha256[2:4], f"{sha256}.gz")
+
+    # ======================
+    # Karantinaya Alma
+    # ======================
+
+    def add(self, file_path: str, metadata: Optional[dict] = None) -> QuarantineEntry:
+        """Dosyayı depoya alır ve orijinalini siler."""
+        return self.add_many([file_path], metadata)[0]
+
+    def add_many(self, file_paths: Iterable[str], metadata: Optional[dict] = None) -> List[QuarantineEntry]:
+        """
+        Birden çok dosyayı tek indeks işleminde karantinaya alır.
+        Bir dosya okunamazsa işlem geri alınır ve hiçbir orijinal silinmez.
+        """
+        file_paths = list(file_paths)
+        created: List[str] = []
+        try:
+            with self._db:
+                entry_ids = [self._store(file_path, metadata, created) for file_path in file_paths]
+        except BaseException:
+            # İndeks geri alındı: bu işlemde yazılan örnekler sahipsiz kalmasın
+            for object_path in created:
+                try:
+                    os.remove(object_path)
+                except OSError:
+                    pass
+            raise
+
+        # İndeks işlendikten sonra orijinaller güvenle silinebilir
+        for file_path in file_paths:
+            try:
+                os.remove(file_path)
+                logger.info(f"Dosya karantinaya alındı: {file_path}")
+            except OSError as e:
+                logger.error(f"Orijinal dosya silinemedi: {file_path} - {e}")
+        return self.get_many(entry_ids)
+
+    def _store(self, file_path: str, metadata: Optional[dict], created: List[str]) -> int:
+        """Dosyayı sıkıştırarak saklar ve indeks kaydını ekler; yeni örnek yolu created'a eklenir."""
+        original_path = os.path.abspath(file_path)
+        mode = os.stat(file_path).st_mode & 0o7777
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.objects_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as dst:
+                sha256, md5, size, stored_size = self._compress(file_path, dst)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+
+        row = self._db.execute("SELECT refcount FROM objects WHERE sha256 = ?", (sha256,)).fetchone()
+        final_path = self.object_path(sha256)
+        if row is not None and os.path.exists(final_path):
+            # Aynı içerik zaten saklı: yalnızca referans sayısını artır
+            os.remove(tmp_path)
+            self._db.execute("UPDATE objects SET refcount = refcount + 1 WHERE sha256 = ?", (sha256,))
+        else:
+            os.makedirs(os.path.dirname(final_path), exist_ok=True)
+            os.replace(tmp_path, final_path)
+            created.append(final_path)
+            self._db.execute(
+                "INSERT OR REPLACE INTO objects (sha256, md5, size, stored_size, refcount) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (sha256, md5, size, stored_size, (row["refcount"] if row else 0) + 1)
+            )
+
+        cursor = self._db.execute(
+            "INSERT INTO entries (sha256, original_path, quarantined_at, mode, metadata) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (sha256, _db_path(original_path), time.time(), mode,
+             json.dumps(metadata, ensure_ascii=False) if metadata else None)
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def _compress(file_path: str, dst) -> Tuple[str, str, int, int]:
+        """Dosyayı okurken hash'ler ve gzip olarak dst'ye yazar."""
+        sha256 = hashlib.sha256()
+        md5 = hashlib.md5()
+        compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, GZIP_WBITS)
+        size = 0
+        stored_size = 0
+
+        with open(file_path, "rb") as src:
+            for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                sha256.update(chunk)
+                md5.update(chunk)
+                size += len(chunk)
+                data = compressor.compress(chunk)
+                stored_size += len(data)
+                dst.write(data)
+        data = compressor.flush()
+        stored_size += len(data)
+        dst.write(data)
+        dst.flush()
+        os.fsync(dst.fileno())
+
+        return sha256.hexdigest(), md5.hexdigest(), size, stored_size
+
+    # ======================
+    # Geri Yükleme
+    # ======================
+
+    def restore(self, entry_id: int, destination: Optional[str] = None) -> str:
+        """Kaydı orijinal yoluna (veya destination'a) geri yükler."""
+        return self.restore_many([entry_id], destination and [destination])[0]
+
+    def restore_many(self, entry_ids: List[int], destinations: Optional[List[str]] = None) -> List[str]:
+        """
+        Kayıtları tek indeks işleminde geri yükler.
+        Hedef dosya zaten varsa FileExistsError yükseltilir ve işlem geri alınır.
+        """
+        restored = []
+        released = []
+        try:
+            with self._db:
+                for index, entry in enumerate(self.get_many(entry_ids)):
+                    if entry.restored_at is not None:
+                        raise ValueError(f"Kayıt zaten geri yüklenmiş: {entry.id}")
+                    target = destinations[index] if destinations else entry.original_path
+                    self._decompress(entry.object_path, target)
+                    restored.append(target)
+                    if entry.mode is not None:
+                        os.chmod(target, entry.mode)
+
+                    self._db.execute("UPDATE entries SET restored_at = ? WHERE id = ?", (time.time(), entry.id))
+                    self._db.execute("UPDATE objects SET refcount = refcount - 1 WHERE sha256 = ?", (entry.sha256,))
+                    released.append(entry.sha256)
+        except BaseException:
+            # İndeks geri alındı: açılan dosyaları da kaldır
+            for target in restored:
+                try:
+                    os.remove(target)
+                except OSError:
+                    pass
+            raise
+
+        self._purge(released)
+        for target in restored:
+            logger.info(f"Dosya karantinadan geri yüklendi: {target}")
+        return restored
+
+    def _purge(self, hashes: List[str]) -> None:
+        """Referansı kalmayan örnekleri indeksten ve diskten siler."""
+        with self._db:
+            for sha256 in set(hashes):
+                row = self._db.execute("SELECT refcount FROM objects WHERE sha256 = ?", (sha256,)).fetchone()
+                if row is None or row["refcount"] > 0:
+                    continue
+                self._db.execute("DELETE FROM objects WHERE sha256 = ?", (sha256,))
+                try:
+                    os.remove(self.object_path(sha256))
+                except OSError:
+                    pass
+
+    @staticmethod
+    def _decompress(object_path: str, target: str) -> None:
+        """gzip örneğini target yoluna açar."""
+        if os.path.exists(target):
+            raise FileExistsError(f"Hedef dosya zaten var: {target}")
+        os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+
+        decompressor = zlib.decompressobj(GZIP_WBITS)
+        with open(object_path, "rb") as src:
+            dst = open(target, "xb")
+            try:
+                with dst:
+                    for chunk in iter(lambda: src.read(CHUNK_SIZE), b""):
+                        dst.write(decompressor.decompress(chunk))
+                    dst.write(decompressor.flush())
+            except BaseException:
+                # Yarım açılmış hedef bırakılmaz
+                os.remove(target)
+                raise
+
+    # ======================
+    # Sorgular
+    # ======================
+
+    def get_many(self, entry_ids: List[int]) -> List[QuarantineEntry]:
+        """Kayıtları verilen sırayla döndürür."""
+        entries = {}
+        for start in range(0, len(entry_ids), 500):
+            chunk = entry_ids[start:start + 500]
+            rows = self._db.execute(
+                f"SELECT e.*, o.md5, o.size FROM entries e JOIN objects o USING (sha256) "
+                f"WHERE e.id IN ({','.join('?' * len(chunk))})", chunk
+            )
+            for row in rows:
+                entries[row["id"]] = QuarantineEntry(row, self.object_path(row["sha256"]))
+        return [entries[entry_id] for entry_id in entry_ids]
+
+    def find(self, original_path: Optional[str] = None, sha256: Optional[str] = None,
+             md5: Optional[str] = None, include_restored: bool = False) -> List[QuarantineEntry]:
+        """Orijinal yol veya hash ile kayıt arar."""
+        query = "SELECT e.*, o.md5, o.size FROM entries e JOIN objects o USING (sha256) WHERE 1=1"
+        params = []
+        if original_path is not None:
+            query += " AND e.original_path = ?"
+            params.append(_db_path(os.path.abspath(original_path)))
+        if sha256 is not None:
+            query += " AND e.sha256 = ?"
+            params.append(sha256)
+        if md5 is not None:
+            query += " AND o.md5 = ?"
+            params.append(md5)
+        if not include_restored:
+            query += " AND e.restored_at IS NULL"
+        query += " ORDER BY e.id"
+        return [QuarantineEntry(row, self.object_path(row["sha256"]))
+                for row in self._db.execute(query, params)]
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM entries WHERE restored_at IS NULL").fetchone()[0]
@@ -0,0 +1,205 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Akışlı (Streaming) Rapor Yazıcı
+
+Created by Mert Ulupınar
+"""
+
+import os
+import csv
+import json
+import time
+import shutil
+import logging
+import threading
+from typing import Iterator, List
+
+logger = logging.getLogger('Mert Ulupınar.Report')
+
+REPORT_FIELDS = ["dosya", "durum", "hash", "boyut", "sure_ms", "motor", "imza_nesli"]
+STATUS_INFECTED = "Tehlikeli"
+STATUS_CLEAN = "Temiz"
+STATUS_SUSPICIOUS = "Şüpheli"
+# Sezgisel motorlar: sonuçları tespit değil uyarıdır, eylem uygulanmaz
+SUSPICIOUS_ENGINES = frozenset({"entropy-heuristic"})
+
+FORMAT_JSONL = "jsonl"
+FORMAT_CSV = "csv"
+FORMAT_JSON = "json"
+
+BUFFER_RECORDS = 512   # Bu kadar kayıt birikince dosyaya yazılır
+FSYNC_INTERVAL = 2.0   # fsync çağrıları arasındaki en kısa süre (saniye)
+_WRITE_BUFFER = 1 << 20
+# os.walk'un UTF-8 olmayan adlar için ürettiği vekil (surrogate) karakterler
+# orijinal byte'lar olarak yazılır ve okunurken aynı dizgeye döner
+_ERRORS = "surrogateescape"
+
+
+def report_format(path: str) -> str:
+    """Dosya uzantısından rapor biçimini belirler."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return FORMAT_CSV
+    if ext == ".json":
+        return FORMAT_JSON
+    return FORMAT_JSONL
+
+
+def verdict_to_record(verdict) -> dict:
+    """Tarama sonucunu rapor kaydına çevirir."""
+    return {
+        "dosya": verdict.path,
+        "durum": (STATUS_INFECTED if verdict.is_virus
+                  else STATUS_SUSPICIOUS if verdict.engine in SUSPICIOUS_ENGINES else STATUS_CLEAN),
+        "hash": verdict.file_hash,
+        "boyut": verdict.size,
+        "sure_ms": round(verdict.elapsed * 1000, 3),
+        "motor": verdict.engine,
+        "imza_nesli": verdict.generation,
+    }
+
+
+class ReportSink:
+    """
+    Tarama sonuçlarını tarama sürerken JSONL veya CSV olarak yazar.
+
+    Kayıtlar bellekte küçük gruplar halinde biriktirilip tek seferde yazılır;
+    fsync en fazla FSYNC_INTERVAL saniyede bir yapılır. Birden çok thread
+    aynı anda write() çağırabilir.
+    """
+
+    def __init__(self, path: str, fsync_interval: float = FSYNC_INTERVAL,
+                 buffer_records: int = BUFFER_RECORDS):
+        self.path = path
+        self.format = report_format(path)
+        if self.format == FORMAT_JSON:
+            raise ValueError("Akışlı rapor için .jsonl veya .csv kullanın")
+        self.fsync_interval = fsync_interval
+        self.buffer_records = buffer_records
+        self.count = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._pending: List[dict] = []
+        self._last_sync = time.monotonic()
+        self._file = open(path, "w", encoding="utf-8", errors=_ERRORS, newline="", buffering=_WRITE_BUFFER)
+        self._csv = None
+        if self.format == FORMAT_CSV:
+            self._csv = csv.DictWriter(self._file, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+            self._csv.writeheader()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, verdict) -> None:
+        """Bir tarama sonucunu rapora ekler."""
+        self.write_record(verdict_to_record(verdict))
+
+    def write_record(self, record: dict) -> None:
+        """Hazır bir kaydı rapora ekler."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._pending.append(record)
+            self.count += 1
+            if len(self._pending) >= self.buffer_records:
+                self._write_pending()
+
+    def flush(self, sync: bool = True) -> None:
+        """Bekleyen kayıtları yazar; sync=True ise diske senkronlar."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._write_pending(force_sync=sync)
+
+    def close(self) -> None:
+        """Kalan kayıtları yazar ve dosyayı kapatır."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._write_pending(force_sync=True)
+            self._file.close()
+            self._file = None
+        logger.info(f"Rapor yazıldı: {self.path} ({self.count} kayıt)")
+
+    def _write_pending(self, force_sync: bool = False) -> None:
+        """
+        Biriken kayıtları yazar ve gerekirse fsync yapar (kilit altında çağrılır).
+        Yazılamayan grup bırakılır; sonraki kayıtları engellemez.
+        """
+        pending, self._pending = self._pending, []
+        try:
+            if pending:
+                if self._csv is not None:
+                    self._csv.writerows(pending)
+                else:
+                    self._file.write("".join(json.dumps(r, ensure_ascii=False) + "\n" for r in pending))
+
+            now = time.monotonic()
+            if force_sync or now - self._last_sync >= self.fsync_interval:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._last_sync = now
+        except (IOError, OSError, ValueError) as e:
+            logger.error(f"Rapor yazılamadı: {self.path} ({len(pending)} kayıt atlandı) - {e}")
+
+
+def write_attachment(report_path: str, name: str, data: dict) -> str:
+    """
+    Rapora ek bilgiyi (ör. zaman dökümü) yanına JSON dosyası olarak yazar.
+    Kayıt akışı değişmediği için iter_report ve export_report etkilenmez.
+    """
+    path = os.path.splitext(report_path)[0] + f".{name}.json"
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def iter_report(path: str) -> Iterator[dict]:
+    """JSONL veya CSV raporundaki kayıtları sırayla üretir."""
+    fmt = report_format(path)
+    with open(path, "r", encoding="utf-8", errors=_ERRORS, newline="") as f:
+        if fmt == FORMAT_CSV:
+            yield from csv.DictReader(f)
+        elif fmt == FORMAT_JSON:
+            yield from json.load(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def export_report(source: str, destination: str) -> str:
+    """
+    Raporu istenen biçimde dışa aktarır.
+    Biçimler aynıysa yalnızca dosya kopyalanır, değilse kayıtlar akışla dönüştürülür.
+    """
+    src_format = report_format(source)
+    dst_format = report_format(destination)
+
+    if src_format == dst_format:
+        shutil.copyfile(source, destination)
+        return destination
+
+    with open(destination, "w", encoding="utf-8", errors=_ERRORS, newline="",
+              buffering=_WRITE_BUFFER) as out:
+        records = iter_report(source)
+        if dst_format == FORMAT_CSV:
+            writer = csv.DictWriter(out, fieldnames=REPORT_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(records)
+        elif dst_format == FORMAT_JSON:
+            out.write("[")
+            for index, record in enumerate(records):
+                out.write(",\n  " if index else "\n  ")
+                out.write(json.dumps(record, ensure_ascii=False))
+            out.write("\n]\n")
+        else:
+            for record in records:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    return destination
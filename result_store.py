@@ -0,0 +1,374 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Sütunlu (Columnar) Tarama Sonucu Deposu
+
+Sonuçlar satır başına Python nesnesi yerine sütunlarda tutulur:
+  * yol     : dizin önek tablosu (her dizin bir kez) + dizin kimliği (array)
+              + UTF-8 dosya adı blob'u ve bitiş ofsetleri
+  * durum   : bayrak sütunu (virüs, hash yok)
+  * boyut, süre, motor, imza nesli : array sütunları
+  * hash    : 16 byte'lık ikili MD5'ler
+
+Satırlar SEGMENT_ROWS'luk segmentlerde toplanır; bellek bütçesi aşılınca
+eski segmentler diske yazılır (spill) ve okunurken geri yüklenir.
+Depo tek yazıcı içindir; okuma ve yazma aynı thread'den yapılmalıdır.
+
+Created by Mert Ulupınar
+"""
+
+import os
+import shutil
+import struct
+import logging
+import tempfile
+from array import array
+from bisect import bisect_right
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+logger = logging.getLogger('Mert Ulupınar.Results')
+
+SEGMENT_ROWS = 65536
+DEFAULT_MEMORY_BUDGET = 64 << 20  # Bellekte tutulacak en fazla sonuç verisi (byte)
+
+FLAG_VIRUS = 1
+FLAG_NO_HASH = 2
+
+_HASH_BYTES = 16
+_ROW_OVERHEAD = 4 + 4 + 1 + 8 + 4 + _HASH_BYTES + 1 + 4  # Ad dışındaki sütunlar
+_LENGTH = struct.Struct("<Q")
+_NAME_ENCODING = ("utf-8", "surrogateescape")
+
+
+class StoredResult(NamedTuple):
+    """Depodan okunan tek satır (ScanVerdict ile aynı alan sırası)."""
+    path: str
+    is_virus: bool
+    file_hash: Optional[str] = None
+    size: int = -1
+    elapsed: float = 0.0
+    engine: str = ""
+    generation: int = 0
+
+
+class _Columns:
+    """Bir segmentin sütunları."""
+
+    __slots__ = ("dir_ids", "name_ends", "names", "flags", "sizes", "elapsed",
+                 "hashes", "engines", "generations")
+
+    _ARRAYS = (("dir_ids", "I"), ("name_ends", "I"), ("flags", "B"), ("sizes", "q"),
+               ("elapsed", "f"), ("engines", "B"), ("generations", "I"))
+
+    def __init__(self):
+        for name, typecode in self._ARRAYS:
+            setattr(self, name, array(typecode))
+        self.names = bytearray()
+        self.hashes = bytearray()
+
+    def __len__(self) -> int:
+        return len(self.flags)
+
+    def name(self, row: int) -> str:
+        start = self.name_ends[row - 1] if row else 0
+        return self.names[start:self.name_ends[row]].decode(*_NAME_ENCODING)
+
+    def file_hash(self, row: int) -> Optional[str]:
+        if self.flags[row] & FLAG_NO_HASH:
+            return None
+        return self.hashes[row * _HASH_BYTES:(row + 1) * _HASH_BYTES].hex()
+
+    def write(self, f) -> None:
+        for name, _ in self._ARRAYS:
+            data = getattr(self, name).tobytes()
+            f.write(_LENGTH.pack(len(data)))
+            f.write(data)
+        for blob in (self.names, self.hashes):
+            f.write(_LENGTH.pack(len(blob)))
+            f.write(blob)
+
+    @classmethod
+    def read(cls, f) -> "_Columns":
+        columns = cls()
+        for name, _ in cls._ARRAYS:
+            (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+            getattr(columns, name).frombytes(f.read(length))
+        for name in ("names", "hashes"):
+            (length,) = _LENGTH.unpack(f.read(_LENGTH.size))
+            setattr(columns, name, bytearray(f.read(length)))
+        return columns
+
+
+class _Segment:
+    """Bellekte veya diskte duran satır grubu."""
+
+    __slots__ = ("columns", "spill_path", "count", "nbytes")
+
+    def __init__(self):
+        self.columns: Optional[_Columns] = _Columns()
+        self.spill_path: Optional[str] = None
+        self.count = 0
+        self.nbytes = 0
+
+
+class ResultStore:
+    """
+    Tarama sonuçlarının sütunlu deposu.
+
+    Args:
+        memory_budget: Bellekte tutulacak en fazla sonuç verisi (byte)
+        spill_dir: Taşan segmentlerin yazılacağı dizin (None = geçici dizin)
+        row_factory: Okunan satırları oluşturan sınıf (ör. ScanVerdict)
+    """
+
+    def __init__(self, memory_budget: int = DEFAULT_MEMORY_BUDGET, spill_dir: Optional[str] = None,
+                 row_factory: Callable = StoredResult, segment_rows: int = SEGMENT_ROWS):
+        self.memory_budget = memory_budget
+        self.row_factory = row_factory
+        self.segment_rows = segment_rows
+        self.infected = 0
+        self.spilled_segments = 0
+        self._spill_parent = spill_dir
+        self._spill_dir: Optional[str] = None
+        self._dirs: List[str] = []
+        self._dir_ids = {}
+        self._engines: List[str] = []
+        self._engine_ids = {}
+        self._segments: List[_Segment] = [_Segment()]
+        self._starts: List[int] = [0]  # Segmentlerin ilk satır numaraları
+        self._count = 0
+        self._memory = 0
+        self._cache_index = -1
+        self._cache: Optional[_Columns] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bellekteki segmentlerin yaklaşık boyutu (dizin tablosu hariç, o hep bellekte)."""
+        return self._memory
+
+    def close(self) -> None:
+        """Diske taşan segmentleri siler."""
+        if self._spill_dir is not None:
+            shutil.rmtree(self._spill_dir, ignore_errors=True)
+            self._spill_dir = None
+
+    # ------------------------------------------------------------------
+    # Yazma
+    # ------------------------------------------------------------------
+
+    def add(self, verdict) -> int:
+        """ScanVerdict benzeri sonucu ekler; satır numarasını döndürür."""
+        return self.append(verdict.path, verdict.is_virus, verdict.file_hash, verdict.size,
+                           verdict.elapsed, verdict.engine, verdict.generation)
+
+    def extend(self, verdicts: Iterable) -> None:
+        for verdict in verdicts:
+            self.add(verdict)
+
+    def append(self, path: str, is_virus: bool, file_hash: Optional[str] = None, size: int = -1,
+               elapsed: float = 0.0, engine: str = "", generation: int = 0) -> int:
+        """Tek bir sonucu sütunlara ekler; satır numarasını döndürür."""
+        segment = self._segments[-1]
+        if segment.count >= self.segment_rows:
+            segment = self._new_segment()
+        columns = segment.columns
+
+        directory, name = os.path.split(path)
+        dir_id = self._dir_ids.get(directory)
+        if dir_id is None:
+            dir_id = self._dir_ids[directory] = len(self._dirs)
+            self._dirs.append(directory)
+        engine_id = self._engine_ids.get(engine)
+        if engine_id is None:
+            engine_id = self._engine_ids[engine] = len(self._engines)
+            self._engines.append(engine)
+
+        encoded = name.encode(*_NAME_ENCODING)
+        columns.names += encoded
+        columns.dir_ids.append(dir_id)
+        columns.name_ends.append(len(columns.names))
+
+        flags = FLAG_VIRUS if is_virus else 0
+        digest = None
+        if file_hash is not None:
+            try:
+                digest = bytes.fromhex(file_hash)
+            except ValueError:
+                pass
+        if digest is None or len(digest) != _HASH_BYTES:
+            flags |= FLAG_NO_HASH
+            digest = bytes(_HASH_BYTES)
+        columns.hashes += digest
+        columns.flags.append(flags)
+        columns.sizes.append(size)
+        columns.elapsed.append(elapsed)
+        columns.engines.append(engine_id)
+        columns.generations.append(generation)
+
+        row_bytes = _ROW_OVERHEAD + len(encoded)
+        segment.count += 1
+        segment.nbytes += row_bytes
+        self._memory += row_bytes
+        self._count += 1
+        if is_virus:
+            self.infected += 1
+        if self._memory > self.memory_budget:
+            self._spill()
+        return self._count - 1
+
+    def _new_segment(self) -> _Segment:
+        segment = _Segment()
+        self._segments.append(segment)
+        self._starts.append(self._count)
+        return segment
+
+    def _spill(self) -> None:
+        """Bütçe aşıldı: bellekteki en eski segmentleri diske yazar."""
+        if self._spill_dir is None:
+            if self._spill_parent is not None:
+                os.makedirs(self._spill_parent, exist_ok=True)
+            self._spill_dir = tempfile.mkdtemp(prefix="results_", dir=self._spill_parent)
+
+        for index, segment in enumerate(self._segments):
+            if self._memory <= self.memory_budget:
+                break
+            if segment.columns is None or segment.count == 0:
+                continue
+            if index == len(self._segments) - 1:
+                # Son segment de yazılır; yeni satırlar yeni segmente gider
+                self._new_segment()
+            segment.spill_path = os.path.join(self._spill_dir, f"segment_{index:06d}.bin")
+            with open(segment.spill_path, "wb") as f:
+                segment.columns.write(f)
+            segment.columns = None
+            self._memory -= segment.nbytes
+            self.spilled_segments += 1
+            logger.debug(f"Sonuç segmenti diske yazıldı: {segment.spill_path}")
+
+    # ------------------------------------------------------------------
+    # Okuma
+    # ------------------------------------------------------------------
+
+    def _columns(self, index: int) -> _Columns:
+        """Segmentin sütunlarını döndürür; diskteyse geri yükler (son yüklenen saklanır)."""
+        segment = self._segments[index]
+        if segment.columns is not None:
+            return segment.columns
+        if self._cache_index != index:
+            with open(segment.spill_path, "rb") as f:
+                self._cache = _Columns.read(f)
+            self._cache_index = index
+        return self._cache
+
+    def _locate(self, index: int):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Sonuç indeksi aralık dışında")
+        segment = bisect_right(self._starts, index) - 1
+        # Boş segmentler aynı başlangıcı paylaşabilir: satırı içeren ilkini bul
+        while self._segments[segment].count <= index - self._starts[segment]:
+            segment += 1
+        return segment, index - self._starts[segment]
+
+    def _make_row(self, columns: _Columns, row: int):
+        directory = self._dirs[columns.dir_ids[row]]
+        name = columns.name(row)
+        return self.row_factory(os.path.join(directory, name) if directory else name,
+                                bool(columns.flags[row] & FLAG_VIRUS), columns.file_hash(row),
+                                columns.sizes[row], columns.elapsed[row],
+                                self._engines[columns.engines[row]], columns.generations[row])
+
+    def __getitem__(self, index: int):
+        segment, row = self._locate(index)
+        return self._make_row(self._columns(segment), row)
+
+    def path(self, index: int) -> str:
+        """Yalnızca satırın yolunu döndürür."""
+        segment, row = self._locate(index)
+        columns = self._columns(segment)
+        directory = self._dirs[columns.dir_ids[row]]
+        name = columns.name(row)
+        return os.path.join(directory, name) if directory else name
+
+    def is_virus(self, index: int) -> bool:
+        segment, row = self._locate(index)
+        return bool(self._columns(segment).flags[row] & FLAG_VIRUS)
+
+    def __iter__(self) -> Iterator:
+        """Satırları sırayla, birer birer oluşturarak üretir."""
+        for index in range(len(self._segments)):
+            columns = self._columns(index)
+            for row in range(len(columns)):
+                yield self._make_row(columns, row)
+
+    def iter_paths(self) -> Iterator[str]:
+        for index in range(len(self._segments)):
+            columns = self._columns(index)
+            for row in range(len(columns)):
+                directory = self._dirs[columns.dir_ids[row]]
+                name = columns.name(row)
+                yield os.path.join(directory, name) if directory else name
+
+    def view(self, infected: Optional[bool] = None, under: Optional[str] = None,
+             engine: Optional[str] = None, predicate: Optional[Callable] = None) -> "ResultView":
+        """
+        Koşullara uyan satırların görünümünü döndürür.
+        Yalnızca satır numaraları tutulur; sütunlar kopyalanmaz.
+        """
+        dir_ids = None
+        if under is not None:
+            prefix = under.rstrip(os.sep)
+            dir_ids = {i for i, d in enumerate(self._dirs)
+                       if d == prefix or d.startswith(prefix + os.sep)}
+        engine_id = self._engine_ids.get(engine, -1) if engine is not None else None
+
+        indices = array("Q")
+        for index in range(len(self._segments)):
+            columns = self._columns(index)
+            base = self._starts[index]
+            for row in range(len(columns)):
+                if infected is not None and bool(columns.flags[row] & FLAG_VIRUS) != infected:
+                    continue
+                if dir_ids is not None and columns.dir_ids[row] not in dir_ids:
+                    continue
+                if engine_id is not None and columns.engines[row] != engine_id:
+                    continue
+                if predicate is not None and not predicate(self._make_row(columns, row)):
+                    continue
+                indices.append(base + row)
+        return ResultView(self, indices)
+
+    def stats(self) -> dict:
+        return {"results": self._count, "infected": self.infected, "directories": len(self._dirs),
+                "memory_bytes": self._memory, "spilled_segments": self.spilled_segments}
+
+
+class ResultView:
+    """ResultStore üzerinde filtrelenmiş, salt okunur görünüm."""
+
+    def __init__(self, store: ResultStore, indices: array):
+        self.store = store
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, position: int):
+        return self.store[self.indices[position]]
+
+    def __iter__(self) -> Iterator:
+        for index in self.indices:
+            yield self.store[index]
+
+    def iter_paths(self) -> Iterator[str]:
+        for index in self.indices:
+            yield self.store.path(index)
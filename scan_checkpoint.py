@@ -0,0 +1,179 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Devam Ettirilebilir Tarama (Checkpoint) Modülü
+
+Created by Mert Ulupınar
+"""
+
+import os
+import json
+import time
+import hashlib
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger('Mert Ulupınar.Checkpoint')
+
+CHECKPOINT_FOLDER = "checkpoints"
+CHECKPOINT_INTERVAL = 5.0  # Diske yazma aralığı (saniye)
+CHECKPOINT_VERSION = 1
+WALK_CHUNK = 10000  # Bir satırdaki en fazla yol sayısı
+
+
+class ScanCheckpoint:
+    """
+    Uzun taramalar için yalnızca-ekleme (append-only) checkpoint dosyası.
+
+    Her satır bağımsız bir JSON kaydıdır ve tek write() + fsync ile yazılır.
+    Çökme anında yarım kalan son satır yükleme sırasında yok sayılır ve
+    devam ederken kesilir; yeni kayıtlar son tam satırın arkasına eklenir.
+
+    Kayıt türleri:
+        header   - kök dizin ve sürüm bilgisi
+        walk     - tarama sırasındaki dosya listesinin bir parçası
+        walk_end - dosya listesinin tamamlandığını gösterir
+        done     - tamamlanmış sonuç satırları (ilk alan dosya yolu)
+    """
+
+    def __init__(self, root: str, folder: str = CHECKPOINT_FOLDER,
+                 interval: float = CHECKPOINT_INTERVAL):
+        self.root = os.path.abspath(root)
+        self.interval = interval
+        digest = hashlib.md5(os.fsencode(self.root)).hexdigest()
+        self.path = os.path.join(folder, f"{digest}.ckpt")
+        self._folder = folder
+        self._file = None
+        self._buffer: List[list] = []
+        self._last_flush = time.monotonic()
+        self._walk_recorded = False
+        self._valid_size: Optional[int] = None  # Son tam satırın bittiği byte (load() ile)
+
+    def exists(self) -> bool:
+        """Bu kök dizin için kaydedilmiş checkpoint var mı?"""
+        return os.path.exists(self.path)
+
+    def load(self) -> Tuple[Optional[List[str]], Dict[str, list]]:
+        """
+        Checkpoint'i okur.
+
+        Returns:
+            (dosya listesi veya None, yol -> tamamlanan sonuç satırı)
+            Dosya listesi kaydı yarımsa None döner ve dizin yeniden taranmalıdır.
+            Son tam satırın bittiği konum valid_size olarak saklanır.
+        """
+        files: List[str] = []
+        completed: Dict[str, list] = {}
+        walk_complete = False
+        self._valid_size = 0
+
+        try:
+            with open(self.path, "rb") as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break  # Yarım yazılmış son satır
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    self._valid_size += len(line)
+
+                    kind = record.get("t")
+                    if kind == "header" and record.get("root") != self.root:
+                        logger.warning(f"Checkpoint farklı bir dizine ait, yok sayılıyor: {self.path}")
+                        self._valid_size = 0
+                        return None, {}
+                    elif kind == "walk":
+                        files.extend(record["files"])
+                    elif kind == "walk_end":
+                        # Önceki yarım listeden sonra yeniden yazılan tam liste sondadır
+                        count = record["count"]
+                        walk_complete = count <= len(files)
+                        files = files[len(files) - count:]
+                    elif kind == "done":
+                        completed.update((row[0], row) for row in record["r"])
+        except (IOError, OSError) as e:
+            logger.error(f"Checkpoint okunamadı: {e}")
+            self._valid_size = 0
+            return None, {}
+
+        self._walk_recorded = walk_complete
+        logger.info(f"Checkpoint yüklendi: {len(completed)} dosya tamamlanmış")
+        return (files if walk_complete else None), completed
+
+    def begin(self, files: List[str], resume: bool = False) -> None:
+        """
+        Checkpoint'i yazmaya hazırlar.
+        resume=False ise eski kayıt silinir; True ise mevcut dosya son tam
+        satırdan sonrası kesilerek eklemeye açılır.
+        """
+        os.makedirs(self._folder, exist_ok=True)
+
+        if resume and self._valid_size is None:
+            self.load()
+        if resume and not self._valid_size:
+            resume = False  # Okunabilir kayıt yok: baştan yaz
+        if not resume:
+            self._walk_recorded = False
+        self._file = open(self.path, "r+" if resume else "w", encoding="utf-8")
+        if resume:
+            # Çökmeden kalan yarım satır yeni kayıtlarla birleşmesin
+            self._file.truncate(self._valid_size)
+            self._file.seek(self._valid_size)
+
+        lines = []
+        if not resume:
+            lines.append({"t": "header", "root": self.root, "v": CHECKPOINT_VERSION})
+        if not self._walk_recorded:
+            for start in range(0, len(files), WALK_CHUNK):
+                lines.append({"t": "walk", "files": files[start:start + WALK_CHUNK]})
+            lines.append({"t": "walk_end", "count": len(files)})
+            self._walk_recorded = True
+
+        self._write_lines(lines)
+
+    def record(self, result: Sequence) -> None:
+        """
+        Tamamlanan sonuç satırını (yol, virüs mü, ...) tamponlar.
+        Aralık dolduysa diske yazar.
+        """
+        self._buffer.append(list(result))
+        if time.monotonic() - self._last_flush >= self.interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Tampondaki sonuçları tek satır olarak yazar ve fsync yapar."""
+        if self._file is None or not self._buffer:
+            return
+        self._write_lines([{"t": "done", "r": self._buffer}])
+        self._buffer = []
+
+    def close(self) -> None:
+        """Kalan sonuçları yazar ve dosyayı kapatır (checkpoint korunur)."""
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        """Tarama tamamlandığında checkpoint'i siler."""
+        self._buffer = []
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+    def _write_lines(self, records: List[dict]) -> None:
+        """
+        Kayıtları tek write() çağrısıyla ekler ve diske senkronlar.
+        UTF-8 olmayan dosya adları (surrogateescape) \\uXXXX kaçışıyla yazılır ve
+        json.loads ile aynı dizgeye döner.
+        """
+        data = "".join(json.dumps(r) + "\n" for r in records)
+        try:
+            self._file.write(data)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except (IOError, OSError) as e:
+            logger.error(f"Checkpoint yazılamadı: {e}")
+        self._last_flush = time.monotonic()
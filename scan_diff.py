@@ -0,0 +1,376 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Sıralı Tarama İndeksi ve Taramalar Arası Fark Raporu
+
+Her taramanın sonuçları dosya yoluna göre sıralı bir indeks dosyasına
+(.idx) yazılır. İki indeks tek bir akışlı birleştirme geçişiyle
+karşılaştırılır; bellekte yalnızca seyrek indeks tutulur.
+
+İndeks dosyası (satır tabanlı, UTF-8):
+    başlık  : {"format": ..., "version": 1, "root": ..., "created": ..., "created_ns": ...,
+               "complete": ...}
+    kayıtlar: [yol, tehlikeli (0/1), hash, boyut, motor, imza nesli] (yola göre sıralı)
+    altbilgi: {"count": N, "sparse": [[yol, ofset], ...]}
+    son     : "#" + altbilginin ofseti (20 hane)
+
+Created by Mert Ulupınar
+"""
+
+import os
+import csv
+import json
+import time
+import bisect
+import logging
+import tempfile
+from datetime import datetime
+from typing import Dict, Iterator, List, NamedTuple, Optional, Union
+
+from external_sort import external_sort, DEFAULT_RUN_SIZE
+from report_writer import iter_report, report_format, STATUS_INFECTED, FORMAT_CSV, FORMAT_JSON
+
+logger = logging.getLogger('Mert Ulupınar.ScanDiff')
+
+INDEX_FORMAT = "pyvirus-scan-index"
+INDEX_VERSION = 1
+INDEX_SUFFIX = ".idx"
+PREVIOUS_SUFFIX = ".prev" + INDEX_SUFFIX  # Üzerine yazılan indeksin saklandığı ad
+SPARSE_INTERVAL = 1024  # Seyrek indekste her bu kadar kayıttan biri tutulur
+_TRAILER = "#{:020d}\n"
+_TRAILER_SIZE = len(_TRAILER.format(0))
+
+# Fark türleri
+DIFF_NEW = "new"            # Yalnızca yeni taramada var
+DIFF_REMOVED = "removed"    # Yalnızca eski taramada var
+DIFF_CHANGED = "changed"    # Hash değişti, karar aynı
+DIFF_DETECTED = "detected"  # Temizken tehlikeli oldu
+DIFF_CLEARED = "cleared"    # Tehlikeliyken temiz oldu
+DIFF_KINDS = (DIFF_NEW, DIFF_REMOVED, DIFF_CHANGED, DIFF_DETECTED, DIFF_CLEARED)
+
+DIFF_FIELDS = ["tur", "dosya", "eski_durum", "yeni_durum", "eski_hash", "yeni_hash",
+               "eski_imza_nesli", "yeni_imza_nesli", "imza_guncellemesi"]
+
+
+class IndexRecord(NamedTuple):
+    """İndeksteki tek bir dosyanın sonucu."""
+    path: str
+    is_virus: bool
+    file_hash: Optional[str]
+    size: int
+    engine: str
+    generation: int
+
+
+class DiffEntry(NamedTuple):
+    """İki tarama arasındaki tek bir fark."""
+    kind: str
+    path: str
+    old: Optional[IndexRecord]
+    new: Optional[IndexRecord]
+    signature_update: bool = False  # Karar yalnızca imza veritabanı değiştiği için değişti
+
+
+def _int(value, default: int) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _report_row(record: dict) -> list:
+    """Rapor kaydını (JSONL veya CSV) indeks satırına çevirir."""
+    return [record.get("dosya") or "", 1 if record.get("durum") == STATUS_INFECTED else 0,
+            record.get("hash") or None, _int(record.get("boyut"), -1),
+            record.get("motor") or "", _int(record.get("imza_nesli"), 0)]
+
+
+def index_path_for(report_path: str) -> str:
+    """Raporun yanındaki indeks dosyasının yolu."""
+    return os.path.splitext(report_path)[0] + INDEX_SUFFIX
+
+
+def build_scan_index(report_path: str, index_path: Optional[str] = None, root: Optional[str] = None,
+                     complete: bool = True, run_size: int = DEFAULT_RUN_SIZE,
+                     tmp_dir: Optional[str] = None, keep_previous: bool = False) -> str:
+    """
+    Rapordaki kayıtları yola göre sıralayıp indeks dosyasını atomik olarak yazar.
+    Aynı yol birden çok kez geçiyorsa son kayıt kullanılır. İndeks yolunu döndürür.
+    keep_previous ise aynı adlı eski indeks silinmez, <ad>.prev.idx olarak saklanır
+    (sabit adlı raporlarda önceki taramayla karşılaştırma için).
+    """
+    if index_path is None:
+        index_path = index_path_for(report_path)
+    header = {"format": INDEX_FORMAT, "version": INDEX_VERSION, "root": root,
+              "created": datetime.now().isoformat(timespec="seconds"), "created_ns": time.time_ns(),
+              "complete": complete, "report": os.path.basename(report_path)}
+
+    rows = (_report_row(record) for record in iter_report(report_path))
+    directory = os.path.dirname(os.path.abspath(index_path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write((json.dumps(header) + "\n").encode("utf-8"))
+            count = 0
+            sparse = []
+            previous = None
+            # Sıralı akışta aynı yolun kayıtları art arda gelir; sonuncusu yazılır
+            for row in external_sort(rows, key=lambda r: r[0], run_size=run_size, tmp_dir=tmp_dir):
+                if previous is not None and previous[0] != row[0]:
+                    count = _write_row(f, previous, count, sparse)
+                previous = row
+            if previous is not None:
+                count = _write_row(f, previous, count, sparse)
+
+            footer_offset = f.tell()
+            f.write((json.dumps({"count": count, "sparse": sparse}) + "\n").encode("utf-8"))
+            f.write(_TRAILER.format(footer_offset).encode("ascii"))
+            f.flush()
+            os.fsync(f.fileno())
+        if keep_previous and os.path.exists(index_path):
+            os.replace(index_path, os.path.splitext(index_path)[0] + PREVIOUS_SUFFIX)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    logger.info(f"Tarama indeksi yazıldı: {index_path} ({count} kayıt)")
+    return index_path
+
+
+def _write_row(f, row: list, count: int, sparse: list) -> int:
+    if count % SPARSE_INTERVAL == 0:
+        sparse.append([row[0], f.tell()])
+    f.write((json.dumps(row, separators=(",", ":")) + "\n").encode("utf-8"))
+    return count + 1
+
+
+class ScanIndex:
+    """
+    Salt okunur tarama indeksi.
+    Kayıtlar sıralı olarak akışla okunur; get() seyrek indeksle tek bloğu tarar.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self.header = json.loads(f.readline())
+                if self.header.get("format") != INDEX_FORMAT:
+                    raise ValueError
+                self._data_offset = f.tell()
+                end = f.seek(0, os.SEEK_END)
+                if end < self._data_offset + _TRAILER_SIZE:
+                    raise ValueError
+                f.seek(end - _TRAILER_SIZE)
+                trailer = f.read(_TRAILER_SIZE).decode("ascii")
+                if not trailer.startswith("#"):
+                    raise ValueError
+                self._footer_offset = int(trailer[1:])
+                f.seek(self._footer_offset)
+                footer = json.loads(f.readline())
+            self.count = footer["count"]
+            self._sparse_paths = [entry[0] for entry in footer["sparse"]]
+            self._sparse_offsets = [entry[1] for entry in footer["sparse"]]
+        except (ValueError, KeyError, TypeError, IndexError, AttributeError):
+            raise ValueError(f"Geçersiz tarama indeksi: {path}")
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def root(self) -> Optional[str]:
+        return self.header.get("root")
+
+    @property
+    def complete(self) -> bool:
+        return bool(self.header.get("complete", True))
+
+    def close(self) -> None:
+        """Kayıtlar her okumada ayrı açıldığından bırakılacak kaynak yoktur."""
+
+    def _iter_from(self, offset: int) -> Iterator[IndexRecord]:
+        # Okuma için ayrı tanıtıcı: get() ve birden çok akış birbirini etkilemez
+        with open(self.path, "rb", buffering=1 << 16) as f:
+            f.seek(offset)
+            while offset < self._footer_offset:
+                line = f.readline()
+                if not line:
+                    return
+                offset += len(line)
+                path, infected, file_hash, size, engine, generation = json.loads(line)
+                yield IndexRecord(path, bool(infected), file_hash, size, engine, generation)
+
+    def __iter__(self) -> Iterator[IndexRecord]:
+        return self._iter_from(self._data_offset)
+
+    def get(self, path: str) -> Optional[IndexRecord]:
+        """Yolun kaydını döndürür; yoksa None."""
+        block = bisect.bisect_right(self._sparse_paths, path) - 1
+        if block < 0:
+            return None
+        for record in self._iter_from(self._sparse_offsets[block]):
+            if record.path == path:
+                return record
+            if record.path > path:
+                break
+        return None
+
+
+def open_scan_index(path: str) -> ScanIndex:
+    """
+    İndeks dosyasını açar. Rapor verilirse yanındaki indeks kullanılır;
+    yoksa veya rapordan eskiyse yeniden oluşturulur.
+    """
+    if path.endswith(INDEX_SUFFIX):
+        return ScanIndex(path)
+    index_path = index_path_for(path)
+    try:
+        stale = os.path.getmtime(index_path) < os.path.getmtime(path)
+    except OSError:
+        stale = True
+    if stale:
+        build_scan_index(path, index_path)
+    return ScanIndex(index_path)
+
+
+def _read_header(path: str) -> dict:
+    """İndeksin yalnızca başlık satırını okur."""
+    try:
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+    except (ValueError, AttributeError):
+        raise ValueError(f"Geçersiz tarama indeksi: {path}")
+    if not isinstance(header, dict) or header.get("format") != INDEX_FORMAT:
+        raise ValueError(f"Geçersiz tarama indeksi: {path}")
+    return header
+
+
+def _created_ns(path: str, header: dict) -> int:
+    """Başlıktaki oluşturma zamanı; eski indekslerde dosyanın değişiklik zamanı."""
+    created = header.get("created_ns")
+    return created if isinstance(created, int) else os.stat(path).st_mtime_ns
+
+
+def find_previous_index(folder: str, root: Optional[str], before: str) -> Optional[str]:
+    """
+    Klasördeki, aynı kök dizini tamamen taramış, before'dan önce oluşturulmuş
+    en yeni indeksi bulur. Sıralama dosya adına değil başlıktaki oluşturma
+    zamanına göredir; rapor adları serbestçe seçilebilir.
+    """
+    try:
+        current = _created_ns(before, _read_header(before))
+        names = [name for name in os.listdir(folder) if name.endswith(INDEX_SUFFIX)]
+    except (ValueError, OSError):
+        return None
+    best, best_created = None, None
+    for name in names:
+        path = os.path.join(folder, name)
+        if os.path.abspath(path) == os.path.abspath(before):
+            continue
+        try:
+            header = _read_header(path)
+            if header.get("root") != root or not header.get("complete", True):
+                continue
+            created = _created_ns(path, header)
+        except (ValueError, OSError):
+            continue
+        if created < current and (best_created is None or created > best_created):
+            best, best_created = path, created
+    return best
+
+
+def iter_scan_diff(old: ScanIndex, new: ScanIndex) -> Iterator[DiffEntry]:
+    """İki indeksi tek geçişte birleştirir ve farkları yol sırasıyla üretir."""
+    old_iter, new_iter = iter(old), iter(new)
+    a = next(old_iter, None)
+    b = next(new_iter, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a.path < b.path):
+            yield DiffEntry(DIFF_REMOVED, a.path, a, None)
+            a = next(old_iter, None)
+        elif a is None or b.path < a.path:
+            yield DiffEntry(DIFF_NEW, b.path, None, b)
+            b = next(new_iter, None)
+        else:
+            hash_changed = a.file_hash != b.file_hash
+            if a.is_virus != b.is_virus:
+                # Hash aynıysa karar yalnızca imza veritabanı değiştiği için değişmiştir
+                yield DiffEntry(DIFF_DETECTED if b.is_virus else DIFF_CLEARED, b.path, a, b,
+                                signature_update=not hash_changed)
+            elif hash_changed:
+                yield DiffEntry(DIFF_CHANGED, b.path, a, b)
+            a = next(old_iter, None)
+            b = next(new_iter, None)
+
+
+def diff_to_record(entry: DiffEntry) -> dict:
+    """Farkı rapor kaydına çevirir."""
+    def status(record: Optional[IndexRecord]) -> Optional[str]:
+        if record is None:
+            return None
+        return STATUS_INFECTED if record.is_virus else "Temiz"
+
+    return {
+        "tur": entry.kind,
+        "dosya": entry.path,
+        "eski_durum": status(entry.old),
+        "yeni_durum": status(entry.new),
+        "eski_hash": entry.old.file_hash if entry.old else None,
+        "yeni_hash": entry.new.file_hash if entry.new else None,
+        "eski_imza_nesli": entry.old.generation if entry.old else None,
+        "yeni_imza_nesli": entry.new.generation if entry.new else None,
+        "imza_guncellemesi": entry.signature_update,
+    }
+
+
+def write_scan_diff(old: Union[str, ScanIndex], new: Union[str, ScanIndex],
+                    output_path: str) -> Dict[str, int]:
+    """
+    İki taramanın farkını JSONL veya CSV olarak yazar; tür başına sayıları döndürür.
+    old ve new indeks, rapor yolu veya açık ScanIndex olabilir.
+    """
+    if report_format(output_path) == FORMAT_JSON:
+        raise ValueError("Fark raporu için .jsonl veya .csv kullanın")
+    opened: List[ScanIndex] = []
+
+    def resolve(source) -> ScanIndex:
+        if isinstance(source, ScanIndex):
+            return source
+        index = open_scan_index(source)
+        opened.append(index)
+        return index
+
+    counts = dict.fromkeys(DIFF_KINDS, 0)
+    counts["signature_update"] = 0
+    try:
+        old_index, new_index = resolve(old), resolve(new)
+        if not old_index.complete or not new_index.complete:
+            logger.warning("Yarıda kalan bir tarama karşılaştırılıyor; 'removed' kayıtları eksik tarama kaynaklı olabilir")
+        # UTF-8 olmayan dosya adları raporlardaki gibi orijinal byte'larıyla yazılır
+        with open(output_path, "w", encoding="utf-8", errors="surrogateescape", newline="",
+                  buffering=1 << 20) as out:
+            writer = None
+            if report_format(output_path) == FORMAT_CSV:
+                writer = csv.DictWriter(out, fieldnames=DIFF_FIELDS)
+                writer.writeheader()
+            for entry in iter_scan_diff(old_index, new_index):
+                counts[entry.kind] += 1
+                counts["signature_update"] += entry.signature_update
+                record = diff_to_record(entry)
+                if writer is not None:
+                    writer.writerow(record)
+                else:
+                    out.write(json.dumps(record, ensure_ascii=False) + "\n")
+    finally:
+        for index in opened:
+            index.close()
+    logger.info(f"Tarama farkı yazıldı: {output_path} ({counts})")
+    return counts
@@ -0,0 +1,266 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Tarama Profilleme (cProfile ve Örnekleme)
+
+İki mod vardır:
+  * cprofile : Her işçi thread'i kendi cProfile.Profile nesnesiyle ölçülür,
+               sonuçlar tek bir pstats dosyasında birleştirilir.
+  * sampling : Ayrı bir thread, tarama thread'lerinin yığınlarını belirli
+               aralıklarla örnekler ve flame graph araçlarının (flamegraph.pl,
+               speedscope, inferno) okuduğu collapsed-stack dosyasını yazar.
+               Ek yükü düşüktür; üretimde kullanılabilir.
+
+Created by Mert Ulupınar
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import pstats
+import cProfile
+import logging
+import threading
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+from typing import Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger('Mert Ulupınar.Profiler')
+
+PROFILE_CPROFILE = "cprofile"
+PROFILE_SAMPLING = "sampling"
+PROFILE_MODES = (PROFILE_CPROFILE, PROFILE_SAMPLING)
+
+PROFILES_FOLDER = "profiles"
+SAMPLE_INTERVAL = 0.005  # Örnekleme aralığı (saniye)
+TOP_FUNCTIONS = 20       # Zaman dökümündeki en pahalı fonksiyon sayısı
+
+# Python 3.12'den itibaren cProfile sys.monitoring kullanır: tek profil tüm
+# thread'leri ölçer ve aynı anda ikinci bir profil etkinleştirilemez
+_SHARED_PROFILE = sys.version_info >= (3, 12)
+
+_POOL_SUFFIX = re.compile(r"_\d+$")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+class ScanProfiler:
+    """
+    Taramanın tüm thread'lerini profilleyen nesne.
+
+    start() tarama thread'inde çağrılır; işçi thread'lerinde çalışan
+    fonksiyonlar wrap() ile sarılır. stop() ölçümü bitirir ve çıktıları
+    output_dir altına yazar.
+    """
+
+    def __init__(self, mode: str = PROFILE_SAMPLING, output_dir: str = PROFILES_FOLDER,
+                 interval: float = SAMPLE_INTERVAL):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Bilinmeyen profil modu: {mode}")
+        self.mode = mode
+        self.output_dir = output_dir
+        self.interval = interval
+        self.outputs: Dict[str, str] = {}
+        self.phases: Dict[str, float] = {}  # Tarama thread'inde ardışık aşamalar (duvar saati)
+        self.totals: Dict[str, float] = {}  # Thread'ler boyunca toplanan süreler
+        self._profiles: List[cProfile.Profile] = []
+        self._stats: Optional[pstats.Stats] = None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._samples: Counter = Counter()
+        self._sample_count = 0
+        self._sampler: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._ignored_threads = set()
+        self._started = None
+        self._elapsed = 0.0
+        self._running = False
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    def start(self, worker_threads: Iterable[int] = ()) -> None:
+        """
+        Ölçümü çağıran (tarama) thread'inde başlatır.
+        worker_threads, taramadan önce oluşturulmuş ama taramaya çalışacak
+        thread'lerin (ör. paylaşılan işçi havuzu) kimlikleridir.
+        """
+        if self._running:
+            return
+        self._running = True
+        self._started = time.perf_counter()
+        if self.mode == PROFILE_CPROFILE:
+            self._enable_thread()
+            return
+
+        # Taramadan önce var olan thread'ler (ör. GUI) örneklenmez
+        owner = threading.get_ident()
+        workers = set(worker_threads)
+        self._ignored_threads = {ident for ident in sys._current_frames()
+                                 if ident != owner and ident not in workers}
+        self._stop_event.clear()
+        self._sampler = threading.Thread(target=self._sample_loop, name="ScanProfiler", daemon=True)
+        self._sampler.start()
+        self._ignored_threads.add(self._sampler.ident)
+
+    def stop(self) -> Dict[str, str]:
+        """Ölçümü bitirir, çıktıları yazar ve dosya yollarını döndürür."""
+        if not self._running:
+            return self.outputs
+        self._running = False
+        self._elapsed = time.perf_counter() - self._started
+        if self.mode == PROFILE_CPROFILE:
+            self._disable_thread()
+            self._stats = self._merged_stats()
+        else:
+            self._stop_event.set()
+            self._sampler.join()
+        self._write_outputs()
+        return self.outputs
+
+    def wrap(self, func: Callable) -> Callable:
+        """İşçi thread'inde çalışacak fonksiyonu profil altında çalıştıracak şekilde sarar."""
+        if self.mode != PROFILE_CPROFILE or _SHARED_PROFILE:
+            # Örnekleme ve paylaşılan profil tüm thread'leri zaten görür
+            return func
+
+        @wraps(func)
+        def profiled(*args, **kwargs):
+            if not self._running:
+                return func(*args, **kwargs)
+            self._enable_thread()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._disable_thread()
+        return profiled
+
+    def record_phase(self, name: str, seconds: float) -> None:
+        """Zaman dökümüne bir tarama aşamasının süresini ekler."""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def record_total(self, name: str, seconds: float) -> None:
+        """Zaman dökümüne thread'ler boyunca toplanmış bir süre ekler."""
+        self.totals[name] = seconds
+
+    # ------------------------------------------------------------------
+    # cProfile
+    # ------------------------------------------------------------------
+
+    def _enable_thread(self) -> None:
+        """Çağıran thread'in profilini (gerekirse oluşturup) etkinleştirir."""
+        profile = getattr(self._local, "profile", None)
+        if profile is None:
+            profile = cProfile.Profile()
+            self._local.profile = profile
+            with self._lock:
+                self._profiles.append(profile)
+        profile.enable()
+
+    def _disable_thread(self) -> None:
+        profile = getattr(self._local, "profile", None)
+        if profile is not None:
+            profile.disable()
+
+    def _merged_stats(self) -> Optional[pstats.Stats]:
+        """Thread profillerini tek bir pstats.Stats nesnesinde birleştirir."""
+        stats = None
+        with self._lock:
+            profiles = list(self._profiles)
+        for profile in profiles:
+            profile.create_stats()
+            if not profile.stats:
+                continue
+            if stats is None:
+                stats = pstats.Stats(profile)
+            else:
+                stats.add(profile)
+        return stats
+
+    # ------------------------------------------------------------------
+    # Örnekleme
+    # ------------------------------------------------------------------
+
+    def _sample_loop(self) -> None:
+        while not self._stop_event.wait(self.interval):
+            self._take_sample()
+
+    def _take_sample(self) -> None:
+        """Tüm tarama thread'lerinin o anki yığınlarını kaydeder."""
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident in self._ignored_threads:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            # Aynı havuzun işçileri tek kökte birleştirilir
+            root = _POOL_SUFFIX.sub("", names.get(ident, str(ident)))
+            stack.append(root)
+            self._samples[";".join(reversed(stack))] += 1
+        self._sample_count += 1
+
+    def _self_time_by_function(self) -> Counter:
+        """Her fonksiyonun yığının tepesinde görüldüğü örnek sayısı."""
+        leaves = Counter()
+        for stack, count in self._samples.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return leaves
+
+    # ------------------------------------------------------------------
+    # Çıktılar
+    # ------------------------------------------------------------------
+
+    def _write_outputs(self) -> None:
+        os.makedirs(self.output_dir, exist_ok=True)
+        prefix = os.path.join(self.output_dir, "scan_" + datetime.now().strftime("%Y%m%d_%H%M%S_%f"))
+
+        if self.mode == PROFILE_CPROFILE:
+            if self._stats is not None:
+                self.outputs["pstats"] = prefix + ".pstats"
+                self._stats.dump_stats(self.outputs["pstats"])
+                self.outputs["text"] = prefix + ".txt"
+                with open(self.outputs["text"], "w", encoding="utf-8") as f:
+                    pstats.Stats(self.outputs["pstats"], stream=f).sort_stats("cumulative").print_stats(50)
+        else:
+            self.outputs["collapsed"] = prefix + ".collapsed"
+            with open(self.outputs["collapsed"], "w", encoding="utf-8") as f:
+                for stack, count in sorted(self._samples.items()):
+                    f.write(f"{stack} {count}\n")
+
+        self.outputs["breakdown"] = prefix + ".json"
+        with open(self.outputs["breakdown"], "w", encoding="utf-8") as f:
+            json.dump(self.breakdown(), f, ensure_ascii=False, indent=2)
+        logger.info(f"Profil yazıldı: {', '.join(self.outputs.values())}")
+
+    def breakdown(self) -> dict:
+        """Aşama süreleri ve en pahalı fonksiyonlardan oluşan zaman dökümü."""
+        result = {
+            "mode": self.mode,
+            "wall_seconds": round(self._elapsed, 6),
+            "phases": {name: round(seconds, 6) for name, seconds in self.phases.items()},
+            "totals": {name: round(seconds, 6) for name, seconds in self.totals.items()},
+        }
+        top = []
+        if self.mode == PROFILE_CPROFILE:
+            if self._stats is not None:
+                rows = sorted(self._stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+                for (filename, line, name), (_, calls, tottime, cumtime, _) in rows[:TOP_FUNCTIONS]:
+                    top.append({"function": f"{os.path.basename(filename)}:{line}({name})",
+                                "calls": calls, "self_seconds": round(tottime, 6),
+                                "cumulative_seconds": round(cumtime, 6)})
+        else:
+            result["samples"] = self._sample_count
+            result["interval"] = self.interval
+            for function, count in self._self_time_by_function().most_common(TOP_FUNCTIONS):
+                top.append({"function": function, "self_samples": count,
+                            "self_seconds": round(count * self.interval, 6)})
+        result["top_functions"] = top
+        return result
@@ -0,0 +1,382 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Tarama İşi Zamanlayıcısı (tek paylaşılan işçi havuzu)
+
+Birden çok tarama işi aynı işçi thread'lerini kullanır. İşler önceliğe göre
+sıralanır; aynı dosya birden çok işin bekleyen kümesindeyse yalnızca bir kez
+taranır ve sonuç hepsine iletilir.
+
+batch_func verilen işlerde işçiler dosyaları batch_size'lık gruplar halinde
+alır (küçük dosya hızlı yolu). Grubun ayrı taranması gereken dosyaları
+(büyük dosyalar, e-postalar) işin kuyruğunun başına tekil iş olarak geri
+konur; tekil bir dosyayı alan işçi, prefetch verilmişse sıradaki
+PREFETCH_DEPTH tekil dosyanın önceden okunmasını başlatır.
+
+Created by Mert Ulupınar
+"""
+
+import queue
+import logging
+import threading
+from collections import deque
+from itertools import count
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from io_scheduler import PREFETCH_DEPTH
+
+logger = logging.getLogger('Mert Ulupınar.Scheduler')
+
+# İş öncelikleri (büyük olan önce çalışır)
+PRIORITY_LOW = 0
+PRIORITY_NORMAL = 1
+PRIORITY_HIGH = 2
+
+# İş durumları
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_PAUSED = "paused"
+JOB_CANCELLED = "cancelled"
+JOB_DONE = "done"
+
+_END = object()
+
+
+class _Work:
+    """Taranacak tek bir dosya ve sonucunu bekleyen işler."""
+
+    __slots__ = ("path", "subscribers", "claimed", "single", "prefetched")
+
+    def __init__(self, path: str):
+        self.path = path
+        self.subscribers: List["ScanJob"] = []
+        self.claimed = False     # Bir işçi taramaya başladı
+        self.single = False      # Toplu işten geri döndü, scan_func ile tek başına taranır
+        self.prefetched = False  # Önceden okunması başlatıldı
+
+
+class ScanJob:
+    """
+    Zamanlayıcıya gönderilmiş tarama işi.
+
+    Sonuçlar results() ile akış olarak okunabilir veya on_result geri
+    çağırmasıyla alınabilir; ikisi birlikte de kullanılabilir. Geri
+    çağırmalar işçi thread'lerinden çağrılır.
+
+    batch_func (yollar, imzalar) -> ({yol: sonuç}, ayrı taranacak yollar)
+    biçimindedir; ayrı taranacak yollar daha sonra scan_func ile taranır.
+    """
+
+    def __init__(self, scheduler: "ScanScheduler", job_id: int, name: str, priority: int,
+                 scan_func: Optional[Callable],
+                 on_result: Optional[Callable] = None,
+                 on_progress: Optional[Callable[[int], None]] = None,
+                 on_finished: Optional[Callable[["ScanJob"], None]] = None,
+                 batch_func: Optional[Callable] = None, batch_size: int = 1,
+                 prefetch: Optional[Callable[[str], None]] = None):
+        self.id = job_id
+        self.name = name
+        self.priority = priority
+        self.scan_func = scan_func
+        self.batch_func = batch_func
+        self.batch_size = batch_size if batch_func is not None else 1
+        self.prefetch = prefetch
+        self.on_result = on_result
+        self.on_progress = on_progress
+        self.on_finished = on_finished
+        self.state = JOB_QUEUED
+        self.total = 0
+        self.completed = 0
+        self.shared = 0  # Başka bir işle paylaşılan (bir kez taranan) dosya sayısı
+        self._scheduler = scheduler
+        self._pending: deque = deque()
+        self._results: "queue.Queue" = queue.Queue()
+        self._done = threading.Event()
+        self._last_percent = -1
+
+    def __repr__(self):
+        return f"ScanJob({self.id}, {self.name!r}, {self.state}, {self.completed}/{self.total})"
+
+    @property
+    def progress(self) -> int:
+        return int(self.completed / self.total * 100) if self.total else 100
+
+    @property
+    def finished(self) -> bool:
+        return self._done.is_set()
+
+    def pause(self) -> None:
+        """Yeni dosya alınmasını durdurur; taranmakta olanlar tamamlanır."""
+        self._scheduler._set_paused(self, True)
+
+    def resume(self) -> None:
+        self._scheduler._set_paused(self, False)
+
+    def cancel(self) -> None:
+        """İşi iptal eder; bekleyen dosyaları taranmaz, sonuç akışı kapanır."""
+        self._scheduler._cancel(self)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """İş bitene veya iptal edilene kadar bekler."""
+        return self._done.wait(timeout)
+
+    def results(self) -> Iterator:
+        """Sonuçları geldikçe üretir; iş bitince veya iptal edilince sona erer."""
+        while True:
+            item = self._results.get()
+            if item is _END:
+                return
+            yield item
+
+
+class ScanScheduler:
+    """
+    Tüm tarama işlerinin paylaştığı işçi havuzu.
+
+    Args:
+        max_workers: İşçi thread sayısı (tüm işler için toplam)
+        scan_func: (yol, imzalar) -> ScanVerdict; işler kendi fonksiyonunu verebilir
+        signature_source: Her dosyadan önce güncel imza görüntüsünü döndürür
+    """
+
+    def __init__(self, max_workers: int = 4, scan_func: Optional[Callable] = None,
+                 signature_source: Optional[Callable] = None):
+        self.max_workers = max_workers
+        self.scan_func = scan_func
+        self.signature_source = signature_source
+        self._jobs: List[ScanJob] = []       # Bitmemiş işler
+        self._work: Dict[str, _Work] = {}    # Bekleyen veya taranmakta olan dosyalar
+        self._ids = count(1)
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._threads = [threading.Thread(target=self._worker, name=f"ScanScheduler_{i}", daemon=True)
+                         for i in range(max_workers)]
+        for thread in self._threads:
+            thread.start()
+
+    def submit(self, files: Iterable[str], priority: int = PRIORITY_NORMAL, name: str = "",
+               scan_func: Optional[Callable] = None,
+               on_result: Optional[Callable] = None,
+               on_progress: Optional[Callable[[int], None]] = None,
+               on_finished: Optional[Callable[[ScanJob], None]] = None,
+               batch_func: Optional[Callable] = None, batch_size: int = 1,
+               prefetch: Optional[Callable[[str], None]] = None) -> ScanJob:
+        """
+        Yeni bir tarama işi kuyruğa ekler.
+        batch_func verilirse dosyalar batch_size'lık gruplar halinde taranır;
+        prefetch, tekil taranacak dosyaların önceden okunmasını başlatır.
+        """
+        finished = False
+        with self._cond:
+            if self._stopping:
+                raise RuntimeError("Zamanlayıcı kapatıldı")
+            job = ScanJob(self, next(self._ids), name, priority, scan_func or self.scan_func,
+                          on_result, on_progress, on_finished, batch_func, batch_size, prefetch)
+            for path in dict.fromkeys(files):
+                work = self._work.get(path)
+                if work is None:
+                    work = self._work[path] = _Work(path)
+                else:
+                    job.shared += 1
+                work.subscribers.append(job)
+                job._pending.append(work)
+            job.total = len(job._pending)
+            if job.total:
+                job.state = JOB_RUNNING
+                self._jobs.append(job)
+                self._cond.notify_all()
+            else:
+                job.state = JOB_DONE
+                finished = True
+        logger.info(f"Tarama işi #{job.id} eklendi: {name} ({job.total} dosya, "
+                    f"{job.shared} dosya başka işlerle paylaşılıyor)")
+        if finished:
+            self._finish(job)
+        return job
+
+    def jobs(self) -> List[ScanJob]:
+        """Bitmemiş işlerin listesi."""
+        with self._cond:
+            return list(self._jobs)
+
+    def thread_ids(self) -> List[int]:
+        """İşçi thread'lerinin kimlikleri (profilleme için)."""
+        return [thread.ident for thread in self._threads]
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Bekleyen işleri iptal eder ve işçileri durdurur."""
+        for job in self.jobs():
+            job.cancel()
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+    # ------------------------------------------------------------------
+    # İşçiler
+    # ------------------------------------------------------------------
+
+    def _next_work(self) -> Tuple[Optional[ScanJob], List[_Work]]:
+        """
+        En yüksek öncelikli çalışan işten sıradaki dosyaları alır (kilit altında).
+        Toplu işlerde en fazla batch_size dosya, tekil dosyalar ise tek başına döner.
+        """
+        while True:
+            candidates = [job for job in self._jobs if job.state == JOB_RUNNING and job._pending]
+            if not candidates:
+                return None, []
+            # Öncelik yüksek olan, eşitse önce gönderilen iş
+            job = max(candidates, key=lambda j: (j.priority, -j.id))
+            works = []
+            while job._pending and len(works) < job.batch_size:
+                work = job._pending.popleft()
+                if work.claimed or job not in work.subscribers:
+                    continue
+                if work.single and works:
+                    job._pending.appendleft(work)
+                    break
+                work.claimed = True
+                works.append(work)
+                if work.single:
+                    break
+            if works:
+                return job, works
+
+    def _prefetch_ahead(self, job: ScanJob) -> List[str]:
+        """İşin kuyruğundaki sıradaki tekil dosyalardan önceden okunacakları seçer (kilit altında)."""
+        paths = []
+        for work in job._pending:
+            if len(paths) >= PREFETCH_DEPTH or not work.single:
+                break
+            if not work.claimed and not work.prefetched:
+                work.prefetched = True
+                paths.append(work.path)
+        return paths
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._stopping:
+                        return
+                    job, works = self._next_work()
+                    if works:
+                        break
+                    self._cond.wait()
+                scan_func, batch_func, prefetch = job.scan_func, job.batch_func, job.prefetch
+                single = batch_func is None or works[0].single
+                ahead = self._prefetch_ahead(job) if single and prefetch is not None else []
+
+            for path in ahead:
+                # İşçi bu dosyayı hash'lerken sıradakiler diskten okunmaya başlar
+                self._call(prefetch, path)
+            signatures = self.signature_source() if self.signature_source is not None else set()
+            if single:
+                work = works[0]
+                try:
+                    verdict = scan_func(work.path, signatures)
+                except Exception as e:
+                    logger.error(f"Zamanlayıcı tarama hatası: {work.path} - {e}")
+                    verdict = None
+                self._deliver(work, verdict)
+                continue
+
+            try:
+                results, separate = batch_func([work.path for work in works], signatures)
+            except Exception as e:
+                logger.error(f"Zamanlayıcı toplu tarama hatası: {len(works)} dosya - {e}")
+                results, separate = {}, ()
+            separate = set(separate)
+            self._requeue([work for work in works if work.path in separate])
+            for work in works:
+                if work.path not in separate:
+                    self._deliver(work, results.get(work.path))
+
+    def _requeue(self, works: List[_Work]) -> None:
+        """Toplu işten dönen dosyaları bekleyen işlerin kuyruğunun başına tekil olarak koyar."""
+        if not works:
+            return
+        with self._cond:
+            for work in reversed(works):
+                work.claimed = False
+                work.single = True
+                if not work.subscribers:
+                    # Bekleyen işler iptal edildi
+                    self._work.pop(work.path, None)
+                    continue
+                for job in work.subscribers:
+                    job._pending.appendleft(work)
+            self._cond.notify_all()
+
+    def _deliver(self, work: _Work, verdict) -> None:
+        """Sonucu dosyayı bekleyen tüm işlere iletir."""
+        finished = []
+        with self._cond:
+            self._work.pop(work.path, None)
+            subscribers = work.subscribers
+            work.subscribers = []
+            for job in subscribers:
+                job.completed += 1
+                if job.completed == job.total:
+                    job.state = JOB_DONE
+                    self._jobs.remove(job)
+                    finished.append(job)
+
+        for job in subscribers:
+            if verdict is not None:
+                job._results.put(verdict)
+                self._call(job.on_result, verdict)
+            percent = job.progress
+            if percent != job._last_percent:
+                job._last_percent = percent
+                self._call(job.on_progress, percent)
+        for job in finished:
+            self._finish(job)
+
+    # ------------------------------------------------------------------
+    # Durum değişiklikleri
+    # ------------------------------------------------------------------
+
+    def _set_paused(self, job: ScanJob, paused: bool) -> None:
+        with self._cond:
+            if job.state not in (JOB_RUNNING, JOB_PAUSED):
+                return
+            job.state = JOB_PAUSED if paused else JOB_RUNNING
+            self._cond.notify_all()
+        logger.info(f"Tarama işi #{job.id} {'duraklatıldı' if paused else 'devam ediyor'}")
+
+    def _cancel(self, job: ScanJob) -> None:
+        with self._cond:
+            if job.state in (JOB_CANCELLED, JOB_DONE):
+                return
+            job.state = JOB_CANCELLED
+            self._jobs.remove(job)
+            for work in job._pending:
+                if job in work.subscribers:
+                    work.subscribers.remove(job)
+                # Başka iş beklemiyorsa dosya hiç taranmaz
+                if not work.subscribers and not work.claimed:
+                    self._work.pop(work.path, None)
+            job._pending.clear()
+            # Taranmakta olan dosyaların sonuçları artık bu işe iletilmez
+            for work in self._work.values():
+                if work.claimed and job in work.subscribers:
+                    work.subscribers.remove(job)
+            self._cond.notify_all()
+        logger.info(f"Tarama işi #{job.id} iptal edildi ({job.completed}/{job.total})")
+        self._finish(job)
+
+    def _finish(self, job: ScanJob) -> None:
+        job._results.put(_END)
+        job._done.set()
+        self._call(job.on_finished, job)
+
+    @staticmethod
+    def _call(callback: Optional[Callable], *args) -> None:
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.error(f"Zamanlayıcı geri çağırması başarısız: {e}")
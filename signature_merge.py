@@ -0,0 +1,206 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Bellek Sınırlı İmza Akışı Birleştirme
+
+Yerel veritabanı ve imza akışları (feed) Python kümelerine yüklenmeden
+birleştirilir: kayıtlar sabit boyutlu parçalar halinde sıralanıp diske
+yazılır (external_sort), k-yollu birleştirmeyle hash sırasında okunur ve
+her hash tek seferde değerlendirilir. Bellek kullanımı memory_limit ile
+sınırlıdır; akışların boyutuna bağlı değildir.
+
+Akışlar verildikleri sırayla uygulanır: ekleme akışı hash'i ekler, silme
+akışı (remove=True) o ana kadar eklenmiş hash'i kaldırır. Sonuç imza
+veritabanı biçiminde (girintili JSON dizisi) yazılır; isteğe bağlı kaynak
+dosyasında her imzanın hangi akışlardan geldiği tutulur.
+
+Created by Mert Ulupınar
+"""
+
+import os
+import re
+import json
+import logging
+import tempfile
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from external_sort import external_sort
+
+logger = logging.getLogger('Mert Ulupınar.SignatureMerge')
+
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024  # Sıralama parçalarının bellek üst sınırı (byte)
+RECORD_MEMORY = 100       # Bellekteki bir kaydın yaklaşık boyutu (36 karakterlik str + liste)
+MIN_RUN_SIZE = 10_000
+READ_CHUNK = 1 << 20
+MAX_TOKEN = 1024          # Ayırıcısız daha uzun diziler imza değildir, atılır
+SOURCES_SUFFIX = ".sources.jsonl"
+
+_HASH_LENGTH = 32
+_INDEX_WIDTH = 4          # Kayıt: hash + akış numarası (onaltılık, sabit genişlik)
+_MAX_FEEDS = 16 ** _INDEX_WIDTH
+_MD5_RE = re.compile(r"[0-9a-f]{32}")
+_SEPARATORS = re.compile(r'[\s,\[\]"]+')
+
+
+class SignatureFeed(NamedTuple):
+    """Birleştirilecek imza kaynağı; name sonuçlarda kaynak adı olarak kullanılır ve benzersiz olmalıdır."""
+    name: str
+    path: str
+    remove: bool = False   # True ise akıştaki hash'ler veritabanından çıkarılır
+    local: bool = False    # Mevcut yerel veritabanı: buradaki imzalar 'new' sayılmaz
+
+
+def iter_signature_file(path: str, chunk_size: int = READ_CHUNK) -> Iterator[str]:
+    """
+    İmza dosyasındaki hash dizgelerini parça parça okuyarak üretir.
+
+    JSON dizisi (tek satır veya girintili) ve satır başına bir hash içeren
+    düz liste aynı şekilde okunur; dosyanın tamamı belleğe alınmaz.
+    """
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        tail = ""
+        for chunk in iter(lambda: f.read(chunk_size), ""):
+            tokens = _SEPARATORS.split(tail + chunk)
+            tail = tokens.pop()
+            if len(tail) > MAX_TOKEN:
+                tail = ""
+            yield from (token for token in tokens if token)
+        if tail:
+            yield tail
+
+
+def run_size_for(memory_limit: int) -> int:
+    """Bellek sınırına sığan sıralama parçası boyutu (kayıt)."""
+    return max(MIN_RUN_SIZE, memory_limit // RECORD_MEMORY)
+
+
+class _AtomicWriter:
+    """Geçici dosyaya yazar; commit() ile os.replace, hata olursa siler."""
+
+    def __init__(self, path: str):
+        self.path = path
+        fd, self.tmp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+        self.file = os.fdopen(fd, "w", encoding="utf-8", buffering=1 << 20)
+
+    def commit(self) -> None:
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+    def discard(self) -> None:
+        self.file.close()
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+
+def merge_signature_files(feeds: List[SignatureFeed], output_path: str,
+                          sources_path: Optional[str] = None,
+                          memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                          tmp_dir: Optional[str] = None) -> Dict:
+    """
+    Akışları sırayla uygulayıp sonucu output_path'e imza veritabanı olarak yazar.
+
+    sources_path verilirse her imza için [hash, [kaynaklar]] satırları
+    (hash sırasında) yazılır. Çıktılar atomik olarak yerine konur.
+    Sayaçları döndürür: signatures, new (yerel akışlarda olmayan), removed,
+    duplicates, invalid ve kaynak başına imza sayısı (sources).
+    """
+    if len(feeds) > _MAX_FEEDS:
+        raise ValueError(f"En fazla {_MAX_FEEDS} akış birleştirilebilir")
+    names = [feed.name for feed in feeds]
+    if len(set(names)) != len(names):
+        raise ValueError("Akış adları benzersiz olmalı")
+    counts = {"signatures": 0, "new": 0, "removed": 0, "duplicates": 0, "invalid": 0,
+              "sources": {feed.name: 0 for feed in feeds if not feed.remove}}
+
+    def records() -> Iterator[str]:
+        for index, feed in enumerate(feeds):
+            suffix = format(index, f"0{_INDEX_WIDTH}x")
+            logger.info(f"İmza akışı okunuyor: {feed.name} ({feed.path})"
+                        + (" [silme]" if feed.remove else ""))
+            for token in iter_signature_file(feed.path):
+                token = token.lower()
+                if not _MD5_RE.fullmatch(token):
+                    counts["invalid"] += 1
+                    continue
+                # Sabit genişlikli kayıt: düz metin sıralaması hash, sonra akış sırasıdır
+                yield token + suffix
+
+    db = _AtomicWriter(output_path)
+    sources = _AtomicWriter(sources_path) if sources_path else None
+    try:
+        db.file.write("[")
+        merged = external_sort(records(), run_size=run_size_for(memory_limit), tmp_dir=tmp_dir)
+        for signature, feed_indexes in _group(merged):
+            present, sources_of, in_local = _apply(signature, feed_indexes, feeds, counts)
+            if not present:
+                continue
+            db.file.write(("\n  " if not counts["signatures"] else ",\n  ") + json.dumps(signature))
+            counts["signatures"] += 1
+            if not in_local:
+                counts["new"] += 1
+            for name in sources_of:
+                counts["sources"][name] += 1
+            if sources is not None:
+                sources.file.write(json.dumps([signature, sources_of], ensure_ascii=False) + "\n")
+        db.file.write("\n]" if counts["signatures"] else "]")
+        db.commit()
+        if sources is not None:
+            sources.commit()
+    except BaseException:
+        db.discard()
+        if sources is not None:
+            sources.discard()
+        raise
+
+    logger.info(f"İmza akışları birleştirildi: {counts['signatures']} imza, {counts['new']} yeni, "
+                f"{counts['removed']} silindi, {counts['invalid']} geçersiz kayıt atlandı")
+    return counts
+
+
+def _group(merged: Iterable[str]) -> Iterator:
+    """Sıralı kayıtları (hash, [akış numaraları]) gruplarına ayırır."""
+    current, indexes = None, []
+    for record in merged:
+        signature, index = record[:_HASH_LENGTH], int(record[_HASH_LENGTH:], 16)
+        if signature != current:
+            if current is not None:
+                yield current, indexes
+            current, indexes = signature, []
+        indexes.append(index)
+    if current is not None:
+        yield current, indexes
+
+
+def _apply(signature: str, feed_indexes: List[int], feeds: List[SignatureFeed], counts: Dict):
+    """Bir hash'in kayıtlarını akış sırasıyla uygular: (var mı, kaynaklar, yerel akışta mı)."""
+    present = False
+    names: List[str] = []
+    for index in feed_indexes:
+        feed = feeds[index]
+        if feed.remove:
+            if present:
+                counts["removed"] += 1
+            present, names = False, []
+        elif feed.name in names:
+            counts["duplicates"] += 1
+        else:
+            present = True
+            names.append(feed.name)
+    in_local = any(feeds[index].local and not feeds[index].remove for index in feed_indexes)
+    return present, names, in_local
+
+
+def load_signature_sources(sources_path: str, signature: str) -> Optional[List[str]]:
+    """Kaynak dosyasında imzanın kaynaklarını arar (doğrusal tarama; tanılama için)."""
+    signature = signature.lower()
+    with open(sources_path, "r", encoding="utf-8") as f:
+        for line in f:
+            entry, names = json.loads(line)
+            if entry == signature:
+                return names
+            if entry > signature:
+                break
+    return None
@@ -0,0 +1,186 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Sürüm Numaralı (Generation) İmza Anlık Görüntüleri
+
+Created by Mert Ulupınar
+"""
+
+import os
+import json
+import time
+import logging
+import tempfile
+import threading
+from typing import Iterable, Optional, Tuple
+
+logger = logging.getLogger('Mert Ulupınar.Signatures')
+
+RELOAD_CHECK_INTERVAL = 1.0  # İmza dosyasının değişip değişmediğine bakma aralığı (saniye)
+GENERATION_SUFFIX = ".gen"
+
+
+class SignatureSnapshot(frozenset):
+    """
+    Değiştirilemez imza kümesi.
+
+    frozenset olduğu için mevcut `hash in imzalar` kullanımı aynen çalışır;
+    generation, kararın hangi imza sürümüyle verildiğini gösterir.
+    """
+
+    __slots__ = ("generation",)
+
+    def __new__(cls, signatures: Iterable[str] = (), generation: int = 0):
+        snapshot = super().__new__(cls, signatures)
+        snapshot.generation = generation
+        return snapshot
+
+    def __reduce__(self):
+        return (self.__class__, (frozenset(self), self.generation))
+
+    def __repr__(self):
+        return f"SignatureSnapshot({len(self)} imza, generation={self.generation})"
+
+
+class SignatureStore:
+    """
+    İmza dosyasının güncel anlık görüntüsünü tutar.
+
+    snapshot() çoğu çağrıda dosya sistemine hiç dokunmaz; dosya en fazla
+    check_interval saniyede bir kontrol edilir. Yeni imzalar publish() ile
+    atomik olarak yazılır ve generation dosyası bir artırılır, böylece diğer
+    süreçler de aynı generation numarasını görür. Yeni görüntü tek bir
+    referans ataması ile yayımlanır; çalışan taramalar onu bir sonraki
+    dosyada alır.
+    """
+
+    def __init__(self, db_file: str, check_interval: float = RELOAD_CHECK_INTERVAL,
+                 label: str = "Virus"):
+        self.db_file = db_file
+        self.label = label  # Log mesajlarında kullanılan imza türü
+        self.generation_file = db_file + GENERATION_SUFFIX
+        self.check_interval = check_interval
+        self._snapshot: Optional[SignatureSnapshot] = None
+        self._file_key: Optional[Tuple[int, int, int]] = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Yayımlanmış son görüntünün generation numarası."""
+        return self.snapshot().generation
+
+    def snapshot(self) -> SignatureSnapshot:
+        """Güncel imza görüntüsünü döndürür (gerekirse yeniden yükler)."""
+        snapshot = self._snapshot
+        if snapshot is not None and time.monotonic() < self._next_check:
+            return snapshot
+        return self.refresh()
+
+    def refresh(self, force: bool = False) -> SignatureSnapshot:
+        """İmza dosyası değiştiyse yeni bir görüntü yükler."""
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            key = self._stat_key()
+            if self._snapshot is not None and key == self._file_key and not force:
+                return self._snapshot
+
+            if key is None:
+                if self._snapshot is None or self._file_key is not None:
+                    logger.warning(f"{self.label} imza dosyası bulunamadı, boş set döndürülüyor")
+                self._swap(SignatureSnapshot((), self._next_generation()), None)
+                return self._snapshot
+
+            try:
+                with open(self.db_file, "r", encoding="utf-8") as f:
+                    signatures = json.load(f)
+            except (json.JSONDecodeError, IOError, OSError) as e:
+                logger.error(f"{self.label} imza dosyası yüklenemedi: {e}")
+                if self._snapshot is None:
+                    self._swap(SignatureSnapshot((), 0), None)
+                return self._snapshot
+
+            self._swap(SignatureSnapshot(signatures, self._next_generation()), key)
+            logger.info(f"{len(self._snapshot)} {self.label.lower()} imzası yüklendi "
+                        f"(generation {self._snapshot.generation})")
+            return self._snapshot
+
+    def publish(self, signatures: Iterable[str]) -> SignatureSnapshot:
+        """
+        İmzaları dosyaya atomik olarak yazar ve yeni görüntüyü yayımlar.
+        Okuyucular hiçbir zaman yarım yazılmış bir dosya görmez.
+        """
+        with self._lock:
+            generation = self._next_generation(publishing=True)
+            ordered = sorted(signatures)
+            self._atomic_write(self.db_file, json.dumps(ordered, indent=2, ensure_ascii=False))
+            self._atomic_write(self.generation_file, str(generation))
+            self._swap(SignatureSnapshot(ordered, generation), self._stat_key())
+            self._next_check = time.monotonic() + self.check_interval
+            return self._snapshot
+
+    def publish_file(self, path: str) -> int:
+        """
+        Başka yerde hazırlanmış imza dosyasını (aynı dosya sisteminde)
+        os.replace ile yerine koyar ve generation numarasını artırır.
+        İmzalar burada belleğe yüklenmez; yeni görüntü ilk snapshot()
+        çağrısında okunur. Yeni generation numarasını döndürür.
+        """
+        with self._lock:
+            generation = self._next_generation(publishing=True)
+            os.replace(path, self.db_file)
+            self._atomic_write(self.generation_file, str(generation))
+            self._next_check = 0.0
+            return generation
+
+    def _swap(self, snapshot: SignatureSnapshot, key: Optional[Tuple[int, int, int]]) -> None:
+        """Yeni görüntüyü tek atama ile yayımlar (kilit altında çağrılır)."""
+        self._file_key = key
+        self._snapshot = snapshot
+
+    def _stat_key(self) -> Optional[Tuple[int, int, int]]:
+        """İmza dosyasının değişimini belirleyen (inode, boyut, mtime) üçlüsü."""
+        try:
+            st = os.stat(self.db_file)
+        except OSError:
+            return None
+        return st.st_ino, st.st_size, st.st_mtime_ns
+
+    def _next_generation(self, publishing: bool = False) -> int:
+        """
+        Yeni görüntünün generation numarasını belirler.
+
+        Dosyayı başka bir süreç publish() ile yazdıysa generation dosyasındaki
+        numara kullanılır; elle düzenlenmişse bellekteki sayı bir artırılır.
+        """
+        current = self._snapshot.generation if self._snapshot is not None else 0
+        try:
+            with open(self.generation_file, "r", encoding="utf-8") as f:
+                stored = int(f.read().strip() or 0)
+        except (IOError, OSError, ValueError):
+            stored = 0
+        if publishing:
+            return max(current, stored) + 1
+        return stored if stored > current else current + 1
+
+    @staticmethod
+    def _atomic_write(path: str, data: str) -> None:
+        """Geçici dosyaya yazıp os.replace ile yerine koyar."""
+        directory = os.path.dirname(os.path.abspath(path))
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except OSError:
+            mode = 0o644
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            os.chmod(tmp_path, mode)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
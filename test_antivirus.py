@@ -6,10 +6,24 @@ Created by Mert Ulupınar
 """
 
 import unittest
+from unittest import mock
 import os
 import json
+import logging
 import tempfile
+import threading
+import time
+import asyncio
+import hashlib
+import sqlite3
+import struct
+import zlib
+import pstats
+import io
 import shutil
+import email
+import email.policy
+from email.message import EmailMessage
 from pathlib import Path
 
 # Test için modülü import et
@@ -23,10 +37,56 @@ from PyVirüs import (
     update_virus_signatures,
     remove_virus_signature,
     scan_file,
+    scan_bytes,
+    scan_stream,
+    inspect_file,
+    _digest_file,
+    inspect_mail,
+    ENGINE_MIME,
+    ENGINE_MIME_CONTAINER,
+    ENGINE_ELF_SECTION,
+    ENGINE_ENTROPY,
+    run_headless_scan,
+    parse_arguments,
+    build_walk_filter,
     move_to_quarantine,
+    restore_from_quarantine,
+    scan_file_batch,
+    scan_file_parallel,
+    scan_files_parallel,
+    scan_files_to_store,
+    iter_scan_results,
+    SMALL_FILE_LIMIT,
+    ENGINE_ALLOWLIST,
+    ScanThread,
+    ScanVerdict,
     VIRUS_DB_FILE,
     QUARANTINE_FOLDER
 )
+from io_scheduler import (order_for_locality, first_physical_offset, PageCacheAdvisor,
+                          data_extents, CACHE_MODE_DROP, CACHE_MODE_PREFETCH)
+from scan_checkpoint import ScanCheckpoint
+from file_walker import WalkFilter, WalkStats, walk_files, parallel_walk_files
+from quarantine_store import QuarantineStore
+from action_stage import DetectionActionStage, ACTION_DELETE
+from report_writer import ReportSink, export_report, iter_report
+from dir_tree_cache import DirTreeCache
+from signature_store import SignatureStore, SignatureSnapshot
+from allowlist import Allowlist, build_allowlist, import_allowlist, iter_hash_source
+from scan_profiler import ScanProfiler, PROFILE_CPROFILE, PROFILE_SAMPLING
+from scan_scheduler import (ScanScheduler, PRIORITY_LOW, PRIORITY_HIGH, JOB_DONE,
+                            JOB_CANCELLED)
+from mime_engine import MimeScanner, LINE_LIMIT
+from elf_engine import buffer_reader, executable_ranges, match_sections, section_hashes
+from entropy_engine import EntropyPolicy, EntropyProfiler, profile_bytes
+from external_sort import external_sort
+from signature_merge import SignatureFeed, iter_signature_file, merge_signature_files, load_signature_sources
+from scan_diff import (ScanIndex, build_scan_index, find_previous_index, iter_scan_diff,
+                       write_scan_diff, DIFF_NEW, DIFF_REMOVED, DIFF_CHANGED, DIFF_DETECTED, DIFF_CLEARED)
+from result_store import ResultStore, StoredResult
+from throttle import TokenBucket, DutyCycle, ScanThrottle
+from log_config import (JsonFormatter, SamplingFilter, DeferredQueueHandler,
+                        configure_logging, LOG_CATEGORY_FILE)
 
 
 class TestHashCalculation(unittest.TestCase):
@@ -181,6 +241,19 @@ class TestQuarantine(unittest.TestCase):
         # Karantina dosyası var
         self.assertTrue(os.path.exists(quarantine_path))
         self.assertTrue(quarantine_path.startswith(QUARANTINE_FOLDER))
+    
+    def test_restore_from_quarantine(self):
+        """Karantinadan geri yükleme testi."""
+        original_path = self.temp_file.name
+        with open(original_path, "rb") as f:
+            content = f.read()
+        
+        move_to_quarantine(original_path)
+        restored_path = restore_from_quarantine(original_path)
+        
+        self.assertEqual(restored_path, os.path.abspath(original_path))
+        with open(original_path, "rb") as f:
+            self.assertEqual(f.read(), content)
 
 
 class TestPerformance(unittest.TestCase):
@@ -213,6 +286,2343 @@ class TestPerformance(unittest.TestCase):
             os.remove(VIRUS_DB_FILE)
 
 
+class TestIOScheduler(unittest.TestCase):
+    """Disk yerelliği sıralama testleri."""
+    
+    def setUp(self):
+        """Test dizini oluştur."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = []
+        for i in range(20):
+            path = os.path.join(self.temp_dir, f"dosya_{i}.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(128))
+            self.files.append(path)
+    
+    def tearDown(self):
+        """Test dizinini sil."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_walk_order_unchanged(self):
+        """walk modunda sıra değişmemeli."""
+        self.assertEqual(list(order_for_locality(self.files, "walk")), self.files)
+    
+    def test_inode_order_within_window(self):
+        """inode modunda her pencere inode'a göre sıralı olmalı."""
+        ordered = list(order_for_locality(self.files, "inode", window=5))
+        self.assertEqual(sorted(ordered), sorted(self.files))
+        for start in range(0, len(ordered), 5):
+            inodes = [os.stat(p).st_ino for p in ordered[start:start + 5]]
+            self.assertEqual(inodes, sorted(inodes))
+    
+    def test_extent_order_keeps_all_files(self):
+        """extent modu FIEMAP yoksa da tüm dosyaları döndürmeli."""
+        ordered = list(order_for_locality(self.files + ["olmayan_dosya.bin"], "extent"))
+        self.assertEqual(len(ordered), len(self.files) + 1)
+        self.assertEqual(ordered[-1], "olmayan_dosya.bin")
+        self.assertIsInstance(first_physical_offset(self.files[0]), int)
+    
+    def test_invalid_mode(self):
+        """Bilinmeyen mod hata vermeli."""
+        with self.assertRaises(ValueError):
+            list(order_for_locality(self.files, "rastgele"))
+
+
+class TestSmallFileBatch(unittest.TestCase):
+    """Küçük dosya toplu tarama testleri."""
+    
+    def setUp(self):
+        """Küçük ve büyük test dosyaları oluştur."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.small_files = []
+        for i in range(30):
+            path = os.path.join(self.temp_dir, f"kucuk_{i}.txt")
+            with open(path, "wb") as f:
+                f.write(f"küçük dosya {i}".encode("utf-8"))
+            self.small_files.append(path)
+        
+        self.large_file = os.path.join(self.temp_dir, "buyuk.bin")
+        with open(self.large_file, "wb") as f:
+            f.write(os.urandom(SMALL_FILE_LIMIT * 4))
+    
+    def tearDown(self):
+        """Test dizinini sil."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_batch_detects_small_files(self):
+        """Toplu tarama küçük dosyalardaki virüsü bulmalı."""
+        virus_sigs = {calculate_hash(self.small_files[3])}
+        results, large_files = scan_file_batch(self.small_files, virus_sigs)
+        
+        self.assertEqual(large_files, [])
+        self.assertEqual(len(results), len(self.small_files))
+        self.assertEqual([r.path for r in results if r.is_virus], [self.small_files[3]])
+    
+    def test_batch_defers_large_files(self):
+        """Büyük dosyalar akış yoluna bırakılmalı, olmayan dosya temiz sayılmalı."""
+        missing = os.path.join(self.temp_dir, "olmayan.txt")
+        results, large_files = scan_file_batch([self.large_file, missing], set())
+        
+        self.assertEqual(large_files, [self.large_file])
+        self.assertEqual([(r.path, r.is_virus, r.file_hash) for r in results], [(missing, False, None)])
+    
+    def test_parallel_scan_matches_serial(self):
+        """Paralel tarama seri tarama ile aynı sonucu vermeli."""
+        files = self.small_files + [self.large_file]
+        virus_sigs = {calculate_hash(self.large_file), calculate_hash(self.small_files[7])}
+        
+        parallel = sorted(scan_files_parallel(files, virus_sigs, max_workers=3))
+        serial = sorted(scan_file(p, virus_sigs) for p in files)
+        self.assertEqual(parallel, serial)
+
+
+class TestScanCheckpoint(unittest.TestCase):
+    """Devam ettirilebilir tarama testleri."""
+    
+    def setUp(self):
+        """Test dizini ve checkpoint klasörü oluştur."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.scan_dir = os.path.join(self.temp_dir, "hedef")
+        self.ckpt_dir = os.path.join(self.temp_dir, "checkpoints")
+        os.makedirs(self.scan_dir)
+        self.files = []
+        for i in range(15):
+            path = os.path.join(self.scan_dir, f"dosya_{i:02d}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(f"içerik {i}")
+            self.files.append(path)
+    
+    def tearDown(self):
+        """Test dizinini sil."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _run_scan(self, checkpoint, resume):
+        """ScanThread'i senkron çalıştırıp sonuçları toplar."""
+        results = []
+        thread = ScanThread(self.scan_dir, 'directory', checkpoint=checkpoint, resume=resume)
+        thread.result.connect(lambda path, is_virus: results.append((path, is_virus)))
+        thread.run()
+        return sorted(results)
+    
+    def test_roundtrip_ignores_torn_line(self):
+        """Kayıtlar geri okunmalı, yarım son satır yok sayılmalı."""
+        checkpoint = ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir, interval=0)
+        checkpoint.begin(self.files)
+        checkpoint.record((self.files[0], True))
+        checkpoint.record((self.files[1], False, "abc123"))
+        checkpoint.close()
+        with open(checkpoint.path, "a", encoding="utf-8") as f:
+            f.write('{"t": "done", "r": [["yarım')
+        
+        files, completed = ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir).load()
+        self.assertEqual(files, self.files)
+        self.assertEqual(completed, {self.files[0]: [self.files[0], True],
+                                     self.files[1]: [self.files[1], False, "abc123"]})
+    
+    def test_repeated_crash_and_resume(self):
+        """Her çökmeden sonra yarım satır kesilmeli, devam kayıtları kaybolmamalı."""
+        def crash(checkpoint):
+            checkpoint.close()
+            with open(checkpoint.path, "a", encoding="utf-8") as f:
+                f.write('{"t": "done", "r": [["yarım')
+        
+        checkpoint = ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir, interval=0)
+        checkpoint.begin(self.files)
+        checkpoint.record((self.files[0], False))
+        crash(checkpoint)
+        
+        for index in (1, 2):
+            checkpoint = ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir, interval=0)
+            files, completed = checkpoint.load()
+            self.assertEqual(files, self.files)
+            self.assertEqual(sorted(completed), self.files[:index])
+            checkpoint.begin(files, resume=True)
+            checkpoint.record((self.files[index], False))
+            crash(checkpoint)
+        
+        files, completed = ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir).load()
+        self.assertEqual(files, self.files)
+        self.assertEqual(sorted(completed), self.files[:3])
+        with open(checkpoint.path, "r", encoding="utf-8") as f:
+            lines = f.read().split("\n")
+        self.assertEqual(sum("yarım" in line for line in lines), 1)
+        self.assertTrue(lines[-1].endswith("yarım"))
+    
+    def test_resume_skips_completed_files(self):
+        """Devam eden tarama tamamlanmış dosyaları yeniden taramamalı."""
+        checkpoint = ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir, interval=0)
+        checkpoint.begin(sorted(self.files))
+        # Gerçekte temiz olan dosya checkpoint'te virüslü görünüyor
+        checkpoint.record((self.files[4], True))
+        checkpoint.close()
+        
+        resumed = self._run_scan(ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir), resume=True)
+        fresh = self._run_scan(None, resume=False)
+        
+        self.assertIn((self.files[4], True), resumed)
+        self.assertEqual(len(resumed), len(fresh))
+        self.assertEqual([r for r in resumed if r[0] != self.files[4]],
+                         [r for r in fresh if r[0] != self.files[4]])
+        self.assertFalse(os.path.exists(checkpoint.path))
+    
+    def test_resume_rescans_mail_files(self):
+        """Devam eden tarama e-posta eklerinin satırlarını da raporlamalı."""
+        message = EmailMessage()
+        message["Subject"] = "ek"
+        message.set_content("Merhaba")
+        message.add_attachment(b"ek icerigi", maintype="application", subtype="octet-stream",
+                               filename="fatura.exe")
+        mail_path = os.path.join(self.scan_dir, "posta.eml")
+        with open(mail_path, "wb") as f:
+            f.write(message.as_bytes())
+        
+        checkpoint = ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir, interval=0)
+        checkpoint.begin(sorted(self.files + [mail_path]))
+        checkpoint.record((mail_path, False))
+        checkpoint.record((self.files[0], False))
+        checkpoint.close()
+        
+        resumed = self._run_scan(ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir), resume=True)
+        fresh = self._run_scan(None, resume=False)
+        self.assertIn((mail_path + "!fatura.exe", False), resumed)
+        self.assertEqual(resumed, fresh)
+    
+    @unittest.skipIf(sys.platform in ("win32", "darwin"), "UTF-8 olmayan dosya adı gerekir")
+    def test_non_utf8_file_name(self):
+        """UTF-8 olmayan dosya adı checkpoint'i bozmamalı, yol aynen geri okunmalı."""
+        raw_path = os.path.join(os.fsencode(self.scan_dir), b"\xffbozuk.bin")
+        with open(raw_path, "wb") as f:
+            f.write(b"icerik")
+        bad_path = os.fsdecode(raw_path)
+        
+        checkpoint = ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir, interval=0)
+        checkpoint.begin(self.files + [bad_path])
+        checkpoint.record((bad_path, False))
+        checkpoint.close()
+        files, completed = ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir).load()
+        self.assertEqual(files[-1], bad_path)
+        self.assertEqual(completed, {bad_path: [bad_path, False]})
+        
+        results = self._run_scan(ScanCheckpoint(self.scan_dir, folder=self.ckpt_dir), resume=False)
+        self.assertIn((bad_path, False), results)
+        self.assertEqual(len(results), len(self.files) + 1)
+
+
+class TestWalkFilters(unittest.TestCase):
+    """Gezinme filtreleri testleri."""
+    
+    def setUp(self):
+        """Örnek dizin ağacı oluştur."""
+        self.temp_dir = tempfile.mkdtemp()
+        layout = {
+            "app/main.py": b"print('merhaba')",
+            "app/data.bin": b"x" * 4096,
+            "app/node_modules/paket/index.js": b"module.exports = 1",
+            ".git/config": b"[core]",
+            "logs/uygulama.log": b"log satiri",
+            "logs/eski/arsiv.log": b"eski log",
+            "vm/disk.img": b"\0" * 100,
+        }
+        for rel, content in layout.items():
+            path = os.path.join(self.temp_dir, *rel.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(content)
+        with open(os.path.join(self.temp_dir, "logs", ".pyvirusignore"), "w", encoding="utf-8") as f:
+            f.write("# yorum\neski/\n")
+    
+    def tearDown(self):
+        """Test dizinini sil."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _walk(self, walk_filter, stats=None):
+        """Göreli yolları sıralı döndürür."""
+        return sorted(os.path.relpath(p, self.temp_dir).replace(os.sep, "/")
+                      for p in walk_files(self.temp_dir, walk_filter, stats))
+    
+    def test_no_filter_matches_os_walk(self):
+        """Filtre yokken os.walk ile aynı dosyalar dönmeli."""
+        expected = sorted(os.path.relpath(os.path.join(d, n), self.temp_dir).replace(os.sep, "/")
+                          for d, _, names in os.walk(self.temp_dir) for n in names)
+        self.assertEqual(self._walk(WalkFilter(ignore_file=None)), expected)
+    
+    def test_exclude_prunes_subtrees(self):
+        """Hariç tutulan dizinler, ignore dosyası ve regex'ler uygulanmalı."""
+        stats = WalkStats()
+        walk_filter = WalkFilter(exclude=["node_modules/", ".git/", "*.img"], exclude_regex=[r"\.log$"])
+        files = self._walk(walk_filter, stats)
+        
+        self.assertEqual(files, ["app/data.bin", "app/main.py", "logs/.pyvirusignore"])
+        self.assertEqual(stats.pruned_dirs, 3)  # node_modules, .git, logs/eski
+        self.assertEqual(stats.excluded_files, 2)
+    
+    def test_include_and_size_limits(self):
+        """Dahil etme kuralları ve boyut sınırları uygulanmalı."""
+        stats = WalkStats()
+        files = self._walk(WalkFilter(include=["*.py", "*.bin"], max_size=1024), stats)
+        
+        self.assertEqual(files, ["app/main.py"])
+        self.assertEqual(stats.size_filtered, 1)
+    
+    def test_path_globs_are_anchored(self):
+        """'/' içeren glob'lar göreli yolun tamamıyla eşleşmeli."""
+        for rel in ("build/x.o", "rebuild/x.o", "src/build/x.o"):
+            path = os.path.join(self.temp_dir, *rel.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"obj")
+        
+        files = self._walk(WalkFilter(exclude=["build/*.o"]))
+        self.assertNotIn("build/x.o", files)
+        self.assertIn("rebuild/x.o", files)
+        self.assertIn("src/build/x.o", files)
+        
+        self.assertEqual(self._walk(WalkFilter(include=["app/*.py"])), ["app/main.py"])
+    
+    def test_path_glob_wildcards_stay_in_segment(self):
+        """Yol glob'larında '*' ve '?' '/' ile eşleşmemeli; '**' dizinleri geçmeli."""
+        for rel in ("build/x.o", "build/sub/x.o", "build/sub/deep/y.o"):
+            path = os.path.join(self.temp_dir, *rel.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "wb") as f:
+                f.write(b"obj")
+        
+        files = self._walk(WalkFilter(exclude=["build/*.o"]))
+        self.assertNotIn("build/x.o", files)
+        self.assertIn("build/sub/x.o", files)
+        self.assertIn("build/sub/deep/y.o", files)
+        
+        files = self._walk(WalkFilter(exclude=["build/?/x.o", "build/*/"]))
+        self.assertIn("build/x.o", files)
+        self.assertNotIn("build/sub/x.o", files)
+        
+        files = self._walk(WalkFilter(include=["build/**/*.o"]))
+        self.assertEqual(files, ["build/sub/deep/y.o", "build/sub/x.o", "build/x.o"])
+    
+    def test_regexes_search_anywhere(self):
+        """Regex kuralları göreli yolun herhangi bir yerinde aranmalı."""
+        files = self._walk(WalkFilter(exclude_regex=[r"build/"], include_regex=[r"\.(py|o)$"]))
+        self.assertEqual(files, ["app/main.py"])
+        
+        files = self._walk(WalkFilter(include_regex=[r"eski/"], ignore_file=None))
+        self.assertEqual(files, ["logs/eski/arsiv.log"])
+    
+    def test_cli_filters(self):
+        """--include/--exclude/--min-size/--max-size başsız taramaya uygulanmalı."""
+        args, _ = parse_arguments(["PyVirüs.py", "--scan", self.temp_dir])
+        self.assertIsNone(build_walk_filter(args))
+        
+        args, _ = parse_arguments(["PyVirüs.py", "--scan", self.temp_dir, "--exclude", "node_modules/", ".git/",
+                                   "--include", "*.py", "*.bin", "*.js", "--min-size", "1", "--max-size", "1024"])
+        summary = run_headless_scan(args.scan, walk_filter=build_walk_filter(args))
+        self.assertEqual(summary["scanned"], 1)  # app/main.py; data.bin boyut sınırını aşar
+        self.assertEqual(summary["size_filtered"], 1)
+        self.assertEqual(summary["pruned_dirs"], 3)  # node_modules, .git, logs/eski
+    
+    @unittest.skipUnless(hasattr(os, "mkfifo"), "FIFO desteklenmiyor")
+    def test_fifo_skipped_without_open(self):
+        """FIFO'lar açılmadan atlanmalı."""
+        os.mkfifo(os.path.join(self.temp_dir, "app", "boru"))
+        stats = WalkStats()
+        files = self._walk(WalkFilter(), stats)
+        
+        self.assertNotIn("app/boru", files)
+        self.assertEqual(stats.special_files, 1)
+
+
+class TestQuarantineStore(unittest.TestCase):
+    """İçerik adresli karantina deposu testleri."""
+    
+    def setUp(self):
+        """Aynı ada ve içeriğe sahip örnekler oluştur."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store_dir = os.path.join(self.temp_dir, "karantina")
+        self.samples = []
+        for i in range(3):
+            folder = os.path.join(self.temp_dir, f"klasor_{i}")
+            os.makedirs(folder)
+            path = os.path.join(folder, "setup.exe")
+            with open(path, "wb") as f:
+                f.write(b"MZ ayni zararli icerik" * 100)
+            self.samples.append(path)
+        self.sample_md5 = calculate_hash(self.samples[0])
+        self.other = os.path.join(self.temp_dir, "farkli.exe")
+        with open(self.other, "wb") as f:
+            f.write(b"MZ farkli icerik")
+    
+    def tearDown(self):
+        """Test dizinini sil."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_duplicates_are_deduplicated(self):
+        """Aynı içerik bir kez, sıkıştırılmış olarak saklanmalı."""
+        with QuarantineStore(self.store_dir) as store:
+            entries = store.add_many(self.samples + [self.other], metadata={"kaynak": "test"})
+            
+            self.assertEqual(len(store), 4)
+            self.assertEqual(len({e.object_path for e in entries}), 2)
+            self.assertLess(os.path.getsize(entries[0].object_path), entries[0].size)
+            self.assertEqual(entries[0].metadata, {"kaynak": "test"})
+            self.assertEqual(entries[0].md5, self.sample_md5)
+        for path in self.samples + [self.other]:
+            self.assertFalse(os.path.exists(path))
+    
+    def test_restore_roundtrip(self):
+        """Geri yüklenen dosya orijinalle aynı olmalı, son referansta örnek silinmeli."""
+        with open(self.samples[0], "rb") as f:
+            original = f.read()
+        
+        with QuarantineStore(self.store_dir) as store:
+            entries = store.add_many(self.samples[:2])
+            store.restore(entries[0].id)
+            self.assertTrue(os.path.exists(entries[1].object_path))
+            
+            store.restore_many([entries[1].id])
+            self.assertFalse(os.path.exists(entries[1].object_path))
+            self.assertEqual(len(store), 0)
+        
+        for path in self.samples[:2]:
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), original)
+    
+    def test_failed_batch_keeps_originals(self):
+        """Toplu işlemde hata olursa hiçbir orijinal silinmemeli."""
+        missing = os.path.join(self.temp_dir, "olmayan.exe")
+        with QuarantineStore(self.store_dir) as store:
+            with self.assertRaises(OSError):
+                store.add_many([self.samples[0], missing])
+            self.assertEqual(len(store), 0)
+        self.assertTrue(os.path.exists(self.samples[0]))
+        # Geri alınan işlemin yazdığı örnekler diskte kalmamalı
+        leftovers = [name for _, _, names in os.walk(os.path.join(self.store_dir, "objects"))
+                     for name in names]
+        self.assertEqual(leftovers, [])
+    
+    def test_failed_restore_removes_partial_target(self):
+        """Bozuk örnek açılamazsa yarım hedef dosya bırakılmamalı."""
+        with QuarantineStore(self.store_dir) as store:
+            entry = store.add(self.samples[0])
+            with open(entry.object_path, "r+b") as f:
+                f.seek(10)  # gzip başlığından sonraki ilk blok
+                f.write(b"\xff" * 64)
+            with self.assertRaises(zlib.error):
+                store.restore(entry.id)
+            self.assertEqual(len(store), 1)
+        self.assertFalse(os.path.exists(self.samples[0]))
+    
+    @unittest.skipIf(sys.platform in ("win32", "darwin"), "UTF-8 olmayan dosya adı gerekir")
+    def test_non_utf8_path(self):
+        """UTF-8 olmayan dosya adı indekse yazılmalı, aranabilmeli ve geri yüklenebilmeli."""
+        raw_path = os.path.join(os.fsencode(self.temp_dir), b"\xffbozuk.exe")
+        with open(raw_path, "wb") as f:
+            f.write(b"MZ bozuk adli dosya")
+        bad_path = os.fsdecode(raw_path)
+        
+        with QuarantineStore(self.store_dir) as store:
+            entries = store.add_many([self.other, bad_path])
+            self.assertEqual(entries[1].original_path, bad_path)
+            self.assertEqual([e.id for e in store.find(original_path=bad_path)], [entries[1].id])
+            self.assertEqual(store.restore(entries[1].id), bad_path)
+        self.assertTrue(os.path.exists(raw_path))
+    
+    def test_restore_refuses_to_overwrite(self):
+        """Hedef varsa geri yükleme reddedilmeli ve kayıt korunmalı."""
+        with QuarantineStore(self.store_dir) as store:
+            entry = store.add(self.other)
+            with open(self.other, "wb") as f:
+                f.write(b"yeni dosya")
+            with self.assertRaises(FileExistsError):
+                store.restore(entry.id)
+            self.assertEqual(len(store), 1)
+
+
+class TestDetectionActionStage(unittest.TestCase):
+    """Tespit sonrası eylem aşaması testleri."""
+    
+    def setUp(self):
+        """Virüslü örnek dosyalar oluştur."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.store_dir = os.path.join(self.temp_dir, "karantina")
+        self.files = []
+        for i in range(5):
+            path = os.path.join(self.temp_dir, f"zararli_{i}.exe")
+            with open(path, "wb") as f:
+                f.write(f"zararlı içerik {i}".encode("utf-8"))
+            self.files.append(path)
+        self.signatures = {calculate_hash(p) for p in self.files}
+    
+    def tearDown(self):
+        """Test dizinini sil."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _run_stage(self, action, paths):
+        """Eylem aşamasını çalıştırıp sonuçları döndürür."""
+        outcomes = []
+        stage = DetectionActionStage(action, lambda: self.signatures, self.store_dir,
+                                     on_outcome=outcomes.append, batch_delay=0.01)
+        for path in paths:
+            stage.submit(path)
+        stage.close(wait=True, timeout=10)
+        return {o.path: o for o in outcomes}
+    
+    def test_quarantine_in_batches(self):
+        """Tespit edilen dosyalar arka planda karantinaya alınmalı."""
+        outcomes = self._run_stage("quarantine", self.files)
+        
+        self.assertEqual(len(outcomes), len(self.files))
+        self.assertTrue(all(o.ok for o in outcomes.values()))
+        self.assertFalse(any(os.path.exists(p) for p in self.files))
+        with QuarantineStore(self.store_dir) as store:
+            self.assertEqual(len(store), len(self.files))
+    
+    def test_changed_file_is_not_touched(self):
+        """Hash'i değişen dosyaya eylem uygulanmamalı (TOCTOU)."""
+        with open(self.files[0], "wb") as f:
+            f.write(b"artik temiz")
+        outcomes = self._run_stage("delete", self.files[:2])
+        
+        self.assertFalse(outcomes[self.files[0]].ok)
+        self.assertTrue(os.path.exists(self.files[0]))
+        self.assertTrue(outcomes[self.files[1]].ok)
+        self.assertFalse(os.path.exists(self.files[1]))
+    
+    def test_report_only_keeps_files(self):
+        """Yalnızca raporlama modunda dosyalar yerinde kalmalı."""
+        outcomes = self._run_stage("report", self.files)
+        
+        self.assertTrue(all(o.ok for o in outcomes.values()))
+        self.assertTrue(all(os.path.exists(p) for p in self.files))
+    
+    def test_invalid_action(self):
+        """Bilinmeyen eylem hata vermeli."""
+        with self.assertRaises(ValueError):
+            DetectionActionStage("yak", lambda: self.signatures, self.store_dir)
+    
+    def test_database_error_reports_failure(self):
+        """Karantina veritabanı hatası thread'i durdurmamalı, başarısız sonuç üretmeli."""
+        with open(self.store_dir, "w") as f:
+            f.write("dizin değil")  # Karantina klasörü/veritabanı açılamaz
+        outcomes = self._run_stage("quarantine", self.files[:2])
+        
+        self.assertEqual(len(outcomes), 2)
+        self.assertFalse(any(o.ok for o in outcomes.values()))
+        self.assertTrue(all(os.path.exists(p) for p in self.files[:2]))
+        
+        os.remove(self.store_dir)
+        with mock.patch.object(QuarantineStore, "add_many",
+                               side_effect=sqlite3.OperationalError("database is locked")):
+            outcomes = self._run_stage("quarantine", self.files[:2])
+        self.assertEqual(len(outcomes), 2)
+        self.assertTrue(all("locked" in o.detail for o in outcomes.values()))
+        self.assertTrue(all(os.path.exists(p) for p in self.files[:2]))
+    
+    @unittest.skipIf(sys.platform in ("win32", "darwin"), "UTF-8 olmayan dosya adı gerekir")
+    def test_non_utf8_path_is_quarantined(self):
+        """UTF-8 olmayan adlı dosya toplu işteki diğer dosyalarla birlikte karantinaya alınmalı."""
+        raw_path = os.path.join(os.fsencode(self.temp_dir), b"\xffbozuk.exe")
+        with open(raw_path, "wb") as f:
+            f.write(b"zararli bozuk adli dosya")
+        bad_path = os.fsdecode(raw_path)
+        self.signatures.add(calculate_hash(bad_path))
+        
+        outcomes = self._run_stage("quarantine", [bad_path] + self.files[:2])
+        self.assertEqual({path: o.ok for path, o in outcomes.items()},
+                         dict.fromkeys([bad_path] + self.files[:2], True))
+    
+    def test_failing_file_does_not_fail_batch(self):
+        """Tek tek denemede yalnızca alınamayan dosya başarısız sayılmalı."""
+        add_many = QuarantineStore.add_many
+        
+        def flaky(store, paths, metadata=None):
+            if self.files[1] in paths:
+                raise UnicodeEncodeError("utf-8", "\udcff", 0, 1, "surrogates not allowed")
+            return add_many(store, paths, metadata)
+        
+        with mock.patch.object(QuarantineStore, "add_many", autospec=True, side_effect=flaky):
+            outcomes = self._run_stage("quarantine", self.files[:3])
+        self.assertEqual({path: o.ok for path, o in outcomes.items()},
+                         {self.files[0]: True, self.files[1]: False, self.files[2]: True})
+        self.assertTrue(os.path.exists(self.files[1]))
+    
+    def test_signatures_refreshed_per_batch(self):
+        """Aşama açıkken eklenen/çıkarılan imzalar sonraki toplu işte kullanılmalı."""
+        signatures = {calculate_hash(self.files[0])}
+        calls = []
+        outcomes = []
+        
+        def source():
+            calls.append(1)
+            return signatures
+        
+        stage = DetectionActionStage("report", source, self.store_dir,
+                                     on_outcome=outcomes.append, batch_delay=0)
+        try:
+            stage.submit(self.files[1])
+            self._wait_for(outcomes, 1)
+            signatures = {calculate_hash(self.files[1])}
+            stage.submit(self.files[1])
+            stage.submit(self.files[0])
+        finally:
+            stage.close(wait=True, timeout=10)
+        
+        self.assertFalse(outcomes[0].ok)
+        self.assertEqual({(o.path, o.ok) for o in outcomes[1:]},
+                         {(self.files[1], True), (self.files[0], False)})
+        self.assertGreaterEqual(len(calls), 2)
+    
+    def _wait_for(self, outcomes, count, timeout=10):
+        deadline = time.monotonic() + timeout
+        while len(outcomes) < count and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+
+class TestReportSink(unittest.TestCase):
+    """Akışlı rapor yazıcı testleri."""
+    
+    def setUp(self):
+        """Test dizini ve dosyaları oluştur."""
+        self.temp_dir = tempfile.mkdtemp()
+        self.scan_dir = os.path.join(self.temp_dir, "hedef")
+        os.makedirs(self.scan_dir)
+        self.files = []
+        for i in range(12):
+            path = os.path.join(self.scan_dir, f"dosya_{i}.txt")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("x" * (i + 1))
+            self.files.append(path)
+    
+    def tearDown(self):
+        """Test dizinini sil."""
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_verdict_fields(self):
+        """Ayrıntılı sonuç hash, boyut ve süre içermeli."""
+        verdict = inspect_file(self.files[2], set())
+        
+        self.assertEqual(verdict.file_hash, calculate_hash(self.files[2]))
+        self.assertEqual(verdict.size, 3)
+        self.assertGreaterEqual(verdict.elapsed, 0)
+    
+    def test_streaming_formats_and_export(self):
+        """JSONL ve CSV raporlar yazılmalı ve dönüştürülebilmeli."""
+        for ext in ("jsonl", "csv"):
+            path = os.path.join(self.temp_dir, f"rapor.{ext}")
+            with ReportSink(path, buffer_records=4) as sink:
+                for file_path in self.files:
+                    sink.write(inspect_file(file_path, set()))
+            
+            records = list(iter_report(path))
+            self.assertEqual(len(records), len(self.files))
+            self.assertEqual(records[0]["dosya"], self.files[0])
+            self.assertEqual(records[0]["durum"], "Temiz")
+        
+        exported = export_report(os.path.join(self.temp_dir, "rapor.jsonl"),
+                                 os.path.join(self.temp_dir, "disa_aktarim.json"))
+        with open(exported, encoding="utf-8") as f:
+            self.assertEqual(len(json.load(f)), len(self.files))
+    
+    @unittest.skipIf(sys.platform in ("win32", "darwin"), "UTF-8 olmayan dosya adı gerekir")
+    def test_non_utf8_paths(self):
+        """UTF-8 olmayan dosya adları raporu bozmamalı ve aynen geri okunmalı."""
+        raw_path = os.path.join(os.fsencode(self.scan_dir), b"\xffbozuk.bin")
+        with open(raw_path, "wb") as f:
+            f.write(b"icerik")
+        bad_path = os.fsdecode(raw_path)
+        
+        for ext in ("jsonl", "csv"):
+            path = os.path.join(self.temp_dir, f"rapor.{ext}")
+            with ReportSink(path, buffer_records=2) as sink:
+                for file_path in [bad_path] + self.files:
+                    sink.write(inspect_file(file_path, set()))
+            records = list(iter_report(path))
+            self.assertEqual(len(records), len(self.files) + 1)
+            self.assertEqual(records[0]["dosya"], bad_path)
+        
+        exported = export_report(os.path.join(self.temp_dir, "rapor.jsonl"),
+                                 os.path.join(self.temp_dir, "disa_aktarim.csv"))
+        self.assertEqual([r["dosya"] for r in iter_report(exported)][0], bad_path)
+    
+    def test_failed_batch_does_not_block_later_writes(self):
+        """Yazılamayan grup bırakılmalı, sonraki kayıtlar yazılmaya devam etmeli."""
+        path = os.path.join(self.temp_dir, "rapor.jsonl")
+        sink = ReportSink(path, buffer_records=1)
+        sink._file = mock.Mock(wraps=sink._file)
+        sink._file.write.side_effect = [OSError("disk dolu"), mock.DEFAULT, mock.DEFAULT]
+        for file_path in self.files[:3]:
+            sink.write(inspect_file(file_path, set()))
+        sink.close()
+        
+        self.assertEqual([r["dosya"] for r in iter_report(path)], self.files[1:3])
+    
+    def test_headless_scan_writes_report(self):
+        """GUI olmadan yapılan tarama rapor üretmeli."""
+        report_path = os.path.join(self.temp_dir, "basliksiz.jsonl")
+        summary = run_headless_scan(self.scan_dir, report_path)
+        
+        records = list(iter_report(report_path))
+        self.assertEqual(summary["scanned"], len(self.files))
+        self.assertEqual(sorted(r["dosya"] for r in records), sorted(self.files))
+        self.assertTrue(all(r["hash"] and r["boyut"] > 0 for r in records))
+
+
+class TestLogging(unittest.TestCase):
+    """Kuyruk tabanlı yapılandırılmış loglama testleri"""
+    
+    def _record(self, level=logging.DEBUG, msg="Temiz dosya: %s", args=("/tmp/a",), **extra):
+        record = logging.LogRecord("Mert Ulupınar", level, __file__, 1, msg, args, None)
+        record.__dict__.update(extra)
+        return record
+    
+    def test_json_formatter(self):
+        """Kayıt tek satır JSON olarak yazılmalı, ek alanlar korunmalı"""
+        line = JsonFormatter().format(self._record(category=LOG_CATEGORY_FILE, hash="abc"))
+        data = json.loads(line)
+        self.assertNotIn("\n", line)
+        self.assertEqual(data["msg"], "Temiz dosya: /tmp/a")
+        self.assertEqual(data["level"], "DEBUG")
+        self.assertEqual(data["category"], LOG_CATEGORY_FILE)
+        self.assertEqual(data["hash"], "abc")
+    
+    def test_sampling_filter(self):
+        """Dosya olaylarından her N kayıtta biri geçmeli, uyarılar hiç elenmemeli"""
+        sampler = SamplingFilter({LOG_CATEGORY_FILE: 10})
+        passed = sum(sampler.filter(self._record(category=LOG_CATEGORY_FILE)) for _ in range(100))
+        self.assertEqual(passed, 10)
+        
+        warnings = sum(sampler.filter(self._record(logging.WARNING, category=LOG_CATEGORY_FILE))
+                       for _ in range(20))
+        self.assertEqual(warnings, 20)
+        self.assertTrue(sampler.filter(self._record()))  # Kategorisiz kayıt
+    
+    def test_deferred_formatting(self):
+        """Kuyruğa eklenen kayıt biçimlendirilmemiş argümanları taşımalı"""
+        import queue
+        q = queue.SimpleQueue()
+        DeferredQueueHandler(q).handle(self._record())
+        record = q.get_nowait()
+        self.assertEqual(record.msg, "Temiz dosya: %s")
+        self.assertEqual(record.args, ("/tmp/a",))
+    
+    def test_configure_logging_idempotent(self):
+        """configure_logging tekrar çağrıldığında ikinci bir handler eklenmemeli"""
+        listener = configure_logging("antivirus.log")
+        self.assertIs(configure_logging("antivirus.log"), listener)
+        handlers = [h for h in logging.getLogger().handlers if isinstance(h, DeferredQueueHandler)]
+        self.assertEqual(len(handlers), 1)
+
+
+class TestSignatureSnapshots(unittest.TestCase):
+    """Generation numaralı imza görüntüsü testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_file = os.path.join(self.temp_dir, "imzalar.json")
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_snapshot_is_immutable(self):
+        """Görüntü değiştirilemez olmalı ve set ile karşılaştırılabilmeli"""
+        snapshot = SignatureStore(self.db_file).publish({"a", "b"})
+        self.assertIsInstance(snapshot, SignatureSnapshot)
+        self.assertEqual(snapshot, {"a", "b"})
+        self.assertFalse(hasattr(snapshot, "add"))
+    
+    def test_generation_increases_on_publish(self):
+        """Her yayımlama generation numarasını artırmalı"""
+        store = SignatureStore(self.db_file)
+        first = store.publish({"a"})
+        second = store.publish({"a", "b"})
+        self.assertEqual(second.generation, first.generation + 1)
+        self.assertIs(store.snapshot(), second)
+        self.assertNotIn("b", first)  # Eski görüntü etkilenmemeli
+    
+    def test_other_process_update(self):
+        """Başka bir deponun yayımladığı imzalar aynı generation ile görülmeli"""
+        reader = SignatureStore(self.db_file, check_interval=0)
+        writer = SignatureStore(self.db_file)
+        writer.publish({"a"})
+        self.assertEqual(reader.snapshot(), {"a"})
+        
+        published = writer.publish({"a", "b"})
+        snapshot = reader.snapshot()
+        self.assertEqual(snapshot, {"a", "b"})
+        self.assertEqual(snapshot.generation, published.generation)
+    
+    def test_reload_is_rate_limited(self):
+        """Kontrol aralığı dolmadan dosya yeniden okunmamalı"""
+        store = SignatureStore(self.db_file, check_interval=3600)
+        SignatureStore(self.db_file).publish({"a"})
+        first = store.snapshot()
+        SignatureStore(self.db_file).publish({"a", "b"})
+        self.assertIs(store.snapshot(), first)
+        self.assertEqual(store.refresh(), {"a", "b"})
+    
+    def test_running_scan_picks_up_new_generation(self):
+        """Çalışan tarama yeni imzaları sonraki dosyada kullanmalı"""
+        files = []
+        for i in range(3):
+            path = os.path.join(self.temp_dir, f"dosya_{i}.bin")
+            with open(path, "wb") as f:
+                f.write(f"içerik {i}".encode())
+            files.append(path)
+        
+        original = load_virus_signatures()
+        report = os.path.join(self.temp_dir, "rapor.jsonl")
+        try:
+            save_virus_signatures(set())
+            sink = ReportSink(report)
+            thread = ScanThread(self.temp_dir, parallel=False, report_sink=sink)
+            thread._get_files = lambda: list(files)
+            
+            def on_result(path, is_virus):
+                if path == files[0]:
+                    # İlk dosyadan sonra tüm dosyaları imzalara ekle
+                    save_virus_signatures({calculate_hash(p) for p in files})
+            
+            thread.result.connect(on_result)
+            thread.run()
+            sink.close()
+        finally:
+            save_virus_signatures(original)
+        
+        records = list(iter_report(report))
+        self.assertEqual(records[0]["durum"], "Temiz")
+        self.assertEqual([r["durum"] for r in records[1:]], ["Tehlikeli", "Tehlikeli"])
+        self.assertEqual(records[1]["imza_nesli"], records[0]["imza_nesli"] + 1)
+
+
+class TestDirTreeCache(unittest.TestCase):
+    """Artımlı tarama dizin ağacı önbelleği testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "kok")
+        self.db = os.path.join(self.temp_dir, "dirtree.sqlite3")
+        self._write("a/x.txt", b"x")
+        self._write("b/c/y.txt", b"y")
+        self._age()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _write(self, rel, data):
+        path = os.path.join(self.root, rel)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+    
+    def _age(self, offset=0):
+        """Zaman damgalarını geçmişe çek (çok yeni damgalara güvenilmez)"""
+        stamp = 1_000_000_000 + offset
+        for directory, _, files in os.walk(self.root, topdown=False):
+            for name in files:
+                os.utime(os.path.join(directory, name), (stamp, stamp))
+            os.utime(directory, (stamp, stamp))
+    
+    def _walk(self, **kwargs):
+        cache = DirTreeCache(self.db, **kwargs)
+        entries = {os.path.relpath(e.path, self.root): e for e in cache.walk(self.root)}
+        return cache, entries
+    
+    def test_unchanged_tree_is_reused(self):
+        """Değişmeyen ağaçta hiçbir dizin yeniden listelenmemeli"""
+        cache, entries = self._walk()
+        self.assertEqual(cache.stats.rescanned_dirs, 4)
+        for entry in entries.values():
+            cache.record_hash(entry.path, calculate_hash(entry.path))
+        cache.close()
+        
+        cache, entries = self._walk()
+        self.assertEqual(cache.stats.rescanned_dirs, 0)
+        self.assertEqual(cache.stats.reused_dirs, 4)
+        self.assertEqual(sorted(entries), ["a/x.txt", "b/c/y.txt"])
+        self.assertEqual(entries["a/x.txt"].hash, calculate_hash(os.path.join(self.root, "a/x.txt")))
+        cache.close()
+    
+    def test_only_changed_branch_is_rescanned(self):
+        """Yalnızca değişen dizin listelenmeli, diğer dizinler önbellekten gelmeli"""
+        cache, entries = self._walk()
+        for entry in entries.values():
+            cache.record_hash(entry.path, calculate_hash(entry.path))
+        cache.close()
+        
+        self._write("b/c/w.txt", b"w")
+        c_dir = os.path.join(self.root, "b", "c")
+        os.utime(os.path.join(c_dir, "w.txt"), (1_000_000_500, 1_000_000_500))
+        os.utime(c_dir, (1_000_000_500, 1_000_000_500))
+        
+        cache, entries = self._walk()
+        self.assertEqual(cache.stats.rescanned_dirs, 1)
+        self.assertEqual(cache.stats.reused_dirs, 3)
+        self.assertIsNone(entries["b/c/w.txt"].hash)
+        self.assertIsNotNone(entries["b/c/y.txt"].hash)  # Değişmeyen dosyanın hash'i korunur
+        self.assertIsNotNone(entries["a/x.txt"].hash)
+        cache.close()
+    
+    def test_removed_subtree(self):
+        """Silinen dizinin kayıtları önbellekten kaldırılmalı"""
+        self._walk()[0].close()
+        shutil.rmtree(os.path.join(self.root, "b"))
+        self._age(offset=200)
+        
+        cache, entries = self._walk()
+        self.assertEqual(sorted(entries), ["a/x.txt"])
+        self.assertEqual(cache.stats.removed_dirs, 2)
+        self.assertEqual(cache._load(os.path.join(self.root, "b", "c")), [])
+        cache.close()
+    
+    def test_in_place_modification(self):
+        """Yerinde değişiklik yalnızca stat_files=True ile fark edilmeli"""
+        cache, entries = self._walk()
+        for entry in entries.values():
+            cache.record_hash(entry.path, calculate_hash(entry.path))
+        cache.close()
+        
+        path = os.path.join(self.root, "a", "x.txt")
+        with open(path, "wb") as f:
+            f.write(b"degisti")
+        os.utime(path, (1_000_000_300, 1_000_000_300))
+        
+        cache, entries = self._walk()
+        self.assertIsNotNone(entries["a/x.txt"].hash)  # Belgelenmiş sınırlama
+        cache.close()
+        
+        cache, entries = self._walk(stat_files=True)
+        self.assertIsNone(entries["a/x.txt"].hash)
+        cache.close()
+    
+    def test_incremental_scan_uses_new_signatures(self):
+        """Önbellekteki hash'ler güncel imzalarla yeniden değerlendirilmeli"""
+        original = load_virus_signatures()
+        target = os.path.join(self.root, "b", "c", "y.txt")
+        try:
+            save_virus_signatures(set())
+            with DirTreeCache(self.db) as cache:
+                ScanThread(self.root, parallel=False, tree_cache=cache).run()
+            
+            save_virus_signatures({calculate_hash(target)})
+            infected = []
+            summary = {}
+            with DirTreeCache(self.db) as cache:
+                thread = ScanThread(self.root, parallel=False, tree_cache=cache)
+                thread.result.connect(lambda p, v: v and infected.append(p))
+                thread.summary.connect(summary.update)
+                thread.run()
+        finally:
+            save_virus_signatures(original)
+        
+        self.assertEqual(infected, [target])
+        self.assertEqual(summary["known_files"], 2)
+        self.assertEqual(summary["rescanned_dirs"], 0)
+    
+    @unittest.skipIf(sys.platform in ("win32", "darwin"), "UTF-8 olmayan dosya adı gerekir")
+    def test_non_utf8_names(self):
+        """UTF-8 olmayan adlar önbelleğe yazılmalı, yeniden kullanılmalı ve silinince temizlenmeli"""
+        bad_dir = os.fsdecode(b"\xffdizin")
+        bad_file = os.fsdecode(b"\xfezarar.bin")
+        self._write(f"a/{bad_file}", b"z")
+        self._write(f"{bad_dir}/alt/{bad_file}", b"w")
+        self._age()
+        expected = {"a/x.txt", "b/c/y.txt", f"a/{bad_file}", f"{bad_dir}/alt/{bad_file}"}
+        
+        cache, entries = self._walk()
+        self.assertEqual(set(entries), expected)
+        for entry in entries.values():
+            cache.record_hash(entry.path, "0" * 32)
+        cache.close()
+        
+        cache, entries = self._walk()
+        self.assertEqual(set(entries), expected)
+        self.assertEqual(cache.stats.rescanned_dirs, 0)
+        self.assertTrue(all(entry.hash == "0" * 32 for entry in entries.values()))
+        cache.close()
+        
+        shutil.rmtree(os.path.join(self.root, bad_dir))
+        self._age(10)
+        cache, entries = self._walk()
+        self.assertEqual(cache.stats.removed_dirs, 2)
+        self.assertEqual(cache._db.execute("SELECT COUNT(*) FROM dirs WHERE typeof(path) = 'blob'").fetchone(), (0,))
+        cache.close()
+    
+    def test_headless_incremental_sees_in_place_edits(self):
+        """--incremental, dizin zaman damgası değişmeyen yerinde düzenlemeyi görmeli"""
+        original = load_virus_signatures()
+        target = os.path.join(self.root, "a", "x.txt")
+        cache_factory = lambda **kwargs: DirTreeCache(self.db, **kwargs)
+        try:
+            with mock.patch("PyVirüs.DirTreeCache", cache_factory):
+                run_headless_scan(self.root, incremental=True)
+                self._write("a/x.txt", b"yerinde degisen zararli icerik")
+                os.utime(target, (1_000_000_100, 1_000_000_100))
+                os.utime(os.path.dirname(target), (1_000_000_000, 1_000_000_000))
+                save_virus_signatures({calculate_hash(target)})
+                summary = run_headless_scan(self.root, incremental=True)
+        finally:
+            save_virus_signatures(original)
+        
+        self.assertEqual(summary["infected"], 1)
+
+
+class TestParallelWalk(unittest.TestCase):
+    """Paralel dizin gezinme testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for d in range(6):
+            for sub in ("src", "node_modules", "logs"):
+                path = os.path.join(self.temp_dir, f"proje_{d}", sub)
+                os.makedirs(path)
+                for f in range(4):
+                    with open(os.path.join(path, f"dosya_{f}.{'log' if sub == 'logs' else 'py'}"), "w") as fh:
+                        fh.write("x" * f)
+        with open(os.path.join(self.temp_dir, "proje_0", ".pyvirusignore"), "w") as f:
+            f.write("src/\n")
+        os.symlink(self.temp_dir, os.path.join(self.temp_dir, "proje_1", "dongu"))
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_same_files_as_serial(self):
+        """Paralel gezinme seri gezinmeyle aynı dosyaları ve sayaçları vermeli"""
+        walk_filter = WalkFilter(exclude=["node_modules/", "*.log"], min_size=1)
+        serial_stats, parallel_stats = WalkStats(), WalkStats()
+        serial = set(walk_files(self.temp_dir, walk_filter, serial_stats))
+        parallel = set(parallel_walk_files(self.temp_dir, walk_filter, parallel_stats, workers=4))
+        self.assertEqual(parallel, serial)
+        self.assertEqual(len(serial), 5 * 3 + 1)  # .pyvirusignore dahil
+        self.assertEqual(parallel_stats.as_dict(), serial_stats.as_dict())
+    
+    def test_symlink_loop_protection(self):
+        """Bağlantılar takip edilse bile döngü sonsuz gezinmeye yol açmamalı"""
+        files = list(parallel_walk_files(self.temp_dir, follow_symlinks=True, workers=4))
+        self.assertEqual(len(files), len(set(files)))
+        self.assertEqual(len(files), 6 * 3 * 4 + 1)  # .pyvirusignore dahil
+    
+    def test_stop(self):
+        """should_continue False dönünce gezinme durmalı"""
+        self.assertEqual(list(parallel_walk_files(self.temp_dir, should_continue=lambda: False)), [])
+
+
+class TestPageCacheAdvisor(unittest.TestCase):
+    """Page cache modu testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = []
+        for i in range(12):
+            path = os.path.join(self.temp_dir, f"dosya_{i}.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(SMALL_FILE_LIMIT * (2 if i % 2 else 0) + 100))
+            self.files.append(path)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_invalid_mode(self):
+        """Bilinmeyen mod ValueError vermeli"""
+        with self.assertRaises(ValueError):
+            PageCacheAdvisor("hepsi")
+    
+    def test_hash_unchanged(self):
+        """Cache modu hash sonucunu değiştirmemeli"""
+        for path in self.files:
+            self.assertEqual(calculate_hash(path, cache_mode=CACHE_MODE_DROP), calculate_hash(path))
+    
+    def test_scan_results_unchanged(self):
+        """Önceden okuma ile paralel tarama aynı sonuçları vermeli"""
+        sigs = {calculate_hash(self.files[3])}
+        expected = {r.path: r.is_virus for r in iter_scan_results(self.files, sigs, 2)}
+        for mode in (CACHE_MODE_PREFETCH, CACHE_MODE_DROP):
+            advisor = PageCacheAdvisor(mode)
+            found = {r.path: r.is_virus for r in iter_scan_results(self.files, sigs, 2, advisor=advisor)}
+            self.assertEqual(found, expected)
+            self.assertEqual(advisor.prefetched, len(self.files) // 2)  # Yalnızca büyük dosyalar
+    
+    def test_unopened_prefetches_do_not_accumulate(self):
+        """Önceden okunup hiç açılmayan dosyaların kayıtları sınırlı kalmalı ve close() ile atılmalı"""
+        advisor = PageCacheAdvisor(CACHE_MODE_DROP)
+        with mock.patch("io_scheduler.PREFETCH_PENDING_LIMIT", 4):
+            for path in self.files:
+                advisor.prefetch(path)
+        self.assertEqual(advisor.prefetched, len(self.files))
+        self.assertEqual(list(advisor._resident), self.files[-4:])
+        
+        with open(self.files[-1], "rb") as f:
+            advisor.begin(f.fileno(), self.files[-1])
+        self.assertEqual(len(advisor._resident), 3)
+        advisor.close()
+        self.assertEqual(len(advisor._resident), 0)
+    
+    def test_drop_only_cold_files(self):
+        """Taramadan önce cache'te olan dosyalar bırakılmamalı"""
+        # Gerçek cache durumu ortama bağlı: yerleşiklik ve fadvise çağrıları taklit edilir
+        hot, cold = self.files[1], self.files[3]
+        hot_inode = os.stat(hot).st_ino
+        advice = []
+        
+        def resident(fd):
+            return os.fstat(fd).st_ino == hot_inode
+        
+        def fadvise(fd, offset, length, advice_name):
+            advice.append((os.fstat(fd).st_ino, advice_name))
+        
+        advisor = PageCacheAdvisor(CACHE_MODE_DROP)
+        with mock.patch("io_scheduler.page_cache_resident", side_effect=resident), \
+                mock.patch("io_scheduler._fadvise", side_effect=fadvise):
+            for path in (hot, cold):
+                with open(path, "rb") as f:
+                    is_resident = advisor.begin(f.fileno(), path)
+                    f.read()
+                    advisor.end(f.fileno(), is_resident)
+        
+        self.assertEqual((advisor.kept_hot, advisor.dropped), (1, 1))
+        dropped = [inode for inode, name in advice if name == "POSIX_FADV_DONTNEED"]
+        self.assertEqual(dropped, [os.stat(cold).st_ino])
+    
+    def test_end_after_growth_and_read_errors(self):
+        """Büyüyen küçük dosyada ve okuma hatasında da end() çağrılmalı"""
+        class GrowingAdvisor(PageCacheAdvisor):
+            def begin(self, fd, path):
+                # fstat ile okuma arasında dosya büyür
+                with open(path, "ab") as f:
+                    f.write(b"x" * 16)
+                return super().begin(fd, path)
+        
+        small, large = self.files[0], self.files[1]
+        with mock.patch("io_scheduler.page_cache_resident", return_value=False), \
+                mock.patch("io_scheduler._fadvise"):
+            advisor = GrowingAdvisor(CACHE_MODE_DROP)
+            results, large_files = scan_file_batch([small], set(), advisor)
+            self.assertEqual((results, large_files), ([], [small]))
+            self.assertEqual(advisor.dropped, 1)
+            
+            advisor = PageCacheAdvisor(CACHE_MODE_DROP)
+            with mock.patch("PyVirüs.data_extents", side_effect=OSError("okuma hatası")):
+                self.assertEqual(_digest_file(large, advisor=advisor), (None, -1))
+            self.assertEqual(advisor.dropped, 1)
+
+
+class TestThrottle(unittest.TestCase):
+    """G/Ç ve CPU sınırlama testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.files = []
+        for i in range(20):
+            path = os.path.join(self.temp_dir, f"dosya_{i}.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(4096 * (i + 1)))
+            self.files.append(path)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_unlimited_does_not_wait(self):
+        """Sınır yoksa acquire beklememeli"""
+        bucket = TokenBucket(None)
+        start = time.perf_counter()
+        for _ in range(10000):
+            bucket.acquire(1 << 20)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(bucket.waited, 0.0)
+    
+    def test_rate_is_steady(self):
+        """Paylaşılan kova toplam hızı tutturmalı"""
+        bucket = TokenBucket(200)
+        
+        def worker():
+            for _ in range(15):
+                bucket.acquire(1)
+        
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        # 60 token, 200/s ve en fazla 10 tokenlık patlama: en az ~0.25 s
+        self.assertGreater(elapsed, 0.2)
+        self.assertLess(elapsed, 1.5)
+    
+    def test_rate_change_applies_to_waiters(self):
+        """Sınır kaldırılınca bekleyen thread hemen devam etmeli"""
+        bucket = TokenBucket(1)
+        bucket.acquire(1)
+        done = threading.Event()
+        waiter = threading.Thread(target=lambda: (bucket.acquire(100), done.set()))
+        waiter.start()
+        time.sleep(0.05)
+        self.assertFalse(done.is_set())
+        bucket.set_rate(None)
+        self.assertTrue(done.wait(1.0))
+        waiter.join()
+    
+    def test_duty_cycle_sleeps(self):
+        """CPU payı sınırı iş biriktikçe uyumalı"""
+        duty = DutyCycle(0.5)
+        duty.pause()
+        end = time.thread_time() + 0.05
+        while time.thread_time() < end:
+            duty.pause()
+        self.assertGreater(duty.slept, 0.02)
+    
+    def test_invalid_ioprio_class(self):
+        """Bilinmeyen ioprio sınıfı ValueError vermeli"""
+        with self.assertRaises(ValueError):
+            ScanThrottle(ioprio_class="hızlı")
+    
+    def test_scan_results_unchanged(self):
+        """Sınırlı tarama aynı sonuçları vermeli ve süreyi raporlamalı"""
+        sigs = {calculate_hash(self.files[5])}
+        expected = {r.path: r.is_virus for r in iter_scan_results(self.files, sigs, 4)}
+        throttle = ScanThrottle(bytes_per_sec=4 << 20, files_per_sec=200)
+        found = {r.path: r.is_virus for r in iter_scan_results(self.files, sigs, 4, throttle=throttle)}
+        self.assertEqual(found, expected)
+        self.assertTrue(throttle.enabled)
+        self.assertGreater(throttle.as_dict()["throttled_seconds"], 0)
+    
+    def test_each_file_charged_once(self):
+        """Hızlı yoldan akış yoluna bırakılan büyük dosyalar dosya/s payını iki kez harcamamalı"""
+        throttle = ScanThrottle(files_per_sec=10000)
+        with mock.patch.object(throttle, "before_file", wraps=throttle.before_file) as before_file:
+            results = list(iter_scan_results(self.files, set(), 4, throttle=throttle))
+        self.assertEqual(len(results), len(self.files))
+        self.assertEqual(before_file.call_count, len(self.files))
+
+
+class TestInMemoryScan(unittest.TestCase):
+    """Bellek ve akış tarama testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.data = os.urandom(200000)
+        self.path = os.path.join(self.temp_dir, "yukleme.bin")
+        with open(self.path, "wb") as f:
+            f.write(self.data)
+        self.sigs = SignatureSnapshot({calculate_hash(self.path)}, generation=3)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_scan_bytes_matches_file(self):
+        """scan_bytes, inspect_file ile aynı kararı vermeli"""
+        expected = inspect_file(self.path, self.sigs)
+        for buffer in (self.data, bytearray(self.data), memoryview(self.data)):
+            verdict = scan_bytes(buffer, self.sigs, name="yukleme")
+            self.assertTrue(verdict.is_virus)
+            self.assertEqual(verdict.file_hash, expected.file_hash)
+            self.assertEqual(verdict.size, len(self.data))
+            self.assertEqual(verdict.generation, 3)
+            self.assertEqual(verdict.path, "yukleme")
+    
+    def test_scan_bytes_slices_and_noncontiguous(self):
+        """memoryview dilimi ve bitişik olmayan görünüm doğru hash'lenmeli"""
+        view = memoryview(self.data)
+        part = scan_bytes(view[100:5000], set())
+        self.assertEqual(part.file_hash, hashlib.md5(self.data[100:5000]).hexdigest())
+        strided = scan_bytes(view[::2], set())
+        self.assertEqual(strided.file_hash, hashlib.md5(self.data[::2]).hexdigest())
+        self.assertFalse(strided.is_virus)
+    
+    def test_scan_stream_sources(self):
+        """Dosya, read()-only nesne ve iterable aynı sonucu vermeli"""
+        class ReadOnly:
+            def __init__(self, data):
+                self._io = io.BytesIO(data)
+            
+            def read(self, size=-1):
+                return self._io.read(size)
+        
+        chunks = [self.data[i:i + 7000] for i in range(0, len(self.data), 7000)]
+        with open(self.path, "rb") as f:
+            sources = [f, io.BytesIO(self.data), ReadOnly(self.data), iter(chunks)]
+            for source in sources:
+                verdict = scan_stream(source, self.sigs, chunk_size=4096)
+                self.assertTrue(verdict.is_virus)
+                self.assertEqual(verdict.size, len(self.data))
+    
+    def test_scan_async_stream(self):
+        """Async iterable kaynak await edilebilir sonuç döndürmeli"""
+        async def body():
+            for i in range(0, len(self.data), 9000):
+                await asyncio.sleep(0)
+                yield self.data[i:i + 9000]
+        
+        verdict = asyncio.run(scan_stream(body(), self.sigs, name="istek"))
+        self.assertTrue(verdict.is_virus)
+        self.assertEqual(verdict.path, "istek")
+        self.assertEqual(verdict.size, len(self.data))
+    
+    def test_scan_stream_read_error(self):
+        """Okuma hatası hash'siz temiz sonuç vermeli"""
+        def broken():
+            yield b"abc"
+            raise IOError("bağlantı koptu")
+        
+        verdict = scan_stream(broken(), self.sigs)
+        self.assertFalse(verdict.is_virus)
+        self.assertIsNone(verdict.file_hash)
+
+
+class TestAllowlist(unittest.TestCase):
+    """Bilinen temiz dosya listesi testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.list_path = os.path.join(self.temp_dir, "allowlist.bin")
+        self.files = []
+        for i in range(30):
+            path = os.path.join(self.temp_dir, f"paket_{i}.bin")
+            with open(path, "wb") as f:
+                f.write(os.urandom(100 + i * 1000))
+            self.files.append(path)
+        # Dosyaların üçte biri bilinen temiz
+        self.known = self.files[::3]
+        build_allowlist(self.list_path, [(calculate_hash(p), os.path.getsize(p)) for p in self.known])
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def test_lookup(self):
+        """Listedeki hash bulunmalı, boyut uyuşmazlığı reddedilmeli"""
+        with Allowlist(self.list_path) as allowlist:
+            self.assertEqual(len(allowlist), len(self.known))
+            for path in self.known:
+                self.assertTrue(allowlist.contains(calculate_hash(path), os.path.getsize(path)))
+                self.assertTrue(allowlist.contains(calculate_hash(path)))
+                self.assertFalse(allowlist.contains(calculate_hash(path), 1))
+            for path in self.files[1::3]:
+                self.assertFalse(allowlist.contains(calculate_hash(path)))
+            self.assertFalse(allowlist.contains("geçersiz"))
+    
+    def test_build_streams_through_external_sort(self):
+        """Birden çok sıralama parçasıyla kurulan liste sıralı ve tekrarsız olmalı"""
+        hashes = [hashlib.md5(str(i).encode()).hexdigest() for i in range(50)]
+        entries = [(h, i) for i, h in enumerate(hashes)] * 2 + [(h, None) for h in hashes[:5]]
+        entries.append(("gecersiz", 1))
+        list_path = os.path.join(self.temp_dir, "akis.bin")
+        sort_dir = os.path.join(self.temp_dir, "siralama")
+        os.makedirs(sort_dir)
+        
+        self.assertEqual(build_allowlist(list_path, entries, run_size=7, tmp_dir=sort_dir), 55)
+        with Allowlist(list_path) as allowlist:
+            records = list(allowlist)
+            self.assertEqual(records, sorted(set((h, i) for i, h in enumerate(hashes))
+                                             | {(h, None) for h in hashes[:5]},
+                                             key=lambda r: (r[0], r[1] is None, r[1] or 0)))
+            self.assertTrue(all(allowlist.contains(h, i) for i, h in enumerate(hashes)))
+        self.assertEqual(os.listdir(sort_dir), [])
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")])
+    
+    def test_prefilter_rejects_without_table(self):
+        """Rastgele hash'lerin çoğu ön filtrede elenmeli"""
+        with Allowlist(self.list_path) as allowlist:
+            for _ in range(1000):
+                allowlist.contains(os.urandom(16).hex())
+            self.assertGreater(allowlist.prefilter_rejects, 950)
+    
+    def test_import_nsrl_and_plain_list(self):
+        """NSRL CSV'si ve düz liste mevcut listeyle birleştirilmeli"""
+        nsrl = os.path.join(self.temp_dir, "NSRLFile.txt")
+        with open(nsrl, "w", encoding="utf-8") as f:
+            f.write('"SHA-1","MD5","CRC32","FileName","FileSize","ProductCode","OpSystemCode","SpecialCode"\n')
+            f.write(f'"00","{calculate_hash(self.files[1]).upper()}","00","a.dll",'
+                    f'"{os.path.getsize(self.files[1])}","1","1",""\n')
+        plain = os.path.join(self.temp_dir, "hashes.txt")
+        with open(plain, "w", encoding="utf-8") as f:
+            f.write("# yorum\n")
+            f.write(f"{calculate_hash(self.files[2])}\n")
+            f.write(f"{calculate_hash(self.files[4])},{os.path.getsize(self.files[4])}\n")
+        
+        self.assertEqual(len(list(iter_hash_source(nsrl))), 1)
+        count = import_allowlist(self.list_path, [nsrl, plain])
+        self.assertEqual(count, len(self.known) + 3)
+        with Allowlist(self.list_path) as allowlist:
+            for path in (self.files[1], self.files[2], self.files[4]):
+                self.assertTrue(allowlist.contains(calculate_hash(path), os.path.getsize(path)))
+    
+    def test_invalid_file(self):
+        """Bozuk dosya ValueError vermeli"""
+        broken = os.path.join(self.temp_dir, "bozuk.bin")
+        with open(broken, "wb") as f:
+            f.write(b"PVALLOW1" + b"\0" * 40)
+        with self.assertRaises(ValueError):
+            Allowlist(broken)
+    
+    def test_allowlist_short_circuits_scan(self):
+        """Allowlist'teki dosya imzalarla karşılaştırılmadan temiz sayılmalı"""
+        sigs = {calculate_hash(self.files[0]), calculate_hash(self.files[1])}
+        with Allowlist(self.list_path) as allowlist:
+            verdicts = {v.path: v for v in iter_scan_results(self.files, sigs, 4, allowlist=allowlist)}
+            self.assertEqual(verdicts[self.files[0]].engine, ENGINE_ALLOWLIST)
+            self.assertFalse(verdicts[self.files[0]].is_virus)
+            self.assertTrue(verdicts[self.files[1]].is_virus)
+            hits = sum(1 for v in verdicts.values() if v.engine == ENGINE_ALLOWLIST)
+            self.assertEqual(hits, len(self.known))
+            self.assertEqual(inspect_file(self.files[3], sigs, allowlist=allowlist).engine, ENGINE_ALLOWLIST)
+
+
+class TestScanProfiler(unittest.TestCase):
+    """Tarama profilleme testleri"""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.scan_dir = os.path.join(self.temp_dir, "tarama")
+        os.makedirs(self.scan_dir)
+        for i in range(40):
+            with open(os.path.join(self.scan_dir, f"dosya_{i}.bin"), "wb") as f:
+                f.write(os.urandom(2000 + i * 500))
+        self.profile_dir = os.path.join(self.temp_dir, "profiller")
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    
+    def _scan(self, mode, report_sink=None):
+        profiler = ScanProfiler(mode, self.profile_dir, interval=0.001)
+        summary = {}
+        thread = ScanThread(self.scan_dir, max_workers=4, profiler=profiler, report_sink=report_sink)
+        thread.summary.connect(summary.update)
+        thread.run()
+        return profiler, summary
+    
+    def test_invalid_mode(self):
+        """Bilinmeyen mod ValueError vermeli"""
+        with self.assertRaises(ValueError):
+            ScanProfiler("perf")
+    
+    def test_cprofile_merges_worker_threads(self):
+        """pstats çıktısı işçi thread'lerindeki fonksiyonları içermeli"""
+        profiler, summary = self._scan(PROFILE_CPROFILE)
+        outputs = summary["profile"]
+        self.assertFalse(profiler.running)
+        stats = pstats.Stats(outputs["pstats"])
+        names = {name for (_, _, name) in stats.stats}
+        self.assertIn("scan_file_batch", names)
+        self.assertIn("_prepare_files", names)
+        
+        with open(outputs["breakdown"], encoding="utf-8") as f:
+            breakdown = json.load(f)
+        self.assertEqual(set(breakdown["phases"]), {"walk", "prepare", "scan", "finalize"})
+        self.assertTrue(breakdown["top_functions"])
+    
+    def test_sampling_writes_collapsed_stacks(self):
+        """Örnekleme modu flame graph için collapsed-stack dosyası yazmalı"""
+        _, summary = self._scan(PROFILE_SAMPLING)
+        with open(summary["profile"]["collapsed"], encoding="utf-8") as f:
+            lines = f.read().splitlines()
+        for line in lines:
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(stack)
+            self.assertGreater(int(count), 0)
+    
+    def test_breakdown_attached_to_report(self):
+        """Zaman dökümü raporun yanına eklenmeli, rapor kayıtları değişmemeli"""
+        report_path = os.path.join(self.temp_dir, "rapor.jsonl")
+        sink = ReportSink(report_path)
+        _, summary = self._scan(PROFILE_SAMPLING, report_sink=sink)
+        sink.close()
+        attachment = summary["profile"]["report"]
+        self.assertEqual(attachment, os.path.join(self.temp_dir, "rapor.profile.json"))
+        with open(attachment, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["mode"], PROFILE_SAMPLING)
+        self.assertEqual(len(list(iter_report(report_path))), 40)
+
+
+class TestScanScheduler(unittest.TestCase):
+    """Paylaşılan işçi havuzlu iş zamanlayıcısı testleri"""
+    
+    def setUp(self):
+        self.gate = threading.Event()
+        self.scanned = []
+        self.lock = threading.Lock()
+        self.scheduler = ScanScheduler(1, self._scan)
+    
+    def tearDown(self):
+        self.gate.set()
+        self.scheduler.shutdown()
+    
+    def _scan(self, path, signatures):
+        self.gate.wait(5)
+        with self.lock:
+            self.scanned.append(path)
+        return path
+    
+    def _block(self):
+        """Tek işçiyi bir bekleyen dosyada tutar."""
+        blocker = self.scheduler.submit(["engel"], name="engel")
+        time.sleep(0.05)
+        return blocker
+    
+    def test_overlapping_jobs_scan_once(self):
+        """Birden çok işte bekleyen dosya bir kez taranmalı, sonuç her işe gitmeli"""
+        self._block()
+        first = self.scheduler.submit([f"d{i}" for i in range(10)])
+        second = self.scheduler.submit([f"d{i}" for i in range(5, 15)])
+        self.assertEqual(second.shared, 5)
+        self.gate.set()
+        self.assertEqual(sorted(first.results()), sorted(f"d{i}" for i in range(10)))
+        self.assertEqual(sorted(second.results()), sorted(f"d{i}" for i in range(5, 15)))
+        self.assertEqual(len(self.scanned), len(set(self.scanned)))
+        self.assertEqual(first.state, JOB_DONE)
+        self.assertEqual(second.progress, 100)
+    
+    def test_priority_order(self):
+        """Yüksek öncelikli iş önce taranmalı"""
+        self._block()
+        low = self.scheduler.submit(["l1", "l2", "l3"], priority=PRIORITY_LOW)
+        high = self.scheduler.submit(["h1", "h2"], priority=PRIORITY_HIGH)
+        self.gate.set()
+        low.wait(5)
+        high.wait(5)
+        self.assertEqual(self.scanned, ["engel", "h1", "h2", "l1", "l2", "l3"])
+    
+    def test_batches_and_separate_files(self):
+        """Dosyalar gruplar halinde taranmalı, ayrılanlar tek tek ve önceden okunarak taranmalı"""
+        self.gate.set()
+        batches, prefetched = [], []
+        
+        def scan_batch(paths, signatures):
+            batches.append(list(paths))
+            return ({path: path for path in paths if path.startswith("k")},
+                    [path for path in paths if path.startswith("b")])
+        
+        files = ["k1", "b1", "k2", "b2", "k3", "b3", "k4"]
+        job = self.scheduler.submit(files, batch_func=scan_batch, batch_size=3, prefetch=prefetched.append)
+        self.assertTrue(job.wait(5))
+        self.assertEqual(batches, [["k1", "b1", "k2"], ["b2", "k3", "b3"], ["k4"]])
+        self.assertEqual(self.scanned, ["b1", "b2", "b3"])
+        self.assertEqual(prefetched, ["b3"])
+        self.assertEqual(sorted(job.results()), sorted(files))
+        self.assertEqual(job.state, JOB_DONE)
+    
+    def test_pause_and_resume(self):
+        """Duraklatılan iş yeni dosya almamalı, devam edince tamamlanmalı"""
+        self.gate.set()
+        progress = []
+        job = self.scheduler.submit(["p1", "p2", "p3"], on_progress=progress.append)
+        job.pause()
+        job.wait(0.1)
+        paused_at = job.completed
+        other = self.scheduler.submit(["o1"])
+        self.assertTrue(other.wait(5))
+        self.assertEqual(job.completed, paused_at)
+        job.resume()
+        self.assertTrue(job.wait(5))
+        self.assertEqual(job.completed, 3)
+        self.assertEqual(progress[-1], 100)
+    
+    def test_cancel(self):
+        """İptal edilen işin akışı kapanmalı, paylaşılan dosya diğer işe gitmeli"""
+        self._block()
+        finished = []
+        cancelled = self.scheduler.submit(["c1", "ortak"], on_finished=finished.append)
+        other = self.scheduler.submit(["ortak"])
+        cancelled.cancel()
+        self.assertEqual(list(cancelled.results()), [])
+        self.assertEqual(cancelled.state, JOB_CANCELLED)
+        self.assertEqual(finished, [cancelled])
+        self.gate.set()
+        self.assertEqual(list(other.results()), ["ortak"])
+        self.assertNotIn("c1", self.scanned)
+    
+    def test_scan_threads_share_pool(self):
+        """Zamanlayıcılı ScanThread'ler aynı sonuçları vermeli"""
+        temp_dir = tempfile.mkdtemp()
+        try:
+            sub = os.path.join(temp_dir, "alt")
+            os.makedirs(sub)
+            for i in range(12):
+                with open(os.path.join(temp_dir if i % 2 else sub, f"dosya_{i}.bin"), "wb") as f:
+                    f.write(os.urandom(300 + i))
+            virus = os.path.join(sub, "dosya_0.bin")
+            sigs = {calculate_hash(virus)}
+            scheduler = ScanScheduler(2, scan_file_parallel, lambda: sigs)
+            try:
+                outer, inner = [], []
+                for root, found in ((temp_dir, outer), (sub, inner)):
+                    thread = ScanThread(root, scheduler=scheduler)
+                    thread.result.connect(lambda path, is_virus, found=found: found.append((path, is_virus)))
+                    thread.run()
+                self.assertEqual(len(outer), 12)
+                self.assertEqual(len(inner), 6)
+                self.assertIn((virus, True), outer)
+                self.assertIn((virus, True), inner)
+            finally:
+                scheduler.shutdown()
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+class TestResultStore(unittest.TestCase):
+    """Sütunlu sonuç deposu testleri"""
+    
+    def setUp(self):
+        self.spill_parent = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.spill_parent, ignore_errors=True)
+    
+    def _rows(self, count):
+        for i in range(count):
+            yield (os.path.join("/veri", f"klasor{i % 7}", f"dosya{i}.bin"), i % 10 == 0,
+                   hashlib.md5(str(i).encode()).hexdigest() if i % 3 else None,
+                   i * 10, i / 1000, "hash" if i % 2 else "cache", i % 4)
+    
+    def test_round_trip(self):
+        """Eklenen satırlar aynı alanlarla geri okunmalı"""
+        with ResultStore(spill_dir=self.spill_parent) as store:
+            rows = list(self._rows(100))
+            for row in rows:
+                store.append(*row)
+            self.assertEqual(len(store), 100)
+            for index, row in enumerate(rows):
+                stored = store[index]
+                self.assertIsInstance(stored, StoredResult)
+                self.assertEqual(stored.path, row[0])
+                self.assertEqual(stored.is_virus, row[1])
+                self.assertEqual(stored.file_hash, row[2])
+                self.assertEqual(stored.size, row[3])
+                self.assertAlmostEqual(stored.elapsed, row[4], places=5)
+                self.assertEqual(stored.engine, row[5])
+                self.assertEqual(stored.generation, row[6])
+            self.assertEqual(list(store.iter_paths()), [row[0] for row in rows])
+            self.assertEqual(store.stats()["infected"], 10)
+    
+    def test_paths_interned(self):
+        """Aynı dizindeki dosyalar tek dizin kaydını paylaşmalı"""
+        with ResultStore(spill_dir=self.spill_parent) as store:
+            for row in self._rows(200):
+                store.append(*row)
+            self.assertEqual(store.stats()["directories"], 7)
+    
+    def test_spill_to_disk(self):
+        """Bellek bütçesi aşılınca segmentler diske yazılmalı ve okunabilmeli"""
+        store = ResultStore(memory_budget=2000, spill_dir=self.spill_parent, segment_rows=50)
+        rows = list(self._rows(500))
+        for row in rows:
+            store.append(*row)
+        stats = store.stats()
+        self.assertGreater(stats["spilled_segments"], 0)
+        self.assertLessEqual(stats["memory_bytes"], 2000)
+        self.assertEqual([r.path for r in store], [row[0] for row in rows])
+        self.assertEqual(store[123].file_hash, rows[123][2])
+        store.close()
+        self.assertEqual(os.listdir(self.spill_parent), [])
+    
+    def test_views(self):
+        """Görünümler koşullara uyan satırları döndürmeli"""
+        with ResultStore(memory_budget=2000, spill_dir=self.spill_parent, segment_rows=50) as store:
+            rows = list(self._rows(300))
+            for row in rows:
+                store.append(*row)
+            infected = store.view(infected=True)
+            self.assertEqual([r.path for r in infected], [row[0] for row in rows if row[1]])
+            under = store.view(under=os.path.join("/veri", "klasor3"))
+            self.assertEqual(len(under), sum(1 for row in rows if "klasor3" in row[0]))
+            self.assertEqual(len(store.view(under="/veri")), 300)
+            cached = store.view(engine="cache", infected=False)
+            self.assertEqual(len(cached), sum(1 for row in rows if row[5] == "cache" and not row[1]))
+            large = store.view(predicate=lambda r: r.size >= 2500)
+            self.assertEqual(list(large.iter_paths()), [row[0] for row in rows if row[3] >= 2500])
+    
+    def test_scan_files_to_store(self):
+        """Paralel tarama sonuçları depoya yazılmalı"""
+        folder = tempfile.mkdtemp()
+        try:
+            files = []
+            for i in range(5):
+                path = os.path.join(folder, f"f{i}.txt")
+                with open(path, "wb") as f:
+                    f.write(f"icerik {i}".encode())
+                files.append(path)
+            virus_hash = hashlib.md5(b"icerik 2").hexdigest()
+            store = scan_files_to_store(files, {virus_hash}, max_workers=2)
+            self.assertEqual(sorted(store.iter_paths()), sorted(files))
+            self.assertIsInstance(store[0], ScanVerdict)
+            self.assertEqual(list(store.view(infected=True).iter_paths()), [files[2]])
+            store.close()
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+
+
+class TestSparseHashing(unittest.TestCase):
+    """Seyrek dosya hash'leme testleri (SEEK_DATA / SEEK_HOLE)"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _sparse_file(self, name, writes, size):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "wb") as f:
+            for offset, data in writes:
+                f.seek(offset)
+                f.write(data)
+            f.truncate(size)
+        with open(path, "rb") as f:
+            if data_extents(f.fileno()) is None:
+                self.skipTest("Dosya sistemi seyrek dosyaları desteklemiyor")
+        return path
+    
+    def _full_md5(self, path):
+        with open(path, "rb") as f:
+            return hashlib.md5(f.read()).hexdigest()
+    
+    def test_hash_matches_full_read(self):
+        """Boşluklar atlanınca hash tam okumayla aynı olmalı"""
+        layouts = [
+            [(5 << 20, b"abc" * 5000), (20 << 20, b"x" * 100)],  # Başta ve sonda boşluk
+            [(0, b"baslik" * 1000), (12 << 20, b"son")],        # Veri ile başlayıp biten
+        ]
+        for i, writes in enumerate(layouts):
+            path = self._sparse_file(f"seyrek{i}.img", writes, 24 << 20 if i == 0 else (12 << 20) + 3)
+            self.assertEqual(calculate_hash(path), self._full_md5(path))
+            self.assertEqual(_digest_file(path)[1], os.path.getsize(path))
+    
+    def test_only_data_is_read(self):
+        """Sınırlayıcıya yalnızca diskten okunan byte'lar bildirilmeli"""
+        path = self._sparse_file("disk.img", [(8 << 20, os.urandom(1 << 20))], 64 << 20)
+        
+        class CountingThrottle:
+            read = 0
+            def before_file(self):
+                pass
+            def after_read(self, nbytes):
+                self.read += nbytes
+        
+        throttle = CountingThrottle()
+        file_hash, size = _digest_file(path, throttle=throttle)
+        self.assertEqual(file_hash, self._full_md5(path))
+        self.assertEqual(size, 64 << 20)
+        self.assertLess(throttle.read, 4 << 20)
+    
+    def test_dense_file_not_sparse(self):
+        """Boşluksuz dosya için veri bölgesi listesi dönmemeli"""
+        path = os.path.join(self.test_dir, "dolu.bin")
+        with open(path, "wb") as f:
+            f.write(os.urandom(256 * 1024))
+        with open(path, "rb") as f:
+            self.assertIsNone(data_extents(f.fileno()))
+
+
+class TestScanDiff(unittest.TestCase):
+    """Harici sıralama, tarama indeksi ve fark raporu testleri"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _report(self, name, verdicts):
+        path = os.path.join(self.test_dir, name)
+        with ReportSink(path) as sink:
+            for verdict in verdicts:
+                sink.write(verdict)
+        return path
+    
+    def test_external_sort_spills_and_is_stable(self):
+        """Parçalara bölünen sıralama kararlı ve doğru olmalı"""
+        items = [[i % 97, i] for i in range(1000)]
+        result = list(external_sort(items, key=lambda item: item[0], run_size=64,
+                                    tmp_dir=self.test_dir))
+        self.assertEqual(result, sorted(items, key=lambda item: item[0]))
+        self.assertEqual(os.listdir(self.test_dir), [])
+    
+    def test_index_sorted_and_lookup(self):
+        """İndeks yola göre sıralı olmalı, tekrarlanan yolda son kayıt kalmalı"""
+        verdicts = [ScanVerdict(f"/d/f{i:05d}", False, "%032x" % i, i) for i in range(3000, 0, -1)]
+        verdicts.append(ScanVerdict("/d/f00010", True, "%032x" % 99, 7))
+        report = self._report("tarama.csv", verdicts)
+        index_path = build_scan_index(report, run_size=500, root="/d")
+        with ScanIndex(index_path) as index:
+            paths = [record.path for record in index]
+            self.assertEqual(paths, sorted(paths))
+            self.assertEqual(len(index), 3000)
+            self.assertEqual(index.root, "/d")
+            record = index.get("/d/f00010")
+            self.assertTrue(record.is_virus)
+            self.assertEqual(record.size, 7)
+            self.assertEqual(index.get("/d/f02999").file_hash, "%032x" % 2999)
+            self.assertIsNone(index.get("/d/yok"))
+            self.assertIsNone(index.get("/a"))
+    
+    def test_diff_kinds(self):
+        """Yeni, silinen, değişen ve yeni tespit edilen dosyalar ayrılmalı"""
+        old = self._report("scan_1.jsonl", [
+            ScanVerdict("/d/ayni", False, "a" * 32, 1, generation=1),
+            ScanVerdict("/d/silinen", False, "b" * 32, 1, generation=1),
+            ScanVerdict("/d/degisen", False, "c" * 32, 1, generation=1),
+            ScanVerdict("/d/imza", False, "d" * 32, 1, generation=1),
+            ScanVerdict("/d/yeni_icerik", False, "e" * 32, 1, generation=1),
+            ScanVerdict("/d/temizlenen", True, "f" * 32, 1, generation=1),
+        ])
+        new = self._report("scan_2.jsonl", [
+            ScanVerdict("/d/ayni", False, "a" * 32, 1, generation=2),
+            ScanVerdict("/d/degisen", False, "1" * 32, 1, generation=2),
+            ScanVerdict("/d/imza", True, "d" * 32, 1, generation=2),
+            ScanVerdict("/d/yeni_icerik", True, "2" * 32, 1, generation=2),
+            ScanVerdict("/d/temizlenen", False, "f" * 32, 1, generation=2),
+            ScanVerdict("/d/eklenen", False, "3" * 32, 1, generation=2),
+        ])
+        with ScanIndex(build_scan_index(old)) as a, ScanIndex(build_scan_index(new)) as b:
+            entries = {entry.path: entry for entry in iter_scan_diff(a, b)}
+        self.assertNotIn("/d/ayni", entries)
+        self.assertEqual(entries["/d/silinen"].kind, DIFF_REMOVED)
+        self.assertEqual(entries["/d/eklenen"].kind, DIFF_NEW)
+        self.assertEqual(entries["/d/degisen"].kind, DIFF_CHANGED)
+        self.assertEqual(entries["/d/imza"].kind, DIFF_DETECTED)
+        self.assertTrue(entries["/d/imza"].signature_update)
+        self.assertEqual(entries["/d/yeni_icerik"].kind, DIFF_DETECTED)
+        self.assertFalse(entries["/d/yeni_icerik"].signature_update)
+        self.assertEqual(entries["/d/temizlenen"].kind, DIFF_CLEARED)
+        self.assertTrue(entries["/d/temizlenen"].signature_update)
+        
+        output = os.path.join(self.test_dir, "fark.csv")
+        counts = write_scan_diff(old, new, output)
+        self.assertEqual(counts, {"new": 1, "removed": 1, "changed": 1, "detected": 2,
+                                  "cleared": 1, "signature_update": 2})
+        self.assertEqual(len(list(iter_report(output))), 6)
+    
+    def test_diff_non_utf8_paths(self):
+        """UTF-8 olmayan dosya adları fark raporunu bozmamalı"""
+        bad_path = os.fsdecode(b"/d/\xffbozuk.bin")
+        old = self._report("scan_1.jsonl", [ScanVerdict("/d/ayni", False, "a" * 32, 1)])
+        new = self._report("scan_2.jsonl", [ScanVerdict("/d/ayni", False, "a" * 32, 1),
+                                            ScanVerdict(bad_path, True, "b" * 32, 1)])
+        for ext in ("jsonl", "csv"):
+            output = os.path.join(self.test_dir, f"fark.{ext}")
+            counts = write_scan_diff(old, new, output)
+            self.assertEqual(counts["new"], 1)
+            self.assertEqual([record["dosya"] for record in iter_report(output)], [bad_path])
+    
+    def test_scan_writes_index_and_diff(self):
+        """Aynı dizinin ikinci taraması önceki taramayla farkı yazmalı"""
+        folder = os.path.join(self.test_dir, "veri")
+        os.makedirs(folder)
+        for i in range(3):
+            with open(os.path.join(folder, f"f{i}.txt"), "w") as f:
+                f.write(f"icerik {i}")
+        reports = os.path.join(self.test_dir, "reports")
+        first = run_headless_scan(folder, os.path.join(reports, "scan_1.jsonl"))
+        self.assertTrue(os.path.exists(first["scan_index"]))
+        self.assertNotIn("changes", first)
+        
+        os.remove(os.path.join(folder, "f0.txt"))
+        with open(os.path.join(folder, "f1.txt"), "w") as f:
+            f.write("degisti")
+        second = run_headless_scan(folder, os.path.join(reports, "scan_2.jsonl"))
+        self.assertEqual(second["changes"]["removed"], 1)
+        self.assertEqual(second["changes"]["changed"], 1)
+        self.assertTrue(os.path.exists(second["diff_report"]))
+    
+    def test_previous_index_by_creation_time(self):
+        """Önceki tarama ada göre değil oluşturma zamanına göre seçilmeli; sabit ad da karşılaştırılmalı"""
+        folder = os.path.join(self.test_dir, "veri")
+        os.makedirs(folder)
+        target = os.path.join(folder, "f.txt")
+        reports = os.path.join(self.test_dir, "reports")
+        
+        def scan(name, content):
+            with open(target, "w") as f:
+                f.write(content)
+            return run_headless_scan(folder, os.path.join(reports, name))
+        
+        # Sonraki tarama alfabetik olarak önce gelen ada yazılıyor
+        scan("z_ilk.jsonl", "bir")
+        second = scan("a_ikinci.jsonl", "iki")
+        self.assertEqual(second["changes"]["changed"], 1)
+        
+        # Sabit adlı rapor: önceki indeks üzerine yazılmadan önce saklanır
+        scan("gece.jsonl", "uc")
+        fourth = scan("gece.jsonl", "dort")
+        self.assertEqual(fourth["changes"]["changed"], 1)
+        self.assertTrue(os.path.exists(os.path.join(reports, "gece.prev.idx")))
+        previous = find_previous_index(reports, os.path.abspath(folder), fourth["scan_index"])
+        self.assertEqual(os.path.basename(previous), "gece.prev.idx")
+
+
+class TestMimeEngine(unittest.TestCase):
+    """E-posta (MIME) ek tarama motoru testleri"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.payload = os.urandom(150000)
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _message(self, subject="ek"):
+        message = EmailMessage()
+        message["From"] = "gonderen@example.com"
+        message["To"] = "alici@example.com"
+        message["Subject"] = subject
+        message.set_content("Merhaba\nFrom satırı\n-- \nimza")
+        message.add_attachment(self.payload, maintype="application", subtype="octet-stream",
+                               filename="fatura.exe")
+        message.add_attachment("satır =\n" * 300, subtype="plain", filename="not.txt",
+                               cte="quoted-printable")
+        return message
+    
+    def _expected(self, message):
+        parsed = email.message_from_bytes(message.as_bytes(), policy=email.policy.default)
+        return [(part.get_filename(), hashlib.md5(part.get_payload(decode=True)).hexdigest())
+                for part in parsed.iter_attachments()]
+    
+    def _scan(self, raw, chunk_size):
+        scanner = MimeScanner()
+        for offset in range(0, len(raw), chunk_size):
+            scanner.feed(raw[offset:offset + chunk_size])
+        return scanner.close()
+    
+    def test_attachments_match_email_module(self):
+        """Parça boyutundan bağımsız olarak ekler email modülüyle aynı hash'lenmeli"""
+        message = self._message()
+        expected = self._expected(message)
+        self.assertEqual(expected[0][1], hashlib.md5(self.payload).hexdigest())
+        raw = message.as_bytes()
+        for chunk_size in (1, 77, 4096, len(raw)):
+            parts = self._scan(raw, chunk_size)
+            self.assertEqual([(part.name, part.file_hash) for part in parts], expected)
+    
+    def test_mbox_messages(self):
+        """mbox'taki her mesajın ekleri numarasıyla raporlanmalı"""
+        messages = [self._message(f"mesaj {i}") for i in range(3)]
+        raw = b"".join(b"From gonderen@example.com Mon Jan  1 00:00:00 2024\n"
+                       + message.as_bytes().replace(b"\nFrom ", b"\n>From ") + b"\n"
+                       for message in messages)
+        scanner = MimeScanner()
+        for offset in range(0, len(raw), 1000):
+            scanner.feed(raw[offset:offset + 1000])
+        parts = scanner.close()
+        self.assertEqual(scanner.messages, 3)
+        self.assertEqual([part.name for part in parts[:2]], ["1!fatura.exe", "1!not.txt"])
+        self.assertEqual([part.file_hash for part in parts],
+                         [file_hash for message in messages for _, file_hash in self._expected(message)])
+    
+    def test_bounded_memory(self):
+        """Satır sonu olmayan büyük gövdede tampon sınırlı kalmalı"""
+        body = b"QUFB" * (1 << 20)  # 4 MB tek satır base64
+        raw = (b"Content-Type: application/octet-stream\nContent-Transfer-Encoding: base64\n"
+               b"Content-Disposition: attachment; filename=buyuk.bin\n\n" + body)
+        scanner = MimeScanner()
+        largest = 0
+        for offset in range(0, len(raw), 65536):
+            scanner.feed(raw[offset:offset + 65536])
+            largest = max(largest, len(scanner._buf))
+        parts = scanner.close()
+        self.assertLess(largest, LINE_LIMIT + 65536)
+        self.assertEqual(parts[0].file_hash, hashlib.md5(b"AAA" * (1 << 20)).hexdigest())
+    
+    def test_infected_attachment_reported(self):
+        """Tehlikeli ek mesaj!ek yoluyla raporlanmalı, e-posta dosyası işaretlenmeli"""
+        path = os.path.join(self.test_dir, "posta.eml")
+        with open(path, "wb") as f:
+            f.write(self._message().as_bytes())
+        signatures = {hashlib.md5(self.payload).hexdigest()}
+        
+        verdicts = inspect_mail(path, signatures)
+        self.assertEqual(verdicts[0].path, path)
+        self.assertTrue(verdicts[0].is_virus)
+        self.assertEqual(verdicts[0].engine, ENGINE_MIME_CONTAINER)
+        members = {verdict.path: verdict for verdict in verdicts[1:]}
+        self.assertTrue(members[path + "!fatura.exe"].is_virus)
+        self.assertEqual(members[path + "!fatura.exe"].engine, ENGINE_MIME)
+        self.assertFalse(members[path + "!not.txt"].is_virus)
+        
+        # Paralel tarama da ekleri üretmeli (küçük dosya yolu atlanır)
+        results = dict(scan_files_parallel([path], signatures))
+        self.assertTrue(results[path])
+        self.assertTrue(results[path + "!fatura.exe"])
+    
+    def test_container_quarantined_by_scan_hash(self):
+        """Eki tehlikeli e-posta taramadaki hash'iyle doğrulanıp karantinaya alınmalı"""
+        path = os.path.join(self.test_dir, "posta.eml")
+        with open(path, "wb") as f:
+            f.write(self._message().as_bytes())
+        signatures = {hashlib.md5(self.payload).hexdigest()}
+        container = inspect_mail(path, signatures)[0]
+        
+        outcomes = []
+        stage = DetectionActionStage("quarantine", lambda: signatures, os.path.join(self.test_dir, "karantina"),
+                                     on_outcome=outcomes.append, batch_delay=0.01)
+        stage.submit(path, container.file_hash)
+        stage.close(wait=True, timeout=10)
+        self.assertTrue(outcomes[0].ok, outcomes[0].detail)
+        self.assertFalse(os.path.exists(path))
+
+
+def build_elf(code: bytes, padding: bytes = b"\0" * 32, comment: bytes = b"GCC 1.0",
+              elf_class: int = 2, order: str = "<", plt: bytes = b"") -> bytes:
+    """
+    .text bölümü ve çalıştırılabilir PT_LOAD segmenti olan küçük bir ELF üretir.
+    plt verilirse .text'in önüne .plt bölümü eklenir (segment ikisini kapsar).
+    """
+    if elf_class == 2:
+        header_format, section_format, program_format = "HHIQQQIHHHHHH", "IIQQQQIIQQ", "IIQQQQQQ"
+    else:
+        header_format, section_format, program_format = "HHIIIIIHHHHHH", "IIIIIIIIII", "IIIIIIII"
+    header_size = 16 + struct.calcsize(order + header_format)
+    program_size = struct.calcsize(order + program_format)
+    section_size = struct.calcsize(order + section_format)
+    names = b"\0.text\0.comment\0.shstrtab\0.plt\0"
+    
+    plt_offset = header_size + program_size + len(padding)
+    text_offset = plt_offset + len(plt)
+    load_size = len(plt) + len(code)
+    comment_offset = text_offset + len(code)
+    names_offset = comment_offset + len(comment)
+    shoff = names_offset + len(names)
+    
+    ident = b"\x7fELF" + bytes([elf_class, 1 if order == "<" else 2, 1]) + b"\0" * 9
+    header = ident + struct.pack(order + header_format, 2, 62, 1, 0, header_size, shoff, 0,
+                                 header_size, program_size, 1, section_size, 5 if plt else 4, 3)
+    if elf_class == 2:
+        program = struct.pack(order + program_format, 1, 5, plt_offset, 0, 0, load_size, load_size, 0)
+    else:
+        program = struct.pack(order + program_format, 1, plt_offset, 0, 0, load_size, load_size, 5, 0)
+    sections = [
+        (0, 0, 0, 0, 0, 0, 0, 0, 0, 0),
+        (1, 1, 0x6, 0, text_offset, len(code), 0, 0, 16, 0),     # .text: ALLOC | EXECINSTR
+        (7, 1, 0, 0, comment_offset, len(comment), 0, 0, 1, 0),  # .comment
+        (16, 3, 0, 0, names_offset, len(names), 0, 0, 1, 0),     # .shstrtab
+    ]
+    if plt:
+        sections.append((26, 1, 0x6, 0, plt_offset, len(plt), 0, 0, 16, 0))  # .plt
+    table = b"".join(struct.pack(order + section_format, *section) for section in sections)
+    return header + program + padding + plt + code + comment + names + table
+
+
+class TestElfEngine(unittest.TestCase):
+    """ELF bölüm düzeyinde hash motoru testleri"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.code = os.urandom(4096)
+        self.code_hash = hashlib.md5(self.code).hexdigest()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _write(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+    
+    def test_executable_ranges(self):
+        """.text bölümü adıyla, çalıştırılabilir segment numarasıyla bulunmalı"""
+        data = build_elf(self.code)
+        ranges = executable_ranges(buffer_reader(data), len(data))
+        self.assertEqual([(r.kind, r.name, r.size) for r in ranges],
+                         [("section", ".text", len(self.code)), ("segment", "0", len(self.code))])
+        self.assertEqual(bytes(data[ranges[0].offset:ranges[0].offset + ranges[0].size]), self.code)
+    
+    def test_32bit_big_endian(self):
+        """32 bit ve big-endian başlıklar da ayrıştırılmalı"""
+        for elf_class, order in ((1, "<"), (1, ">"), (2, ">")):
+            data = build_elf(self.code, elf_class=elf_class, order=order)
+            match = match_sections(buffer_reader(data), len(data), {self.code_hash})
+            self.assertIsNotNone(match, (elf_class, order))
+            self.assertEqual(match[0].name, ".text")
+    
+    def test_non_elf_and_truncated(self):
+        """ELF olmayan veya kesik dosyalarda aralık bulunmamalı"""
+        self.assertEqual(executable_ranges(buffer_reader(b"MZ" + b"\0" * 100), 102), [])
+        data = build_elf(self.code)
+        truncated = data[:len(data) // 2]
+        self.assertEqual([r for r in executable_ranges(buffer_reader(truncated), len(truncated))
+                          if r.kind == "section"], [])
+    
+    def test_padding_and_string_changes_keep_detection(self):
+        """Dolgu veya string byte'ı değişen varyant bölüm imzasıyla yakalanmalı"""
+        original = build_elf(self.code)
+        variant = build_elf(self.code, padding=b"\x90" * 32, comment=b"GCC 2.0")
+        self.assertNotEqual(hashlib.md5(original).hexdigest(), hashlib.md5(variant).hexdigest())
+        
+        sample = self._write("ornek", original)
+        section_signatures = {digest for _, digest in section_hashes(sample)}
+        self.assertIn(self.code_hash, section_signatures)
+        
+        variant_path = self._write("varyant", variant)
+        verdict = inspect_file(variant_path, set(),
+                               section_signatures=section_signatures)
+        self.assertTrue(verdict.is_virus)
+        self.assertEqual(verdict.engine, ENGINE_ELF_SECTION)
+        self.assertEqual(verdict.file_hash, hashlib.md5(variant).hexdigest())
+        
+        # Küçük dosya hızlı yolu ve bellek taraması da aynı sonucu vermeli
+        small = build_elf(self.code, padding=b"\xcc" * 8)
+        self.assertLessEqual(len(small), SMALL_FILE_LIMIT)
+        small_path = self._write("kucuk", small)
+        small_signatures = {self.code_hash}
+        results, large = scan_file_batch([small_path], set(),
+                                         section_signatures=small_signatures)
+        self.assertEqual(large, [])
+        self.assertEqual(results[0].engine, ENGINE_ELF_SECTION)
+        self.assertTrue(scan_bytes(bytearray(small), set(), section_signatures=small_signatures).is_virus)
+        
+        # Kod değişirse eşleşme olmamalı
+        other = self._write("baska", build_elf(os.urandom(4096)))
+        self.assertFalse(inspect_file(other, set(),
+                                      section_signatures=section_signatures).is_virus)
+    
+    def test_shared_plt_does_not_cross_match(self):
+        """Yalnızca .text ve çalıştırılabilir segment indekslenmeli; ortak PLT eşleşme üretmemeli"""
+        plt = os.urandom(8192)
+        sample = self._write("ornek", build_elf(self.code, plt=plt))
+        hashes = section_hashes(sample)
+        self.assertEqual([(r.kind, r.name) for r, _ in hashes], [("section", ".text"), ("segment", "0")])
+        self.assertNotIn(hashlib.md5(plt).hexdigest(), {digest for _, digest in hashes})
+        
+        other = self._write("baska", build_elf(os.urandom(4096), plt=plt))
+        verdict = inspect_file(other, set(), section_signatures={digest for _, digest in hashes})
+        self.assertFalse(verdict.is_virus)
+    
+    def test_small_ranges_are_ignored(self):
+        """Küçük .text bölümleri (ortak derleyici kodu) indekslenmemeli"""
+        data = build_elf(os.urandom(512))
+        self.assertEqual(executable_ranges(buffer_reader(data), len(data)), [])
+    
+    def test_allowlist_and_signature_take_precedence(self):
+        """Dosya imzası veya allowlist eşleşmesinde bölüm kontrolü yapılmamalı"""
+        data = build_elf(self.code)
+        path = self._write("ornek", data)
+        file_hash = hashlib.md5(data).hexdigest()
+        verdict = inspect_file(path, {file_hash}, section_signatures={self.code_hash})
+        self.assertEqual(verdict.engine, "md5-signature")
+        list_path = os.path.join(self.test_dir, "allowlist.bin")
+        build_allowlist(list_path, [(file_hash, len(data))])
+        with Allowlist(list_path) as allowlist:
+            verdict = inspect_file(path, set(), allowlist=allowlist, section_signatures={self.code_hash})
+        self.assertFalse(verdict.is_virus)
+        self.assertEqual(verdict.engine, ENGINE_ALLOWLIST)
+    
+    def test_stream_sections(self):
+        """Akışla taranan ELF, parça boyutundan bağımsız bölüm imzasıyla yakalanmalı"""
+        data = build_elf(self.code, padding=os.urandom(64))
+        signatures = {self.code_hash}
+        chunks = [data[i:i + 100] for i in range(0, len(data), 100)]
+        
+        verdict = scan_stream(iter(chunks), set(), section_signatures=signatures)
+        self.assertTrue(verdict.is_virus)
+        self.assertEqual(verdict.engine, ENGINE_ELF_SECTION)
+        self.assertEqual(verdict.file_hash, hashlib.md5(data).hexdigest())
+        with mock.patch("PyVirüs.STREAM_SPOOL_MEMORY", 1024):  # Geçici dosyaya taşan tampon
+            self.assertTrue(scan_stream(io.BytesIO(data), set(), chunk_size=1000,
+                                        section_signatures=signatures).is_virus)
+        
+        async def body():
+            for chunk in chunks:
+                yield chunk
+        
+        verdict = asyncio.run(scan_stream(body(), set(), name="istek", section_signatures=signatures))
+        self.assertEqual(verdict.engine, ENGINE_ELF_SECTION)
+        # ELF olmayan akışta aynı kod eşleşmemeli
+        self.assertFalse(scan_stream(iter([b"MZ" + data[4:]]), set(), section_signatures=signatures).is_virus)
+
+
+class TestEntropyEngine(unittest.TestCase):
+    """Entropi ve byte histogramı sezgisel motoru testleri"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.policy = EntropyPolicy()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _write(self, name, data):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+    
+    def test_entropy_values(self):
+        """Düzgün dağılımlı veri 8, tek değerli veri 0 bit/byte vermeli"""
+        uniform = profile_bytes(bytes(range(256)) * 1024)
+        self.assertAlmostEqual(uniform.mean_entropy, 8.0, places=6)
+        self.assertAlmostEqual(uniform.file_entropy, 8.0, places=6)
+        self.assertAlmostEqual(uniform.chi_square, 0.0, places=6)
+        self.assertEqual(uniform.blocks, 4)
+        zeros = profile_bytes(bytes(200000))
+        self.assertEqual(zeros.max_entropy, 0.0)
+        self.assertEqual(zeros.high_ratio, 0.0)
+    
+    def test_chunking_does_not_change_profile(self):
+        """Parça boyutu blok sınırlarından bağımsız aynı profili vermeli"""
+        data = os.urandom(100000) + bytes(100000) + os.urandom(50000)
+        expected = profile_bytes(data)
+        for chunk_size in (1000, 4097, 65536, 70000):
+            profiler = EntropyProfiler()
+            for offset in range(0, len(data), chunk_size):
+                profiler.update(memoryview(data)[offset:offset + chunk_size])
+            report = profiler.report()
+            self.assertEqual(report.blocks, expected.blocks)
+            self.assertAlmostEqual(report.mean_entropy, expected.mean_entropy, places=9)
+            self.assertAlmostEqual(report.chi_square, expected.chi_square, places=6)
+    
+    def test_policy(self):
+        """Yalnızca büyük, çalıştırılabilir ve çoğunlukla yüksek entropili dosyalar şüpheli"""
+        packed = b"MZ" + os.urandom(300000)
+        self.assertTrue(self.policy.is_suspicious(profile_bytes(packed)))
+        self.assertFalse(self.policy.is_suspicious(profile_bytes(packed[2:])))  # arşiv/medya
+        self.assertFalse(self.policy.is_suspicious(profile_bytes(b"MZ" + os.urandom(1000))))
+        self.assertFalse(self.policy.is_suspicious(profile_bytes(b"MZ" + bytes(300000))))
+        self.assertTrue(EntropyPolicy(executables_only=False).is_suspicious(profile_bytes(packed[2:])))
+        strict = EntropyPolicy(threshold=8.1)
+        self.assertFalse(strict.is_suspicious(profile_bytes(packed, strict)))
+    
+    def test_inspect_file_and_scan(self):
+        """Hash için okunan parçalarla entropi sezgiseli uygulanmalı"""
+        packed = b"MZ" + os.urandom(300000)
+        packed_path = self._write("paketli.exe", packed)
+        plain_path = self._write("normal.exe", b"MZ" + bytes(300000))
+        
+        verdict = inspect_file(packed_path, set(), entropy=self.policy)
+        self.assertFalse(verdict.is_virus)
+        self.assertEqual(verdict.engine, ENGINE_ENTROPY)
+        self.assertEqual(verdict.file_hash, hashlib.md5(packed).hexdigest())
+        self.assertFalse(inspect_file(packed_path, set()).is_virus)
+        self.assertEqual(inspect_file(plain_path, set(), entropy=self.policy).engine, "md5-signature")
+        
+        # Şüpheli dosya raporlanır ama tehlikeli sayılmaz ve silinmez
+        report_path = os.path.join(self.test_dir, "rapor.jsonl")
+        summary = run_headless_scan(self.test_dir, report_path, action=ACTION_DELETE, max_workers=2,
+                                    entropy_policy=self.policy)
+        self.assertEqual(summary["infected"], 0)
+        self.assertEqual(summary["suspicious"], 1)
+        self.assertTrue(os.path.exists(packed_path))
+        statuses = {record["dosya"]: record["durum"] for record in iter_report(report_path)}
+        self.assertEqual(statuses[packed_path], "Şüpheli")
+        self.assertEqual(statuses[plain_path], "Temiz")
+    
+    def test_stream_and_bytes(self):
+        """Akış ve bellek taraması aynı entropi kararını vermeli"""
+        packed = b"MZ" + os.urandom(300000)
+        
+        async def body():
+            for offset in range(0, len(packed), 9000):
+                yield packed[offset:offset + 9000]
+        
+        verdicts = [scan_stream(io.BytesIO(packed), set(), entropy=self.policy),
+                    asyncio.run(scan_stream(body(), set(), entropy=self.policy)),
+                    scan_bytes(packed, set(), entropy=self.policy)]
+        for verdict in verdicts:
+            self.assertFalse(verdict.is_virus)
+            self.assertEqual(verdict.engine, ENGINE_ENTROPY)
+        self.assertEqual(scan_stream(io.BytesIO(packed), set()).engine, "md5-signature")
+
+
+class TestSignatureMerge(unittest.TestCase):
+    """Bellek sınırlı imza akışı birleştirme testleri"""
+    
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+    
+    def _hashes(self, count, seed):
+        return [hashlib.md5(f"{seed}-{i}".encode()).hexdigest() for i in range(count)]
+    
+    def _write(self, name, text):
+        path = os.path.join(self.test_dir, name)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(text)
+        return path
+    
+    def test_iter_signature_file_formats(self):
+        """Girintili/tek satır JSON ve düz liste parça sınırlarından bağımsız okunmalı"""
+        hashes = self._hashes(50, "bicim")
+        compact = self._write("compact.json", json.dumps(hashes))
+        pretty = self._write("pretty.json", json.dumps(hashes, indent=2))
+        plain = self._write("plain.txt", "\n".join(hashes) + "\n")
+        for path in (compact, pretty, plain):
+            for chunk_size in (7, 33, 1 << 20):
+                self.assertEqual(list(iter_signature_file(path, chunk_size)), hashes)
+    
+    def test_merge_with_removals_and_sources(self):
+        """Akışlar sırayla uygulanmalı; kaynaklar ve sayaçlar doğru olmalı"""
+        local = self._hashes(30000, "yerel")
+        feed = local[:5000] + self._hashes(20000, "bulut") + local[:10]
+        removed = local[100:200] + ["gecersiz", "F" * 32]
+        readded = local[150:160]
+        
+        feeds = [
+            SignatureFeed("local", self._write("local.json", json.dumps(local, indent=2)), local=True),
+            SignatureFeed("cloud", self._write("cloud.json", json.dumps([h.upper() for h in feed]))),
+            SignatureFeed("retract", self._write("remove.txt", "\n".join(removed)), remove=True),
+            SignatureFeed("manual", self._write("manual.txt", "\n".join(readded))),
+        ]
+        output = os.path.join(self.test_dir, "merged.json")
+        sources = os.path.join(self.test_dir, "merged.sources.jsonl")
+        # memory_limit=0: en küçük parça boyutu, kayıtlar birden çok parçaya taşar
+        counts = merge_signature_files(feeds, output, sources, memory_limit=0, tmp_dir=self.test_dir)
+        
+        expected = (set(local) | set(feed)) - set(local[100:200]) | set(readded)
+        with open(output, encoding="utf-8") as f:
+            text = f.read()
+        self.assertEqual(text, json.dumps(sorted(expected), indent=2))
+        self.assertEqual(counts["signatures"], len(expected))
+        self.assertEqual(counts["new"], 20000)
+        self.assertEqual(counts["removed"], 100)
+        self.assertEqual(counts["invalid"], 1)
+        self.assertEqual(counts["duplicates"], 10)
+        self.assertEqual(counts["sources"]["manual"], 10)
+        
+        self.assertEqual(load_signature_sources(sources, local[0]), ["local", "cloud"])
+        self.assertEqual(load_signature_sources(sources, local[150]), ["manual"])
+        self.assertIsNone(load_signature_sources(sources, local[120]))
+        self.assertEqual(sorted(os.listdir(self.test_dir)),
+                         sorted(["local.json", "cloud.json", "remove.txt", "manual.txt",
+                                 "merged.json", "merged.sources.jsonl"]))
+    
+    def test_empty_result_and_publish(self):
+        """Boş sonuç geçerli JSON olmalı; publish_file generation artırmalı"""
+        hashes = self._hashes(3, "bos")
+        feeds = [SignatureFeed("a", self._write("a.txt", "\n".join(hashes))),
+                 SignatureFeed("sil", self._write("sil.txt", "\n".join(hashes)), remove=True)]
+        output = os.path.join(self.test_dir, "bos.json")
+        self.assertEqual(merge_signature_files(feeds, output)["signatures"], 0)
+        with open(output, encoding="utf-8") as f:
+            self.assertEqual(json.load(f), [])
+        
+        store = SignatureStore(os.path.join(self.test_dir, "db.json"), check_interval=60)
+        first = store.publish(hashes[:1])
+        merged = os.path.join(self.test_dir, "yeni.json")
+        merge_signature_files([SignatureFeed("a", feeds[0].path)], merged)
+        generation = store.publish_file(merged)
+        self.assertEqual(generation, first.generation + 1)
+        snapshot = store.snapshot()
+        self.assertEqual(snapshot, frozenset(hashes))
+        self.assertEqual(snapshot.generation, generation)
+    
+    def test_without_local_feed_and_same_basename(self):
+        """Yerel akış yoksa hepsi yeni sayılmalı; aynı adlı dosyalar ayrı kaynak kalmalı"""
+        first, second = self._hashes(40, "bir"), self._hashes(30, "iki")
+        paths = []
+        for subdir, hashes in (("a", first), ("b", first[:10] + second)):
+            os.makedirs(os.path.join(self.test_dir, subdir))
+            paths.append(self._write(os.path.join(subdir, "feed.txt"), "\n".join(hashes)))
+        feeds = [SignatureFeed(path, path) for path in paths]
+        counts = merge_signature_files(feeds, os.path.join(self.test_dir, "out.json"),
+                                       os.path.join(self.test_dir, "sources.jsonl"))
+        self.assertEqual(counts["signatures"], 70)
+        self.assertEqual(counts["new"], 70)
+        self.assertEqual(counts["duplicates"], 0)
+        self.assertEqual(counts["sources"], {paths[0]: 40, paths[1]: 40})
+        self.assertEqual(load_signature_sources(os.path.join(self.test_dir, "sources.jsonl"), first[0]), paths)
+        
+        with self.assertRaises(ValueError):
+            merge_signature_files([SignatureFeed("feed.txt", path) for path in paths],
+                                  os.path.join(self.test_dir, "out.json"))
+
+
 def run_tests():
     """Tüm testleri çalıştır."""
     loader = unittest.TestLoader()
@@ -223,6 +2633,30 @@ def run_tests():
     suite.addTests(loader.loadTestsFromTestCase(TestFileScan))
     suite.addTests(loader.loadTestsFromTestCase(TestQuarantine))
     suite.addTests(loader.loadTestsFromTestCase(TestPerformance))
+    suite.addTests(loader.loadTestsFromTestCase(TestIOScheduler))
+    suite.addTests(loader.loadTestsFromTestCase(TestSmallFileBatch))
+    suite.addTests(loader.loadTestsFromTestCase(TestScanCheckpoint))
+    suite.addTests(loader.loadTestsFromTestCase(TestWalkFilters))
+    suite.addTests(loader.loadTestsFromTestCase(TestQuarantineStore))
+    suite.addTests(loader.loadTestsFromTestCase(TestDetectionActionStage))
+    suite.addTests(loader.loadTestsFromTestCase(TestReportSink))
+    suite.addTests(loader.loadTestsFromTestCase(TestLogging))
+    suite.addTests(loader.loadTestsFromTestCase(TestSignatureSnapshots))
+    suite.addTests(loader.loadTestsFromTestCase(TestDirTreeCache))
+    suite.addTests(loader.loadTestsFromTestCase(TestParallelWalk))
+    suite.addTests(loader.loadTestsFromTestCase(TestPageCacheAdvisor))
+    suite.addTests(loader.loadTestsFromTestCase(TestThrottle))
+    suite.addTests(loader.loadTestsFromTestCase(TestInMemoryScan))
+    suite.addTests(loader.loadTestsFromTestCase(TestAllowlist))
+    suite.addTests(loader.loadTestsFromTestCase(TestScanProfiler))
+    suite.addTests(loader.loadTestsFromTestCase(TestScanScheduler))
+    suite.addTests(loader.loadTestsFromTestCase(TestResultStore))
+    suite.addTests(loader.loadTestsFromTestCase(TestSparseHashing))
+    suite.addTests(loader.loadTestsFromTestCase(TestScanDiff))
+    suite.addTests(loader.loadTestsFromTestCase(TestMimeEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestElfEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestEntropyEngine))
+    suite.addTests(loader.loadTestsFromTestCase(TestSignatureMerge))
     
     runner = unittest.TextTestRunner(verbosity=2)
     result = runner.run(suite)
@@ -0,0 +1,235 @@
+"""
+PyVirus - Mert Ulupınar Antivirus Scanner Pro
+Arka Plan Taramaları için G/Ç ve CPU Sınırlama
+
+Created by Mert Ulupınar
+"""
+
+import os
+import sys
+import time
+import ctypes
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger('Mert Ulupınar.Throttle')
+
+BURST_SECONDS = 0.05  # Kova kapasitesi: bu kadar sürelik iş birikebilir (patlama yok)
+MAX_WAIT = 0.1        # Bekleyenler sınır değişikliklerini en geç bu sürede görür
+DUTY_SLICE = 0.01     # CPU payı bu kadar iş biriktikçe uygulanır (saniye)
+
+# ioprio sınıfları (linux/ioprio.h)
+IOPRIO_CLASS_RT = 1
+IOPRIO_CLASS_BE = 2
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_CLASSES = {"rt": IOPRIO_CLASS_RT, "be": IOPRIO_CLASS_BE, "idle": IOPRIO_CLASS_IDLE}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_SHIFT = 13
+_SYS_IOPRIO_SET = {"x86_64": 251, "i686": 289, "i386": 289, "aarch64": 30, "armv7l": 314,
+                   "ppc64le": 273, "s390x": 282, "riscv64": 30}
+
+_UNCHANGED = object()
+
+
+class TokenBucket:
+    """
+    Birden çok thread tarafından paylaşılan token kovası.
+
+    Kapasite yalnızca BURST_SECONDS kadar iş alır; böylece sınır ani
+    patlamalar yerine düzgün bir hızla uygulanır. Kapasiteden büyük istekler
+    kova dolduğunda geçer ve borç bırakır, sonraki istekler borç ödenene kadar
+    bekler. Hız tarama sürerken set_rate() ile değiştirilebilir.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst_seconds: float = BURST_SECONDS):
+        self.burst_seconds = burst_seconds
+        self.rate: Optional[float] = None
+        self.capacity = 0.0
+        self.waited = 0.0  # Toplam bekleme süresi (saniye)
+        self._tokens = 0.0
+        self._last = time.monotonic()
+        self._cond = threading.Condition()
+        self.set_rate(rate)
+
+    def set_rate(self, rate: Optional[float]) -> None:
+        """Hızı değiştirir (None veya 0 = sınırsız); bekleyenler hemen yeni hızı görür."""
+        with self._cond:
+            self._refill()
+            self.rate = rate if rate and rate > 0 else None
+            if self.rate is None:
+                self.capacity = 0.0
+                self._tokens = 0.0
+            else:
+                self.capacity = max(self.rate * self.burst_seconds, 1.0)
+                self._tokens = min(self._tokens, self.capacity)
+            self._cond.notify_all()
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """amount kadar token alınana kadar bekler."""
+        with self._cond:
+            started = None
+            while self.rate is not None:
+                self._refill()
+                needed = min(amount, self.capacity)
+                if self._tokens >= needed:
+                    self._tokens -= amount
+                    break
+                if started is None:
+                    started = time.monotonic()
+                self._cond.wait(min((needed - self._tokens) / self.rate, MAX_WAIT))
+            if started is not None:
+                self.waited += time.monotonic() - started
+
+    def _refill(self) -> None:
+        """Geçen süreye göre token ekler (kilit altında çağrılır)."""
+        now = time.monotonic()
+        if self.rate is not None:
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+
+class DutyCycle:
+    """
+    İşçi thread başına CPU payı sınırı.
+
+    Her thread'in harcadığı CPU süresi time.thread_time() ile ölçülür;
+    DUTY_SLICE kadar iş biriktiğinde, payı tutturacak kadar uyunur.
+    """
+
+    def __init__(self, fraction: Optional[float] = None):
+        self.fraction: Optional[float] = None
+        self.slept = 0.0
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.set_fraction(fraction)
+
+    def set_fraction(self, fraction: Optional[float]) -> None:
+        """CPU payını değiştirir (None veya >= 1 = sınırsız)."""
+        self.fraction = fraction if fraction and 0 < fraction < 1 else None
+
+    def pause(self) -> None:
+        """İş birimi bittiğinde çağrılır; gerekirse uyur."""
+        fraction = self.fraction
+        now = time.thread_time()
+        last = getattr(self._local, "last", None)
+        self._local.last = now
+        if fraction is None or last is None:
+            self._local.busy = 0.0
+            return
+
+        busy = getattr(self._local, "busy", 0.0) + (now - last)
+        if busy < DUTY_SLICE:
+            self._local.busy = busy
+            return
+        self._local.busy = 0.0
+        delay = busy * (1.0 / fraction - 1.0)
+        time.sleep(delay)
+        self._local.last = time.thread_time()
+        with self._lock:
+            self.slept += delay
+
+
+def set_io_priority(ioprio_class: int, level: int = 4) -> bool:
+    """
+    Çağıran thread'in G/Ç önceliğini ayarlar (Linux, ioprio_set).
+    Sonradan oluşturulan thread'ler bu önceliği devralır.
+    """
+    number = _SYS_IOPRIO_SET.get(os.uname().machine) if hasattr(os, "uname") else None
+    if not sys.platform.startswith("linux") or number is None:
+        logger.debug("ioprio bu platformda desteklenmiyor")
+        return False
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        value = (ioprio_class << _IOPRIO_CLASS_SHIFT) | (level if ioprio_class != IOPRIO_CLASS_IDLE else 0)
+        if libc.syscall(number, _IOPRIO_WHO_PROCESS, 0, value) != 0:
+            logger.warning(f"ioprio ayarlanamadı: {os.strerror(ctypes.get_errno())}")
+            return False
+    except (OSError, AttributeError) as e:
+        logger.warning(f"ioprio ayarlanamadı: {e}")
+        return False
+    return True
+
+
+def set_nice(nice: int) -> bool:
+    """
+    Çağıran thread'in nice değerini en az nice olacak şekilde yükseltir.
+    Linux'ta nice thread başınadır; GUI thread'i etkilenmez.
+    """
+    if not hasattr(os, "getpriority"):
+        return False
+    try:
+        current = os.getpriority(os.PRIO_PROCESS, 0)
+        if nice > current:
+            os.setpriority(os.PRIO_PROCESS, 0, nice)
+    except OSError as e:
+        logger.warning(f"nice ayarlanamadı: {e}")
+        return False
+    return True
+
+
+class ScanThrottle:
+    """
+    Tarama işçilerinin ortak hız sınırları.
+
+    Args:
+        bytes_per_sec: Saniyede okunacak en fazla byte (None = sınırsız)
+        files_per_sec: Saniyede açılacak en fazla dosya (None = sınırsız)
+        cpu_fraction: İşçi başına CPU payı, 0-1 arası (None = sınırsız)
+        nice: Tarama thread'lerinin nice değeri
+        ioprio_class: 'idle', 'be' veya 'rt' G/Ç önceliği sınıfı
+        ioprio_level: be/rt sınıfında 0 (yüksek) - 7 (düşük) arası seviye
+
+    Sınırlar tarama sürerken set_limits() ile değiştirilebilir.
+    """
+
+    def __init__(self, bytes_per_sec: Optional[float] = None, files_per_sec: Optional[float] = None,
+                 cpu_fraction: Optional[float] = None, nice: Optional[int] = None,
+                 ioprio_class: Optional[str] = None, ioprio_level: int = 4):
+        if ioprio_class is not None and ioprio_class not in IOPRIO_CLASSES:
+            raise ValueError(f"Bilinmeyen ioprio sınıfı: {ioprio_class}")
+        self.bytes = TokenBucket(bytes_per_sec)
+        self.files = TokenBucket(files_per_sec)
+        self.duty = DutyCycle(cpu_fraction)
+        self.nice = nice
+        self.ioprio_class = ioprio_class
+        self.ioprio_level = ioprio_level
+
+    @property
+    def enabled(self) -> bool:
+        return self.bytes.rate is not None or self.files.rate is not None or self.duty.fraction is not None
+
+    def set_limits(self, bytes_per_sec=_UNCHANGED, files_per_sec=_UNCHANGED, cpu_fraction=_UNCHANGED) -> None:
+        """Verilen sınırları değiştirir; verilmeyenler aynı kalır."""
+        if bytes_per_sec is not _UNCHANGED:
+            self.bytes.set_rate(bytes_per_sec)
+        if files_per_sec is not _UNCHANGED:
+            self.files.set_rate(files_per_sec)
+        if cpu_fraction is not _UNCHANGED:
+            self.duty.set_fraction(cpu_fraction)
+        logger.info(f"Tarama sınırları: {self.as_dict()}")
+
+    def apply_priority(self) -> None:
+        """nice ve ioprio ayarlarını çağıran (tarama) thread'ine uygular."""
+        if self.nice is not None:
+            set_nice(self.nice)
+        if self.ioprio_class is not None:
+            set_io_priority(IOPRIO_CLASSES[self.ioprio_class], self.ioprio_level)
+
+    def before_file(self) -> None:
+        """Dosya açılmadan önce çağrılır."""
+        self.files.acquire(1)
+
+    def after_read(self, nbytes: int) -> None:
+        """Okunan veri için token harcar ve CPU payını uygular."""
+        if nbytes:
+            self.bytes.acquire(nbytes)
+        self.duty.pause()
+
+    def as_dict(self) -> dict:
+        return {
+            "bytes_per_sec": self.bytes.rate,
+            "files_per_sec": self.files.rate,
+            "cpu_fraction": self.duty.fraction,
+            "throttled_seconds": round(self.bytes.waited + self.files.waited + self.duty.slept, 3),
+        }